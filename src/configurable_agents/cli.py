@@ -663,9 +663,23 @@ def cmd_deploy(args: argparse.Namespace) -> int:
     return 0
 
 
+def _cost_ledger_path(args: argparse.Namespace) -> str:
+    """Storage database holding the cost ledger (--db or the default storage path)."""
+    db_path = getattr(args, "db", None)
+    if db_path:
+        return db_path
+    from configurable_agents.config.schema import StorageConfig
+
+    return StorageConfig().path
+
+
 def cmd_report_costs(args: argparse.Namespace) -> int:
     """
-    Generate cost reports from MLFlow tracking data.
+    Generate cost reports from the local cost ledger or MLFlow tracking data.
+
+    The ledger source (default) pushes filters and aggregation down to the
+    storage database and streams exports; --source mlflow queries MLFlow
+    experiments instead.
 
     Args:
         args: Parsed command-line arguments
@@ -674,11 +688,17 @@ def cmd_report_costs(args: argparse.Namespace) -> int:
         Exit code (0 for success, 1 for error)
     """
     try:
-        # Initialize cost reporter
-        tracking_uri = args.tracking_uri
-        reporter = CostReporter(tracking_uri=tracking_uri)
+        source = getattr(args, "source", "ledger")
 
-        print_info(f"Querying MLFlow: {colorize(tracking_uri, Colors.CYAN)}")
+        # Initialize cost reporter
+        if source == "mlflow":
+            tracking_uri = args.tracking_uri
+            reporter = CostReporter(tracking_uri=tracking_uri)
+            print_info(f"Querying MLFlow: {colorize(tracking_uri, Colors.CYAN)}")
+        else:
+            ledger_path = _cost_ledger_path(args)
+            reporter = CostReporter(ledger_path=ledger_path)
+            print_info(f"Querying cost ledger: {colorize(ledger_path, Colors.CYAN)}")
 
         # Parse date range
         start_date = None
@@ -696,31 +716,43 @@ def cmd_report_costs(args: argparse.Namespace) -> int:
                 return 1
         elif args.start_date or args.end_date:
             if args.start_date:
-                from datetime import datetime
-
                 start_date = datetime.fromisoformat(args.start_date)
             if args.end_date:
-                from datetime import datetime
-
                 end_date = datetime.fromisoformat(args.end_date)
 
-        # Query cost entries
-        entries = reporter.get_cost_entries(
-            experiment_name=args.experiment,
-            workflow_name=args.workflow,
-            start_date=start_date,
-            end_date=end_date,
-            status_filter=args.status,
-        )
+        filters = {
+            "experiment_name": args.experiment,
+            "workflow_name": args.workflow,
+            "start_date": start_date,
+            "end_date": end_date,
+            "status_filter": args.status,
+        }
 
-        if not entries:
-            print_warning("No cost entries found matching the filters")
-            return 0
+        if source == "mlflow":
+            # Query cost entries
+            entries = reporter.get_cost_entries(**filters)
+
+            if not entries:
+                print_warning("No cost entries found matching the filters")
+                return 0
+
+            print_success(f"Found {len(entries)} workflow runs")
+
+            # Generate summary
+            summary = reporter.generate_summary(entries)
+        else:
+            filters["model"] = getattr(args, "model", None)
+            filters["provider"] = getattr(args, "provider", None)
+
+            # Summary is aggregated by the database; entries are only read to export
+            entries = None
+            summary = reporter.summarize(**filters)
 
-        print_success(f"Found {len(entries)} workflow runs")
+            if not summary.total_runs:
+                print_warning("No cost entries found matching the filters")
+                return 0
 
-        # Generate summary
-        summary = reporter.generate_summary(entries)
+            print_success(f"Found {summary.total_runs} workflow runs")
 
         # Display summary
         print(f"\n{colorize('Cost Summary:', Colors.BOLD)}")
@@ -751,22 +783,28 @@ def cmd_report_costs(args: argparse.Namespace) -> int:
         # Aggregate by period if requested
         if args.aggregate_by:
             print(f"\n{colorize(f'Cost by {args.aggregate_by.capitalize()}:', Colors.BOLD)}")
-            aggregated = reporter.aggregate_by_period(entries, period=args.aggregate_by)
+            if entries is None:
+                aggregated = reporter.aggregate_by_period(period=args.aggregate_by, **filters)
+            else:
+                aggregated = reporter.aggregate_by_period(entries, period=args.aggregate_by)
             for period_key, cost in sorted(aggregated.items()):
                 print(f"  {period_key:<15} ${cost:.6f}")
 
         # Export to file if requested
         if args.output:
             output_format = args.format.lower()
+            if output_format not in ("json", "csv"):
+                print_error(f"Invalid format: {output_format}")
+                return 1
+
+            if entries is None:
+                entries = reporter.iter_cost_entries(**filters)  # Streamed to the file
             if output_format == "json":
                 reporter.export_to_json(
                     entries, args.output, include_summary=args.include_summary
                 )
-            elif output_format == "csv":
-                reporter.export_to_csv(entries, args.output)
             else:
-                print_error(f"Invalid format: {output_format}")
-                return 1
+                reporter.export_to_csv(entries, args.output)
 
             print_success(f"Exported to {args.output}")
 
@@ -795,7 +833,7 @@ def cmd_report_costs(args: argparse.Namespace) -> int:
 
 def cmd_cost_report(args: argparse.Namespace) -> int:
     """
-    Generate unified cost report from MLFlow experiment data.
+    Generate unified cost report by provider from the cost ledger or MLFlow.
 
     Args:
         args: Parsed command-line arguments
@@ -817,7 +855,12 @@ def cmd_cost_report(args: argparse.Namespace) -> int:
             return 1
 
         # Generate cost report
-        report = generate_cost_report(experiment_name, mlflow_uri=mlflow_uri)
+        if getattr(args, "source", "ledger") == "mlflow":
+            report = generate_cost_report(experiment_name, mlflow_uri=mlflow_uri)
+        else:
+            report = generate_cost_report(
+                experiment_name, mlflow_uri=mlflow_uri, ledger_path=_cost_ledger_path(args)
+            )
 
         console = Console()
 
@@ -2466,12 +2509,23 @@ For more information, visit: https://github.com/yourusername/configurable-agents
     costs_parser = report_subparsers.add_parser(
         "costs",
         help="Generate cost reports",
-        description="Query MLFlow for cost data and generate reports",
+        description="Query the local cost ledger (or MLFlow) and generate cost reports",
+    )
+    costs_parser.add_argument(
+        "--source",
+        choices=["ledger", "mlflow"],
+        default="ledger",
+        help="Cost data source (default: ledger)",
+    )
+    costs_parser.add_argument(
+        "--db",
+        default=None,
+        help="Storage database holding the cost ledger (default: ./workflows.db)",
     )
     costs_parser.add_argument(
         "--tracking-uri",
         default="file://./mlruns",
-        help="MLFlow tracking URI (default: file://./mlruns)",
+        help="MLFlow tracking URI for --source mlflow (default: file://./mlruns)",
     )
     costs_parser.add_argument(
         "--experiment",
@@ -2499,6 +2553,14 @@ For more information, visit: https://github.com/yourusername/configurable-agents
         choices=["success", "failure"],
         help="Filter by run status",
     )
+    costs_parser.add_argument(
+        "--model",
+        help="Filter by model (ledger source only)",
+    )
+    costs_parser.add_argument(
+        "--provider",
+        help="Filter by provider (ledger source only)",
+    )
     costs_parser.add_argument(
         "--breakdown",
         action="store_true",
@@ -2534,13 +2596,24 @@ For more information, visit: https://github.com/yourusername/configurable-agents
     cost_report_parser = subparsers.add_parser(
         "cost-report",
         help="Generate unified cost report by provider",
-        description="Generate cost breakdown by provider from MLFlow experiment data",
+        description="Generate cost breakdown by provider from the cost ledger or MLFlow",
     )
     cost_report_parser.add_argument(
         "--experiment",
         required=True,
         help="MLFlow experiment name (required)",
     )
+    cost_report_parser.add_argument(
+        "--source",
+        choices=["ledger", "mlflow"],
+        default="ledger",
+        help="Cost data source (default: ledger)",
+    )
+    cost_report_parser.add_argument(
+        "--db",
+        default=None,
+        help="Storage database holding the cost ledger (default: ./workflows.db)",
+    )
     cost_report_parser.add_argument(
         "--mlflow-uri",
         default=None,
@@ -2609,6 +2682,17 @@ For more information, visit: https://github.com/yourusername/configurable-agents
         required=True,
         help="MLFlow experiment name (required)",
     )
+    obs_cost_parser.add_argument(
+        "--source",
+        choices=["ledger", "mlflow"],
+        default="ledger",
+        help="Cost data source (default: ledger)",
+    )
+    obs_cost_parser.add_argument(
+        "--db",
+        default=None,
+        help="Storage database holding the cost ledger (default: ./workflows.db)",
+    )
     obs_cost_parser.add_argument(
         "--mlflow-uri",
         default=None,
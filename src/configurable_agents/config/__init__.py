@@ -1,5 +1,10 @@
 """Config parsing and validation"""
 
+from configurable_agents.config.conditions import (
+    CompiledCondition,
+    ConditionError,
+    compile_condition,
+)
 from configurable_agents.config.parser import (
     ConfigLoader,
     ConfigParseError,
@@ -82,6 +87,10 @@ __all__ = [
     "parse_type_string",
     "validate_type_string",
     "get_python_type",
+    # Conditions
+    "CompiledCondition",
+    "ConditionError",
+    "compile_condition",
     # Validator
     "ValidationError",
     "validate_config",
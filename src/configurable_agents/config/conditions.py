@@ -0,0 +1,319 @@
+"""
+Condition compiler for routing edges.
+
+Route conditions are parsed once into a small, whitelisted expression tree
+and evaluated directly against state attributes. Parsing uses Python's own
+tokenizer (ast in "eval" mode), so parentheses, operator precedence and
+quoting behave as users expect, but only the node types below are accepted:
+
+- Field references: state.field (nested: state.field.key)
+- Literals: strings, numbers, true/false/null (any case), bare words as strings
+  (including hyphenated words such as in-progress after a comparison operator)
+- Comparison: ==, !=, <, <=, >, >= (chains allowed: 0 < state.x <= 10)
+- Membership: in, not in (against a field or a literal list/tuple)
+- Boolean: and, or, not, parentheses for grouping
+
+Anything else (calls, subscripts, lambdas, dunder attributes, arithmetic) is
+rejected at compile time. Compiled conditions are cached by source string.
+
+Missing fields never raise: a comparison or truthiness check involving a
+field that is absent from state is False (including under ``not``).
+"""
+
+import ast
+import keyword
+import operator
+import re
+from functools import lru_cache
+from typing import Any, Callable, List, Tuple
+
+CONDITION_CACHE_SIZE = 1024
+
+_COMPARISON_OPS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b,
+}
+
+_WORD_LITERALS = {"true": True, "false": False, "null": None, "none": None}
+
+# Quoted strings (left untouched) or a bare word right after a comparison
+# operator. Hyphenated words and Python keywords are not valid expressions,
+# so they are quoted before parsing (state.status == in-progress).
+_BARE_LITERAL_PATTERN = re.compile(
+    r"""("(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')"""
+    r"|((?:==|!=|<=|>=|<|>)\s*)([\w.]+(?:-[\w.]+)*)(?![\w.(\[-])"
+)
+
+
+class _Missing:
+    """Sentinel for state fields that are not set."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<missing>"
+
+
+MISSING = _Missing()
+
+
+class ConditionError(Exception):
+    """Raised when a condition cannot be compiled or evaluated."""
+
+    def __init__(self, condition: str, message: str):
+        self.condition = condition
+        super().__init__(f"Invalid condition '{condition}': {message}")
+
+
+def get_state_value(state: Any, name: str, default: Any = MISSING) -> Any:
+    """
+    Read one field from state without dumping the whole model.
+
+    Args:
+        state: Pydantic model, dict or any object with attributes
+        name: Field name
+        default: Returned when the field is not present
+
+    Returns:
+        Field value or default
+    """
+    if isinstance(state, dict):
+        return state.get(name, default)
+    return getattr(state, name, default)
+
+
+def _quote_bare_literals(source: str) -> str:
+    """Quote bare comparison operands that Python would not parse as a word."""
+
+    def replace(match: "re.Match[str]") -> str:
+        quoted, op, word = match.groups()
+        if quoted:
+            return quoted
+        if word.startswith("state."):
+            return match.group(0)
+        if "-" in word or (keyword.iskeyword(word) and word.lower() not in _WORD_LITERALS):
+            return f'{op}"{word}"'
+        return match.group(0)
+
+    return _BARE_LITERAL_PATTERN.sub(replace, source)
+
+
+def _truthy(value: Any) -> bool:
+    return value is not MISSING and bool(value)
+
+
+class CompiledCondition:
+    """
+    Condition parsed once, evaluated many times.
+
+    Attributes:
+        source: Original condition string
+        fields: Top-level state fields referenced, in order of appearance
+    """
+
+    __slots__ = ("source", "fields", "_evaluate")
+
+    def __init__(self, source: str, fields: Tuple[str, ...], evaluate: Callable[[Any], Any]):
+        self.source = source
+        self.fields = fields
+        self._evaluate = evaluate
+
+    def evaluate(self, state: Any) -> bool:
+        """
+        Evaluate the condition against state.
+
+        Args:
+            state: Pydantic model, dict or object exposing fields as attributes
+
+        Returns:
+            Boolean result
+
+        Raises:
+            ConditionError: If a comparison fails (e.g. incompatible types)
+        """
+        try:
+            return _truthy(self._evaluate(state))
+        except TypeError as e:
+            raise ConditionError(self.source, str(e)) from e
+
+    __call__ = evaluate
+
+    def __repr__(self) -> str:
+        return f"CompiledCondition({self.source!r})"
+
+
+class _Compiler:
+    """Translate a whitelisted AST into nested closures."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.fields: List[str] = []
+
+    def fail(self, message: str) -> ConditionError:
+        return ConditionError(self.source, message)
+
+    def boolean(self, node: ast.AST) -> Callable[[Any], Any]:
+        """Compile a node used in a boolean position (top level, and/or/not)."""
+        if isinstance(node, ast.BoolOp):
+            parts = [self.boolean(v) for v in node.values]
+            if isinstance(node.op, ast.And):
+                return lambda s: all(_truthy(p(s)) for p in parts)
+            return lambda s: any(_truthy(p(s)) for p in parts)
+
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+            inner = self.boolean(node.operand)
+
+            def negate(s: Any) -> Any:
+                value = inner(s)
+                return False if value is MISSING else not _truthy(value)
+
+            return negate
+
+        if isinstance(node, ast.Compare):
+            return self.compare(node)
+
+        if isinstance(node, ast.Attribute):
+            return self.field(node)
+
+        if isinstance(node, ast.Constant):
+            value = self.literal(node)
+            return lambda s: value
+
+        if isinstance(node, ast.Name):
+            if node.id.lower() in _WORD_LITERALS:
+                value = _WORD_LITERALS[node.id.lower()]
+                return lambda s: value
+            raise self.fail(f"bare name '{node.id}' is not a field; use 'state.{node.id}'")
+
+        raise self.fail(f"unsupported expression '{type(node).__name__}'")
+
+    def compare(self, node: ast.Compare) -> Callable[[Any], Any]:
+        operands = [self.operand(node.left)] + [self.operand(c) for c in node.comparators]
+        ops = []
+        for op in node.ops:
+            fn = _COMPARISON_OPS.get(type(op))
+            if fn is None:
+                raise self.fail(f"unsupported operator '{type(op).__name__}'")
+            ops.append(fn)
+
+        if len(ops) == 1:
+            left, right = operands
+            compare_op = ops[0]
+
+            def compare_one(s: Any) -> bool:
+                a, b = left(s), right(s)
+                if a is MISSING or b is MISSING:
+                    return False
+                return compare_op(a, b)
+
+            return compare_one
+
+        def compare_chain(s: Any) -> bool:
+            a = operands[0](s)
+            for compare_op, right in zip(ops, operands[1:]):
+                b = right(s)
+                if a is MISSING or b is MISSING or not compare_op(a, b):
+                    return False
+                a = b
+            return True
+
+        return compare_chain
+
+    def operand(self, node: ast.AST) -> Callable[[Any], Any]:
+        """Compile a comparison operand (field or literal)."""
+        if isinstance(node, ast.Attribute):
+            return self.field(node)
+        if isinstance(node, ast.Name):
+            # Unquoted words are string literals (state.status == approved)
+            value = _WORD_LITERALS.get(node.id.lower(), node.id)
+            return lambda s: value
+        value = self.literal(node)
+        return lambda s: value
+
+    def literal(self, node: ast.AST) -> Any:
+        if isinstance(node, (ast.List, ast.Tuple)):
+            return tuple(self.literal(element) for element in node.elts)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = self.literal(node.operand)
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                raise self.fail("unary +/- only applies to numbers")
+            return -value if isinstance(node.op, ast.USub) else value
+        if isinstance(node, ast.Constant) and (
+            node.value is None or isinstance(node.value, (str, int, float, bool))
+        ):
+            return node.value
+        raise self.fail(f"unsupported operand '{type(node).__name__}'")
+
+    def field(self, node: ast.Attribute) -> Callable[[Any], Any]:
+        path: List[str] = []
+        current: ast.AST = node
+        while isinstance(current, ast.Attribute):
+            if current.attr.startswith("__"):
+                raise self.fail(f"access to '{current.attr}' is not allowed")
+            path.append(current.attr)
+            current = current.value
+        if not (isinstance(current, ast.Name) and current.id == "state"):
+            raise self.fail("field references must start with 'state.'")
+
+        path.reverse()
+        if path[0] not in self.fields:
+            self.fields.append(path[0])
+        root, rest = path[0], tuple(path[1:])
+
+        if not rest:
+            return lambda s: get_state_value(s, root)
+
+        def walk(s: Any) -> Any:
+            value = get_state_value(s, root)
+            for key in rest:
+                if value is MISSING or value is None:
+                    return MISSING
+                value = get_state_value(value, key)
+            return value
+
+        return walk
+
+
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def compile_condition(logic: str) -> CompiledCondition:
+    """
+    Compile a route condition string (cached by source).
+
+    "default" (or an empty string) compiles to a condition that is always True.
+
+    Args:
+        logic: Condition expression, e.g. "state.score > 0.8 and not state.done"
+
+    Returns:
+        CompiledCondition
+
+    Raises:
+        ConditionError: If the expression is malformed, uses unsupported
+            syntax or references no state field
+
+    Example:
+        >>> cond = compile_condition("(state.a > 1 or state.b) and state.c == 'x'")
+        >>> cond.evaluate({"a": 2, "b": False, "c": "x"})
+        True
+    """
+    source = (logic or "").strip()
+    if not source or source == "default":
+        return CompiledCondition(source or "default", (), lambda s: True)
+
+    try:
+        tree = ast.parse(_quote_bare_literals(source), mode="eval")
+    except SyntaxError as e:
+        raise ConditionError(source, f"syntax error: {e.msg}") from None
+
+    compiler = _Compiler(source)
+    evaluate = compiler.boolean(tree.body)
+    if not compiler.fields:
+        raise compiler.fail("condition must reference at least one state field")
+    return CompiledCondition(source, tuple(compiler.fields), evaluate)
+
@@ -198,6 +198,14 @@ class SandboxConfig(BaseModel):
         le=3600,
         description="Execution timeout in seconds (overrides preset)"
     )
+    pool: bool = Field(
+        False,
+        description=(
+            "Reuse warm workers: worker processes in python mode (process "
+            "isolation, hard timeouts, preset memory limit), locked-down "
+            "containers in docker mode (pool size from the preset)"
+        ),
+    )
 
     @field_validator("preset")
     @classmethod
@@ -291,6 +299,19 @@ class MemoryConfig(BaseModel):
         "agent",
         description="Default memory scope: 'agent', 'workflow', or 'node'",
     )
+    recall_k: int = Field(
+        0,
+        ge=0,
+        description="Append the k most relevant memories to the prompt (0 disables recall)",
+    )
+    recall_query: Optional[str] = Field(
+        None,
+        description="Template for the recall search query (default: the resolved prompt)",
+    )
+    index: Literal["flat", "ivf"] = Field(
+        "flat",
+        description="Recall index: 'flat' (exact) or 'ivf' (approximate, for large scopes)",
+    )
 
 
 class ToolConfig(BaseModel):
@@ -415,6 +436,18 @@ class ParallelConfig(BaseModel):
     collect_field: str = Field(
         ..., description="State field to collect results into (must be list type)"
     )
+    max_concurrency: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Maximum target node executions in flight at once (None = unbounded)",
+    )
+    projection: Literal["full", "referenced"] = Field(
+        "full",
+        description=(
+            "State passed to each branch: 'full' copies every field, 'referenced' "
+            "only the fields the target node's prompt/inputs use (plus required fields)"
+        ),
+    )
 
 
 class EdgeConfig(BaseModel):
@@ -574,6 +607,19 @@ class StorageConfig(BaseModel):
 
     backend: str = Field("sqlite", description="Storage backend type: 'sqlite' or connection URI")
     path: str = Field("./workflows.db", description="SQLite database path (only for sqlite backend)")
+    checkpoint_durability: Literal["sync", "group", "async"] = Field(
+        "group",
+        description=(
+            "Execution checkpoint writes: 'sync' (commit per node), 'group' (batched in "
+            "the background, flushed at run completion) or 'async' (batched, best effort)"
+        ),
+    )
+    checkpoint_batch_size: int = Field(
+        100, ge=1, description="Maximum checkpoints committed per transaction"
+    )
+    checkpoint_queue_size: int = Field(
+        10000, ge=1, description="Maximum queued checkpoints before node execution blocks"
+    )
 
 
 class GlobalConfig(BaseModel):
@@ -9,6 +9,7 @@ import re
 from collections import defaultdict, deque
 from typing import Dict, List, Optional, Set
 
+from configurable_agents.config.conditions import ConditionError, compile_condition
 from configurable_agents.config.schema import WorkflowConfig
 from configurable_agents.config.types import TypeParseError, validate_type_string
 
@@ -461,7 +462,8 @@ def _validate_conditional_edges(
     Checks:
     - Each route.to is a valid node ID or "END"
     - At least one route has condition.logic == "default" (fallback required)
-    - Condition logic references only valid state fields (basic check)
+    - Condition logic compiles (syntax, allowed operators)
+    - Condition logic references only valid state fields
     """
     for i, edge in enumerate(config.edges):
         if edge.routes:
@@ -476,13 +478,23 @@ def _validate_conditional_edges(
                     context="Every conditional edge needs a fallback route",
                 )
 
-            # Validate each route's condition references valid state fields
+            # Compile each condition (fails on malformed syntax) and check
+            # that it references only valid state fields
             for route in edge.routes:
                 if route.condition.logic != "default":
-                    # Extract state field references from condition logic
-                    # Basic check: look for state.X patterns and validate X exists
-                    for match in re.finditer(r"\bstate\.(\w+)\b", route.condition.logic):
-                        field_name = match.group(1)
+                    try:
+                        compiled = compile_condition(route.condition.logic)
+                    except ConditionError as e:
+                        raise ValidationError(
+                            f"Edge {i} (from '{edge.from_}'): {e}",
+                            suggestion=(
+                                "Use state.field references with ==, !=, <, <=, >, >=, "
+                                "and, or, not and parentheses"
+                            ),
+                            context=f"Condition: {route.condition.logic}",
+                        ) from e
+
+                    for field_name in compiled.fields:
                         if field_name not in state_fields:
                             similar = _find_similar(field_name, list(state_fields))
                             suggestion = (
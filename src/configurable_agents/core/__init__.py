@@ -13,22 +13,34 @@ from configurable_agents.core.output_builder import (
 )
 from configurable_agents.core.parallel import (
     create_fan_out_function,
+    ConcurrencyLimiter,
     get_parallel_index,
     get_parallel_item,
+    get_referenced_fields,
     is_parallel_execution,
+    limit_branches,
+    limit_branches_async,
+)
+from configurable_agents.core.runnable_cache import (
+    RunnableCache,
+    clear_runnable_cache,
+    get_runnable_cache,
 )
 from configurable_agents.core.state_builder import (
     StateBuilderError,
     build_state_model,
 )
 from configurable_agents.core.template import (
+    CompiledTemplate,
     TemplateResolutionError,
+    compile_template,
     resolve_prompt,
     extract_variables,
 )
 from configurable_agents.core.node_executor import (
     NodeExecutionError,
     execute_node,
+    execute_node_async,
 )
 from configurable_agents.core.graph_builder import (
     GraphBuilderError,
@@ -46,7 +58,11 @@ __all__ = [
     "create_fan_out_function",
     "get_parallel_index",
     "get_parallel_item",
+    "get_referenced_fields",
     "is_parallel_execution",
+    "ConcurrencyLimiter",
+    "limit_branches",
+    "limit_branches_async",
     # State and output
     "build_state_model",
     "StateBuilderError",
@@ -54,10 +70,17 @@ __all__ = [
     "OutputBuilderError",
     # Template
     "resolve_prompt",
+    "compile_template",
+    "CompiledTemplate",
     "extract_variables",
     "TemplateResolutionError",
+    # Runnable cache
+    "RunnableCache",
+    "get_runnable_cache",
+    "clear_runnable_cache",
     # Node execution
     "execute_node",
+    "execute_node_async",
     "NodeExecutionError",
     # Graph builder
     "build_graph",
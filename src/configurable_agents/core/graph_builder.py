@@ -11,6 +11,10 @@ Integrates:
 Design decisions:
 - Direct Pydantic BaseModel integration with LangGraph
 - Closure-based node functions (captures node_config and global_config)
+- Each node has a sync and a native async implementation, so the same
+  compiled graph serves both graph.invoke() and graph.ainvoke()
+- Run-specific tracker may be supplied per invocation via
+  config["configurable"]["tracker"], so one compiled graph can serve many runs
 - START/END as entry/exit points (not identity nodes)
 - Compiled graph return (ready for execution)
 - Minimal defensive validation (T-004 already validates)
@@ -18,8 +22,9 @@ Design decisions:
 """
 
 import logging
-from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Type
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, Optional, Type
 
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from pydantic import BaseModel
@@ -36,8 +41,17 @@ from configurable_agents.core.control_flow import (
     get_loop_iteration_key,
     increment_loop_iteration,
 )
-from configurable_agents.core.node_executor import NodeExecutionError, execute_node
-from configurable_agents.core.parallel import create_fan_out_function
+from configurable_agents.core.node_executor import (
+    NodeExecutionError,
+    execute_node,
+    execute_node_async,
+)
+from configurable_agents.core.parallel import (
+    create_fan_out_function,
+    limit_branches,
+    limit_branches_async,
+)
+from configurable_agents.core.template import compile_template
 
 if TYPE_CHECKING:
     from configurable_agents.observability import MLFlowTracker
@@ -63,6 +77,7 @@ def build_graph(
     state_model: Type[BaseModel],
     global_config: Optional[GlobalConfig] = None,
     tracker: Optional["MLFlowTracker"] = None,
+    output_models: Optional[Dict[str, Type[BaseModel]]] = None,
 ) -> CompiledStateGraph:
     """
     Build and compile LangGraph from config.
@@ -77,7 +92,10 @@ def build_graph(
         config: Validated workflow configuration
         state_model: Pydantic state model (from build_state_model)
         global_config: Global configuration (optional)
-        tracker: MLFlow tracker for observability (optional)
+        tracker: MLFlow tracker for observability (optional). When omitted,
+            a tracker can be passed per invocation via
+            ``graph.invoke(state, config={"configurable": {"tracker": tracker}})``
+        output_models: Prebuilt output models keyed by node ID (optional)
 
     Returns:
         Compiled LangGraph ready for execution
@@ -98,6 +116,9 @@ def build_graph(
         >>> initial = state_model(topic="AI Safety")
         >>> final = graph.invoke(initial)
         >>> print(final.research)
+        >>>
+        >>> # Or on an event loop (LLM calls use ainvoke)
+        >>> final = await graph.ainvoke(initial)
     """
     logger.info(f"Building graph for workflow '{config.flow.name}'")
 
@@ -107,17 +128,32 @@ def build_graph(
     # Collect nodes that are targets of loops for iteration tracking
     loop_targets = _collect_loop_targets(config)
 
+    # Fan-out targets whose branches run inside a concurrency window
+    limited_targets = _collect_limited_targets(config)
+
     # Create StateGraph with Pydantic model
     graph = StateGraph(state_model)
     logger.debug(f"Created StateGraph with state: {state_model.__name__}")
 
     # Add nodes (via closure-based functions)
     for node_config in config.nodes:
-        node_fn = make_node_function(node_config, global_config, tracker)
+        output_model = output_models.get(node_config.id) if output_models else None
+        node_fn = make_node_function(node_config, global_config, tracker, output_model)
+        async_node_fn = make_async_node_function(
+            node_config, global_config, tracker, output_model
+        )
         # Wrap with loop counter if this node is a loop target
         if node_config.id in loop_targets:
             node_fn = _wrap_with_loop_counter(node_fn, node_config.id)
-        graph.add_node(node_config.id, node_fn)
+            async_node_fn = _wrap_with_loop_counter_async(async_node_fn, node_config.id)
+        # Bound in-flight branches per fan-out dispatch (window sent with each Send)
+        if node_config.id in limited_targets:
+            node_fn = limit_branches(node_fn)
+            async_node_fn = limit_branches_async(async_node_fn)
+        graph.add_node(
+            node_config.id,
+            RunnableLambda(node_fn, afunc=async_node_fn, name=node_config.id),
+        )
         logger.debug(f"Added node: {node_config.id}")
 
     # Add edges (all types: linear, conditional, loop, parallel)
@@ -147,6 +183,7 @@ def make_node_function(
     node_config: NodeConfig,
     global_config: Optional[GlobalConfig],
     tracker: Optional["MLFlowTracker"] = None,
+    output_model: Optional[Type[BaseModel]] = None,
 ) -> Callable[[BaseModel], BaseModel]:
     """
     Create LangGraph-compatible node function.
@@ -158,21 +195,31 @@ def make_node_function(
         node_config: Node configuration
         global_config: Global configuration (optional)
         tracker: MLFlow tracker for observability (optional)
+        output_model: Prebuilt output model for the node (optional)
 
     Returns:
-        Node function: (state: BaseModel) -> BaseModel
+        Node function: (state: BaseModel, config: RunnableConfig) -> BaseModel
 
     Design:
         - Closure captures node_config, global_config, and tracker
+        - Without a captured tracker, uses config["configurable"]["tracker"]
         - Calls execute_node from T-011
         - NodeExecutionError propagated unchanged (already has context)
         - Unexpected errors wrapped with node context
     """
 
-    def node_fn(state: BaseModel) -> BaseModel:
+    execute_kwargs = {"output_model": output_model} if output_model is not None else {}
+    _precompile_templates(node_config)
+
+    def node_fn(state: BaseModel, config: Optional[RunnableConfig] = None) -> BaseModel:
         """Node function that executes the node."""
+        run_tracker = tracker
+        if run_tracker is None and config:
+            run_tracker = config.get("configurable", {}).get("tracker")
         try:
-            updated_state = execute_node(node_config, state, global_config, tracker)
+            updated_state = execute_node(
+                node_config, state, global_config, run_tracker, **execute_kwargs
+            )
             return updated_state
         except NodeExecutionError:
             # Already has node context, re-raise as-is
@@ -189,6 +236,59 @@ def make_node_function(
     return node_fn
 
 
+def make_async_node_function(
+    node_config: NodeConfig,
+    global_config: Optional[GlobalConfig],
+    tracker: Optional["MLFlowTracker"] = None,
+    output_model: Optional[Type[BaseModel]] = None,
+) -> Callable[..., Awaitable[BaseModel]]:
+    """
+    Create the native async counterpart of make_node_function.
+
+    Used by LangGraph when the graph runs via ainvoke/astream. Calls
+    execute_node_async so LLM requests await the provider instead of
+    occupying a worker thread per node.
+
+    Args:
+        node_config: Node configuration
+        global_config: Global configuration (optional)
+        tracker: MLFlow tracker for observability (optional)
+        output_model: Prebuilt output model for the node (optional)
+
+    Returns:
+        Async node function: (state, config) -> Awaitable[BaseModel]
+    """
+
+    execute_kwargs = {"output_model": output_model} if output_model is not None else {}
+
+    async def node_fn(state: BaseModel, config: Optional[RunnableConfig] = None) -> BaseModel:
+        """Async node function that executes the node."""
+        run_tracker = tracker
+        if run_tracker is None and config:
+            run_tracker = config.get("configurable", {}).get("tracker")
+        try:
+            return await execute_node_async(
+                node_config, state, global_config, run_tracker, **execute_kwargs
+            )
+        except NodeExecutionError:
+            raise
+        except Exception as e:
+            raise NodeExecutionError(
+                f"Node '{node_config.id}': Unexpected error: {e}",
+                node_id=node_config.id,
+            ) from e
+
+    node_fn.__name__ = f"async_node_{node_config.id}"
+    return node_fn
+
+
+def _precompile_templates(node_config: NodeConfig) -> None:
+    """Compile the node's prompt and input templates at build time (cached)."""
+    compile_template(node_config.prompt or "")
+    for template_str in (node_config.inputs or {}).values():
+        compile_template(template_str)
+
+
 def _add_edge(
     graph: StateGraph,
     edge: EdgeConfig,
@@ -232,7 +332,8 @@ def _add_edge(
 
     # Parallel edge (fan-out)
     if edge.parallel:
-        fan_out_fn = create_fan_out_function(edge.parallel)
+        target = next((n for n in nodes if n.id == edge.parallel.target_node), None)
+        fan_out_fn = create_fan_out_function(edge.parallel, target)
         graph.add_conditional_edges(from_node, fan_out_fn)
         return
 
@@ -262,6 +363,23 @@ def _collect_loop_targets(config: WorkflowConfig) -> set:
     return loop_targets
 
 
+def _collect_limited_targets(config: WorkflowConfig) -> set:
+    """
+    Collect target nodes of parallel edges with max_concurrency.
+
+    Args:
+        config: Workflow configuration
+
+    Returns:
+        Set of node IDs whose branches run inside a concurrency window
+    """
+    return {
+        edge.parallel.target_node
+        for edge in config.edges
+        if edge.parallel and edge.parallel.max_concurrency
+    }
+
+
 def _wrap_with_loop_counter(node_fn: Callable, node_id: str) -> Callable:
     """
     Wrap a node function to increment its loop iteration counter.
@@ -278,32 +396,55 @@ def _wrap_with_loop_counter(node_fn: Callable, node_id: str) -> Callable:
     """
     iteration_key = get_loop_iteration_key(node_id)
 
-    def wrapped_fn(state: BaseModel) -> BaseModel:
+    def wrapped_fn(state: BaseModel, config: Optional[RunnableConfig] = None) -> BaseModel:
         """Execute node with loop counter increment."""
-        # Increment iteration counter
-        if hasattr(state, "model_dump"):
-            state_dict = state.model_dump()
-        else:
-            state_dict = dict(state)
-
-        # Increment counter
-        current = state_dict.get(iteration_key, 0)
-        # Update state with new counter value
-        if hasattr(state, "model_copy"):
-            new_state = state.model_copy(update={iteration_key: current + 1})
-        else:
-            # Fallback for dict-like state
-            state[iteration_key] = current + 1
-            new_state = state
-
         # Execute original node function
-        return node_fn(new_state)
+        return node_fn(_increment_loop_counter(state, iteration_key), config)
 
     # Preserve function name for debugging
     wrapped_fn.__name__ = f"loop_wrapped_{node_fn.__name__}"
     return wrapped_fn
 
 
+def _wrap_with_loop_counter_async(node_fn: Callable, node_id: str) -> Callable:
+    """
+    Async counterpart of _wrap_with_loop_counter.
+
+    Args:
+        node_fn: Original async node function
+        node_id: Node identifier
+
+    Returns:
+        Wrapped async node function that increments loop counter
+    """
+    iteration_key = get_loop_iteration_key(node_id)
+
+    async def wrapped_fn(state: BaseModel, config: Optional[RunnableConfig] = None) -> BaseModel:
+        """Execute node with loop counter increment."""
+        return await node_fn(_increment_loop_counter(state, iteration_key), config)
+
+    wrapped_fn.__name__ = f"loop_wrapped_{node_fn.__name__}"
+    return wrapped_fn
+
+
+def _increment_loop_counter(state: Any, iteration_key: str) -> Any:
+    """Return state with its loop iteration counter incremented."""
+    # Increment iteration counter
+    if hasattr(state, "model_dump"):
+        state_dict = state.model_dump()
+    else:
+        state_dict = dict(state)
+
+    # Increment counter
+    current = state_dict.get(iteration_key, 0)
+    # Update state with new counter value
+    if hasattr(state, "model_copy"):
+        return state.model_copy(update={iteration_key: current + 1})
+    # Fallback for dict-like state
+    state[iteration_key] = current + 1
+    return state
+
+
 def _describe_edge(edge: EdgeConfig) -> str:
     """Get a human-readable description of an edge for logging."""
     from_node = edge.from_
@@ -14,31 +14,36 @@ Design decisions:
 - Copy-on-write state updates (immutable pattern)
 - Fail-fast error handling with context
 - Input mappings resolved before prompt resolution
-- {state.field} syntax preprocessed to {field} for template resolver
-  (TODO T-011.1: Update template resolver to handle state. prefix natively)
+- LLM clients, output models, tools and bound runnables reused via
+  core.runnable_cache (keyed on config content)
+- {state.field} placeholders resolved natively by the template resolver
 """
 
+import asyncio
 import json
 import logging
-import re
 import time
-from typing import TYPE_CHECKING, Any, Optional, Union
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Type, Union
 
 from pydantic import BaseModel, ValidationError
 
 from configurable_agents.config.schema import GlobalConfig, MemoryConfig, NodeConfig, ToolConfig
 from configurable_agents.core.output_builder import OutputBuilderError, build_output_model
+from configurable_agents.core.runnable_cache import get_runnable_cache
 from configurable_agents.core.template import TemplateResolutionError, resolve_prompt
 from configurable_agents.llm import (
     LLMAPIError,
     LLMConfigError,
     LLMProviderError,
+    bind_structured_output,
     call_llm_structured,
+    call_llm_structured_async,
     create_llm,
     merge_llm_config,
 )
-from configurable_agents.memory import AgentMemory
-from configurable_agents.observability.cost_estimator import CostEstimator
+from configurable_agents.memory import AgentMemory, format_recalled_memories
+from configurable_agents.observability.cost_estimator import get_cost_estimator
 from configurable_agents.storage.base import MemoryRepository
 from configurable_agents.tools import ToolConfigError, ToolNotFoundError, get_tool
 
@@ -49,6 +54,8 @@ try:
         PythonSandboxExecutor,
         SafetyError,
         get_preset,
+        get_sandbox_pool,
+        parse_memory_limit,
         SandboxResult,
     )
     SANDBOX_AVAILABLE = True
@@ -58,6 +65,8 @@ except ImportError:
     PythonSandboxExecutor = None
     SafetyError = None
     get_preset = None
+    get_sandbox_pool = None
+    parse_memory_limit = None
     SandboxResult = None
 
 # Optional MLFlow import for direct metric logging
@@ -94,39 +103,37 @@ class NodeExecutionError(Exception):
         super().__init__(message)
 
 
-def _strip_state_prefix(template: str) -> str:
-    """
-    Strip {state.field} → {field} for template resolver compatibility.
+@dataclass
+class _NodeContext:
+    """Per-invocation values shared by the sync and async execution paths."""
 
-    The validator (T-004) accepts {state.field} syntax in prompts, and
-    SPEC.md examples use this syntax. However, the template resolver (T-010)
-    expects {field} to access state fields directly.
+    node_config: NodeConfig
+    state: BaseModel
+    global_config: Optional[GlobalConfig]
+    output_model: Optional[Type[BaseModel]]
+    execution_state_repo: Any = None
+    run_id: Optional[str] = None
+    usage: Any = None
+    resolved_inputs: Dict[str, Any] = field(default_factory=dict)
+    resolved_prompt: str = ""
+    agent_memory: Optional[AgentMemory] = None
+    tools: List[Any] = field(default_factory=list)
 
-    This is a temporary workaround until the template resolver is updated
-    to handle state. prefix natively.
+    @property
+    def node_id(self) -> str:
+        return self.node_config.id
 
-    TODO T-011.1: Update template resolver to handle {state.X} syntax directly
-    and remove this preprocessing step.
 
-    Args:
-        template: Template string potentially with {state.X} references
+@dataclass
+class _LLMCall:
+    """Prepared LLM invocation for a node."""
 
-    Returns:
-        Template with state. prefix removed from all placeholders
-
-    Examples:
-        >>> _strip_state_prefix("{state.topic}")
-        "{topic}"
-        >>> _strip_state_prefix("Process {state.input} and {state.metadata.author}")
-        "Process {input} and {metadata.author}"
-        >>> _strip_state_prefix("{query}")  # No state prefix
-        "{query}"
-        >>> _strip_state_prefix("No placeholders")
-        "No placeholders"
-    """
-    # Replace {state.field} with {field}
-    # This regex matches {state.anything} and replaces with {anything}
-    return re.sub(r"\{state\.([^}]+)\}", r"{\1}", template)
+    llm: Any
+    structured_llm: Any
+    output_model: Type[BaseModel]
+    tools: Optional[List[Any]]
+    max_retries: int
+    model_name: str
 
 
 def execute_node(
@@ -134,6 +141,7 @@ def execute_node(
     state: BaseModel,
     global_config: Optional[GlobalConfig] = None,
     tracker: Optional["MLFlowTracker"] = None,
+    output_model: Optional[Type[BaseModel]] = None,
 ) -> BaseModel:
     """
     Execute a single workflow node.
@@ -154,6 +162,8 @@ def execute_node(
         state: Current workflow state (Pydantic model)
         global_config: Global configuration (optional)
         tracker: MLFlow tracker for observability (optional)
+        output_model: Prebuilt output model (optional, built from
+            node_config.output_schema when omitted)
 
     Returns:
         Updated state (new Pydantic instance with outputs applied)
@@ -174,10 +184,147 @@ def execute_node(
     """
     node_id = node_config.id
 
+    try:
+        ctx = _prepare_node(node_config, state, global_config, tracker, output_model)
+        _inject_recalled_memories(ctx)
+
+        if node_config.code:
+            return _execute_code_node(ctx)
+
+        call = _prepare_llm_call(ctx)
+
+        # NOTE: Node-level tracing is now automatic via mlflow.langchain.autolog()
+        # The tracker parameter is kept for backward compatibility and config access,
+        # but actual tracing happens automatically - no manual track_node() needed!
+
+        # Start timing for node execution
+        node_start_time = time.time()
+
+        try:
+            # Call LLM with structured output enforcement
+            # Retries handled automatically
+            # Token usage automatically captured by MLflow 3.9 via mlflow.langchain.autolog()
+            result, usage = call_llm_structured(
+                llm=call.llm,
+                prompt=ctx.resolved_prompt,
+                output_model=call.output_model,
+                tools=call.tools,
+                max_retries=call.max_retries,
+                structured_llm=call.structured_llm,
+            )
+        except (LLMAPIError, ValidationError) as e:
+            _save_node_state(ctx, _failed_node_state(ctx, e, node_start_time))
+            raise _llm_failure_error(ctx, e)
+
+        new_state, node_state = _finalize_llm_node(ctx, call, result, usage, node_start_time)
+        _save_node_state(ctx, node_state)
+        return new_state
+
+    except NodeExecutionError:
+        # Re-raise NodeExecutionError as-is
+        raise
+    except Exception as e:
+        # Wrap any unexpected errors
+        raise NodeExecutionError(
+            f"Node '{node_id}': Unexpected error during execution: {e}",
+            node_id=node_id,
+        ) from e
+
+
+async def execute_node_async(
+    node_config: NodeConfig,
+    state: BaseModel,
+    global_config: Optional[GlobalConfig] = None,
+    tracker: Optional["MLFlowTracker"] = None,
+    output_model: Optional[Type[BaseModel]] = None,
+) -> BaseModel:
+    """
+    Execute a single workflow node on the running event loop.
+
+    Same flow, arguments and errors as execute_node, but the LLM call uses
+    call_llm_structured_async (ainvoke + asyncio.sleep backoff) so many
+    nodes and runs can share one event loop. Blocking work runs in worker
+    threads: memory recall, execution state saves (which may commit or wait
+    on a full write-behind queue) and sandboxed code nodes.
+
+    Args:
+        node_config: Node configuration
+        state: Current workflow state (Pydantic model)
+        global_config: Global configuration (optional)
+        tracker: MLFlow tracker for observability (optional)
+        output_model: Prebuilt output model (optional)
+
+    Returns:
+        Updated state (new Pydantic instance with outputs applied)
+
+    Raises:
+        NodeExecutionError: If any execution step fails
+    """
+    node_id = node_config.id
+
+    try:
+        ctx = _prepare_node(node_config, state, global_config, tracker, output_model)
+        if ctx.agent_memory is not None:
+            await asyncio.to_thread(_inject_recalled_memories, ctx)
+
+        if node_config.code:
+            return await asyncio.to_thread(_execute_code_node, ctx)
+
+        call = _prepare_llm_call(ctx)
+        node_start_time = time.time()
+
+        try:
+            result, usage = await call_llm_structured_async(
+                llm=call.llm,
+                prompt=ctx.resolved_prompt,
+                output_model=call.output_model,
+                tools=call.tools,
+                max_retries=call.max_retries,
+                structured_llm=call.structured_llm,
+            )
+        except (LLMAPIError, ValidationError) as e:
+            node_state = _failed_node_state(ctx, e, node_start_time)
+            if node_state is not None:
+                await asyncio.to_thread(_save_node_state, ctx, node_state)
+            raise _llm_failure_error(ctx, e)
+
+        new_state, node_state = _finalize_llm_node(ctx, call, result, usage, node_start_time)
+        if node_state is not None:
+            await asyncio.to_thread(_save_node_state, ctx, node_state)
+        return new_state
+
+    except NodeExecutionError:
+        raise
+    except Exception as e:
+        raise NodeExecutionError(
+            f"Node '{node_id}': Unexpected error during execution: {e}",
+            node_id=node_id,
+        ) from e
+
+
+def _prepare_node(
+    node_config: NodeConfig,
+    state: BaseModel,
+    global_config: Optional[GlobalConfig],
+    tracker: Optional["MLFlowTracker"],
+    output_model: Optional[Type[BaseModel]],
+) -> _NodeContext:
+    """
+    Resolve inputs and prompt, create memory context and load tools.
+
+    Memory recall is left to the caller (_inject_recalled_memories), so the
+    async path can run it in a worker thread.
+
+    Raises:
+        NodeExecutionError: If inputs, prompt or tools cannot be resolved
+    """
+    node_id = node_config.id
+
     # Extract storage repos from tracker (attached by executor)
     execution_state_repo = getattr(tracker, 'execution_state_repo', None) if tracker else None
     run_id = getattr(tracker, 'run_id', None) if tracker else None
     memory_repo = getattr(tracker, 'memory_repo', None) if tracker else None
+    usage = getattr(tracker, 'usage', None) if tracker else None
 
     # Extract workflow context from tracker (attached by runtime executor)
     workflow_name = getattr(tracker, 'workflow_name', None) if tracker else None
@@ -186,448 +333,534 @@ def execute_node(
     # Get agent_id from workflow name for memory namespacing
     agent_id = workflow_name or "default_agent"
 
-    try:
-        # ========================================
-        # 1. RESOLVE INPUT MAPPINGS
-        # ========================================
-        resolved_inputs = {}
-        if node_config.inputs:
-            for local_name, template_str in node_config.inputs.items():
-                # Input mapping values are templates like "{topic}" or "{metadata.author}"
-                # Resolve them against state to get actual values
-                try:
-                    # Strip {state.X} prefix if present in input mapping templates
-                    cleaned_template = _strip_state_prefix(template_str)
-                    # Resolve with no inputs (only state) to get the value
-                    value = resolve_prompt(cleaned_template, {}, state)
-                    resolved_inputs[local_name] = value
-                except TemplateResolutionError as e:
-                    raise NodeExecutionError(
-                        f"Node '{node_id}': Failed to resolve input mapping '{local_name}' "
-                        f"from template '{template_str}': {e}",
-                        node_id=node_id,
-                    )
+    ctx = _NodeContext(
+        node_config=node_config,
+        state=state,
+        global_config=global_config,
+        output_model=output_model,
+        execution_state_repo=execution_state_repo,
+        run_id=run_id,
+        usage=usage,
+    )
 
-        logger.debug(
-            f"Node '{node_id}': Resolved {len(resolved_inputs)} input mappings: "
-            f"{list(resolved_inputs.keys())}"
+    # ========================================
+    # 1. RESOLVE INPUT MAPPINGS
+    # ========================================
+    if node_config.inputs:
+        for local_name, template_str in node_config.inputs.items():
+            # Input mapping values are templates like "{topic}" or "{metadata.author}"
+            # Resolve them against state to get actual values
+            try:
+                # Compiled once per template text; {state.X} handled natively
+                # Resolve with no inputs (only state) to get the value
+                value = resolve_prompt(template_str, {}, state)
+                ctx.resolved_inputs[local_name] = value
+            except TemplateResolutionError as e:
+                raise NodeExecutionError(
+                    f"Node '{node_id}': Failed to resolve input mapping '{local_name}' "
+                    f"from template '{template_str}': {e}",
+                    node_id=node_id,
+                )
+
+    logger.debug(
+        f"Node '{node_id}': Resolved {len(ctx.resolved_inputs)} input mappings: "
+        f"{list(ctx.resolved_inputs.keys())}"
+    )
+
+    # ========================================
+    # 2. RESOLVE PROMPT TEMPLATE
+    # ========================================
+    try:
+        # Resolve with inputs (override state) and state (fallback)
+        # {state.X} is handled natively by the compiled template
+        ctx.resolved_prompt = resolve_prompt(node_config.prompt, ctx.resolved_inputs, state)
+    except TemplateResolutionError as e:
+        raise NodeExecutionError(
+            f"Node '{node_id}': Prompt template resolution failed: {e}",
+            node_id=node_id,
         )
 
-        # ========================================
-        # 2. RESOLVE PROMPT TEMPLATE
-        # ========================================
-        try:
-            # Strip {state.X} → {X} for template resolver compatibility
-            cleaned_prompt = _strip_state_prefix(node_config.prompt)
-            # Resolve with inputs (override state) and state (fallback)
-            resolved_prompt = resolve_prompt(cleaned_prompt, resolved_inputs, state)
-        except TemplateResolutionError as e:
-            raise NodeExecutionError(
-                f"Node '{node_id}': Prompt template resolution failed: {e}",
-                node_id=node_id,
-            )
+    logger.debug(
+        f"Node '{node_id}': Resolved prompt ({len(ctx.resolved_prompt)} chars)"
+    )
 
+    # ========================================
+    # 3. CREATE MEMORY CONTEXT (if enabled)
+    # ========================================
+    if node_config.memory and node_config.memory.enabled and memory_repo:
+        memory_config = node_config.memory
+        # Get scope (node-level overrides workflow-level defaults)
+        scope = memory_config.default_scope or "agent"
+
+        ctx.agent_memory = AgentMemory(
+            agent_id=agent_id,
+            workflow_id=workflow_id,
+            node_id=node_id,
+            scope=scope,
+            repo=memory_repo,
+            index_kind=memory_config.index,
+        )
         logger.debug(
-            f"Node '{node_id}': Resolved prompt ({len(resolved_prompt)} chars)"
+            f"Node '{node_id}': Memory enabled with scope '{scope}'"
         )
 
-        # ========================================
-        # 3. CREATE MEMORY CONTEXT (if enabled)
-        # ========================================
-        agent_memory = None
-        if node_config.memory and node_config.memory.enabled and memory_repo:
-            memory_config = node_config.memory
-            # Get scope (node-level overrides workflow-level defaults)
-            scope = memory_config.default_scope or "agent"
-
-            agent_memory = AgentMemory(
-                agent_id=agent_id,
-                workflow_id=workflow_id,
-                node_id=node_id,
-                scope=scope,
-                repo=memory_repo,
-            )
-            logger.debug(
-                f"Node '{node_id}': Memory enabled with scope '{scope}'"
-            )
-
-        # ========================================
-        # 4. LOAD TOOLS (with ToolConfig support)
-        # ========================================
-        tools = []
+    # ========================================
+    # 4. LOAD TOOLS (with ToolConfig support)
+    # ========================================
+    if node_config.tools:
+        runnable_cache = get_runnable_cache()
         tool_error_modes = {}  # Track error handling per tool
-        if node_config.tools:
-            try:
-                for tool_config in node_config.tools:
-                    if isinstance(tool_config, str):
-                        # Simple string tool name
-                        tool = get_tool(tool_config)
-                        tools.append(tool)
-                        tool_error_modes[tool_config] = "fail"
-                    elif isinstance(tool_config, dict):
-                        # ToolConfig dict
-                        tool_name = tool_config.get("name")
-                        if not tool_name:
-                            raise NodeExecutionError(
-                                f"Node '{node_id}': Tool config missing 'name' field",
-                                node_id=node_id,
-                            )
-                        tool = get_tool(tool_name)
-                        tools.append(tool)
-                        tool_error_modes[tool_name] = tool_config.get("on_error", "fail")
-                    else:
-                        raise NodeExecutionError(
-                            f"Node '{node_id}': Invalid tool config type: {type(tool_config)}",
-                            node_id=node_id,
-                        )
-
-                tool_names = [t.name for t in tools]
-                logger.debug(
-                    f"Node '{node_id}': Loaded {len(tools)} tools: {tool_names}"
-                )
-            except (ToolNotFoundError, ToolConfigError) as e:
-                raise NodeExecutionError(
-                    f"Node '{node_id}': Tool loading failed: {e}",
-                    node_id=node_id,
-                )
-
-        # ========================================
-        # 4.5. CODE EXECUTION (if code field is present)
-        # ========================================
-        if node_config.code and SANDBOX_AVAILABLE:
-            logger.info(f"Node '{node_id}': Executing code in sandbox")
-
-            sandbox_config = node_config.sandbox
-            if sandbox_config and sandbox_config.enabled:
-                # Determine which executor to use
-                use_docker = sandbox_config.mode == "docker"
-
-                # Get resource preset
-                preset = get_preset(sandbox_config.preset) if get_preset else {}
-                resources = preset.copy()
-                if sandbox_config.resources:
-                    resources.update(sandbox_config.resources)
-
-                # Determine timeout
-                timeout = resources.get("timeout", 60)
-                if sandbox_config.timeout:
-                    timeout = sandbox_config.timeout
-
-                # Add network config
-                if not sandbox_config.network:
-                    resources["network"] = False
-
-                # For code execution, we need actual values from state, not strings
-                # Create code_inputs dict with actual values
-                code_inputs = {}
-                if node_config.inputs:
-                    for local_name, template_str in node_config.inputs.items():
-                        # Extract the actual field name from template (e.g., "{numbers}" -> "numbers")
-                        field_name = template_str.strip("{}")
-                        if hasattr(state, field_name):
-                            code_inputs[local_name] = getattr(state, field_name)
-                        else:
-                            # Fallback to resolved input string value
-                            code_inputs[local_name] = resolved_inputs.get(local_name)
-
-                # Create executor and run code
-                try:
-                    if use_docker:
-                        executor = DockerSandboxExecutor()
-                        sandbox_result: SandboxResult = executor.execute(
-                            code=node_config.code,
-                            inputs=code_inputs,
-                            timeout=timeout,
-                            resources=resources,
-                        )
-                    else:
-                        executor = PythonSandboxExecutor()
-                        # PythonSandboxExecutor doesn't use resources dict
-                        sandbox_result: SandboxResult = executor.execute(
-                            code=node_config.code,
-                            inputs=code_inputs,
-                            timeout=timeout,
-                        )
-
-                    if not sandbox_result.success:
+        try:
+            for tool_config in node_config.tools:
+                if isinstance(tool_config, str):
+                    # Simple string tool name
+                    tool = runnable_cache.get_tool(tool_config, get_tool)
+                    ctx.tools.append(tool)
+                    tool_error_modes[tool_config] = "fail"
+                elif isinstance(tool_config, dict):
+                    # ToolConfig dict
+                    tool_name = tool_config.get("name")
+                    if not tool_name:
                         raise NodeExecutionError(
-                            f"Node '{node_id}': Sandbox execution failed: {sandbox_result.error}",
+                            f"Node '{node_id}': Tool config missing 'name' field",
                             node_id=node_id,
                         )
-
-                    # Update state with result
-                    new_state = state.model_copy()
-                    output_name = node_config.outputs[0]
-                    setattr(new_state, output_name, sandbox_result.output)
-                    logger.info(
-                        f"Node '{node_id}': Sandbox execution complete, "
-                        f"output={output_name}={sandbox_result.output}"
-                    )
-                    return new_state
-
-                except SafetyError as e:
+                    tool = runnable_cache.get_tool(tool_name, get_tool)
+                    ctx.tools.append(tool)
+                    tool_error_modes[tool_name] = tool_config.get("on_error", "fail")
+                else:
                     raise NodeExecutionError(
-                        f"Node '{node_id}': Code safety violation: {e}",
+                        f"Node '{node_id}': Invalid tool config type: {type(tool_config)}",
                         node_id=node_id,
                     )
-            else:
-                # Sandbox disabled - this is unsafe but allowed
-                logger.warning(
-                    f"Node '{node_id}': Sandbox disabled, executing code directly "
-                    f"(this is unsafe and not recommended)"
-                )
-                # Execute code directly without sandbox (unsafe!)
-                try:
-                    exec_globals = {
-                        "inputs": resolved_inputs,
-                        "result": None,
-                        "memory": agent_memory,  # Inject memory for code access
-                    }
-                    exec(node_config.code, exec_globals)
-                    new_state = state.model_copy()
-                    output_name = node_config.outputs[0]
-                    setattr(new_state, output_name, exec_globals["result"])
-                    return new_state
-                except Exception as e:
-                    raise NodeExecutionError(
-                        f"Node '{node_id}': Direct code execution failed: {e}",
-                        node_id=node_id,
-                    )
-        elif node_config.code and not SANDBOX_AVAILABLE:
+
+            tool_names = [t.name for t in ctx.tools]
+            logger.debug(
+                f"Node '{node_id}': Loaded {len(ctx.tools)} tools: {tool_names}"
+            )
+        except (ToolNotFoundError, ToolConfigError) as e:
             raise NodeExecutionError(
-                f"Node '{node_id}': Code execution requested but sandbox module not available",
+                f"Node '{node_id}': Tool loading failed: {e}",
                 node_id=node_id,
             )
 
-        # ========================================
-        # 4. CONFIGURE LLM
-        # ========================================
-        # Merge node-level LLM config with global (node overrides global)
-        merged_llm_config = merge_llm_config(
-            node_config.llm,
-            global_config.llm if global_config else None,
+    return ctx
+
+
+def _inject_recalled_memories(ctx: _NodeContext) -> None:
+    """
+    Append the memories most relevant to the node's query to its prompt.
+
+    Does nothing unless memory is enabled with recall_k. Recall is
+    best-effort: a failed search is logged and the prompt is left unchanged.
+    """
+    memory_config = ctx.node_config.memory
+    if ctx.agent_memory is None or not memory_config.recall_k:
+        return
+    node_id = ctx.node_config.id
+    try:
+        if memory_config.recall_query:
+            query = resolve_prompt(memory_config.recall_query, ctx.resolved_inputs, ctx.state)
+        else:
+            query = ctx.resolved_prompt
+        results = ctx.agent_memory.search(query, k=memory_config.recall_k)
+    except Exception as e:
+        logger.warning(f"Node '{node_id}': Memory recall failed: {e}")
+        return
+
+    if results:
+        ctx.resolved_prompt = f"{ctx.resolved_prompt}\n\n{format_recalled_memories(results)}"
+    logger.debug(f"Node '{node_id}': Recalled {len(results)} memories")
+
+
+def _execute_code_node(ctx: _NodeContext) -> BaseModel:
+    """
+    Run a code node in the sandbox (or directly, if the sandbox is disabled).
+
+    Raises:
+        NodeExecutionError: If the sandbox is unavailable or execution fails
+    """
+    node_config = ctx.node_config
+    node_id = ctx.node_id
+    state = ctx.state
+    resolved_inputs = ctx.resolved_inputs
+
+    if not SANDBOX_AVAILABLE:
+        raise NodeExecutionError(
+            f"Node '{node_id}': Code execution requested but sandbox module not available",
+            node_id=node_id,
         )
 
+    # ========================================
+    # 4.5. CODE EXECUTION (if code field is present)
+    # ========================================
+    logger.info(f"Node '{node_id}': Executing code in sandbox")
+
+    sandbox_config = node_config.sandbox
+    if sandbox_config and sandbox_config.enabled:
+        # Determine which executor to use
+        use_docker = sandbox_config.mode == "docker"
+
+        # Get resource preset
+        preset = get_preset(sandbox_config.preset) if get_preset else {}
+        resources = preset.copy()
+        if sandbox_config.resources:
+            resources.update(sandbox_config.resources)
+
+        # Determine timeout
+        timeout = resources.get("timeout", 60)
+        if sandbox_config.timeout:
+            timeout = sandbox_config.timeout
+
+        # Add network config
+        if not sandbox_config.network:
+            resources["network"] = False
+
+        # For code execution, we need actual values from state, not strings
+        # Create code_inputs dict with actual values
+        code_inputs = {}
+        if node_config.inputs:
+            for local_name, template_str in node_config.inputs.items():
+                # Extract the actual field name from template (e.g., "{numbers}" -> "numbers")
+                field_name = template_str.strip("{}")
+                if hasattr(state, field_name):
+                    code_inputs[local_name] = getattr(state, field_name)
+                else:
+                    # Fallback to resolved input string value
+                    code_inputs[local_name] = resolved_inputs.get(local_name)
+
+        # Create executor and run code
         try:
-            llm = create_llm(merged_llm_config)
-            logger.debug(f"Node '{node_id}': Created LLM instance")
-        except (LLMConfigError, LLMProviderError) as e:
+            if use_docker:
+                executor = DockerSandboxExecutor(pooled=sandbox_config.pool)
+                sandbox_result: SandboxResult = executor.execute(
+                    code=node_config.code,
+                    inputs=code_inputs,
+                    timeout=timeout,
+                    resources=resources,
+                )
+            else:
+                pool = None
+                if sandbox_config.pool:
+                    pool = get_sandbox_pool(parse_memory_limit(resources.get("memory")))
+                executor = PythonSandboxExecutor(pool=pool)
+                # PythonSandboxExecutor only uses the memory limit (via the pool)
+                sandbox_result: SandboxResult = executor.execute(
+                    code=node_config.code,
+                    inputs=code_inputs,
+                    timeout=timeout,
+                )
+
+            if not sandbox_result.success:
+                raise NodeExecutionError(
+                    f"Node '{node_id}': Sandbox execution failed: {sandbox_result.error}",
+                    node_id=node_id,
+                )
+
+            # Update state with result
+            new_state = state.model_copy()
+            output_name = node_config.outputs[0]
+            setattr(new_state, output_name, sandbox_result.output)
+            logger.info(
+                f"Node '{node_id}': Sandbox execution complete, "
+                f"output={output_name}={sandbox_result.output}"
+            )
+            return new_state
+
+        except SafetyError as e:
             raise NodeExecutionError(
-                f"Node '{node_id}': LLM creation failed: {e}",
+                f"Node '{node_id}': Code safety violation: {e}",
                 node_id=node_id,
             )
-
-        # ========================================
-        # 5. BUILD OUTPUT MODEL
-        # ========================================
+    else:
+        # Sandbox disabled - this is unsafe but allowed
+        logger.warning(
+            f"Node '{node_id}': Sandbox disabled, executing code directly "
+            f"(this is unsafe and not recommended)"
+        )
+        # Execute code directly without sandbox (unsafe!)
         try:
-            OutputModel = build_output_model(node_config.output_schema, node_id)
-            logger.debug(f"Node '{node_id}': Built output model: {OutputModel.__name__}")
-        except OutputBuilderError as e:
+            exec_globals = {
+                "inputs": resolved_inputs,
+                "result": None,
+                "memory": ctx.agent_memory,  # Inject memory for code access
+            }
+            exec(node_config.code, exec_globals)
+            new_state = state.model_copy()
+            output_name = node_config.outputs[0]
+            setattr(new_state, output_name, exec_globals["result"])
+            return new_state
+        except Exception as e:
             raise NodeExecutionError(
-                f"Node '{node_id}': Output model creation failed: {e}",
+                f"Node '{node_id}': Direct code execution failed: {e}",
                 node_id=node_id,
             )
 
-        # ========================================
-        # 6. CALL LLM WITH STRUCTURED OUTPUT
-        # ========================================
-        # Get max_retries from global config
-        max_retries = 3  # Default
-        if global_config and global_config.execution:
-            max_retries = global_config.execution.max_retries
 
-        # Get model name (for logging and debugging)
-        model_name = merged_llm_config.model or "gemini-1.5-flash"  # Default from config
+def _prepare_llm_call(ctx: _NodeContext) -> _LLMCall:
+    """
+    Configure the LLM, output model and bound structured runnable (cached).
 
-        # NOTE: Node-level tracing is now automatic via mlflow.langchain.autolog()
-        # The tracker parameter is kept for backward compatibility and config access,
-        # but actual tracing happens automatically - no manual track_node() needed!
+    Raises:
+        NodeExecutionError: If LLM or output model creation fails
+    """
+    node_config = ctx.node_config
+    global_config = ctx.global_config
+    node_id = ctx.node_id
+
+    # Process-wide cache for LLM clients, output models, tools and bound runnables
+    runnable_cache = get_runnable_cache()
+
+    # ========================================
+    # 4. CONFIGURE LLM
+    # ========================================
+    # Merge node-level LLM config with global (node overrides global)
+    merged_llm_config = merge_llm_config(
+        node_config.llm,
+        global_config.llm if global_config else None,
+    )
 
-        # Start timing for node execution
-        node_start_time = time.time()
+    try:
+        llm = runnable_cache.get_llm(merged_llm_config, create_llm)
+        logger.debug(f"Node '{node_id}': Got LLM instance")
+    except (LLMConfigError, LLMProviderError) as e:
+        raise NodeExecutionError(
+            f"Node '{node_id}': LLM creation failed: {e}",
+            node_id=node_id,
+        )
 
-        try:
-            # Call LLM with structured output enforcement
-            # Tools are bound if present, retries handled automatically
-            # Token usage automatically captured by MLflow 3.9 via mlflow.langchain.autolog()
-            result, usage = call_llm_structured(
-                llm=llm,
-                prompt=resolved_prompt,
-                output_model=OutputModel,
-                tools=tools if tools else None,
-                max_retries=max_retries,
+    # ========================================
+    # 5. BUILD OUTPUT MODEL
+    # ========================================
+    try:
+        if ctx.output_model is not None:
+            OutputModel = ctx.output_model
+        else:
+            OutputModel = runnable_cache.get_output_model(
+                node_config.output_schema, node_id, build_output_model
             )
-            logger.info(f"Node '{node_id}': LLM call successful")
+        logger.debug(f"Node '{node_id}': Built output model: {OutputModel.__name__}")
+    except OutputBuilderError as e:
+        raise NodeExecutionError(
+            f"Node '{node_id}': Output model creation failed: {e}",
+            node_id=node_id,
+        )
 
-            # Log token usage for immediate visibility (MLflow captures this too)
-            logger.debug(
-                f"Node '{node_id}': {usage.input_tokens} input tokens, "
-                f"{usage.output_tokens} output tokens"
-            )
+    # ========================================
+    # 6. BIND TOOLS AND STRUCTURED OUTPUT
+    # ========================================
+    # Get max_retries from global config
+    max_retries = 3  # Default
+    if global_config and global_config.execution:
+        max_retries = global_config.execution.max_retries
+
+    # Get model name (for logging and debugging)
+    model_name = merged_llm_config.model or "gemini-1.5-flash"  # Default from config
+
+    tools = ctx.tools if ctx.tools else None
+
+    # Reuse the tool-bound structured runnable across nodes and runs
+    structured_llm = runnable_cache.get_structured_llm(
+        merged_llm_config,
+        OutputModel,
+        ctx.tools,
+        lambda: bind_structured_output(llm, OutputModel, tools),
+    )
+
+    return _LLMCall(
+        llm=llm,
+        structured_llm=structured_llm,
+        output_model=OutputModel,
+        tools=tools,
+        max_retries=max_retries,
+        model_name=model_name,
+    )
+
+
+def _failed_node_state(
+    ctx: _NodeContext, error: Exception, node_start_time: float
+) -> Optional[Dict[str, Any]]:
+    """Execution state recorded for a failed LLM call (None without storage)."""
+    if not (ctx.execution_state_repo and ctx.run_id):
+        return None
+    return {
+        "node_id": ctx.node_id,
+        "duration_seconds": round(time.time() - node_start_time, 4),
+        "status": "failed",
+        "error": str(error)[:500],  # Truncate long error messages
+    }
+
+
+def _llm_failure_error(ctx: _NodeContext, error: Exception) -> NodeExecutionError:
+    """Build the NodeExecutionError raised for an LLM failure."""
+    return NodeExecutionError(
+        f"Node '{ctx.node_id}': LLM call failed: {error}",
+        node_id=ctx.node_id,
+    )
 
-        except (LLMAPIError, ValidationError) as e:
-            # Save failed execution state before raising
-            if execution_state_repo and run_id:
-                try:
-                    error_state = {
-                        "node_id": node_id,
-                        "duration_seconds": round(time.time() - node_start_time, 4),
-                        "status": "failed",
-                        "error": str(e)[:500],  # Truncate long error messages
-                    }
-                    execution_state_repo.save_state(
-                        run_id=run_id,
-                        state_data=error_state,
-                        node_id=node_id,
-                    )
-                except Exception:
-                    pass  # Double-fault: don't let storage errors mask the real error
-            raise NodeExecutionError(
-                f"Node '{node_id}': LLM call failed: {e}",
-                node_id=node_id,
-            )
 
-        node_duration = time.time() - node_start_time
-        node_duration_ms = node_duration * 1000
+def _save_node_state(ctx: _NodeContext, state_data: Optional[Dict[str, Any]]) -> None:
+    """
+    Persist a node's execution state (no-op if state_data is None).
+
+    Storage failures are logged and never break execution or mask the
+    node's own error.
+    """
+    if state_data is None:
+        return
+    try:
+        ctx.execution_state_repo.save_state(
+            run_id=ctx.run_id,
+            state_data=state_data,
+            node_id=ctx.node_id,
+        )
+    except Exception as e:
+        logger.warning(f"Node '{ctx.node_id}': Failed to save execution state: {e}")
+        return
+    logger.debug(f"Node '{ctx.node_id}': Saved {state_data['status']} execution state")
+
+
+def _finalize_llm_node(
+    ctx: _NodeContext,
+    call: _LLMCall,
+    result: BaseModel,
+    usage: Any,
+    node_start_time: float,
+) -> Tuple[BaseModel, Optional[Dict[str, Any]]]:
+    """
+    Record metrics and apply LLM outputs to a state copy.
+
+    Returns:
+        The new state and the execution state to persist with
+        _save_node_state (None without storage)
+    """
+    node_config = ctx.node_config
+    node_id = ctx.node_id
+    model_name = call.model_name
+
+    logger.info(f"Node '{node_id}': LLM call successful")
+
+    # Log token usage for immediate visibility (MLflow captures this too)
+    logger.debug(
+        f"Node '{node_id}': {usage.input_tokens} input tokens, "
+        f"{usage.output_tokens} output tokens"
+    )
+
+    node_duration = time.time() - node_start_time
+    node_duration_ms = node_duration * 1000
 
-        # ========================================
-        # 6.5: RECORD TO PROFILER AND LOG METRICS
-        # ========================================
-        # Record timing to BottleneckAnalyzer (if set by runtime executor)
-        # Lazy import to avoid circular dependency with runtime module
+    # ========================================
+    # 6.5: RECORD TO PROFILER AND LOG METRICS
+    # ========================================
+    # Record timing to BottleneckAnalyzer (if set by runtime executor)
+    # Lazy import to avoid circular dependency with runtime module
+    try:
+        from configurable_agents.runtime.profiler import get_profiler
+        analyzer = get_profiler()
+        if analyzer:
+            analyzer.record_node(node_id, node_duration_ms)
+    except ImportError:
+        pass  # Profiler not available
+
+    # Log per-node metrics to MLFlow
+    if MLFLOW_AVAILABLE and mlflow.active_run():
         try:
-            from configurable_agents.runtime.profiler import get_profiler
-            analyzer = get_profiler()
-            if analyzer:
-                analyzer.record_node(node_id, node_duration_ms)
-        except ImportError:
-            pass  # Profiler not available
-
-        # Log per-node metrics to MLFlow
+            mlflow.log_metric(f"node_{node_id}_duration_ms", node_duration_ms)
+            logger.debug(f"Logged MLFlow metric: node_{node_id}_duration_ms = {node_duration_ms:.2f}ms")
+        except Exception as e:
+            logger.warning(f"Failed to log node duration to MLFlow: {e}")
+
+    # Calculate cost with the process-wide (memoized) CostEstimator
+    cost_usd = 0.0
+    try:
+        cost_usd = get_cost_estimator().estimate_cost(
+            model=model_name,
+            input_tokens=usage.input_tokens,
+            output_tokens=usage.output_tokens,
+        )
+        # Log per-node cost to MLFlow
         if MLFLOW_AVAILABLE and mlflow.active_run():
             try:
-                mlflow.log_metric(f"node_{node_id}_duration_ms", node_duration_ms)
-                logger.debug(f"Logged MLFlow metric: node_{node_id}_duration_ms = {node_duration_ms:.2f}ms")
+                mlflow.log_metric(f"node_{node_id}_cost_usd", cost_usd)
+                logger.debug(f"Logged MLFlow metric: node_{node_id}_cost_usd = ${cost_usd:.6f}")
             except Exception as e:
-                logger.warning(f"Failed to log node duration to MLFlow: {e}")
+                logger.warning(f"Failed to log node cost to MLFlow: {e}")
+    except Exception as e:
+        logger.debug(f"Failed to estimate cost for node '{node_id}': {e}")
+
+    # Record the call in the run's usage accumulator (source of the run cost summary)
+    if ctx.usage is not None:
+        ctx.usage.record(
+            node_id,
+            model_name,
+            usage.input_tokens,
+            usage.output_tokens,
+            cost_usd,
+            node_duration_ms,
+        )
 
-        # Calculate cost using CostEstimator
-        cost_usd = 0.0
-        try:
-            cost_estimator = CostEstimator()
-            cost_usd = cost_estimator.estimate_cost(
-                model=model_name,
-                input_tokens=usage.input_tokens,
-                output_tokens=usage.output_tokens,
-            )
-            # Log per-node cost to MLFlow
-            if MLFLOW_AVAILABLE and mlflow.active_run():
-                try:
-                    mlflow.log_metric(f"node_{node_id}_cost_usd", cost_usd)
-                    logger.debug(f"Logged MLFlow metric: node_{node_id}_cost_usd = ${cost_usd:.6f}")
-                except Exception as e:
-                    logger.warning(f"Failed to log node cost to MLFlow: {e}")
-        except Exception as e:
-            logger.debug(f"Failed to estimate cost for node '{node_id}': {e}")
-
-        # ========================================
-        # 7. UPDATE STATE
-        # ========================================
-        # Copy-on-write: create new state instance (immutable pattern)
-        new_state = state.model_copy()
-
-        # Add execution metadata to state (hidden fields for tracking)
-        setattr(new_state, f"_execution_time_ms_{node_id}", round(node_duration_ms, 2))
-        setattr(new_state, f"_cost_usd_{node_id}", round(cost_usd, 6))
-
-        # Extract output values from LLM result and update state
-        if node_config.output_schema.type == "object":
-            # Object output: multiple fields
-            for output_name in node_config.outputs:
-                value = getattr(result, output_name)
-                setattr(new_state, output_name, value)
-                logger.debug(
-                    f"Node '{node_id}': Updated state.{output_name} "
-                    f"(type: {type(value).__name__})"
-                )
-        else:
-            # Simple output: single field wrapped in 'result' (from T-007)
-            output_name = node_config.outputs[0]
-            value = result.result
+    # ========================================
+    # 7. UPDATE STATE
+    # ========================================
+    # Copy-on-write: create new state instance (immutable pattern)
+    new_state = ctx.state.model_copy()
+
+    # Add execution metadata to state (hidden fields for tracking)
+    setattr(new_state, f"_execution_time_ms_{node_id}", round(node_duration_ms, 2))
+    setattr(new_state, f"_cost_usd_{node_id}", round(cost_usd, 6))
+
+    # Extract output values from LLM result and update state
+    if node_config.output_schema.type == "object":
+        # Object output: multiple fields
+        for output_name in node_config.outputs:
+            value = getattr(result, output_name)
             setattr(new_state, output_name, value)
             logger.debug(
                 f"Node '{node_id}': Updated state.{output_name} "
                 f"(type: {type(value).__name__})"
             )
-
-        # Pydantic auto-validates on setattr
-        # If validation fails, raises ValidationError (caught above)
-
-        # ========================================
-        # 6.5: PERSIST EXECUTION STATE (if storage available)
-        # ========================================
-        if execution_state_repo and run_id:
-            try:
-                state_snapshot = {
-                    "node_id": node_id,
-                    "duration_seconds": round(node_duration, 4),
-                    "input_tokens": usage.input_tokens,
-                    "output_tokens": usage.output_tokens,
-                    "total_tokens": usage.input_tokens + usage.output_tokens,
-                    "model": model_name,
-                    "status": "completed",
-                }
-
-                # Add cost if available from cost estimator
-                try:
-                    from configurable_agents.observability.cost_estimator import CostEstimator
-                    estimator = CostEstimator()
-                    cost = estimator.estimate_cost(
-                        model=model_name,
-                        input_tokens=usage.input_tokens,
-                        output_tokens=usage.output_tokens,
-                    )
-                    state_snapshot["cost_usd"] = cost
-                except Exception:
-                    state_snapshot["cost_usd"] = 0.0
-
-                # Include the output state values (for trace inspection)
-                output_values = {}
-                for output_name in node_config.outputs:
-                    val = getattr(new_state, output_name, None)
-                    if val is not None:
-                        # Truncate large string outputs for storage efficiency
-                        str_val = str(val)
-                        output_values[output_name] = str_val[:500] if len(str_val) > 500 else str_val
-                state_snapshot["outputs"] = output_values
-
-                execution_state_repo.save_state(
-                    run_id=run_id,
-                    state_data=state_snapshot,
-                    node_id=node_id,
-                )
-                logger.debug(
-                    f"Node '{node_id}': Saved execution state "
-                    f"(duration={node_duration:.3f}s, tokens={usage.input_tokens + usage.output_tokens})"
-                )
-            except Exception as e:
-                # Storage failure must not break execution
-                logger.warning(f"Node '{node_id}': Failed to save execution state: {e}")
-
-        logger.info(
-            f"Node '{node_id}': Execution complete, updated {len(node_config.outputs)} "
-            f"state fields"
+    else:
+        # Simple output: single field wrapped in 'result' (from T-007)
+        output_name = node_config.outputs[0]
+        value = result.result
+        setattr(new_state, output_name, value)
+        logger.debug(
+            f"Node '{node_id}': Updated state.{output_name} "
+            f"(type: {type(value).__name__})"
         )
 
-        return new_state
+    # Pydantic auto-validates on setattr
+    # If validation fails, raises ValidationError (wrapped by caller)
+
+    # ========================================
+    # 6.5: BUILD EXECUTION STATE (persisted by the caller)
+    # ========================================
+    state_snapshot = None
+    if ctx.execution_state_repo and ctx.run_id:
+        state_snapshot = {
+            "node_id": node_id,
+            "duration_seconds": round(node_duration, 4),
+            "input_tokens": usage.input_tokens,
+            "output_tokens": usage.output_tokens,
+            "total_tokens": usage.input_tokens + usage.output_tokens,
+            "model": model_name,
+            "status": "completed",
+            "cost_usd": cost_usd,
+        }
+
+        # Include the output state values (for trace inspection)
+        output_values = {}
+        for output_name in node_config.outputs:
+            val = getattr(new_state, output_name, None)
+            if val is not None:
+                # Truncate large string outputs for storage efficiency
+                str_val = str(val)
+                output_values[output_name] = str_val[:500] if len(str_val) > 500 else str_val
+        state_snapshot["outputs"] = output_values
+
+    logger.info(
+        f"Node '{node_id}': Execution complete, updated {len(node_config.outputs)} "
+        f"state fields"
+    )
 
-    except NodeExecutionError:
-        # Re-raise NodeExecutionError as-is
-        raise
-    except Exception as e:
-        # Wrap any unexpected errors
-        raise NodeExecutionError(
-            f"Node '{node_id}': Unexpected error during execution: {e}",
-            node_id=node_id,
-        ) from e
+    return new_state, state_snapshot
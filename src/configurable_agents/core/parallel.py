@@ -1,17 +1,41 @@
 """
 Parallel execution functions for fan-out/fan-in patterns.
 
-Provides Send object factories for parallel node execution via LangGraph.
+Provides Send object factories for parallel node execution via LangGraph,
+plus the concurrency limiter applied to fan-out target nodes.
+
+Design decisions:
+- projection="referenced" sends each branch only the state fields its
+  target node reads (prompt and input templates) plus required fields, so
+  large fan-outs don't copy the whole state once per item
+- Branch payloads are built from the projected fields directly, without
+  materializing a full state dict first. LangGraph schedules every Send
+  of a fan-out in one superstep, so dispatch itself is not chunked
+- max_concurrency is enforced per dispatch: each fan-out creates its own
+  ConcurrencyLimiter and hands it to its branches in the Send payload, and
+  the target node function waits on it, so at most N branches of that
+  fan-out call the provider at once while the rest stay queued. Concurrent
+  runs of a cached compiled graph never share a window
 """
 
-from typing import Any, Callable, Dict, List
+import asyncio
+import threading
+from typing import Any, Callable, Dict, FrozenSet, List, Optional
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.types import Send
 
-from configurable_agents.config.schema import ParallelConfig
+from configurable_agents.config.schema import NodeConfig, ParallelConfig
+from configurable_agents.core.template import extract_variables
 
+# Send payload key carrying a fan-out's ConcurrencyLimiter to its branches
+PARALLEL_WINDOW_KEY = "_parallel_window"
 
-def create_fan_out_function(parallel_config: ParallelConfig) -> Callable:
+
+def create_fan_out_function(
+    parallel_config: ParallelConfig,
+    target_node: Optional[NodeConfig] = None,
+) -> Callable:
     """
     Create a fan-out function for parallel execution.
 
@@ -20,6 +44,8 @@ def create_fan_out_function(parallel_config: ParallelConfig) -> Callable:
 
     Args:
         parallel_config: Parallel execution configuration
+        target_node: Target node config (required for projection="referenced";
+            without it every field is sent)
 
     Returns:
         Function that takes state and returns list of Send objects
@@ -27,41 +53,182 @@ def create_fan_out_function(parallel_config: ParallelConfig) -> Callable:
     Each Send object:
     - Targets the configured node
     - Passes state with _parallel_item (current item) and _parallel_index (position)
+    - With max_concurrency, also passes the dispatch's ConcurrencyLimiter
+      (consumed by limit_branches before the node runs)
     - Results are collected via state reducer on collect_field
     """
+    referenced = None
+    if parallel_config.projection == "referenced" and target_node is not None:
+        referenced = get_referenced_fields(target_node)
+
+    # Per state model: fields to send (referenced + required), computed once
+    projections: Dict[type, List[str]] = {}
+
     def fan_out_fn(state):
         """Create Send objects for each item to process in parallel."""
-        # Convert state to dict if it's a Pydantic model
-        if hasattr(state, "model_dump"):
-            state_dict = state.model_dump()
-        elif hasattr(state, "dict"):
-            state_dict = state.dict()
+        if referenced is not None and hasattr(state, "model_fields"):
+            state_type = type(state)
+            fields = projections.get(state_type)
+            if fields is None:
+                fields = _projected_fields(state_type, referenced)
+                projections[state_type] = fields
+            base = {name: getattr(state, name) for name in fields}
+            items = getattr(state, parallel_config.items_field, None)
         else:
-            state_dict = dict(state)
-
-        # Get items to fan out over
-        items = state_dict.get(parallel_config.items_field, [])
+            # Convert state to dict if it's a Pydantic model
+            if hasattr(state, "model_dump"):
+                base = state.model_dump()
+            elif hasattr(state, "dict"):
+                base = state.dict()
+            else:
+                base = dict(state)
+            items = base.get(parallel_config.items_field, [])
 
         if not items:
             return []  # No items to process, skip fan-out
 
-        # Create Send object for each item
-        sends = []
-        for i, item in enumerate(items):
-            # Each parallel invocation gets the full state plus item-specific context
-            item_state = {
-                **state_dict,
-                "_parallel_item": item,
-                "_parallel_index": i,
-                "_parallel_source": parallel_config.items_field,
-            }
-            sends.append(Send(parallel_config.target_node, item_state))
+        context = {"_parallel_source": parallel_config.items_field}
+        if parallel_config.max_concurrency:
+            # One window per dispatch, shared by this fan-out's branches only
+            context[PARALLEL_WINDOW_KEY] = ConcurrencyLimiter(parallel_config.max_concurrency)
 
-        return sends
+        # Create Send object for each item with the (projected) state plus item-specific context
+        return [
+            Send(
+                parallel_config.target_node,
+                {**base, "_parallel_item": item, "_parallel_index": i, **context},
+            )
+            for i, item in enumerate(items)
+        ]
 
     return fan_out_fn
 
 
+def get_referenced_fields(node_config: NodeConfig) -> FrozenSet[str]:
+    """
+    Get the top-level state fields a node's prompt and input mappings reference.
+
+    Args:
+        node_config: Node configuration
+
+    Returns:
+        Set of state field names (``{state.meta.author}`` -> ``meta``)
+
+    Example:
+        >>> node = NodeConfig(id="n", prompt="Summarize {state.doc} for {audience}", ...)
+        >>> sorted(get_referenced_fields(node))
+        ['audience', 'doc']
+    """
+    inputs = node_config.inputs or {}
+    fields = set()
+
+    # Input mappings always resolve against state
+    for template in inputs.values():
+        for variable in extract_variables(template):
+            fields.add(_root_field(variable))
+
+    # Prompt variables resolve from inputs first; local input names are not state reads
+    for variable in extract_variables(node_config.prompt or ""):
+        if variable.startswith("state.") or variable.split(".", 1)[0] not in inputs:
+            fields.add(_root_field(variable))
+
+    return frozenset(fields)
+
+
+def _root_field(variable: str) -> str:
+    """Top-level state field of a template variable (``state.a.b`` -> ``a``)."""
+    if variable.startswith("state."):
+        variable = variable[len("state."):]
+    return variable.split(".", 1)[0]
+
+
+def _projected_fields(state_type: type, referenced: FrozenSet[str]) -> List[str]:
+    """Fields sent to a branch: referenced fields plus required ones (for validation)."""
+    return [
+        name
+        for name, field in state_type.model_fields.items()
+        if name in referenced or field.is_required()
+    ]
+
+
+class ConcurrencyLimiter:
+    """
+    Bound how many branches of one fan-out dispatch run at once.
+
+    Sync branches share a threading semaphore and async branches an asyncio
+    semaphore (a graph invocation runs on a single event loop).
+
+    Attributes:
+        limit: Maximum concurrent executions
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize limiter.
+
+        Args:
+            limit: Maximum concurrent executions (must be >= 1)
+
+        Raises:
+            ValueError: If limit is less than 1
+        """
+        if limit < 1:
+            raise ValueError(f"limit must be >= 1, got {limit}")
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit)
+        self._async_semaphore = asyncio.Semaphore(limit)
+
+    def run(self, node_fn: Callable, state: Any, config: Optional[RunnableConfig] = None) -> Any:
+        """Run a sync node function inside the window."""
+        with self._semaphore:
+            return node_fn(state, config)
+
+    async def run_async(
+        self, node_fn: Callable, state: Any, config: Optional[RunnableConfig] = None
+    ) -> Any:
+        """Run an async node function inside the window."""
+        async with self._async_semaphore:
+            return await node_fn(state, config)
+
+
+def limit_branches(node_fn: Callable) -> Callable:
+    """
+    Wrap a fan-out target so branches run inside their dispatch's window.
+
+    The limiter is removed from the branch state before node_fn sees it;
+    states without one (plain edges, unbounded fan-outs) run directly.
+    """
+
+    def limited_fn(state: Any, config: Optional[RunnableConfig] = None) -> Any:
+        limiter = _pop_limiter(state)
+        if limiter is None:
+            return node_fn(state, config)
+        return limiter.run(node_fn, state, config)
+
+    limited_fn.__name__ = f"limited_{node_fn.__name__}"
+    return limited_fn
+
+
+def limit_branches_async(node_fn: Callable) -> Callable:
+    """Async variant of limit_branches."""
+
+    async def limited_fn(state: Any, config: Optional[RunnableConfig] = None) -> Any:
+        limiter = _pop_limiter(state)
+        if limiter is None:
+            return await node_fn(state, config)
+        return await limiter.run_async(node_fn, state, config)
+
+    limited_fn.__name__ = f"limited_{node_fn.__name__}"
+    return limited_fn
+
+
+def _pop_limiter(state: Any) -> Optional[ConcurrencyLimiter]:
+    """Take the dispatch's limiter out of a branch state (Send payloads are dicts)."""
+    if isinstance(state, dict):
+        return state.pop(PARALLEL_WINDOW_KEY, None)
+    return None
+
+
 def get_parallel_item(state: Any) -> Any:
     """
     Get the current parallel item from state.
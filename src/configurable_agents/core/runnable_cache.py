@@ -0,0 +1,213 @@
+"""
+Runnable cache - Reuse LLM clients, output models and bound runnables.
+
+execute_node used to call create_llm, build_output_model, get_tool,
+bind_tools and with_structured_output on every invocation. In loops and
+parallel fan-outs that rebuilds identical objects hundreds of times per run.
+This cache keeps them across nodes and runs.
+
+Keys:
+- Chat model: merged LLM config content
+- Output model: node ID + output schema content
+- Tool: tool name
+- Structured runnable: chat model key + output model class + tool names
+
+Design decisions:
+- Factories are passed in by the caller (keeps node_executor the single
+  place that decides how objects are built, and keeps them patchable)
+- One bounded LRU shared by all kinds of entries
+- Thread-safe; on a concurrent miss the first stored value wins
+- Failures are never cached (errors surface on every attempt)
+- Credentials are read from the environment when a client is created; call
+  clear_runnable_cache() after rotating API keys
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Sequence, Type
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 512
+
+
+def _model_key(model: Optional[BaseModel]) -> str:
+    """Canonical JSON content key for a config model (None-safe)."""
+    if model is None:
+        return "null"
+    return json.dumps(model.model_dump(mode="json"), sort_keys=True, default=str)
+
+
+class RunnableCache:
+    """
+    Bounded, thread-safe LRU cache for node execution objects.
+
+    Attributes:
+        max_entries: Maximum number of cached objects (all kinds combined)
+        hits: Number of lookups served from cache
+        misses: Number of lookups that called the factory
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize runnable cache.
+
+        Args:
+            max_entries: Maximum number of entries (must be >= 1)
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_llm(self, llm_config: Any, factory: Callable[[Any], Any]) -> Any:
+        """
+        Get a chat model for a (merged) LLM config.
+
+        Args:
+            llm_config: Merged LLMConfig
+            factory: Called as factory(llm_config) on miss (e.g. create_llm)
+
+        Returns:
+            Chat model instance
+        """
+        key = ("llm", _model_key(llm_config))
+        return self._get_or_create(key, lambda: factory(llm_config))
+
+    def get_output_model(
+        self,
+        output_schema: Any,
+        node_id: str,
+        factory: Callable[[Any, str], Type[BaseModel]],
+    ) -> Type[BaseModel]:
+        """
+        Get the output model class for a node's output schema.
+
+        Args:
+            output_schema: Node OutputSchema
+            node_id: Node identifier (part of the generated model name)
+            factory: Called as factory(output_schema, node_id) on miss
+
+        Returns:
+            Pydantic model class
+        """
+        key = ("output_model", node_id, _model_key(output_schema))
+        return self._get_or_create(key, lambda: factory(output_schema, node_id))
+
+    def get_tool(self, name: str, factory: Callable[[str], Any]) -> Any:
+        """
+        Get a tool instance by name.
+
+        Args:
+            name: Registered tool name
+            factory: Called as factory(name) on miss (e.g. get_tool)
+
+        Returns:
+            Tool instance
+        """
+        return self._get_or_create(("tool", name), lambda: factory(name))
+
+    def get_structured_llm(
+        self,
+        llm_config: Any,
+        output_model: Type[BaseModel],
+        tools: Sequence[Any],
+        factory: Callable[[], Any],
+    ) -> Any:
+        """
+        Get the tool-bound, structured-output runnable for a node.
+
+        Args:
+            llm_config: Merged LLMConfig the chat model was built from
+            output_model: Output model class bound as schema
+            tools: Tools bound to the model (identified by name)
+            factory: Zero-argument callable that binds on miss
+
+        Returns:
+            Runnable ready for invoke()
+        """
+        tool_names = tuple(getattr(t, "name", repr(t)) for t in tools)
+        key = ("structured", _model_key(llm_config), output_model, tool_names)
+        return self._get_or_create(key, factory)
+
+    def clear(self) -> int:
+        """
+        Drop all cached objects.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = len(self._entries)
+            self._entries.clear()
+            return removed
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with size, max_entries, hits and misses
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+    def _get_or_create(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return cached value for key, building it outside the lock on miss."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        value = factory()
+
+        with self._lock:
+            if key in self._entries:
+                # Another thread stored it first; share that instance
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return value
+
+
+# Process-wide cache used by execute_node
+_runnable_cache = RunnableCache()
+
+
+def get_runnable_cache() -> RunnableCache:
+    """
+    Get the process-wide runnable cache.
+
+    Returns:
+        Shared RunnableCache instance
+    """
+    return _runnable_cache
+
+
+def clear_runnable_cache() -> int:
+    """
+    Drop every object in the process-wide runnable cache.
+
+    Returns:
+        Number of entries removed
+    """
+    return _runnable_cache.clear()
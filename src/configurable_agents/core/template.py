@@ -2,12 +2,26 @@
 Prompt template resolution for node prompts.
 
 Resolves {variable} placeholders from input mappings and state.
+
+Templates are compiled once (compile_template, LRU-cached by template text)
+into a list of literal chunks and placeholders with pre-split nested paths,
+so rendering is a single pass and one str.join. The {state.x} prefix is
+handled by the compiler: {state.x} resolves exactly like {x}.
 """
 
 import re
-from typing import Any, Dict, Set
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Set, Tuple, Union
 from pydantic import BaseModel
 
+# {variable}, {nested.path} or {state.variable}
+_PLACEHOLDER_PATTERN = re.compile(r"\{(state\.)?([a-zA-Z_][a-zA-Z0-9_\.]*)\}")
+
+# Distinct compiled templates kept in memory
+TEMPLATE_CACHE_SIZE = 2048
+
+_MISSING = object()
+
 
 class TemplateResolutionError(Exception):
     """Error resolving template variables."""
@@ -61,17 +75,111 @@ def resolve_prompt(
     if not prompt_template:
         return ""
 
-    # Extract all variable references
-    variables = extract_variables(prompt_template)
+    return compile_template(prompt_template).render(inputs, state)
+
+
+class _Placeholder(NamedTuple):
+    """Compiled {variable}: lookup name and pre-split state path."""
+
+    variable: str
+    path: Tuple[str, ...]
 
-    # Resolve each variable
-    resolved = prompt_template
-    for var in variables:
-        value = resolve_variable(var, inputs, state)
-        # Replace {variable} with resolved value
-        resolved = resolved.replace(f"{{{var}}}", str(value))
 
-    return resolved
+class CompiledTemplate:
+    """
+    Prompt template compiled into literal chunks and placeholders.
+
+    Attributes:
+        source: Original template text
+        variables: Variable names in order of appearance ({state.x} -> "x")
+    """
+
+    __slots__ = ("source", "variables", "_segments")
+
+    def __init__(self, source: str, segments: List[Union[str, _Placeholder]]):
+        self.source = source
+        self._segments = segments
+        self.variables = tuple(
+            seg.variable for seg in segments if isinstance(seg, _Placeholder)
+        )
+
+    def render(self, inputs: Dict[str, Any], state: BaseModel) -> str:
+        """
+        Render the template against inputs and state.
+
+        Args:
+            inputs: Input mappings (override state)
+            state: Workflow state (Pydantic model)
+
+        Returns:
+            Resolved prompt string
+
+        Raises:
+            TemplateResolutionError: If a variable cannot be resolved
+        """
+        parts = []
+        for seg in self._segments:
+            if seg.__class__ is str:
+                parts.append(seg)
+                continue
+            if seg.variable in inputs:
+                value = inputs[seg.variable]
+            else:
+                value = _walk_path(state, seg.path)
+                if value is _MISSING:
+                    # Slow path only for errors: builds the detailed message
+                    value = resolve_variable(seg.variable, inputs, state)
+            parts.append(value if value.__class__ is str else str(value))
+        return "".join(parts)
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({self.source!r})"
+
+
+@lru_cache(maxsize=TEMPLATE_CACHE_SIZE)
+def compile_template(template: str) -> CompiledTemplate:
+    """
+    Compile a template into literal chunks and placeholders (cached).
+
+    Args:
+        template: Template string with {variable} placeholders
+
+    Returns:
+        CompiledTemplate ready for render()
+
+    Examples:
+        >>> compiled = compile_template("Summarize {state.doc} for {audience}")
+        >>> compiled.variables
+        ('doc', 'audience')
+        >>> compiled.render({"audience": "execs"}, state)
+        "Summarize ... for execs"
+    """
+    segments: List[Union[str, _Placeholder]] = []
+    position = 0
+    for match in _PLACEHOLDER_PATTERN.finditer(template):
+        if match.start() > position:
+            segments.append(template[position:match.start()])
+        variable = match.group(2)
+        segments.append(_Placeholder(variable, tuple(variable.split("."))))
+        position = match.end()
+    if position < len(template):
+        segments.append(template[position:])
+    return CompiledTemplate(template, segments)
+
+
+def _walk_path(obj: Any, path: Tuple[str, ...]) -> Any:
+    """Follow a pre-split path through models/dicts; _MISSING if it breaks."""
+    current = obj
+    for part in path:
+        if isinstance(current, BaseModel):
+            current = getattr(current, part, _MISSING)
+        elif isinstance(current, dict):
+            current = current.get(part, _MISSING)
+        else:
+            return _MISSING
+        if current is _MISSING:
+            return _MISSING
+    return current
 
 
 def extract_variables(template: str) -> Set[str]:
@@ -9,6 +9,8 @@ Multi-provider support (v0.1+):
 Public API:
     - create_llm: Create LLM from configuration
     - call_llm_structured: Call LLM with structured output
+    - call_llm_structured_async: Async structured call (ainvoke, non-blocking backoff)
+    - bind_structured_output: Bind tools and output schema once for reuse
     - merge_llm_config: Merge node and global configs
     - stream_chat: Stream chat completion with async generator
     - LLMConfigError: Configuration error exception
@@ -45,7 +47,9 @@ from configurable_agents.llm.provider import (
     LLMConfigError,
     LLMProviderError,
     LLMUsageMetadata,
+    bind_structured_output,
     call_llm_structured,
+    call_llm_structured_async,
     create_llm,
     merge_llm_config,
 )
@@ -123,6 +127,8 @@ async def stream_chat(
 __all__ = [
     "create_llm",
     "call_llm_structured",
+    "call_llm_structured_async",
+    "bind_structured_output",
     "merge_llm_config",
     "stream_chat",
     "LLMConfigError",
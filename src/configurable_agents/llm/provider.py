@@ -14,10 +14,12 @@ Example:
     >>> llm = create_llm(config)
 """
 
+import asyncio
 import time
 from typing import Any, Dict, List, Optional, Type
 
 from langchain_core.language_models import BaseChatModel
+from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 from pydantic import BaseModel
 
@@ -169,12 +171,54 @@ class LLMUsageMetadata:
         self.output_tokens = output_tokens
 
 
+def bind_structured_output(
+    llm: BaseChatModel,
+    output_model: Type[BaseModel],
+    tools: Optional[List[BaseTool]] = None,
+) -> Runnable:
+    """Bind tools and structured output schema to an LLM.
+
+    The returned runnable is stateless and can be reused across calls
+    (see call_llm_structured's structured_llm argument).
+
+    Args:
+        llm: LLM instance (from create_llm)
+        output_model: Pydantic model for output validation
+        tools: Optional list of tools the LLM can use
+
+    Returns:
+        Runnable returning {"parsed": ..., "raw": ...} on invoke
+    """
+    # Bind tools FIRST if provided (before structured output)
+    if tools:
+        # Special handling for ChatLiteLLM with Google/Gemini to fix tool_choice
+        # VertexAI doesn't support tool_choice="any" which is LangChain's default
+        try:
+            from langchain_community.chat_models import ChatLiteLLM
+            if isinstance(llm, ChatLiteLLM):
+                model = getattr(llm, "model", "")
+                if isinstance(model, str) and "gemini/" in model:
+                    # Bind with explicit tool_choice="auto" instead of default "any"
+                    llm = llm.bind_tools(tools, tool_choice="auto")
+                else:
+                    llm = llm.bind_tools(tools)
+            else:
+                llm = llm.bind_tools(tools)
+        except (ImportError, AttributeError):
+            # Not a ChatLiteLLM or other issue, use default binding
+            llm = llm.bind_tools(tools)
+
+    # Then bind structured output to LLM
+    return llm.with_structured_output(output_model, include_raw=True)
+
+
 def call_llm_structured(
     llm: BaseChatModel,
     prompt: str,
     output_model: Type[BaseModel],
     tools: Optional[List[BaseTool]] = None,
     max_retries: int = 3,
+    structured_llm: Optional[Runnable] = None,
 ) -> tuple[BaseModel, LLMUsageMetadata]:
     """Call LLM with structured output enforcement.
 
@@ -191,6 +235,8 @@ def call_llm_structured(
         output_model: Pydantic model for output validation
         tools: Optional list of tools the LLM can use
         max_retries: Maximum retry attempts on validation failure
+        structured_llm: Pre-bound runnable from bind_structured_output()
+            (optional; skips tool and schema binding when provided)
 
     Returns:
         Tuple of (output_model instance, usage_metadata)
@@ -213,31 +259,11 @@ def call_llm_structured(
     """
     from pydantic import ValidationError
 
-    # Bind tools FIRST if provided (before structured output)
-    if tools:
-        # Special handling for ChatLiteLLM with Google/Gemini to fix tool_choice
-        # VertexAI doesn't support tool_choice="any" which is LangChain's default
-        try:
-            from langchain_community.chat_models import ChatLiteLLM
-            if isinstance(llm, ChatLiteLLM):
-                model = getattr(llm, "model", "")
-                if isinstance(model, str) and "gemini/" in model:
-                    # Bind with explicit tool_choice="auto" instead of default "any"
-                    llm = llm.bind_tools(tools, tool_choice="auto")
-                else:
-                    llm = llm.bind_tools(tools)
-            else:
-                llm = llm.bind_tools(tools)
-        except (ImportError, AttributeError):
-            # Not a ChatLiteLLM or other issue, use default binding
-            llm = llm.bind_tools(tools)
-
-    # Then bind structured output to LLM
-    structured_llm = llm.with_structured_output(output_model, include_raw=True)
+    if structured_llm is None:
+        structured_llm = bind_structured_output(llm, output_model, tools)
 
-    # Track retries for usage calculation
-    total_input_tokens = 0
-    total_output_tokens = 0
+    # Track retries for usage calculation: [input_tokens, output_tokens]
+    totals = [0, 0]
 
     # Attempt call with retries
     last_error = None
@@ -245,68 +271,24 @@ def call_llm_structured(
         try:
             # Call LLM with include_raw=True to get usage metadata
             response = structured_llm.invoke(prompt)
-
-            # Extract structured output and raw response
-            # with_structured_output(include_raw=True) returns dict with 'parsed' and 'raw'
-            if isinstance(response, dict) and "parsed" in response and "raw" in response:
-                result = response["parsed"]
-                raw_message = response["raw"]
-
-                # Extract token usage from raw message
-                usage_data = getattr(raw_message, "usage_metadata", None)
-                if usage_data:
-                    input_tokens = getattr(usage_data, "input_tokens", 0)
-                    output_tokens = getattr(usage_data, "output_tokens", 0)
-                    total_input_tokens += input_tokens
-                    total_output_tokens += output_tokens
-            else:
-                # Fallback for unexpected response format
-                result = response
-                total_input_tokens = 0
-                total_output_tokens = 0
-
-            # Validate result
-            if isinstance(result, output_model):
-                usage = LLMUsageMetadata(total_input_tokens, total_output_tokens)
-                return result, usage
-
-            # If result is a dict, try to parse it
-            if isinstance(result, dict):
-                parsed = output_model(**result)
-                usage = LLMUsageMetadata(total_input_tokens, total_output_tokens)
-                return parsed, usage
-
-            # Unexpected result type
-            raise LLMAPIError(
-                f"LLM returned unexpected type: {type(result).__name__}",
-                retryable=False,
-            )
+            result = _parse_structured_response(response, output_model, totals)
+            return result, LLMUsageMetadata(totals[0], totals[1])
 
         except ValidationError as e:
             last_error = e
             # On validation error, retry with clarified prompt
             if attempt < max_retries - 1:
                 time.sleep(0.5 * (attempt + 1))  # Exponential backoff
-                clarified_prompt = (
-                    f"{prompt}\n\n"
-                    f"Previous attempt failed validation. "
-                    f"Please ensure the response matches the required schema exactly."
-                )
-                prompt = clarified_prompt
+                prompt = _clarify_prompt(prompt)
             continue
 
         except Exception as e:
             # Check if it's a retryable error (rate limit, timeout, etc.)
-            error_msg = str(e).lower()
-            retryable = any(
-                keyword in error_msg
-                for keyword in ["rate limit", "timeout", "temporarily unavailable"]
-            )
+            retryable = _is_retryable(e)
 
             if retryable and attempt < max_retries - 1:
                 # Exponential backoff
-                wait_time = 2**attempt
-                time.sleep(wait_time)
+                time.sleep(2**attempt)
                 continue
 
             # Non-retryable error or out of retries
@@ -316,6 +298,140 @@ def call_llm_structured(
     raise last_error
 
 
+async def call_llm_structured_async(
+    llm: BaseChatModel,
+    prompt: str,
+    output_model: Type[BaseModel],
+    tools: Optional[List[BaseTool]] = None,
+    max_retries: int = 3,
+    structured_llm: Optional[Runnable] = None,
+) -> tuple[BaseModel, LLMUsageMetadata]:
+    """Async variant of call_llm_structured.
+
+    Uses ``ainvoke`` on the structured runnable and ``asyncio.sleep`` for
+    backoff, so waiting on the provider never blocks the event loop. Retry,
+    validation and usage semantics are identical to call_llm_structured.
+
+    Args:
+        llm: LLM instance (from create_llm)
+        prompt: Prompt text to send
+        output_model: Pydantic model for structured output
+        tools: Optional list of tools to bind to LLM
+        max_retries: Maximum retry attempts (default: 3)
+        structured_llm: Prebuilt runnable from bind_structured_output
+            (optional, bound from llm/output_model/tools when omitted)
+
+    Returns:
+        Tuple of (validated output, usage metadata)
+
+    Raises:
+        LLMAPIError: If API call fails after retries
+        ValidationError: If output doesn't match schema after retries
+
+    Example:
+        >>> result, usage = await call_llm_structured_async(
+        ...     llm, "Write an article about AI", Article
+        ... )
+    """
+    from pydantic import ValidationError
+
+    if structured_llm is None:
+        structured_llm = bind_structured_output(llm, output_model, tools)
+
+    totals = [0, 0]
+    last_error = None
+    for attempt in range(max_retries):
+        try:
+            response = await structured_llm.ainvoke(prompt)
+            result = _parse_structured_response(response, output_model, totals)
+            return result, LLMUsageMetadata(totals[0], totals[1])
+
+        except ValidationError as e:
+            last_error = e
+            if attempt < max_retries - 1:
+                await asyncio.sleep(0.5 * (attempt + 1))
+                prompt = _clarify_prompt(prompt)
+            continue
+
+        except Exception as e:
+            retryable = _is_retryable(e)
+
+            if retryable and attempt < max_retries - 1:
+                await asyncio.sleep(2**attempt)
+                continue
+
+            raise LLMAPIError(str(e), retryable=retryable) from e
+
+    raise last_error
+
+
+def _parse_structured_response(
+    response: Any, output_model: Type[BaseModel], totals: List[int]
+) -> BaseModel:
+    """Extract the validated output from a structured runnable response.
+
+    Args:
+        response: Value returned by the structured runnable
+        output_model: Expected Pydantic model
+        totals: Running [input_tokens, output_tokens], updated in place
+
+    Returns:
+        Validated output instance
+
+    Raises:
+        LLMAPIError: If the response has an unexpected type
+        ValidationError: If a dict result doesn't match output_model
+    """
+    # Extract structured output and raw response
+    # with_structured_output(include_raw=True) returns dict with 'parsed' and 'raw'
+    if isinstance(response, dict) and "parsed" in response and "raw" in response:
+        result = response["parsed"]
+        raw_message = response["raw"]
+
+        # Extract token usage from raw message
+        usage_data = getattr(raw_message, "usage_metadata", None)
+        if usage_data:
+            totals[0] += getattr(usage_data, "input_tokens", 0)
+            totals[1] += getattr(usage_data, "output_tokens", 0)
+    else:
+        # Fallback for unexpected response format
+        result = response
+        totals[0] = 0
+        totals[1] = 0
+
+    # Validate result
+    if isinstance(result, output_model):
+        return result
+
+    # If result is a dict, try to parse it
+    if isinstance(result, dict):
+        return output_model(**result)
+
+    # Unexpected result type
+    raise LLMAPIError(
+        f"LLM returned unexpected type: {type(result).__name__}",
+        retryable=False,
+    )
+
+
+def _clarify_prompt(prompt: str) -> str:
+    """Append a schema reminder to a prompt after a validation failure."""
+    return (
+        f"{prompt}\n\n"
+        f"Previous attempt failed validation. "
+        f"Please ensure the response matches the required schema exactly."
+    )
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Whether an LLM error is transient (rate limit, timeout, etc.)."""
+    error_msg = str(error).lower()
+    return any(
+        keyword in error_msg
+        for keyword in ["rate limit", "timeout", "temporarily unavailable"]
+    )
+
+
 def merge_llm_config(node_config: Any, global_config: Any) -> Any:
     """Merge node-level and global LLM configurations.
 
@@ -5,7 +5,12 @@ state across workflow executions.
 
 Public API:
     - AgentMemory: Main memory class with dict-like reads and explicit writes
-    - MemoryStore: Low-level storage access
+    - MemoryStore: Low-level storage access (cached reads)
+    - MemoryCache: Per-process LRU read-through cache with cross-process
+      invalidation
+    - MemoryReaper: Background purge of expired entries
+    - MemoryVectorIndex: Semantic index behind AgentMemory.search()
+    - HashingEmbedder: Default deterministic, offline embedder
     - memory_context: Context manager for automatic cleanup
 
 Example:
@@ -15,6 +20,22 @@ Example:
     >>> result = memory["last_query"]
 """
 
+from configurable_agents.memory.cache import (
+    MemoryCache,
+    MemoryReaper,
+    clear_memory_caches,
+    get_memory_cache,
+)
+from configurable_agents.memory.vector import (
+    Embedder,
+    FlatIndex,
+    HashingEmbedder,
+    IVFIndex,
+    MemoryVectorIndex,
+    clear_vector_indexes,
+    format_recalled_memories,
+    get_vector_index,
+)
 from configurable_agents.memory.store import (
     AgentMemory,
     MemoryStore,
@@ -25,4 +46,16 @@ __all__ = [
     "AgentMemory",
     "MemoryStore",
     "memory_context",
+    "MemoryCache",
+    "MemoryReaper",
+    "get_memory_cache",
+    "clear_memory_caches",
+    "Embedder",
+    "HashingEmbedder",
+    "FlatIndex",
+    "IVFIndex",
+    "MemoryVectorIndex",
+    "get_vector_index",
+    "clear_vector_indexes",
+    "format_recalled_memories",
 ]
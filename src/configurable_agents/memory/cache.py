@@ -0,0 +1,455 @@
+"""In-process cache and expiry reaper for agent memory.
+
+MemoryStore reads go through a per-process LRU cache so hot keys (read
+repeatedly inside loops or across node executions) are served without a
+database round trip or JSON decode.
+
+Design decisions:
+- One cache per repository instance, shared by every MemoryStore and
+  AgentMemory built on it (see get_memory_cache)
+- Read-through and write-through; missing keys are cached too
+- Entries remember their TTL expiry and are dropped lazily when read
+- Cross-process invalidation: at most every sync_interval seconds the
+  cache polls the repository's change log and evicts keys (or prefixes)
+  changed by other processes, so staleness is bounded by sync_interval
+- Scalars are cached as values; containers are cached as their JSON text
+  and decoded per read, so callers can never mutate a cached value
+- Expired rows and change log rows past their retention are deleted by a
+  background MemoryReaper thread, started for a repository on its first
+  write (every write appends to the change log, TTL or not). The reaper
+  holds the repository weakly and exits once it is collected
+
+Example:
+    >>> cache = get_memory_cache(memory_repo)
+    >>> cache.get("bot:*:*:counter")  # database on first read
+    >>> cache.get("bot:*:*:counter")  # memory afterwards
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from configurable_agents.storage.base import MemoryRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_SYNC_INTERVAL = 0.5
+DEFAULT_MAX_SYNC_GAP = 600.0
+DEFAULT_REAPER_INTERVAL = 60.0
+
+# Cached entry: (value, json_text or None, expires_at as time.time() or None)
+_Entry = Tuple[Any, Optional[str], Optional[float]]
+
+_ABSENT = object()
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _expiry_timestamp(expires_at: Optional[datetime]) -> Optional[float]:
+    """Convert a naive UTC datetime into a time.time() timestamp."""
+    if expires_at is None:
+        return None
+    return (expires_at - datetime(1970, 1, 1)).total_seconds()
+
+
+class MemoryCache:
+    """
+    LRU read-through/write-through cache for one memory repository.
+
+    Attributes:
+        max_entries: Maximum number of cached keys
+        sync_interval: Seconds between change log polls (bound on how stale
+            an entry changed by another process can be)
+        max_sync_gap: If no poll happened for this long (e.g. an idle
+            process), the whole cache is dropped instead, since the change
+            log may have been purged in between
+
+    Example:
+        >>> cache = MemoryCache(memory_repo, max_entries=1000)
+        >>> cache.put("bot:*:*:name", "Alice")
+        >>> cache.get("bot:*:*:name")
+        'Alice'
+    """
+
+    def __init__(
+        self,
+        repo: MemoryRepository,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sync_interval: float = DEFAULT_SYNC_INTERVAL,
+        max_sync_gap: float = DEFAULT_MAX_SYNC_GAP,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            repo: Repository to read through to
+            max_entries: Maximum number of cached keys (must be >= 1)
+            sync_interval: Seconds between change log polls
+            max_sync_gap: Seconds without a poll after which everything is
+                dropped (keep below the repository's change log retention)
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+
+        self._repo = repo
+        self.max_entries = max_entries
+        self.sync_interval = sync_interval
+        self.max_sync_gap = max_sync_gap
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0  # Bumped by local writes; guards read-through fills
+        self._sync_lock = threading.Lock()
+        self._change_id, _ = repo.changes_since(None)
+        self._last_sync = time.monotonic()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def get(self, namespace_key: str) -> Any:
+        """
+        Get a deserialized value, reading through to the repository on a miss.
+
+        Args:
+            namespace_key: Full namespace key (agent:workflow:node:key)
+
+        Returns:
+            Deserialized value or None if not found, expired or undecodable
+        """
+        self.sync()
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(namespace_key)
+            if entry is not None and (entry[2] is None or entry[2] > now):
+                self._entries.move_to_end(namespace_key)
+                self._counters["hits"] += 1
+                return self._materialize(entry)
+            self._counters["misses"] += 1
+            generation = self._generation
+
+        row = self._repo.get_entry(namespace_key)
+        if row is None:
+            self._store(namespace_key, (_ABSENT, None, None), generation)
+            return None
+
+        value_str, expires_at = row
+        try:
+            value = json.loads(value_str)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to deserialize value for key {namespace_key}")
+            return None
+        self._store(
+            namespace_key,
+            self._entry(value, value_str, _expiry_timestamp(expires_at)),
+            generation,
+        )
+        return value
+
+    def get_many(self, namespace_keys: List[str]) -> Dict[str, Any]:
+        """
+        Get many deserialized values, reading all misses in one repository call.
+
+        Args:
+            namespace_keys: Full namespace keys
+
+        Returns:
+            Dict of namespace_key -> value for keys found (missing, expired
+            and undecodable keys are omitted)
+        """
+        self.sync()
+        now = time.time()
+        found: Dict[str, Any] = {}
+        misses: List[str] = []
+        with self._lock:
+            for namespace_key in namespace_keys:
+                entry = self._entries.get(namespace_key)
+                if entry is not None and (entry[2] is None or entry[2] > now):
+                    self._entries.move_to_end(namespace_key)
+                    if entry[0] is not _ABSENT:
+                        found[namespace_key] = self._materialize(entry)
+                else:
+                    misses.append(namespace_key)
+            self._counters["hits"] += len(namespace_keys) - len(misses)
+            self._counters["misses"] += len(misses)
+            generation = self._generation
+
+        if not misses:
+            return found
+
+        rows = self._repo.get_entries(misses)
+        for namespace_key in misses:
+            row = rows.get(namespace_key)
+            if row is None:
+                self._store(namespace_key, (_ABSENT, None, None), generation)
+                continue
+            value_str, expires_at = row
+            try:
+                value = json.loads(value_str)
+            except json.JSONDecodeError:
+                logger.warning(f"Failed to deserialize value for key {namespace_key}")
+                continue
+            found[namespace_key] = value
+            self._store(
+                namespace_key,
+                self._entry(value, value_str, _expiry_timestamp(expires_at)),
+                generation,
+            )
+        return found
+
+    def put(
+        self,
+        namespace_key: str,
+        value: Any,
+        serialized: Optional[str] = None,
+        ttl: Optional[int] = None,
+    ) -> None:
+        """
+        Record a value just written to the repository (write-through).
+
+        Args:
+            namespace_key: Full namespace key
+            value: Deserialized value
+            serialized: JSON text of value (computed if None)
+            ttl: Time-to-live in seconds (None for no expiry)
+        """
+        if serialized is None:
+            serialized = json.dumps(value)
+        expires = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._generation += 1
+        self._store(namespace_key, self._entry(value, serialized, expires))
+
+    def invalidate(self, namespace_key: str) -> None:
+        """
+        Drop one key.
+
+        Args:
+            namespace_key: Full namespace key
+        """
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(namespace_key, None)
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        Drop every key starting with a namespace prefix.
+
+        Args:
+            prefix: Namespace prefix (e.g., "bot:wf:")
+
+        Returns:
+            Number of keys dropped
+        """
+        with self._lock:
+            self._generation += 1
+            doomed = [key for key in self._entries if key.startswith(prefix)]
+            for key in doomed:
+                del self._entries[key]
+        return len(doomed)
+
+    def clear(self) -> None:
+        """Drop every cached key."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def sync(self, force: bool = False) -> None:
+        """
+        Evict keys changed by other processes since the last poll.
+
+        Polls the repository change log at most once per sync_interval
+        unless force is set.
+
+        Args:
+            force: Poll even if sync_interval has not elapsed
+        """
+        now = time.monotonic()
+        if not force and now - self._last_sync < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return  # Another thread is polling
+        try:
+            latest, changes = self._repo.changes_since(self._change_id)
+            if now - self._last_sync > self.max_sync_gap:
+                self.clear()
+            else:
+                for namespace_key, is_prefix in changes:
+                    if is_prefix:
+                        self.invalidate_prefix(namespace_key)
+                    else:
+                        self.invalidate(namespace_key)
+                with self._lock:
+                    self._counters["invalidations"] += len(changes)
+            self._change_id = latest
+            self._last_sync = now
+        except Exception as e:
+            # Keep serving; entries stay bounded by the next successful poll
+            logger.warning(f"Memory cache sync failed: {e}")
+        finally:
+            self._sync_lock.release()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with size, hits, misses, evictions and invalidations
+        """
+        with self._lock:
+            return {"size": len(self._entries), **self._counters}
+
+    def _store(self, namespace_key: str, entry: _Entry, generation: Optional[int] = None) -> None:
+        """Insert an entry; read-through fills pass the generation they started at."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return  # A write or invalidation raced with the fill; skip it
+            self._entries[namespace_key] = entry
+            self._entries.move_to_end(namespace_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    @staticmethod
+    def _entry(value: Any, serialized: str, expires: Optional[float]) -> _Entry:
+        if isinstance(value, _SCALARS):
+            return (value, None, expires)
+        return (None, serialized, expires)
+
+    @staticmethod
+    def _materialize(entry: _Entry) -> Any:
+        value, serialized, _ = entry
+        if serialized is not None:
+            return json.loads(serialized)
+        return None if value is _ABSENT else value
+
+
+class MemoryReaper:
+    """
+    Background thread that periodically purges expired memory entries.
+
+    Attributes:
+        interval: Seconds between purges
+
+    Example:
+        >>> reaper = MemoryReaper(memory_repo, interval=30)
+        >>> reaper.start()
+        >>> reaper.stop()
+    """
+
+    def __init__(self, repo: MemoryRepository, interval: float = DEFAULT_REAPER_INTERVAL):
+        """
+        Initialize the reaper (not started).
+
+        Args:
+            repo: Repository to purge
+            interval: Seconds between purges
+        """
+        # Weak, so a running reaper does not keep its repository alive
+        self._repo = weakref.ref(repo)
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the background thread (no-op if already running)."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="memory-reaper")
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop the background thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def purge(self) -> int:
+        """
+        Purge expired entries now.
+
+        Returns:
+            Number of expired entries deleted (0 once the repository is gone)
+        """
+        repo = self._repo()
+        if repo is None:
+            return 0
+        count = repo.purge_expired()
+        if count:
+            logger.debug(f"Purged {count} expired memory entries")
+        return count
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            if self._repo() is None:
+                return
+            try:
+                self.purge()
+            except Exception as e:
+                logger.warning(f"Memory expiry purge failed: {e}")
+
+
+# Process-wide caches and reapers, one per repository instance
+_caches: "weakref.WeakKeyDictionary[MemoryRepository, MemoryCache]" = weakref.WeakKeyDictionary()
+_reapers: "weakref.WeakKeyDictionary[MemoryRepository, MemoryReaper]" = weakref.WeakKeyDictionary()
+_registry_lock = threading.Lock()
+
+
+def get_memory_cache(repo: MemoryRepository) -> MemoryCache:
+    """
+    Get (or create) the process-wide cache for a repository.
+
+    Args:
+        repo: Memory repository
+
+    Returns:
+        Shared MemoryCache
+    """
+    with _registry_lock:
+        cache = _caches.get(repo)
+        if cache is None:
+            cache = _caches[repo] = MemoryCache(repo)
+        return cache
+
+
+def ensure_memory_reaper(repo: MemoryRepository) -> MemoryReaper:
+    """
+    Get (or start) the process-wide expiry reaper for a repository.
+
+    Args:
+        repo: Memory repository
+
+    Returns:
+        Running MemoryReaper
+    """
+    with _registry_lock:
+        reaper = _reapers.get(repo)
+        if reaper is None:
+            reaper = _reapers[repo] = MemoryReaper(repo)
+            reaper.start()
+        return reaper
+
+
+def clear_memory_caches() -> None:
+    """Drop every process-wide memory cache and stop every reaper."""
+    with _registry_lock:
+        reapers = list(_reapers.values())
+        _caches.clear()
+        _reapers.clear()
+    for reaper in reapers:
+        reaper.stop()
+
+
+atexit.register(clear_memory_caches)
@@ -16,8 +16,10 @@ Example:
 import json
 import logging
 from contextlib import contextmanager
-from typing import Any, List, Literal, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
 
+from configurable_agents.memory.cache import MemoryCache, ensure_memory_reaper, get_memory_cache
+from configurable_agents.memory.vector import Embedder, get_vector_index
 from configurable_agents.storage.base import MemoryRepository
 
 logger = logging.getLogger(__name__)
@@ -29,17 +31,25 @@ class MemoryStore:
     Provides low-level access to memory repository without namespace
     management. Used internally by AgentMemory and for advanced use cases.
 
+    Reads and writes go through the repository's process-wide MemoryCache
+    (read-through/write-through), so repeated reads of a key skip the
+    database and JSON decoding.
+
     Attributes:
         repo: MemoryRepository instance for persistence
+        cache: Shared MemoryCache, or None when caching is disabled
     """
 
-    def __init__(self, repo: MemoryRepository) -> None:
+    def __init__(self, repo: MemoryRepository, use_cache: bool = True) -> None:
         """Initialize memory store with repository.
 
         Args:
             repo: MemoryRepository instance for persistence
+            use_cache: Serve reads from the repository's shared in-process
+                cache (False to always read the database)
         """
         self._repo = repo
+        self.cache: Optional[MemoryCache] = get_memory_cache(repo) if use_cache else None
 
     def get(self, namespace_key: str) -> Any:
         """Get a value by namespace key.
@@ -48,8 +58,11 @@ class MemoryStore:
             namespace_key: Full namespace key (agent:workflow:node:key)
 
         Returns:
-            Deserialized value or None if not found
+            Deserialized value or None if not found (or expired)
         """
+        if self.cache is not None:
+            return self.cache.get(namespace_key)
+
         value = self._repo.get(namespace_key)
         if value is None:
             return None
@@ -67,6 +80,7 @@ class MemoryStore:
         workflow_id: Optional[str],
         node_id: Optional[str],
         key: str,
+        ttl: Optional[int] = None,
     ) -> None:
         """Store a value with namespace key.
 
@@ -77,11 +91,110 @@ class MemoryStore:
             workflow_id: Workflow identifier (optional)
             node_id: Node identifier (optional)
             key: User-facing key name
+            ttl: Time-to-live in seconds (None for no expiry)
         """
         serialized = json.dumps(value)
-        self._repo.set(namespace_key, serialized, agent_id, workflow_id, node_id, key)
+        self._repo.set(namespace_key, serialized, agent_id, workflow_id, node_id, key, ttl=ttl)
+        if self.cache is not None:
+            self.cache.put(namespace_key, value, serialized, ttl=ttl)
+        ensure_memory_reaper(self._repo)
         logger.debug(f"Stored memory: {namespace_key}")
 
+    def get_many(self, namespace_keys: List[str]) -> Dict[str, Any]:
+        """Get many values by namespace key in one repository call.
+
+        Args:
+            namespace_keys: Full namespace keys
+
+        Returns:
+            Dict of namespace_key -> deserialized value for keys found
+        """
+        if self.cache is not None:
+            return self.cache.get_many(namespace_keys)
+
+        values = {}
+        for namespace_key, value in self._repo.get_many(namespace_keys).items():
+            try:
+                values[namespace_key] = json.loads(value)
+            except json.JSONDecodeError:
+                logger.warning(f"Failed to deserialize value for key {namespace_key}")
+        return values
+
+    def set_many(
+        self,
+        entries: List[Tuple[str, Any, str, Optional[str], Optional[str], str]],
+        ttl: Optional[int] = None,
+    ) -> None:
+        """Store many values in one transaction.
+
+        Args:
+            entries: (namespace_key, value, agent_id, workflow_id, node_id, key)
+                tuples; values will be JSON serialized
+            ttl: Time-to-live in seconds for every entry (None for no expiry)
+        """
+        serialized = [
+            (namespace_key, json.dumps(value), agent_id, workflow_id, node_id, key)
+            for namespace_key, value, agent_id, workflow_id, node_id, key in entries
+        ]
+        self._repo.set_many(serialized, ttl=ttl)
+        if self.cache is not None:
+            for (namespace_key, value, *_), (_, value_str, *_) in zip(entries, serialized):
+                self.cache.put(namespace_key, value, value_str, ttl=ttl)
+        ensure_memory_reaper(self._repo)
+        logger.debug(f"Stored {len(entries)} memory entries")
+
+    def delete(self, namespace_key: str) -> bool:
+        """Delete a value by namespace key.
+
+        Args:
+            namespace_key: Full namespace key (agent:workflow:node:key)
+
+        Returns:
+            True if the key was deleted, False if not found
+        """
+        deleted = self._repo.delete(namespace_key)
+        if self.cache is not None:
+            self.cache.invalidate(namespace_key)
+        ensure_memory_reaper(self._repo)
+        return deleted
+
+    def delete_many(self, namespace_keys: List[str]) -> int:
+        """Delete many values in one transaction.
+
+        Args:
+            namespace_keys: Full namespace keys
+
+        Returns:
+            Number of keys deleted
+        """
+        deleted = self._repo.delete_many(namespace_keys)
+        if self.cache is not None:
+            for namespace_key in namespace_keys:
+                self.cache.invalidate(namespace_key)
+        ensure_memory_reaper(self._repo)
+        return deleted
+
+    def clear(self, agent_id: str, workflow_id: Optional[str] = None) -> int:
+        """Clear all memory for an agent, or for one of its workflows.
+
+        Args:
+            agent_id: Agent identifier
+            workflow_id: Workflow identifier (None for all of the agent's memory)
+
+        Returns:
+            Number of entries deleted
+        """
+        if workflow_id is not None:
+            count = self._repo.clear_by_workflow(agent_id, workflow_id)
+            prefix = f"{agent_id}:{workflow_id}:"
+        else:
+            count = self._repo.clear(agent_id)
+            prefix = f"{agent_id}:"
+        if self.cache is not None:
+            self.cache.invalidate_prefix(prefix)
+        ensure_memory_reaper(self._repo)
+        return count
+
 
 class AgentMemory:
     """Agent memory with dict-like reads and explicit writes.
@@ -112,6 +225,8 @@ class AgentMemory:
         node_id: Optional[str] = None,
         scope: Literal["agent", "workflow", "node"] = "agent",
         repo: Optional[MemoryRepository] = None,
+        index_kind: Literal["flat", "ivf"] = "flat",
+        embedder: Optional[Embedder] = None,
     ) -> None:
         """Initialize agent memory.
 
@@ -121,12 +236,17 @@ class AgentMemory:
             node_id: Node identifier (required for node scope)
             scope: Memory scope - "agent", "workflow", or "node"
             repo: MemoryRepository instance (optional, for direct access)
+            index_kind: Vector index used by search() - "flat" (exact) or
+                "ivf" (approximate, for large scopes)
+            embedder: Embedder used by search() (default: HashingEmbedder)
         """
         self._agent_id = agent_id
         self._workflow_id = workflow_id
         self._node_id = node_id
         self._scope = scope
         self._store = MemoryStore(repo) if repo else None
+        self._index_kind = index_kind
+        self._embedder = embedder
 
         # Validate scope parameters
         if scope == "workflow" and not workflow_id:
@@ -176,11 +296,13 @@ class AgentMemory:
         Args:
             key: Key to store
             value: Value to store (will be JSON serialized)
-            ttl: Time-to-live in seconds (reserved for future use)
+            ttl: Time-to-live in seconds; the key reads as missing once it
+                has expired (None for no expiry)
 
         Example:
             >>> memory.write("user_name", "Alice")
             >>> memory.write("settings", {"theme": "dark", "lang": "en"})
+            >>> memory.write("session_token", "abc", ttl=3600)
         """
         if self._store is None:
             logger.warning(f"Memory write attempted but no repository configured for key '{key}'")
@@ -194,9 +316,81 @@ class AgentMemory:
             self._workflow_id,
             self._node_id,
             key,
+            ttl=ttl,
         )
         logger.debug(f"Memory written: {key} (scope: {self._scope})")
 
+    def get_many(self, keys: Iterable[str], default: Any = None) -> Dict[str, Any]:
+        """Read many keys with one storage query.
+
+        Args:
+            keys: Keys to read
+            default: Value for keys that are not found
+
+        Returns:
+            Dict with every requested key mapped to its value or default
+
+        Example:
+            >>> prefs = memory.get_many(["theme", "language"], default="unset")
+        """
+        keys = list(keys)
+        if self._store is None:
+            return {key: default for key in keys}
+
+        found = self._store.get_many([self._build_namespace(key) for key in keys])
+        values = {}
+        for key in keys:
+            value = found.get(self._build_namespace(key))
+            values[key] = default if value is None else value
+        return values
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """Write many keys in one transaction.
+
+        Args:
+            items: Mapping of key -> value (values will be JSON serialized)
+            ttl: Time-to-live in seconds for every key (None for no expiry)
+
+        Example:
+            >>> memory.set_many({"user_name": "Alice", "theme": "dark"})
+        """
+        if self._store is None:
+            logger.warning("Memory write attempted but no repository configured")
+            return
+
+        self._store.set_many(
+            [
+                (
+                    self._build_namespace(key),
+                    value,
+                    self._agent_id,
+                    self._workflow_id,
+                    self._node_id,
+                    key,
+                )
+                for key, value in items.items()
+            ],
+            ttl=ttl,
+        )
+        logger.debug(f"Memory written: {len(items)} keys (scope: {self._scope})")
+
+    def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete many keys in one transaction.
+
+        Args:
+            keys: Keys to delete
+
+        Returns:
+            Number of keys deleted
+
+        Example:
+            >>> memory.delete_many(["temp_1", "temp_2"])
+        """
+        if self._store is None:
+            return 0
+
+        return self._store.delete_many([self._build_namespace(key) for key in keys])
+
     def read(self, key: str, default: Any = None) -> Any:
         """Read a value with default fallback.
 
@@ -229,16 +423,19 @@ class AgentMemory:
             return False
 
         namespace_key = self._build_namespace(key)
-        return self._store._repo.delete(namespace_key)
+        return self._store.delete(namespace_key)
 
     def list(self, prefix: str = "") -> List[Tuple[str, Any]]:
         """List keys with optional prefix filtering.
 
+        Runs a single range query over the current scope's namespace, so
+        only entries written at this scope are returned.
+
         Args:
             prefix: Key prefix to filter (e.g., "user:")
 
         Returns:
-            List of (key, value) tuples
+            List of (key, value) tuples ordered by key
 
         Example:
             >>> for key, value in memory.list("user:"):
@@ -247,55 +444,80 @@ class AgentMemory:
         if self._store is None:
             return []
 
-        # Get all items for this agent
-        all_items = self._store._repo.list(self._agent_id, "")
+        return [
+            self._decode_item(namespace_key, value_str)
+            for namespace_key, value_str in self._store._repo.scan(self._build_namespace(prefix))
+        ]
 
-        # Filter by current scope's namespace prefix
-        # For workflow scope, filter by agent:workflow:
-        # For node scope, filter by agent:workflow:node:
-        namespace_prefix = self._build_namespace("").rstrip(":")
-
-        # Deserialize values and filter by scope
-        result = []
-        for key, value_str in all_items:
-            # Check if this key belongs to current scope
-            # by checking the full namespace key
-            full_namespace = self._build_namespace(key)
+    def list_page(
+        self,
+        prefix: str = "",
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[Tuple[str, Any]], Optional[str]]:
+        """List one page of keys at the current scope.
 
-            # For list operation, we need to get the actual namespace from the repo
-            # Since we only have key/value from list(), we need to check scope
-            if not self._key_matches_scope(key):
-                continue
+        Args:
+            prefix: Key prefix to filter (e.g., "user:")
+            limit: Maximum number of items in the page
+            cursor: Key returned as next cursor by the previous page
+                (None for the first page)
 
-            # Apply user-specified prefix filter
-            if prefix and not key.startswith(prefix):
-                continue
+        Returns:
+            Tuple of (items, next_cursor); next_cursor is None on the last page
 
-            try:
-                value = json.loads(value_str)
-                result.append((key, value))
-            except json.JSONDecodeError:
-                logger.warning(f"Failed to deserialize value for key {key}")
-                result.append((key, value_str))
+        Example:
+            >>> items, cursor = memory.list_page("user:", limit=50)
+            >>> while cursor is not None:
+            ...     more, cursor = memory.list_page("user:", limit=50, cursor=cursor)
+        """
+        if self._store is None:
+            return [], None
 
-        return result
+        after = self._build_namespace(cursor) if cursor is not None else None
+        rows = self._store._repo.scan(self._build_namespace(prefix), after=after, limit=limit)
+        items = [self._decode_item(namespace_key, value_str) for namespace_key, value_str in rows]
+        next_cursor = items[-1][0] if len(items) == limit else None
+        return items, next_cursor
 
-    def _key_matches_scope(self, key: str) -> bool:
-        """Check if a key matches the current memory scope.
+    def iter_items(self, prefix: str = "", batch_size: int = 500) -> Iterator[Tuple[str, Any]]:
+        """Stream keys at the current scope without loading them all at once.
 
         Args:
-            key: User-facing key name
+            prefix: Key prefix to filter (e.g., "user:")
+            batch_size: Entries fetched per query
 
-        Returns:
-            True if key exists in current scope, False otherwise
+        Yields:
+            (key, value) tuples ordered by key
+
+        Example:
+            >>> for key, value in memory.iter_items("events:"):
+            ...     process(value)
         """
         if self._store is None:
-            return False
+            return
 
-        # Build the full namespace for this key
-        namespace_key = self._build_namespace(key)
-        value = self._store._repo.get(namespace_key)
-        return value is not None
+        for namespace_key, value_str in self._store._repo.iter_scan(
+            self._build_namespace(prefix), batch_size=batch_size
+        ):
+            yield self._decode_item(namespace_key, value_str)
+
+    def _decode_item(self, namespace_key: str, value_str: str) -> Tuple[str, Any]:
+        """Turn a (namespace_key, serialized value) row into (key, value).
+
+        Args:
+            namespace_key: Full namespace key within the current scope
+            value_str: JSON-serialized value
+
+        Returns:
+            (key, value) tuple; undecodable values are returned as stored
+        """
+        key = namespace_key[len(self._build_namespace("")):]
+        try:
+            return key, json.loads(value_str)
+        except json.JSONDecodeError:
+            logger.warning(f"Failed to deserialize value for key {key}")
+            return key, value_str
 
     def clear(self) -> None:
         """Clear all memory at current scope.
@@ -307,10 +529,10 @@ class AgentMemory:
             return
 
         if self._scope == "workflow" and self._workflow_id:
-            count = self._store._repo.clear_by_workflow(self._agent_id, self._workflow_id)
+            count = self._store.clear(self._agent_id, self._workflow_id)
             logger.info(f"Cleared {count} memory entries for workflow {self._workflow_id}")
         else:
-            count = self._store._repo.clear(self._agent_id)
+            count = self._store.clear(self._agent_id)
             logger.info(f"Cleared {count} memory entries for agent {self._agent_id}")
 
     def keys(self) -> List[str]:
@@ -342,7 +564,42 @@ class AgentMemory:
         Returns:
             Number of stored keys
         """
-        return len(self.keys())
+        if self._store is None:
+            return 0
+        return self._store._repo.count(self._build_namespace(""))
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, Any, float]]:
+        """Find the stored entries most similar to a query.
+
+        Uses a vector index over every key at current scope, kept up to date
+        with writes from any process.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+
+        Returns:
+            List of (key, value, score) tuples, best first
+
+        Example:
+            >>> memory.write("favorite_color", "blue")
+            >>> memory.search("what color does the user like?", k=1)
+            [('favorite_color', 'blue', 0.41)]
+        """
+        if self._store is None:
+            logger.warning("Memory search attempted but no repository configured")
+            return []
+
+        index = get_vector_index(
+            self._store._repo,
+            self._build_namespace(""),
+            kind=self._index_kind,
+            embedder=self._embedder,
+        )
+        return [
+            (namespace_key.split(":", 3)[3], value, score)
+            for namespace_key, value, score in index.search(query, k)
+        ]
 
 
 @contextmanager
@@ -0,0 +1,701 @@
+"""Semantic vector index for agent memory recall.
+
+AgentMemory lookups are exact (key or key prefix). MemoryVectorIndex keeps an
+embedding of every entry under a memory scope so agents can recall the few
+entries relevant to a query instead of reading everything.
+
+Design decisions:
+- Pluggable Embedder; HashingEmbedder (signed feature hashing of words and
+  word pairs) is the default: deterministic, dependency-free and offline
+- Vectors are L2-normalized, so inner product is cosine similarity
+- FlatIndex scores every vector (exact); IVFIndex clusters vectors with
+  k-means and only scores the nprobe closest clusters (approximate, for
+  large scopes); IVF searches exhaustively until min_train_size vectors
+- The index is derived data: it catches up with the repository's change
+  log (every write, delete and clear, from any process) before each
+  search, and results are re-read from the repository so deleted or
+  expired entries are never returned
+- Persisted as .npz next to the SQLite database ("<db>.vectors/") on
+  build and at exit; a missing, mismatched or stale file is rebuilt from
+  the repository, and so is an index left unsynced long enough that the
+  change log it would replay may have been purged
+
+Example:
+    >>> index = get_vector_index(memory_repo, "bot:*:*:")
+    >>> for namespace_key, value, score in index.search("user's favourite color", k=3):
+    ...     print(namespace_key, score)
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from configurable_agents.storage.base import MemoryRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_DIM = 256
+DEFAULT_IVF_NLIST = 64
+DEFAULT_IVF_NPROBE = 8
+IVF_MIN_TRAIN_SIZE = 1024
+IVF_TRAIN_ITERATIONS = 10
+# Indexes not synced for this long (persisted files included) are rebuilt:
+# the change log they would need to catch up from is only kept for an hour
+DEFAULT_MAX_INDEX_AGE = 1800.0
+EMBED_BATCH_SIZE = 500
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+@lru_cache(maxsize=65536)
+def _feature_hash(feature: str) -> int:
+    return int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+
+
+class Embedder(ABC):
+    """
+    Turns texts into fixed-size vectors.
+
+    Attributes:
+        dim: Vector dimension
+        name: Identifier stored with persisted indexes (a different name
+            forces a rebuild)
+    """
+
+    dim: int
+    name: str
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            float32 array of shape (len(texts), dim)
+        """
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Deterministic bag-of-words embedder using signed feature hashing.
+
+    Words and adjacent word pairs are hashed into dim buckets. Texts that
+    share vocabulary get similar vectors; no model or network is needed.
+
+    Example:
+        >>> embedder = HashingEmbedder(dim=128)
+        >>> embedder.embed(["dark mode theme"]).shape
+        (1, 128)
+    """
+
+    def __init__(self, dim: int = DEFAULT_EMBEDDING_DIM):
+        """
+        Initialize the embedder.
+
+        Args:
+            dim: Vector dimension (must be >= 8)
+
+        Raises:
+            ValueError: If dim is less than 8
+        """
+        if dim < 8:
+            raise ValueError(f"dim must be >= 8, got {dim}")
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = _TOKEN_RE.findall(text.lower())
+            features = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+            for feature in features:
+                h = _feature_hash(feature)
+                vectors[row, h % self.dim] += 1.0 if h >> 63 else -1.0
+        return _normalize(vectors)
+
+
+class FlatIndex:
+    """
+    Exact inner-product index over normalized vectors.
+
+    Example:
+        >>> index = FlatIndex(dim=4)
+        >>> index.upsert(["a"], np.eye(4, dtype=np.float32)[:1])
+        >>> index.search(np.eye(4, dtype=np.float32)[0], k=1)
+        [('a', 1.0)]
+    """
+
+    kind = "flat"
+
+    def __init__(self, dim: int):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Vector dimension
+        """
+        self.dim = dim
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.zeros((16, dim), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._positions
+
+    def ids(self) -> List[str]:
+        """Ids in storage order."""
+        return list(self._ids)
+
+    def upsert(self, ids: List[str], vectors: np.ndarray) -> None:
+        """
+        Add or replace vectors.
+
+        Args:
+            ids: Item ids
+            vectors: Normalized vectors, one row per id
+        """
+        for item_id, vector in zip(ids, vectors):
+            position = self._positions.get(item_id)
+            if position is None:
+                position = len(self._ids)
+                if position == len(self._vectors):
+                    self._grow(2 * len(self._vectors))
+                self._ids.append(item_id)
+                self._positions[item_id] = position
+            self._vectors[position] = vector
+            self._placed(position)
+
+    def remove(self, ids: List[str]) -> int:
+        """
+        Remove vectors (unknown ids are ignored).
+
+        Args:
+            ids: Item ids
+
+        Returns:
+            Number of vectors removed
+        """
+        removed = 0
+        for item_id in ids:
+            position = self._positions.pop(item_id, None)
+            if position is None:
+                continue
+            last = len(self._ids) - 1
+            if position != last:
+                moved_id = self._ids[last]
+                self._ids[position] = moved_id
+                self._positions[moved_id] = position
+                self._vectors[position] = self._vectors[last]
+                self._moved(last, position)
+            self._ids.pop()
+            removed += 1
+        return removed
+
+    def search(self, query: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        """
+        Find the k vectors with the highest inner product.
+
+        Args:
+            query: Normalized query vector
+            k: Number of results
+
+        Returns:
+            (id, score) tuples, best first
+        """
+        if k <= 0 or not self._ids:
+            return []
+        candidates = self._candidates(query)
+        if candidates is None:
+            candidates = np.arange(len(self._ids))
+        if len(candidates) == 0:
+            return []
+        scores = self._vectors[candidates] @ query
+        if k < len(scores):
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[candidates[i]], float(scores[i])) for i in top]
+
+    def state(self) -> Dict[str, np.ndarray]:
+        """Arrays describing the index (for persistence)."""
+        return {
+            "ids": np.array(self._ids, dtype=str),
+            "vectors": self._vectors[: len(self._ids)].copy(),
+        }
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        """Restore from arrays produced by state()."""
+        self._ids = [str(item_id) for item_id in state["ids"]]
+        self._positions = {item_id: i for i, item_id in enumerate(self._ids)}
+        self._grow(max(16, len(self._ids)))
+        self._vectors[: len(self._ids)] = state["vectors"]
+
+    def _grow(self, capacity: int) -> None:
+        vectors = np.zeros((capacity, self.dim), dtype=np.float32)
+        count = min(len(self._ids), len(self._vectors))
+        vectors[:count] = self._vectors[:count]
+        self._vectors = vectors
+
+    # Hooks for subclasses
+    def _placed(self, position: int) -> None:
+        pass
+
+    def _moved(self, source: int, target: int) -> None:
+        pass
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        return None
+
+
+class IVFIndex(FlatIndex):
+    """
+    Inverted-file index: k-means clusters, search limited to nearby clusters.
+
+    Trained once min_train_size vectors exist and retrained whenever the
+    index has doubled in size since. Below that size every vector is scored.
+
+    Attributes:
+        nlist: Number of clusters
+        nprobe: Clusters scored per search
+    """
+
+    kind = "ivf"
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: int = DEFAULT_IVF_NLIST,
+        nprobe: int = DEFAULT_IVF_NPROBE,
+        min_train_size: int = IVF_MIN_TRAIN_SIZE,
+    ):
+        """
+        Initialize an empty index.
+
+        Args:
+            dim: Vector dimension
+            nlist: Number of clusters
+            nprobe: Clusters scored per search
+            min_train_size: Vectors needed before clustering
+        """
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.zeros(16, dtype=np.int32)
+        self._trained_size = 0
+        super().__init__(dim)
+
+    def train(self) -> None:
+        """Cluster the current vectors (spherical k-means, fixed seed)."""
+        count = len(self._ids)
+        if count == 0:
+            return
+        vectors = self._vectors[:count]
+        nlist = min(self.nlist, count)
+        rng = np.random.default_rng(0)
+        centroids = vectors[rng.choice(count, nlist, replace=False)].copy()
+        for _ in range(IVF_TRAIN_ITERATIONS):
+            assignments = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            empty = ~sums.any(axis=1)
+            sums[empty] = centroids[empty]  # Keep centroids of empty clusters
+            centroids = _normalize(sums)
+        self._centroids = centroids
+        self._assignments[:count] = np.argmax(vectors @ centroids.T, axis=1)
+        self._trained_size = count
+
+    def state(self) -> Dict[str, np.ndarray]:
+        state = super().state()
+        if self._centroids is not None:
+            state["centroids"] = self._centroids
+            state["assignments"] = self._assignments[: len(self._ids)].copy()
+        return state
+
+    def load_state(self, state: Dict[str, np.ndarray]) -> None:
+        super().load_state(state)
+        if "centroids" in state:
+            self._centroids = state["centroids"]
+            self._assignments[: len(self._ids)] = state["assignments"]
+            self._trained_size = len(self._ids)
+
+    def _grow(self, capacity: int) -> None:
+        super()._grow(capacity)
+        assignments = np.zeros(capacity, dtype=np.int32)
+        count = min(len(self._ids), len(self._assignments))
+        assignments[:count] = self._assignments[:count]
+        self._assignments = assignments
+
+    def _placed(self, position: int) -> None:
+        if self._centroids is not None:
+            self._assignments[position] = int(np.argmax(self._centroids @ self._vectors[position]))
+
+    def _moved(self, source: int, target: int) -> None:
+        self._assignments[target] = self._assignments[source]
+
+    def _candidates(self, query: np.ndarray) -> Optional[np.ndarray]:
+        count = len(self._ids)
+        if count < self.min_train_size:
+            return None
+        if self._centroids is None or count >= 2 * self._trained_size:
+            self.train()
+        closest = np.argsort(-(self._centroids @ query))[: self.nprobe]
+        return np.flatnonzero(np.isin(self._assignments[:count], closest))
+
+
+def memory_text(namespace_key: str, value: Any) -> str:
+    """
+    Text embedded for a memory entry: its key followed by its value.
+
+    Args:
+        namespace_key: Full namespace key (agent:workflow:node:key)
+        value: Deserialized value
+
+    Returns:
+        Text to embed
+    """
+    key = namespace_key.split(":", 3)[-1]
+    text = value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+    return f"{key}: {text}"
+
+
+class MemoryVectorIndex:
+    """
+    Embedding index for every memory entry under one namespace prefix.
+
+    Attributes:
+        namespace_prefix: Scope indexed (e.g. "bot:*:*:")
+        embedder: Embedder used for entries and queries
+        path: Persistence file (None for in-memory only)
+    """
+
+    def __init__(
+        self,
+        repo: MemoryRepository,
+        namespace_prefix: str,
+        embedder: Optional[Embedder] = None,
+        kind: str = "flat",
+        path: Optional[Path] = None,
+        max_index_age: float = DEFAULT_MAX_INDEX_AGE,
+    ):
+        """
+        Load the persisted index or build it from the repository.
+
+        Args:
+            repo: Memory repository
+            namespace_prefix: Scope to index
+            embedder: Embedder (default: HashingEmbedder)
+            kind: "flat" (exact) or "ivf" (approximate, for large scopes)
+            path: Persistence file (None for in-memory only)
+            max_index_age: Seconds without a sync (or since a persisted index
+                was saved) after which the index is rebuilt instead of
+                caught up; keep below the change log retention
+
+        Raises:
+            ValueError: If kind is not "flat" or "ivf"
+        """
+        if kind not in ("flat", "ivf"):
+            raise ValueError(f"Unknown index kind '{kind}' (expected 'flat' or 'ivf')")
+        self._repo = repo
+        self.namespace_prefix = namespace_prefix
+        self.embedder = embedder or HashingEmbedder()
+        self.kind = kind
+        self.path = path
+        self.max_index_age = max_index_age
+        self._lock = threading.RLock()
+        self._index = self._new_index()
+        self._change_id = 0
+        self._synced_at = time.time()
+        self._dirty = False
+
+        if not self._load():
+            self.rebuild()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def rebuild(self) -> None:
+        """Re-embed every entry under the prefix and persist the result."""
+        with self._lock:
+            # Take the change cursor first: changes racing with the scan are
+            # replayed by the next sync()
+            change_id, _ = self._repo.changes_since(None)
+            index = self._new_index()
+            batch: List[Tuple[str, Any]] = []
+            for namespace_key, value_str in self._repo.iter_scan(self.namespace_prefix):
+                try:
+                    batch.append((namespace_key, json.loads(value_str)))
+                except json.JSONDecodeError:
+                    continue
+                if len(batch) >= EMBED_BATCH_SIZE:
+                    self._embed_into(index, batch)
+                    batch = []
+            self._embed_into(index, batch)
+            self._index = index
+            self._change_id = change_id
+            self._synced_at = time.time()
+            self._dirty = True
+            self.save()
+            logger.debug(f"Built memory index for '{self.namespace_prefix}' ({len(index)} entries)")
+
+    def sync(self) -> None:
+        """Apply every memory change (from any process) since the last sync."""
+        with self._lock:
+            if time.time() - self._synced_at > self.max_index_age:
+                # Change rows since our cursor may have been purged
+                self.rebuild()
+                return
+            latest, changes = self._repo.changes_since(self._change_id, include_own=True)
+            changed: set = set()
+            for namespace_key, is_prefix in changes:
+                if is_prefix:
+                    if self.namespace_prefix.startswith(namespace_key):
+                        self._index = self._new_index()  # Whole scope cleared
+                        changed.clear()
+                    elif namespace_key.startswith(self.namespace_prefix):
+                        self._index.remove(
+                            [i for i in self._index.ids() if i.startswith(namespace_key)]
+                        )
+                        changed = {k for k in changed if not k.startswith(namespace_key)}
+                    self._dirty = True
+                elif namespace_key.startswith(self.namespace_prefix):
+                    changed.add(namespace_key)
+
+            if changed:
+                entries = self._repo.get_entries(sorted(changed))
+                present = []
+                for namespace_key in changed:
+                    if namespace_key in entries:
+                        try:
+                            present.append((namespace_key, json.loads(entries[namespace_key][0])))
+                            continue
+                        except json.JSONDecodeError:
+                            pass
+                    self._index.remove([namespace_key])
+                self._embed_into(self._index, present)
+                self._dirty = True
+            self._change_id = latest
+            self._synced_at = time.time()
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, Any, float]]:
+        """
+        Find the entries most similar to a query.
+
+        Args:
+            query: Free-text query
+            k: Maximum number of results
+
+        Returns:
+            (namespace_key, value, score) tuples, best first; score is
+            cosine similarity in [-1, 1]
+        """
+        if k <= 0:
+            return []
+        self.sync()
+        query_vector = self.embedder.embed([query])[0]
+        results: List[Tuple[str, Any, float]] = []
+        with self._lock:
+            while True:
+                hits = self._index.search(query_vector, k)
+                entries = self._repo.get_entries([item_id for item_id, _ in hits])
+                # Expired (or purged) entries are dropped and the search repeated
+                gone = [item_id for item_id, _ in hits if item_id not in entries]
+                if gone:
+                    self._index.remove(gone)
+                    self._dirty = True
+                    continue
+                for item_id, score in hits:
+                    try:
+                        results.append((item_id, json.loads(entries[item_id][0]), score))
+                    except json.JSONDecodeError:
+                        continue
+                return results
+
+    def save(self) -> None:
+        """Persist the index if it changed (no-op without a path)."""
+        if self.path is None:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            state = self._index.state()
+            meta = {
+                "kind": self.kind,
+                "embedder": self.embedder.name,
+                "dim": self.embedder.dim,
+                "prefix": self.namespace_prefix,
+                "change_id": self._change_id,
+                "saved_at": time.time(),
+            }
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as f:
+                np.savez(f, meta=np.array(json.dumps(meta)), **state)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def _load(self) -> bool:
+        if self.path is None or not self.path.exists():
+            return False
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                meta = json.loads(str(data["meta"]))
+                state = {name: data[name] for name in data.files if name != "meta"}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable memory index {self.path}: {e}")
+            return False
+
+        expected = (self.kind, self.embedder.name, self.embedder.dim, self.namespace_prefix)
+        actual = (meta.get("kind"), meta.get("embedder"), meta.get("dim"), meta.get("prefix"))
+        if actual != expected or time.time() - meta.get("saved_at", 0) > self.max_index_age:
+            return False
+
+        self._index.load_state(state)
+        self._change_id = meta["change_id"]
+        self._synced_at = meta["saved_at"]
+        return True
+
+    def _new_index(self) -> FlatIndex:
+        if self.kind == "ivf":
+            return IVFIndex(self.embedder.dim)
+        return FlatIndex(self.embedder.dim)
+
+    def _embed_into(self, index: FlatIndex, entries: List[Tuple[str, Any]]) -> None:
+        if not entries:
+            return
+        vectors = self.embedder.embed([memory_text(key, value) for key, value in entries])
+        index.upsert([key for key, _ in entries], vectors)
+
+
+def default_index_path(repo: MemoryRepository, namespace_prefix: str, kind: str) -> Optional[Path]:
+    """
+    Persistence file for an index: "<db file>.vectors/<prefix hash>-<kind>.npz".
+
+    Args:
+        repo: Memory repository (SQLite file databases only)
+        namespace_prefix: Indexed scope
+        kind: Index kind
+
+    Returns:
+        Path, or None for in-memory or non-SQLite databases
+    """
+    url = getattr(getattr(repo, "engine", None), "url", None)
+    if url is None or url.get_backend_name() != "sqlite":
+        return None
+    database = url.database
+    if not database or database == ":memory:":
+        return None
+    digest = hashlib.sha1(namespace_prefix.encode("utf-8")).hexdigest()[:16]
+    return Path(f"{database}.vectors") / f"{digest}-{kind}.npz"
+
+
+# Process-wide indexes keyed by repository, prefix, kind and embedder
+_indexes: "weakref.WeakKeyDictionary[MemoryRepository, Dict[Hashable, MemoryVectorIndex]]" = (
+    weakref.WeakKeyDictionary()
+)
+_indexes_lock = threading.Lock()
+
+
+def get_vector_index(
+    repo: MemoryRepository,
+    namespace_prefix: str,
+    kind: str = "flat",
+    embedder: Optional[Embedder] = None,
+) -> MemoryVectorIndex:
+    """
+    Get (or load/build) the process-wide index for a memory scope.
+
+    Args:
+        repo: Memory repository
+        namespace_prefix: Scope to index (e.g. "bot:*:*:")
+        kind: "flat" or "ivf"
+        embedder: Embedder (default: HashingEmbedder)
+
+    Returns:
+        Shared MemoryVectorIndex
+    """
+    embedder = embedder or HashingEmbedder()
+    key = (namespace_prefix, kind, embedder.name)
+    with _indexes_lock:
+        per_repo = _indexes.setdefault(repo, {})
+        index = per_repo.get(key)
+        if index is None:
+            index = per_repo[key] = MemoryVectorIndex(
+                repo,
+                namespace_prefix,
+                embedder=embedder,
+                kind=kind,
+                path=default_index_path(repo, namespace_prefix, kind),
+            )
+        return index
+
+
+def save_vector_indexes() -> int:
+    """
+    Persist every process-wide index that has unsaved changes.
+
+    Returns:
+        Number of indexes checked
+    """
+    with _indexes_lock:
+        indexes = [index for per_repo in _indexes.values() for index in per_repo.values()]
+    for index in indexes:
+        try:
+            index.save()
+        except Exception as e:
+            logger.warning(f"Failed to save memory index {index.path}: {e}")
+    return len(indexes)
+
+
+def clear_vector_indexes() -> None:
+    """Persist and drop every process-wide index."""
+    save_vector_indexes()
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def format_recalled_memories(results: List[Tuple[str, Any, float]]) -> str:
+    """
+    Render search results as a prompt section.
+
+    Args:
+        results: (key, value, score) tuples from AgentMemory.search()
+
+    Returns:
+        "Relevant memories:" followed by one "- key: value" line per result
+    """
+    lines = ["Relevant memories:"]
+    for key, value, _ in results:
+        text = value if isinstance(value, str) else json.dumps(value, default=str)
+        lines.append(f"- {key}: {text}")
+    return "\n".join(lines)
+
+
+atexit.register(save_vector_indexes)
@@ -8,11 +8,15 @@ Key components:
 - MLFlowTracker: MLFlow integration for workflow tracking
 - CostReporter: Query and aggregate cost data from MLFlow
 - MultiProviderCostTracker: Unified cost tracking across LLM providers
+- UsageAccumulator: In-process per-run usage accounting (source of run cost summaries)
 """
 
 from configurable_agents.observability.cost_estimator import (
     CostEstimator,
+    clear_cost_estimator,
+    get_cost_estimator,
     get_model_pricing,
+    load_pricing_file,
 )
 from configurable_agents.observability.cost_reporter import (
     CostEntry,
@@ -20,7 +24,7 @@ from configurable_agents.observability.cost_reporter import (
     CostSummary,
     get_date_range_filter,
 )
-from configurable_agents.observability.mlflow_tracker import MLFlowTracker
+from configurable_agents.observability.mlflow_tracker import MLFlowTracker, flush_mlflow_sink
 from configurable_agents.observability.multi_provider_tracker import (
     MultiProviderCostTracker,
     generate_cost_report,
@@ -28,11 +32,16 @@ from configurable_agents.observability.multi_provider_tracker import (
     ProviderCostEntry,
     ProviderCostSummary,
 )
+from configurable_agents.observability.usage import NodeCall, UsageAccumulator
 
 __all__ = [
     "CostEstimator",
+    "get_cost_estimator",
+    "clear_cost_estimator",
     "get_model_pricing",
+    "load_pricing_file",
     "MLFlowTracker",
+    "flush_mlflow_sink",
     "CostReporter",
     "CostEntry",
     "CostSummary",
@@ -42,4 +51,6 @@ __all__ = [
     "_extract_provider",
     "ProviderCostEntry",
     "ProviderCostSummary",
+    "NodeCall",
+    "UsageAccumulator",
 ]
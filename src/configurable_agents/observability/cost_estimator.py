@@ -1,11 +1,28 @@
 """Cost estimation for LLM API usage.
 
 Provides token-to-cost conversion based on provider pricing models.
-Uses LiteLLM pricing when available, with fallback to hardcoded pricing.
-Pricing data updated as of January 2025.
+Prices are resolved once per (model, provider) and memoized, so the hot
+path is a dict lookup and two multiplies. Resolution order:
+
+1. Pricing override file (CONFIGURABLE_AGENTS_PRICING_FILE or pricing_file=)
+2. Built-in pricing tables (Gemini, Ollama); pricing data as of January 2025
+3. LiteLLM's model price table (when LiteLLM is installed)
+
+Use get_cost_estimator() for the process-wide instance and
+estimate_costs() to price NumPy arrays of token counts in one call.
+
+Override file format (JSON or YAML), prices in USD per 1K tokens:
+
+    gpt-4o: {input: 0.0025, output: 0.01}
+    openai/gpt-4o-mini: {input: 0.00015, output: 0.0006}
 """
 
-from typing import Dict, Optional, Tuple
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 # Check for LiteLLM availability
 try:
@@ -16,6 +33,14 @@ except ImportError:
     LITELLM_AVAILABLE = False
     litellm = None  # type: ignore
 
+# Environment variable naming the pricing override file
+PRICING_FILE_ENV = "CONFIGURABLE_AGENTS_PRICING_FILE"
+
+# LiteLLM provider names accepted for each provider name used here
+_LITELLM_PROVIDERS = {
+    "google": {"gemini", "vertex_ai", "vertex_ai-language-models"},
+}
+
 # Pricing per 1K tokens (input, output) in USD
 # Source: Google AI Pricing (https://ai.google.dev/pricing) - January 2025
 # Used as fallback when LiteLLM is unavailable
@@ -65,25 +90,95 @@ _OLLAMA_PRICING = {
 }
 
 
+def load_pricing_file(path: Union[str, Path]) -> Dict[str, Dict[str, float]]:
+    """Load a pricing override file.
+
+    Args:
+        path: JSON or YAML file mapping model name to {"input", "output"}
+            prices in USD per 1K tokens
+
+    Returns:
+        Dict mapping model name to {"input": float, "output": float}
+
+    Raises:
+        ValueError: If the file is malformed or a price is missing/negative
+    """
+    path = Path(path)
+    text = path.read_text()
+    try:
+        if path.suffix.lower() in (".yaml", ".yml"):
+            import yaml
+
+            data = yaml.safe_load(text) or {}
+        else:
+            data = json.loads(text)
+    except Exception as e:
+        raise ValueError(f"Invalid pricing file {path}: {e}") from e
+    return _validate_pricing(data, source=str(path))
+
+
+def _validate_pricing(data: object, source: str = "overrides") -> Dict[str, Dict[str, float]]:
+    if not isinstance(data, dict):
+        raise ValueError(f"Pricing {source} must map model names to prices")
+    pricing = {}
+    for model, prices in data.items():
+        if not isinstance(prices, dict):
+            raise ValueError(f"Pricing {source}: '{model}' must have 'input' and 'output' prices")
+        try:
+            input_price = float(prices["input"])
+            output_price = float(prices["output"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(
+                f"Pricing {source}: '{model}' must have numeric 'input' and 'output' prices"
+            ) from e
+        if input_price < 0 or output_price < 0:
+            raise ValueError(f"Pricing {source}: '{model}' has a negative price")
+        pricing[str(model)] = {"input": input_price, "output": output_price}
+    return pricing
+
+
 class CostEstimator:
     """Estimates API costs based on token usage.
 
     Supports multiple LLM providers with provider-specific pricing models.
-    Uses LiteLLM pricing data when available for accurate cost tracking.
+    Prices are resolved once per (model, provider) and memoized; failed
+    lookups are memoized too, so unpriced models do not repeat the search.
 
     Example:
         >>> estimator = CostEstimator()
         >>> cost = estimator.estimate_cost("gemini-1.5-flash", input_tokens=150, output_tokens=500)
         >>> print(f"Estimated cost: ${cost:.6f}")
-        Estimated cost: $0.000075
+        Estimated cost: $0.000161
     """
 
-    def __init__(self):
-        """Initialize cost estimator with current pricing data."""
+    def __init__(
+        self,
+        pricing_file: Optional[Union[str, Path]] = None,
+        pricing_overrides: Optional[Dict[str, Dict[str, float]]] = None,
+    ):
+        """Initialize cost estimator with current pricing data.
+
+        Args:
+            pricing_file: Pricing override file (JSON or YAML, optional)
+            pricing_overrides: Model -> {"input", "output"} prices per 1K
+                tokens; applied after pricing_file (optional)
+
+        Raises:
+            ValueError: If the overrides are malformed
+        """
         self._pricing_tables = {
             "google": GEMINI_PRICING,
             "ollama": {"default": _OLLAMA_PRICING},
         }
+        self._overrides: Dict[str, Dict[str, float]] = {}
+        if pricing_file is not None:
+            self._overrides.update(load_pricing_file(pricing_file))
+        if pricing_overrides:
+            self._overrides.update(_validate_pricing(pricing_overrides))
+
+        # (model, provider) -> (input, output) price per 1K tokens, or the
+        # ValueError message for models that cannot be priced
+        self._prices: Dict[Tuple[str, Optional[str]], Union[Tuple[float, float], str]] = {}
 
     def estimate_cost(
         self,
@@ -103,66 +198,161 @@ class CostEstimator:
         Returns:
             Estimated cost in USD (rounded to 6 decimal places)
 
+        Raises:
+            ValueError: If the model or provider cannot be priced
+
         Example:
             >>> estimator = CostEstimator()
             >>> cost = estimator.estimate_cost("gemini-1.5-flash", 150, 500)
             >>> cost
-            0.000075
+            0.000161
         """
+        input_price, output_price = self._price(model, provider)
+
+        # Calculate cost: (tokens / 1000) * price_per_1k_tokens
+        total_cost = (input_tokens / 1000) * input_price + (output_tokens / 1000) * output_price
+
+        # Round to 6 decimal places (microdollars)
+        return round(total_cost, 6)
+
+    def estimate_costs(
+        self,
+        model: Union[str, Sequence[str]],
+        input_tokens: "np.typing.ArrayLike",
+        output_tokens: "np.typing.ArrayLike",
+        provider: Optional[str] = None,
+        strict: bool = True,
+    ) -> np.ndarray:
+        """Calculate costs for many calls at once (for reporting).
+
+        Prices are looked up once per distinct model, then costs are
+        computed as array operations.
+
+        Args:
+            model: One model for every call, or one model name per call
+            input_tokens: Input token counts (array-like)
+            output_tokens: Output token counts (array-like, same length)
+            provider: Provider name (auto-detected per model if not specified)
+            strict: Raise for unpriced models (False: they cost 0.0)
+
+        Returns:
+            Float array of costs in USD, rounded to 6 decimal places
+
+        Raises:
+            ValueError: If lengths differ, or a model cannot be priced (strict)
+
+        Example:
+            >>> estimator = CostEstimator()
+            >>> estimator.estimate_costs("gemini-1.5-flash", [150, 1000], [500, 0]).tolist()
+            [0.000161, 7.5e-05]
+        """
+        inputs = np.asarray(input_tokens, dtype=np.float64)
+        outputs = np.asarray(output_tokens, dtype=np.float64)
+        if inputs.shape != outputs.shape:
+            raise ValueError(
+                f"input_tokens and output_tokens differ in shape: {inputs.shape} vs {outputs.shape}"
+            )
+
+        if isinstance(model, str):
+            input_price, output_price = self._price_or_zero(model, provider, strict)
+            costs = inputs / 1000 * input_price + outputs / 1000 * output_price
+            return np.round(costs, 6)
+
+        models = np.asarray(model, dtype=object)
+        if models.shape != inputs.shape:
+            raise ValueError(
+                f"model and token arrays differ in shape: {models.shape} vs {inputs.shape}"
+            )
+        names, index = np.unique(models.astype(str), return_inverse=True)
+        prices = np.array(
+            [self._price_or_zero(name, provider, strict) for name in names], dtype=np.float64
+        ).reshape(-1, 2)
+        costs = (
+            inputs / 1000 * prices[index.reshape(inputs.shape), 0]
+            + outputs / 1000 * prices[index.reshape(inputs.shape), 1]
+        )
+        return np.round(costs, 6)
+
+    def _price_or_zero(
+        self, model: str, provider: Optional[str], strict: bool
+    ) -> Tuple[float, float]:
+        try:
+            return self._price(model, provider)
+        except ValueError:
+            if strict:
+                raise
+            return 0.0, 0.0
+
+    def _price(self, model: str, provider: Optional[str]) -> Tuple[float, float]:
+        """Memoized (input, output) price per 1K tokens."""
+        key = (model, provider)
+        price = self._prices.get(key)
+        if price is None:
+            try:
+                price = self._resolve_price(model, provider)
+            except ValueError as e:
+                price = str(e)
+            self._prices[key] = price
+        if isinstance(price, str):
+            raise ValueError(price)
+        return price
+
+    def _resolve_price(self, model: str, provider: Optional[str]) -> Tuple[float, float]:
+        """Find the (input, output) price per 1K tokens for a model."""
         # Handle LiteLLM-style model strings (e.g., "openai/gpt-4o")
-        base_model = model
-        if "/" in model:
-            # Extract base model from "provider/model" format
-            base_model = model.split("/", 1)[1]
+        base_model = model.split("/", 1)[1] if "/" in model else model
+
+        # Overrides win, and may price models no provider is detected for
+        override = self._overrides.get(model) or self._overrides.get(base_model)
+        if override is not None:
+            return override["input"], override["output"]
 
         # Auto-detect provider if not specified
         if provider is None:
             provider = self._detect_provider(model)
 
-        # Ollama models are free
-        if provider == "ollama":
-            return 0.0
-
-        # Try LiteLLM pricing first (most accurate, supports all providers)
-        if LITELLM_AVAILABLE:
-            try:
-                # LiteLLM's cost_per_token returns standard pricing
-                input_cost = litellm.cost_per_token(model=model, input_tokens=input_tokens)  # type: ignore
-                output_cost = litellm.cost_per_token(  # type: ignore
-                    model=model, output_tokens=output_tokens
-                )
-                return round(input_cost + output_cost, 6)
-            except Exception:
-                # Fall through to hardcoded pricing if LiteLLM lookup fails
-                pass
-
-        # Fallback to hardcoded pricing tables
         pricing_table = self._pricing_tables.get(provider, {})
 
-        if not pricing_table:
-            raise ValueError(
-                f"Unsupported provider: {provider}. "
-                f"Supported: {list(self._pricing_tables.keys())}"
-            )
-
         # For pricing tables with single "default" entry (like Ollama)
         if "default" in pricing_table:
             pricing = pricing_table["default"]
-        elif base_model in pricing_table:
+            return pricing["input"], pricing["output"]
+        if base_model in pricing_table:
             pricing = pricing_table[base_model]
-        else:
-            raise ValueError(
-                f"Unsupported model: {base_model}. "
-                f"Supported {provider} models: {list(pricing_table.keys())}"
-            )
+            return pricing["input"], pricing["output"]
 
-        # Calculate cost: (tokens / 1000) * price_per_1k_tokens
-        input_cost = (input_tokens / 1000) * pricing["input"]
-        output_cost = (output_tokens / 1000) * pricing["output"]
-        total_cost = input_cost + output_cost
+        litellm_price = self._litellm_price(model, base_model, provider)
+        if litellm_price is not None:
+            return litellm_price
 
-        # Round to 6 decimal places (microdollars)
-        return round(total_cost, 6)
+        if not pricing_table:
+            raise ValueError(
+                f"Unsupported provider: {provider}. "
+                f"Supported: {list(self._pricing_tables.keys())}"
+            )
+        raise ValueError(
+            f"Unsupported model: {base_model}. "
+            f"Supported {provider} models: {list(pricing_table.keys())}"
+        )
+
+    @staticmethod
+    def _litellm_price(
+        model: str, base_model: str, provider: str
+    ) -> Optional[Tuple[float, float]]:
+        """Price per 1K tokens from LiteLLM's model table, if listed for the provider."""
+        if not LITELLM_AVAILABLE:
+            return None
+        model_cost = getattr(litellm, "model_cost", None) or {}
+        entry = model_cost.get(model) or model_cost.get(base_model)
+        if not entry or "input_cost_per_token" not in entry:
+            return None
+        accepted = _LITELLM_PROVIDERS.get(provider, {provider})
+        if entry.get("litellm_provider") not in accepted:
+            return None
+        return (
+            float(entry["input_cost_per_token"]) * 1000,
+            float(entry.get("output_cost_per_token") or 0.0) * 1000,
+        )
 
     def _detect_provider(self, model: str) -> str:
         """Auto-detect provider from model name.
@@ -229,42 +419,36 @@ class CostEstimator:
             >>> estimator = CostEstimator()
             >>> pricing = estimator.get_pricing("gemini-1.5-flash")
             >>> pricing
-            {'input': 0.000035, 'output': 0.00014}
+            {'input': 7.5e-05, 'output': 0.0003}
         """
-        if provider is None:
-            provider = self._detect_provider(model)
+        input_price, output_price = self._price(model, provider)
+        return {"input": input_price, "output": output_price}
 
-        # Ollama is free
-        if provider == "ollama":
-            return {"input": 0.0, "output": 0.0}
 
-        # Try LiteLLM first
-        if LITELLM_AVAILABLE:
-            try:
-                # Get standard pricing from LiteLLM
-                # Note: LiteLLM doesn't expose a direct pricing lookup,
-                # so we use cost_per_token with 1000 tokens
-                input_price = litellm.cost_per_token(model=model, input_tokens=1000)  # type: ignore
-                output_price = litellm.cost_per_token(model=model, output_tokens=1000)  # type: ignore
-                return {"input": input_price, "output": output_price}
-            except Exception:
-                pass
+# Process-wide estimator, created on first use
+_cost_estimator: Optional[CostEstimator] = None
 
-        # Fallback to hardcoded pricing
-        if provider not in self._pricing_tables:
-            raise ValueError(f"Unsupported provider: {provider}")
 
-        pricing_table = self._pricing_tables[provider]
+def get_cost_estimator() -> CostEstimator:
+    """
+    Get the process-wide cost estimator.
 
-        # Handle bare model name
-        base_model = model.split("/")[-1] if "/" in model else model
+    Created on first use with the pricing file named by
+    CONFIGURABLE_AGENTS_PRICING_FILE (if set).
 
-        if "default" in pricing_table:
-            return pricing_table["default"]
-        elif base_model in pricing_table:
-            return pricing_table[base_model]
-        else:
-            raise ValueError(f"Unsupported model: {model}")
+    Returns:
+        Shared CostEstimator instance
+    """
+    global _cost_estimator
+    if _cost_estimator is None:
+        _cost_estimator = CostEstimator(pricing_file=os.environ.get(PRICING_FILE_ENV) or None)
+    return _cost_estimator
+
+
+def clear_cost_estimator() -> None:
+    """Drop the process-wide estimator (the next use re-reads the pricing file)."""
+    global _cost_estimator
+    _cost_estimator = None
 
 
 def get_model_pricing(model: str) -> Tuple[float, float]:
@@ -282,10 +466,9 @@ def get_model_pricing(model: str) -> Tuple[float, float]:
     Example:
         >>> input_price, output_price = get_model_pricing("gemini-1.5-flash")
         >>> input_price
-        0.000035
+        7.5e-05
         >>> output_price
-        0.00014
+        0.0003
     """
-    estimator = CostEstimator()
-    pricing = estimator.get_pricing(model)
+    pricing = get_cost_estimator().get_pricing(model)
     return pricing["input"], pricing["output"]
@@ -1,16 +1,24 @@
-"""Cost reporting and aggregation from MLFlow tracking data.
+"""Cost reporting and aggregation from the local cost ledger or MLFlow.
 
-Provides utilities to query MLFlow experiments and generate cost reports
-with various aggregations (by workflow, model, time period, etc.).
+Provides utilities to query cost data and generate cost reports with
+various aggregations (by workflow, model, time period, etc.).
+
+The local cost ledger (written to the workflow storage database when runs
+finish) is the preferred source: filters and aggregations run inside
+indexed SQLite queries and exports stream. Querying MLFlow experiments is
+still supported for data recorded before the ledger existed.
 """
 
 import csv
 import json
 import logging
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from configurable_agents.storage.base import CostLedgerFilter, CostLedgerRepository
 
 logger = logging.getLogger(__name__)
 
@@ -65,26 +73,180 @@ class CostSummary:
     breakdown_by_model: Dict[str, float]  # model -> total_cost
 
 
+def open_cost_ledger(db_path: str) -> "CostLedgerRepository":
+    """Open the cost ledger stored in a workflow storage database.
+
+    Args:
+        db_path: SQLite database path (as in StorageConfig.path)
+
+    Returns:
+        Cost ledger repository backed by the shared storage engine
+    """
+    from configurable_agents.config.schema import StorageConfig
+    from configurable_agents.storage.factory import get_storage_backend
+
+    runs_repo, *_ = get_storage_backend(StorageConfig(path=db_path))
+    return runs_repo.cost_ledger
+
+
+def _to_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive local (or aware) datetime -> naive UTC, as stored in the ledger."""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _to_local(value: datetime) -> datetime:
+    """Naive UTC datetime from the ledger -> naive local time."""
+    return value.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+
+
+def _period_key(day: date, period: str) -> str:
+    if period == "daily":
+        return day.strftime("%Y-%m-%d")
+    if period == "weekly":
+        # ISO week: YYYY-WW
+        year, week, _ = day.isocalendar()
+        return f"{year}-W{week:02d}"
+    return day.strftime("%Y-%m")
+
+
+def _entry_to_dict(entry: CostEntry) -> Dict[str, Any]:
+    return {
+        "run_id": entry.run_id,
+        "run_name": entry.run_name,
+        "workflow_name": entry.workflow_name,
+        "start_time": entry.start_time.isoformat(),
+        "duration_seconds": entry.duration_seconds,
+        "status": entry.status,
+        "total_cost_usd": entry.total_cost_usd,
+        "input_tokens": entry.input_tokens,
+        "output_tokens": entry.output_tokens,
+        "node_count": entry.node_count,
+        "model": entry.model,
+    }
+
+
+def _summary_to_dict(summary: CostSummary) -> Dict[str, Any]:
+    return {
+        "total_cost_usd": summary.total_cost_usd,
+        "total_runs": summary.total_runs,
+        "total_tokens": summary.total_tokens,
+        "successful_runs": summary.successful_runs,
+        "failed_runs": summary.failed_runs,
+        "avg_cost_per_run": summary.avg_cost_per_run,
+        "avg_tokens_per_run": summary.avg_tokens_per_run,
+        "date_range": [
+            summary.date_range[0].isoformat(),
+            summary.date_range[1].isoformat(),
+        ],
+        "breakdown_by_workflow": summary.breakdown_by_workflow,
+        "breakdown_by_model": summary.breakdown_by_model,
+    }
+
+
+class _SummaryAccumulator:
+    """Builds a CostSummary in one pass, so entries can be streamed."""
+
+    def __init__(self) -> None:
+        self.total_cost = 0.0
+        self.total_runs = 0
+        self.total_tokens = 0
+        self.successful_runs = 0
+        self.first: Optional[datetime] = None
+        self.last: Optional[datetime] = None
+        self.by_workflow: Dict[str, float] = {}
+        self.by_model: Dict[str, float] = {}
+
+    def add(self, entry: CostEntry) -> None:
+        self.total_cost += entry.total_cost_usd
+        self.total_runs += 1
+        self.total_tokens += entry.input_tokens + entry.output_tokens
+        if entry.status == "success":
+            self.successful_runs += 1
+        if self.first is None or entry.start_time < self.first:
+            self.first = entry.start_time
+        if self.last is None or entry.start_time > self.last:
+            self.last = entry.start_time
+        self.by_workflow[entry.workflow_name] = (
+            self.by_workflow.get(entry.workflow_name, 0.0) + entry.total_cost_usd
+        )
+        if entry.model:
+            self.by_model[entry.model] = (
+                self.by_model.get(entry.model, 0.0) + entry.total_cost_usd
+            )
+
+    def result(self) -> CostSummary:
+        if not self.total_runs:
+            now = datetime.now()
+            return CostSummary(
+                total_cost_usd=0.0,
+                total_runs=0,
+                total_tokens=0,
+                successful_runs=0,
+                failed_runs=0,
+                avg_cost_per_run=0.0,
+                avg_tokens_per_run=0.0,
+                date_range=(now, now),
+                breakdown_by_workflow={},
+                breakdown_by_model={},
+            )
+        return CostSummary(
+            total_cost_usd=self.total_cost,
+            total_runs=self.total_runs,
+            total_tokens=self.total_tokens,
+            successful_runs=self.successful_runs,
+            failed_runs=self.total_runs - self.successful_runs,
+            avg_cost_per_run=self.total_cost / self.total_runs,
+            avg_tokens_per_run=self.total_tokens / self.total_runs,
+            date_range=(self.first, self.last),
+            breakdown_by_workflow=self.by_workflow,
+            breakdown_by_model=self.by_model,
+        )
+
+
 class CostReporter:
-    """Query and aggregate cost data from MLFlow experiments.
+    """Query and aggregate cost data from the cost ledger or MLFlow experiments.
 
     Provides methods to generate cost reports with various filters and aggregations.
+    With a ledger, summaries and period aggregates are computed by the
+    database (see summarize() and aggregate_by_period(entries=None)) and
+    entries can be streamed with iter_cost_entries().
 
     Example:
+        >>> reporter = CostReporter(ledger_path="./workflows.db")
+        >>> summary = reporter.summarize(workflow_name="article_writer")
+        >>> print(f"Total cost: ${summary.total_cost_usd:.2f}")
+        >>> # Stream every matching run to CSV
+        >>> reporter.export_to_csv(reporter.iter_cost_entries(), "costs.csv")
+        >>> # MLFlow source
         >>> reporter = CostReporter(tracking_uri="file://./mlruns")
-        >>> # Get all costs for an experiment
         >>> entries = reporter.get_cost_entries(experiment_name="my_workflows")
-        >>> # Generate summary
-        >>> summary = reporter.generate_summary(entries)
-        >>> print(f"Total cost: ${summary.total_cost_usd:.2f}")
     """
 
-    def __init__(self, tracking_uri: str = "file://./mlruns"):
+    def __init__(
+        self,
+        tracking_uri: str = "file://./mlruns",
+        ledger: Optional["CostLedgerRepository"] = None,
+        ledger_path: Optional[str] = None,
+    ):
         """Initialize cost reporter.
 
         Args:
-            tracking_uri: MLFlow tracking URI (default: file://./mlruns)
+            tracking_uri: MLFlow tracking URI (default: file://./mlruns),
+                used when no ledger is given
+            ledger: Cost ledger repository to report from (optional)
+            ledger_path: Storage database holding the cost ledger (optional)
         """
+        if ledger is None and ledger_path is not None:
+            ledger = open_cost_ledger(ledger_path)
+        self.ledger = ledger
+        if ledger is not None:
+            self.tracking_uri = None
+            self.client = None
+            logger.debug("Initialized CostReporter on the local cost ledger")
+            return
+
         if not MLFLOW_AVAILABLE:
             raise RuntimeError(
                 "MLFlow is not installed. Install with: pip install mlflow"
@@ -101,8 +263,10 @@ class CostReporter:
         start_date: Optional[datetime] = None,
         end_date: Optional[datetime] = None,
         status_filter: Optional[str] = None,  # "success" or "failure"
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
     ) -> List[CostEntry]:
-        """Query MLFlow for cost entries with optional filters.
+        """Query cost entries with optional filters.
 
         Args:
             experiment_name: Filter by experiment name (default: all experiments)
@@ -110,6 +274,8 @@ class CostReporter:
             start_date: Filter runs starting after this date (default: no filter)
             end_date: Filter runs ending before this date (default: no filter)
             status_filter: Filter by status - "success" or "failure" (default: all)
+            model: Filter by model, ledger only (default: all models)
+            provider: Filter by provider, ledger only (default: all providers)
 
         Returns:
             List of CostEntry objects matching the filters
@@ -117,6 +283,21 @@ class CostReporter:
         Raises:
             ValueError: If experiment doesn't exist or filters are invalid
         """
+        if self.ledger is not None:
+            return list(
+                self.iter_cost_entries(
+                    experiment_name=experiment_name,
+                    workflow_name=workflow_name,
+                    start_date=start_date,
+                    end_date=end_date,
+                    status_filter=status_filter,
+                    model=model,
+                    provider=provider,
+                )
+            )
+        if model or provider:
+            raise ValueError("Model and provider filters require the cost ledger")
+
         # Get experiment(s)
         if experiment_name:
             try:
@@ -187,6 +368,135 @@ class CostReporter:
 
         return entries
 
+    def iter_cost_entries(
+        self,
+        experiment_name: Optional[str] = None,
+        workflow_name: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status_filter: Optional[str] = None,
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> Iterator[CostEntry]:
+        """Stream cost entries (one per run, newest first).
+
+        Same filters as get_cost_entries(). With a ledger, runs are read in
+        pages as the iterator advances; with MLFlow, all runs are queried
+        first.
+
+        Yields:
+            CostEntry objects matching the filters
+
+        Raises:
+            ValueError: If filters are invalid
+        """
+        if self.ledger is None:
+            yield from self.get_cost_entries(
+                experiment_name=experiment_name,
+                workflow_name=workflow_name,
+                start_date=start_date,
+                end_date=end_date,
+                status_filter=status_filter,
+                model=model,
+                provider=provider,
+            )
+            return
+
+        filters = self._ledger_filter(
+            experiment_name, workflow_name, start_date, end_date, status_filter, model, provider
+        )
+        for run in self.ledger.iter_runs(filters):
+            yield CostEntry(
+                run_id=run.run_id,
+                run_name=run.run_id,
+                workflow_name=run.workflow_name,
+                start_time=_to_local(run.started_at),
+                duration_seconds=run.duration_seconds,
+                status=run.status,
+                total_cost_usd=run.cost_usd,
+                input_tokens=run.input_tokens,
+                output_tokens=run.output_tokens,
+                node_count=run.calls,
+                model=run.model if run.model != "unknown" else None,
+            )
+
+    def summarize(
+        self,
+        experiment_name: Optional[str] = None,
+        workflow_name: Optional[str] = None,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        status_filter: Optional[str] = None,
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> CostSummary:
+        """Summarize cost entries matching filters without loading them.
+
+        Same filters as get_cost_entries(). With a ledger, the summary is
+        computed by the database; otherwise entries are fetched and passed
+        to generate_summary().
+
+        Returns:
+            CostSummary for the matching runs
+
+        Raises:
+            ValueError: If filters are invalid
+        """
+        if self.ledger is None:
+            return self.generate_summary(
+                self.get_cost_entries(
+                    experiment_name, workflow_name, start_date, end_date, status_filter
+                )
+            )
+
+        totals = self.ledger.summarize(
+            self._ledger_filter(
+                experiment_name, workflow_name, start_date, end_date, status_filter, model, provider
+            )
+        )
+        runs = totals["total_runs"]
+        if not runs:
+            return _SummaryAccumulator().result()
+        return CostSummary(
+            total_cost_usd=totals["total_cost_usd"],
+            total_runs=runs,
+            total_tokens=totals["total_tokens"],
+            successful_runs=totals["successful_runs"],
+            failed_runs=totals["failed_runs"],
+            avg_cost_per_run=totals["total_cost_usd"] / runs,
+            avg_tokens_per_run=totals["total_tokens"] / runs,
+            date_range=(
+                _to_local(totals["first_started_at"]),
+                _to_local(totals["last_started_at"]),
+            ),
+            breakdown_by_workflow=totals["by_workflow"],
+            breakdown_by_model=totals["by_model"],
+        )
+
+    @staticmethod
+    def _ledger_filter(
+        experiment_name: Optional[str],
+        workflow_name: Optional[str],
+        start_date: Optional[datetime],
+        end_date: Optional[datetime],
+        status_filter: Optional[str],
+        model: Optional[str] = None,
+        provider: Optional[str] = None,
+    ) -> "CostLedgerFilter":
+        from configurable_agents.storage.base import CostLedgerFilter
+
+        if status_filter and status_filter not in ["success", "failure"]:
+            raise ValueError(f"Invalid status_filter: {status_filter}")
+        return CostLedgerFilter(
+            workflow_name=workflow_name,
+            experiment=experiment_name,
+            model=model,
+            provider=provider,
+            status=status_filter,
+            start=_to_utc(start_date),
+            end=_to_utc(end_date),
+        )
+
     def _run_to_cost_entry(self, run: Any) -> CostEntry:
         """Convert MLFlow run to CostEntry.
 
@@ -260,188 +570,127 @@ class CostReporter:
             model=model,
         )
 
-    def generate_summary(self, entries: List[CostEntry]) -> CostSummary:
+    def generate_summary(self, entries: Iterable[CostEntry]) -> CostSummary:
         """Generate aggregated cost summary from entries.
 
         Args:
-            entries: List of CostEntry objects
+            entries: CostEntry objects (any iterable; consumed in one pass)
 
         Returns:
             CostSummary with aggregated statistics
         """
-        if not entries:
-            # Return empty summary
-            now = datetime.now()
-            return CostSummary(
-                total_cost_usd=0.0,
-                total_runs=0,
-                total_tokens=0,
-                successful_runs=0,
-                failed_runs=0,
-                avg_cost_per_run=0.0,
-                avg_tokens_per_run=0.0,
-                date_range=(now, now),
-                breakdown_by_workflow={},
-                breakdown_by_model={},
-            )
-
-        # Aggregate totals
-        total_cost = sum(e.total_cost_usd for e in entries)
-        total_runs = len(entries)
-        total_tokens = sum(e.input_tokens + e.output_tokens for e in entries)
-        successful_runs = sum(1 for e in entries if e.status == "success")
-        failed_runs = total_runs - successful_runs
-
-        # Calculate averages
-        avg_cost_per_run = total_cost / total_runs if total_runs > 0 else 0.0
-        avg_tokens_per_run = total_tokens / total_runs if total_runs > 0 else 0.0
-
-        # Date range
-        start_times = [e.start_time for e in entries]
-        date_range = (min(start_times), max(start_times))
-
-        # Breakdown by workflow
-        breakdown_by_workflow: Dict[str, float] = {}
-        for entry in entries:
-            workflow = entry.workflow_name
-            breakdown_by_workflow[workflow] = (
-                breakdown_by_workflow.get(workflow, 0.0) + entry.total_cost_usd
-            )
-
-        # Breakdown by model
-        breakdown_by_model: Dict[str, float] = {}
+        accumulator = _SummaryAccumulator()
         for entry in entries:
-            if entry.model:
-                breakdown_by_model[entry.model] = (
-                    breakdown_by_model.get(entry.model, 0.0) + entry.total_cost_usd
-                )
-
-        return CostSummary(
-            total_cost_usd=total_cost,
-            total_runs=total_runs,
-            total_tokens=total_tokens,
-            successful_runs=successful_runs,
-            failed_runs=failed_runs,
-            avg_cost_per_run=avg_cost_per_run,
-            avg_tokens_per_run=avg_tokens_per_run,
-            date_range=date_range,
-            breakdown_by_workflow=breakdown_by_workflow,
-            breakdown_by_model=breakdown_by_model,
-        )
+            accumulator.add(entry)
+        return accumulator.result()
 
     def aggregate_by_period(
         self,
-        entries: List[CostEntry],
+        entries: Optional[Iterable[CostEntry]] = None,
         period: str = "daily",  # "daily", "weekly", "monthly"
+        **filters: Any,
     ) -> Dict[str, float]:
         """Aggregate costs by time period.
 
         Args:
-            entries: List of CostEntry objects
+            entries: CostEntry objects to aggregate. If None, the ledger is
+                aggregated in the database (one row per day is read)
             period: Aggregation period - "daily", "weekly", or "monthly"
+            **filters: get_cost_entries() filters, used when entries is None
 
         Returns:
             Dict mapping period key (YYYY-MM-DD, YYYY-WW, or YYYY-MM) to total cost
 
         Raises:
-            ValueError: If period is invalid
+            ValueError: If period is invalid, or entries is None without a ledger
         """
         if period not in ["daily", "weekly", "monthly"]:
             raise ValueError(f"Invalid period: {period}. Use 'daily', 'weekly', or 'monthly'")
 
         aggregated: Dict[str, float] = {}
 
+        if entries is None:
+            if self.ledger is None:
+                raise ValueError("Aggregating without entries requires the cost ledger")
+            by_day = self.ledger.aggregate_by_day(
+                self._ledger_filter(
+                    filters.get("experiment_name"),
+                    filters.get("workflow_name"),
+                    filters.get("start_date"),
+                    filters.get("end_date"),
+                    filters.get("status_filter"),
+                    filters.get("model"),
+                    filters.get("provider"),
+                ),
+                local_time=True,
+            )
+            for day, cost in by_day.items():
+                key = _period_key(date.fromisoformat(day), period)
+                aggregated[key] = aggregated.get(key, 0.0) + cost
+            return aggregated
+
         for entry in entries:
-            # Generate period key
-            if period == "daily":
-                key = entry.start_time.strftime("%Y-%m-%d")
-            elif period == "weekly":
-                # ISO week: YYYY-WW
-                year, week, _ = entry.start_time.isocalendar()
-                key = f"{year}-W{week:02d}"
-            else:  # monthly
-                key = entry.start_time.strftime("%Y-%m")
-
-            # Accumulate cost
+            # Generate period key and accumulate cost
+            key = _period_key(entry.start_time, period)
             aggregated[key] = aggregated.get(key, 0.0) + entry.total_cost_usd
 
         return aggregated
 
     def export_to_json(
         self,
-        entries: List[CostEntry],
+        entries: Iterable[CostEntry],
         output_path: str,
         include_summary: bool = True,
     ) -> None:
         """Export cost entries to JSON file.
 
+        Entries are written as they are read, so an iterator from
+        iter_cost_entries() is exported without holding every run in memory.
+
         Args:
-            entries: List of CostEntry objects
+            entries: CostEntry objects (any iterable)
             output_path: Path to output JSON file
             include_summary: Whether to include summary statistics (default: True)
         """
-        # Convert entries to dicts
-        entries_data = [
-            {
-                "run_id": e.run_id,
-                "run_name": e.run_name,
-                "workflow_name": e.workflow_name,
-                "start_time": e.start_time.isoformat(),
-                "duration_seconds": e.duration_seconds,
-                "status": e.status,
-                "total_cost_usd": e.total_cost_usd,
-                "input_tokens": e.input_tokens,
-                "output_tokens": e.output_tokens,
-                "node_count": e.node_count,
-                "model": e.model,
-            }
-            for e in entries
-        ]
-
-        output_data: Dict[str, Any] = {"entries": entries_data}
-
-        # Add summary if requested
-        if include_summary:
-            summary = self.generate_summary(entries)
-            output_data["summary"] = {
-                "total_cost_usd": summary.total_cost_usd,
-                "total_runs": summary.total_runs,
-                "total_tokens": summary.total_tokens,
-                "successful_runs": summary.successful_runs,
-                "failed_runs": summary.failed_runs,
-                "avg_cost_per_run": summary.avg_cost_per_run,
-                "avg_tokens_per_run": summary.avg_tokens_per_run,
-                "date_range": [
-                    summary.date_range[0].isoformat(),
-                    summary.date_range[1].isoformat(),
-                ],
-                "breakdown_by_workflow": summary.breakdown_by_workflow,
-                "breakdown_by_model": summary.breakdown_by_model,
-            }
-
-        # Write to file
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        accumulator = _SummaryAccumulator()
+        count = 0
         with open(output_file, "w") as f:
-            json.dump(output_data, f, indent=2)
+            f.write('{\n  "entries": [')
+            for entry in entries:
+                f.write(",\n    " if count else "\n    ")
+                f.write(json.dumps(_entry_to_dict(entry)))
+                accumulator.add(entry)
+                count += 1
+            f.write("\n  ]" if count else "]")
+
+            # Add summary if requested
+            if include_summary:
+                summary = json.dumps(_summary_to_dict(accumulator.result()), indent=2)
+                f.write(',\n  "summary": ' + summary.replace("\n", "\n  "))
+            f.write("\n}\n")
 
-        logger.info(f"Exported {len(entries)} cost entries to {output_path}")
+        logger.info(f"Exported {count} cost entries to {output_path}")
 
     def export_to_csv(
         self,
-        entries: List[CostEntry],
+        entries: Iterable[CostEntry],
         output_path: str,
     ) -> None:
         """Export cost entries to CSV file.
 
+        Rows are written as entries are read (see export_to_json).
+
         Args:
-            entries: List of CostEntry objects
+            entries: CostEntry objects (any iterable)
             output_path: Path to output CSV file
         """
         output_file = Path(output_path)
         output_file.parent.mkdir(parents=True, exist_ok=True)
 
+        count = 0
         with open(output_file, "w", newline="") as f:
             writer = csv.DictWriter(
                 f,
@@ -480,8 +729,9 @@ class CostReporter:
                         "model": entry.model or "",
                     }
                 )
+                count += 1
 
-        logger.info(f"Exported {len(entries)} cost entries to {output_path}")
+        logger.info(f"Exported {count} cost entries to {output_path}")
 
 
 def get_date_range_filter(
@@ -17,18 +17,25 @@ Responsibilities:
 2. Configure observability settings (artifact levels, overrides)
 3. Provide trace decorator helper
 4. Post-process traces for cost calculation
-5. Graceful degradation (enabled flag, server check)
+5. Log run cost summaries (optionally off the calling thread)
+6. Graceful degradation (enabled flag, server check)
+
+Run cost summaries are built in-process by observability.usage; MLflow is
+a sink for them, not their source.
 """
 
 import json
 import logging
 import os
 import socket
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Any, Dict, Optional
 from urllib.parse import urlparse
 
 from configurable_agents.config import ObservabilityMLFlowConfig, WorkflowConfig
-from configurable_agents.observability.cost_estimator import CostEstimator
+from configurable_agents.observability.cost_estimator import get_cost_estimator
 from configurable_agents.observability.multi_provider_tracker import (
     MultiProviderCostTracker,
     _extract_provider,
@@ -49,6 +56,61 @@ except ImportError:
     )
 
 
+# Single background worker for asynchronous summary logging (created lazily)
+_sink_executor: Optional[ThreadPoolExecutor] = None
+_sink_lock = threading.Lock()
+
+
+def _get_sink_executor() -> ThreadPoolExecutor:
+    global _sink_executor
+    with _sink_lock:
+        if _sink_executor is None:
+            _sink_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="mlflow-sink")
+        return _sink_executor
+
+
+def flush_mlflow_sink(timeout: Optional[float] = None) -> bool:
+    """
+    Wait until summaries submitted to the asynchronous MLflow sink are logged.
+
+    Args:
+        timeout: Seconds to wait (default: no limit)
+
+    Returns:
+        True if the sink drained within the timeout
+    """
+    if _sink_executor is None:
+        return True
+    try:
+        _get_sink_executor().submit(lambda: None).result(timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def _summary_metrics(cost_summary: Dict[str, Any]) -> Dict[str, float]:
+    """Flatten a run cost summary into MLflow metrics."""
+    total_tokens = cost_summary.get("total_tokens", {})
+
+    # Base metrics
+    metrics = {
+        "total_cost_usd": cost_summary.get("total_cost_usd", 0),
+        "total_tokens": total_tokens.get("total_tokens", 0),
+        "prompt_tokens": total_tokens.get("prompt_tokens", 0),
+        "completion_tokens": total_tokens.get("completion_tokens", 0),
+        "node_count": len(cost_summary.get("node_breakdown", {})),
+    }
+
+    # Per-provider metrics
+    for provider, data in cost_summary.get("by_provider", {}).items():
+        metrics[f"provider_{provider}_cost_usd"] = data.get("total_cost_usd", 0)
+        metrics[f"provider_{provider}_tokens"] = data.get("total_tokens", 0)
+        metrics[f"provider_{provider}_input_tokens"] = data.get("input_tokens", 0)
+        metrics[f"provider_{provider}_output_tokens"] = data.get("output_tokens", 0)
+        metrics[f"provider_{provider}_calls"] = data.get("calls", 0)
+    return metrics
+
+
 class MLFlowTracker:
     """
     MLflow 3.9 integration for workflow observability.
@@ -67,9 +129,8 @@ class MLFlowTracker:
         ...     result = graph.invoke(state)
         ...     return result
         >>>
-        >>> # Get cost summary after execution
-        >>> cost_summary = tracker.get_workflow_cost_summary()
-        >>> print(f"Total cost: ${cost_summary['total_cost_usd']:.6f}")
+        >>> # Log the run's in-process cost summary without blocking
+        >>> tracker.submit_workflow_summary(usage.summary())
     """
 
     def __init__(
@@ -91,7 +152,7 @@ class MLFlowTracker:
         )
         self.mlflow_config = mlflow_config
         self.workflow_config = workflow_config
-        self.cost_estimator = CostEstimator()
+        self.cost_estimator = get_cost_estimator()
         self.cost_tracker = MultiProviderCostTracker(mlflow_tracker=self)
 
         if self.enabled:
@@ -460,26 +521,9 @@ class MLFlowTracker:
 
         try:
             total_tokens = cost_summary.get("total_tokens", {})
-
-            # Log base metrics
-            metrics = {
-                "total_cost_usd": cost_summary.get("total_cost_usd", 0),
-                "total_tokens": total_tokens.get("total_tokens", 0),
-                "prompt_tokens": total_tokens.get("prompt_tokens", 0),
-                "completion_tokens": total_tokens.get("completion_tokens", 0),
-                "node_count": len(cost_summary.get("node_breakdown", {})),
-            }
-
-            # Log per-provider metrics
             by_provider = cost_summary.get("by_provider", {})
-            for provider, data in by_provider.items():
-                metrics[f"provider_{provider}_cost_usd"] = data.get("total_cost_usd", 0)
-                metrics[f"provider_{provider}_tokens"] = data.get("total_tokens", 0)
-                metrics[f"provider_{provider}_input_tokens"] = data.get("input_tokens", 0)
-                metrics[f"provider_{provider}_output_tokens"] = data.get("output_tokens", 0)
-                metrics[f"provider_{provider}_calls"] = data.get("calls", 0)
 
-            mlflow.log_metrics(metrics)
+            mlflow.log_metrics(_summary_metrics(cost_summary))
 
             # Log cost summary as artifact (minimal level and above)
             if self._should_log_artifacts("minimal"):
@@ -502,3 +546,64 @@ class MLFlowTracker:
 
         except Exception as e:
             logger.warning(f"Failed to log workflow summary: {e}")
+
+    def submit_workflow_summary(self, cost_summary: Dict[str, Any]) -> Optional[Future]:
+        """
+        Log a run cost summary to the active MLflow run off the calling thread.
+
+        The active run is resolved now; metrics and artifacts are written by
+        a background worker through MlflowClient, so a slow or unreachable
+        tracking server does not delay run completion. With
+        async_logging disabled this is log_workflow_summary().
+
+        Args:
+            cost_summary: Run cost summary (see UsageAccumulator.summary())
+
+        Returns:
+            Future for the background write, or None if nothing was queued
+        """
+        if not self.enabled or not mlflow.active_run():
+            return None
+
+        if not getattr(self.mlflow_config, "async_logging", True):
+            self.log_workflow_summary(cost_summary)
+            return None
+
+        run_id = mlflow.active_run().info.run_id
+        log_artifacts = self._should_log_artifacts("minimal")
+        return _get_sink_executor().submit(
+            self._write_summary, run_id, cost_summary, log_artifacts
+        )
+
+    def _write_summary(
+        self, run_id: str, cost_summary: Dict[str, Any], log_artifacts: bool
+    ) -> None:
+        """Write a cost summary to an MLflow run (runs on the sink worker)."""
+        try:
+            from mlflow.entities import Metric
+            from mlflow.tracking import MlflowClient
+
+            client = MlflowClient(tracking_uri=self.mlflow_config.tracking_uri)
+            timestamp = int(time.time() * 1000)
+            client.log_batch(
+                run_id,
+                metrics=[
+                    Metric(key, float(value), timestamp, 0)
+                    for key, value in _summary_metrics(cost_summary).items()
+                ],
+            )
+            if log_artifacts:
+                client.log_dict(run_id, cost_summary, "cost_summary.json")
+                by_provider = cost_summary.get("by_provider", {})
+                if by_provider:
+                    client.log_dict(
+                        run_id,
+                        {
+                            "total_cost_usd": cost_summary.get("total_cost_usd", 0),
+                            "by_provider": by_provider,
+                        },
+                        "provider_cost_summary.json",
+                    )
+            logger.debug(f"Workflow summary logged to MLflow run {run_id}")
+        except Exception as e:
+            logger.warning(f"Failed to log workflow summary: {e}")
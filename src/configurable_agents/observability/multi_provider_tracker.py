@@ -10,7 +10,7 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from configurable_agents.observability.cost_estimator import CostEstimator
+from configurable_agents.observability.cost_estimator import get_cost_estimator
 
 logger = logging.getLogger(__name__)
 
@@ -153,7 +153,7 @@ class MultiProviderCostTracker:
             mlflow_tracker: Optional MLFlowTracker instance for integration
         """
         self.mlflow_tracker = mlflow_tracker
-        self.cost_estimator = CostEstimator()
+        self.cost_estimator = get_cost_estimator()
         self._call_history: List[ProviderCostEntry] = []
 
     def track_call(
@@ -470,29 +470,51 @@ class MultiProviderCostTracker:
 def generate_cost_report(
     experiment_name: str,
     mlflow_uri: Optional[str] = None,
+    ledger_path: Optional[str] = None,
 ) -> Dict[str, Any]:
     """Generate unified cost report for an MLFlow experiment.
 
-    Standalone function for CLI usage. Creates MLFlow client, queries experiment,
-    and generates provider-aware cost summary.
+    Standalone function for CLI usage. With ledger_path, the report is
+    aggregated by the local cost ledger (grouped in the database, filtered
+    by the experiment runs were tracked under); otherwise MLFlow is queried
+    and runs are aggregated client-side.
 
     Args:
         experiment_name: MLFlow experiment name
         mlflow_uri: Optional MLFlow tracking URI (uses default if not specified)
+        ledger_path: Storage database holding the cost ledger (optional)
 
     Returns:
         Dict with: experiment, total_cost_usd, total_tokens, by_provider breakdown
 
     Raises:
-        RuntimeError: If MLFlow is not installed
-        ValueError: If experiment doesn't exist
+        RuntimeError: If MLFlow is not installed (MLFlow source only)
+        ValueError: If experiment doesn't exist (MLFlow source only)
 
     Example:
-        >>> report = generate_cost_report("my_workflows")
+        >>> report = generate_cost_report("my_workflows", ledger_path="./workflows.db")
         >>> print(f"Total cost: ${report['total_cost_usd']:.2f}")
         >>> for provider, data in report['by_provider'].items():
         ...     print(f"{provider}: ${data['total_cost_usd']:.2f}")
     """
+    if ledger_path is not None:
+        from configurable_agents.observability.cost_reporter import open_cost_ledger
+        from configurable_agents.storage.base import CostLedgerFilter
+
+        by_provider = open_cost_ledger(ledger_path).by_provider(
+            CostLedgerFilter(experiment=experiment_name)
+        )
+        return {
+            "experiment": experiment_name,
+            "experiment_id": None,
+            "total_cost_usd": round(
+                sum(data["total_cost_usd"] for data in by_provider.values()), 6
+            ),
+            "total_tokens": sum(data["total_tokens"] for data in by_provider.values()),
+            "by_provider": by_provider,
+            "generated_at": datetime.utcnow().isoformat(),
+        }
+
     if not MLFLOW_AVAILABLE:
         raise RuntimeError(
             "MLFlow is not installed. Cannot generate cost report. "
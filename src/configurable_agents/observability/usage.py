@@ -0,0 +1,201 @@
+"""In-process usage accounting for a single workflow run.
+
+Node executors record every successful LLM call (tokens, cost, model,
+provider, latency) into the run's UsageAccumulator as it happens. The
+executor builds the run's cost summary from it directly, so the summary
+never depends on finding the run's trace in MLFlow afterwards (which is
+slow and can pick up another run's trace under concurrency).
+
+The accumulator is attached to the run's tracker by the runtime executor
+(tracker.usage) and read by node executors, the same way storage repos
+are threaded through.
+
+Example:
+    >>> usage = UsageAccumulator("article_writer")
+    >>> usage.record("research", "gpt-4o", 120, 480, 0.0051, 830.0)
+    >>> usage.summary()["total_cost_usd"]
+    0.0051
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from configurable_agents.observability.multi_provider_tracker import _extract_provider
+
+
+@dataclass(frozen=True)
+class NodeCall:
+    """Usage of one LLM call made by a node."""
+
+    node_id: str
+    model: str
+    provider: str
+    input_tokens: int
+    output_tokens: int
+    cost_usd: float
+    duration_ms: float
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+
+class UsageAccumulator:
+    """
+    Collects per-node LLM usage for one workflow run.
+
+    Thread-safe: parallel branches of a run may record concurrently.
+
+    Attributes:
+        workflow_name: Workflow the run belongs to (copied into summaries)
+        workflow_version: Workflow version (copied into summaries)
+    """
+
+    def __init__(
+        self,
+        workflow_name: Optional[str] = None,
+        workflow_version: Optional[str] = None,
+    ):
+        """
+        Initialize an empty accumulator.
+
+        Args:
+            workflow_name: Workflow name for the summary (optional)
+            workflow_version: Workflow version for the summary (optional)
+        """
+        self.workflow_name = workflow_name
+        self.workflow_version = workflow_version
+        self._calls: List[NodeCall] = []
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        node_id: str,
+        model: str,
+        input_tokens: int,
+        output_tokens: int,
+        cost_usd: float,
+        duration_ms: float,
+        provider: Optional[str] = None,
+    ) -> NodeCall:
+        """
+        Record one LLM call.
+
+        Args:
+            node_id: Node that made the call
+            model: Model name (provider prefix allowed)
+            input_tokens: Prompt tokens
+            output_tokens: Completion tokens
+            cost_usd: Estimated cost
+            duration_ms: Node LLM latency in milliseconds
+            provider: Provider name (default: derived from model)
+
+        Returns:
+            The recorded NodeCall
+        """
+        call = NodeCall(
+            node_id=node_id,
+            model=model or "unknown",
+            provider=provider or _extract_provider(model or "unknown"),
+            input_tokens=input_tokens or 0,
+            output_tokens=output_tokens or 0,
+            cost_usd=cost_usd or 0.0,
+            duration_ms=duration_ms,
+        )
+        with self._lock:
+            self._calls.append(call)
+        return call
+
+    @property
+    def calls(self) -> List[NodeCall]:
+        """Recorded calls in recording order (a copy)."""
+        with self._lock:
+            return list(self._calls)
+
+    def by_model(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Usage grouped by (provider, model).
+
+        Returns:
+            Dict mapping (provider, model) to {input_tokens, output_tokens,
+            cost_usd, calls}
+        """
+        groups: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for call in self.calls:
+            group = groups.setdefault(
+                (call.provider, call.model),
+                {"input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "calls": 0},
+            )
+            group["input_tokens"] += call.input_tokens
+            group["output_tokens"] += call.output_tokens
+            group["cost_usd"] += call.cost_usd
+            group["calls"] += 1
+        return groups
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Build the run's cost summary.
+
+        Same shape as MLFlowTracker.get_workflow_cost_summary(); repeated
+        calls of a node (loops) are summed under its node id.
+
+        Returns:
+            Dict with total_tokens, total_cost_usd, node_breakdown,
+            by_provider, workflow_name and workflow_version
+        """
+        calls = self.calls
+        node_breakdown: Dict[str, Dict[str, Any]] = {}
+        by_provider: Dict[str, Dict[str, Any]] = {}
+        for call in calls:
+            node = node_breakdown.setdefault(
+                call.node_id,
+                {
+                    "tokens": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+                    "cost_usd": 0.0,
+                    "duration_ms": 0.0,
+                    "calls": 0,
+                },
+            )
+            node["tokens"]["prompt_tokens"] += call.input_tokens
+            node["tokens"]["completion_tokens"] += call.output_tokens
+            node["tokens"]["total_tokens"] += call.total_tokens
+            node["cost_usd"] += call.cost_usd
+            node["duration_ms"] += call.duration_ms
+            node["calls"] += 1
+            node["model"] = call.model
+            node["provider"] = call.provider
+
+            provider = by_provider.setdefault(
+                call.provider,
+                {
+                    "total_cost_usd": 0.0,
+                    "total_tokens": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "calls": 0,
+                },
+            )
+            provider["total_cost_usd"] += call.cost_usd
+            provider["total_tokens"] += call.total_tokens
+            provider["input_tokens"] += call.input_tokens
+            provider["output_tokens"] += call.output_tokens
+            provider["calls"] += 1
+
+        for data in by_provider.values():
+            data["total_cost_usd"] = round(data["total_cost_usd"], 6)
+
+        prompt_tokens = sum(call.input_tokens for call in calls)
+        completion_tokens = sum(call.output_tokens for call in calls)
+        return {
+            "total_tokens": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+            "total_cost_usd": sum(call.cost_usd for call in calls),
+            "node_breakdown": node_breakdown,
+            "by_provider": by_provider,
+            "workflow_name": self.workflow_name,
+            "workflow_version": self.workflow_version or "unversioned",
+        }
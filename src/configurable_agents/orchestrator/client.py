@@ -44,6 +44,7 @@ class AgentRegistryOrchestratorClient:
 
         # HTTP client with connection pooling
         self._client = httpx.Client(timeout=timeout)
+        self._server_query_supported = True
 
     def _get_headers(self) -> Dict[str, str]:
         """Get HTTP headers for registry requests.
@@ -135,7 +136,9 @@ class AgentRegistryOrchestratorClient:
         """Query agents by metadata/capabilities.
 
         Allows filtering agents by their metadata JSON blob using
-        key-value matching with wildcard support.
+        key-value matching with wildcard support. Matching runs on the
+        registry's capability index (POST /agents/query); registries without
+        that endpoint fall back to listing all agents and filtering here.
 
         Args:
             metadata_filters: Dictionary of metadata filters
@@ -158,6 +161,23 @@ class AgentRegistryOrchestratorClient:
             ...     "provider": "openai"
             ... })
         """
+        if self._server_query_supported:
+            url = f"{self.registry_url}/agents/query"
+            try:
+                response = self._client.post(
+                    url,
+                    json={"filters": metadata_filters},
+                    headers=self._get_headers(),
+                )
+                if response.status_code in (404, 405):
+                    # Registry predates server-side queries
+                    self._server_query_supported = False
+                else:
+                    response.raise_for_status()
+                    return response.json()
+            except httpx.HTTPError as e:
+                logger.debug(f"Server-side capability query failed, filtering locally: {e}")
+
         all_agents = self.list_agents(include_dead=False)
         return self._filter_by_metadata(all_agents, metadata_filters)
 
@@ -221,8 +241,8 @@ class AgentRegistryOrchestratorClient:
         filtered = []
 
         for agent in agents:
-            # Parse agent_metadata JSON
-            metadata_str = agent.get("agent_metadata")
+            # Parse agent_metadata JSON ("metadata" in registry AgentInfo responses)
+            metadata_str = agent.get("agent_metadata") or agent.get("metadata")
             if not metadata_str:
                 continue
 
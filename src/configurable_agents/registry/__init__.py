@@ -12,6 +12,7 @@ The registry tracks:
 Public API:
     - AgentRegistryServer: FastAPI-based registry server
     - AgentRegistryClient: Client for agent self-registration (stub for Phase 2)
+    - send_batch_heartbeat: Renew many agents' registrations in one request
     - AgentRecord: ORM model for agent records
 
 Example:
@@ -26,10 +27,11 @@ from configurable_agents.storage.models import AgentRecord
 
 # Server and client components
 from configurable_agents.registry.server import AgentRegistryServer
-from configurable_agents.registry.client import AgentRegistryClient
+from configurable_agents.registry.client import AgentRegistryClient, send_batch_heartbeat
 
 __all__ = [
     "AgentRegistryServer",
     "AgentRegistryClient",
+    "send_batch_heartbeat",
     "AgentRecord",
 ]
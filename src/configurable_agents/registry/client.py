@@ -17,7 +17,7 @@ Example:
 
 import asyncio
 import socket
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 import httpx
 
@@ -261,3 +261,34 @@ class AgentRegistryClient:
         """Async context manager exit - deregisters and closes client."""
         await self.deregister()
         await self.close()
+
+
+async def send_batch_heartbeat(
+    registry_url: str,
+    agent_ids: List[str],
+    http_client: Optional[httpx.AsyncClient] = None,
+) -> Dict[str, Any]:
+    """Renew many agents' registrations with one request.
+
+    For hosts running many agents: one POST /agents/heartbeat replaces a
+    heartbeat request per agent.
+
+    Args:
+        registry_url: URL of the registry server
+        agent_ids: Agents to renew
+        http_client: Client to reuse (a temporary one is created if None)
+
+    Returns:
+        Response dict with "renewed" and "unknown" agent ID lists
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    url = f"{registry_url.rstrip('/')}/agents/heartbeat"
+    if http_client is None:
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.post(url, json={"agent_ids": agent_ids})
+    else:
+        response = await http_client.post(url, json={"agent_ids": agent_ids})
+    response.raise_for_status()
+    return response.json()
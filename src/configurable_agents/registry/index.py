@@ -0,0 +1,153 @@
+"""In-memory inverted capability index for the agent registry server.
+
+Maps each flattened metadata entry (see storage/capabilities.py) to the
+agents that have it, so capability queries are resolved from posting sets
+without touching the database or parsing metadata. Wildcard filters scan
+the distinct values of one key, not the agents.
+
+Example:
+    >>> index = CapabilityIndex()
+    >>> index.add("agent-1", '{"type": "llm", "model": "gpt-4o"}')
+    >>> index.query({"model": "gpt-*"})
+    {'agent-1'}
+"""
+
+import threading
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from configurable_agents.storage.capabilities import (
+    CapabilityEntry,
+    CapabilityMatch,
+    index_entries,
+    metadata_matches,
+    parse_metadata,
+    split_filters,
+)
+
+
+class CapabilityIndex:
+    """
+    Thread-safe inverted index from metadata entries to agent IDs.
+
+    Only agents with valid JSON-object metadata are indexed; like the
+    repository query, agents without metadata never match.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._postings: Dict[CapabilityEntry, Set[str]] = defaultdict(set)
+        # key -> distinct (value_type, value, in_list) for wildcard scans
+        self._values: Dict[str, Set[Tuple[str, str, bool]]] = defaultdict(set)
+        self._entries: Dict[str, List[CapabilityEntry]] = {}
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._metadata)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._metadata
+
+    def add(self, agent_id: str, metadata: Any) -> None:
+        """
+        Index (or re-index) an agent's metadata.
+
+        Args:
+            agent_id: Agent identifier
+            metadata: Stored metadata (JSON string or dict)
+        """
+        parsed = parse_metadata(metadata)
+        entries = index_entries(parsed) if parsed is not None else []
+        with self._lock:
+            self._remove(agent_id)
+            if parsed is None:
+                return
+            self._metadata[agent_id] = parsed
+            self._entries[agent_id] = entries
+            for entry in entries:
+                self._postings[entry].add(agent_id)
+                self._values[entry[0]].add(entry[1:])
+
+    def remove(self, agent_id: str) -> None:
+        """
+        Drop an agent from the index (no-op if not indexed).
+
+        Args:
+            agent_id: Agent identifier
+        """
+        with self._lock:
+            self._remove(agent_id)
+
+    def rebuild(self, agents: Iterable[Any]) -> None:
+        """
+        Replace the index contents.
+
+        Args:
+            agents: Records with agent_id and agent_metadata attributes
+        """
+        with self._lock:
+            self._postings.clear()
+            self._values.clear()
+            self._entries.clear()
+            self._metadata.clear()
+        for agent in agents:
+            self.add(agent.agent_id, agent.agent_metadata)
+
+    def query(self, filters: Dict[str, Any]) -> Set[str]:
+        """
+        Find agents whose metadata matches all filters.
+
+        Same semantics as AgentRegistryRepository.query_by_metadata(),
+        without the liveness check.
+
+        Args:
+            filters: Metadata filters (AND-ed, dot-path keys, "*" wildcards)
+
+        Returns:
+            Matching agent IDs
+        """
+        compiled, remaining = split_filters(filters)
+        with self._lock:
+            candidates = None
+            for match in compiled:
+                ids = self._lookup(match)
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return set()
+            if candidates is None:
+                candidates = set(self._metadata)
+            if remaining:
+                candidates = {
+                    agent_id
+                    for agent_id in candidates
+                    if metadata_matches(self._metadata[agent_id], remaining)
+                }
+            return candidates
+
+    def _lookup(self, match: CapabilityMatch) -> Set[str]:
+        ids: Set[str] = set()
+        if match.scalar_glob is None:
+            for value_type, value in match.scalar_values:
+                ids |= self._postings.get((match.key, value_type, value, False), set())
+            for value_type, value in match.list_values:
+                ids |= self._postings.get((match.key, value_type, value, True), set())
+            return ids
+        for value_type, value, in_list in self._values.get(match.key, ()):
+            if match.matches_entry(value_type, value, in_list):
+                ids |= self._postings[(match.key, value_type, value, in_list)]
+        return ids
+
+    def _remove(self, agent_id: str) -> None:
+        self._metadata.pop(agent_id, None)
+        for entry in self._entries.pop(agent_id, []):
+            posting = self._postings.get(entry)
+            if posting is None:
+                continue
+            posting.discard(agent_id)
+            if not posting:
+                del self._postings[entry]
+                values = self._values[entry[0]]
+                values.discard(entry[1:])
+                if not values:
+                    del self._values[entry[0]]
@@ -0,0 +1,176 @@
+"""In-memory liveness table for the agent registry server.
+
+Heartbeats are absorbed here instead of being committed one by one: a
+heartbeat only updates the agent's timestamp in memory and marks it
+pending. The server flushes pending heartbeats to the database in one
+batched transaction per interval, and answers liveness questions
+(is this agent alive, which agents expired) from memory.
+
+Example:
+    >>> table = LivenessTable()
+    >>> table.track("agent-1", datetime.utcnow(), ttl_seconds=60)
+    >>> table.beat("agent-1")
+    >>> table.is_alive("agent-1")
+    True
+    >>> repo.update_heartbeats(table.drain())
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class LivenessTable:
+    """
+    Thread-safe last-heartbeat and TTL table with pending-write tracking.
+
+    Liveness follows AgentRecord.is_alive(): an agent is alive while now
+    is before last_heartbeat + ttl_seconds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self._heartbeats: Dict[str, datetime] = {}
+        self._ttls: Dict[str, int] = {}
+        self._pending: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._heartbeats)
+
+    def __contains__(self, agent_id: str) -> bool:
+        return agent_id in self._heartbeats
+
+    @property
+    def pending_count(self) -> int:
+        """Heartbeats not yet written to the database."""
+        return len(self._pending)
+
+    def load(self, agents: Iterable[Any]) -> None:
+        """
+        Replace the table with stored agents, keeping newer pending heartbeats.
+
+        Args:
+            agents: Records with agent_id, last_heartbeat and ttl_seconds
+        """
+        with self._lock:
+            self._heartbeats.clear()
+            self._ttls.clear()
+            for agent in agents:
+                self._track(agent.agent_id, agent.last_heartbeat, agent.ttl_seconds)
+            for agent_id in list(self._pending):
+                if agent_id not in self._heartbeats:
+                    del self._pending[agent_id]
+                elif self._pending[agent_id] > self._heartbeats[agent_id]:
+                    self._heartbeats[agent_id] = self._pending[agent_id]
+
+    def track(self, agent_id: str, last_heartbeat: datetime, ttl_seconds: Optional[int]) -> None:
+        """
+        Start tracking an agent (or reset it after re-registration).
+
+        The stored timestamp is current, so any pending heartbeat is dropped.
+
+        Args:
+            agent_id: Agent identifier
+            last_heartbeat: Heartbeat timestamp as stored
+            ttl_seconds: Agent TTL (None = 60)
+        """
+        with self._lock:
+            self._track(agent_id, last_heartbeat, ttl_seconds)
+            self._pending.pop(agent_id, None)
+
+    def forget(self, agent_id: str) -> None:
+        """
+        Stop tracking an agent (no-op if unknown).
+
+        Args:
+            agent_id: Agent identifier
+        """
+        with self._lock:
+            self._heartbeats.pop(agent_id, None)
+            self._ttls.pop(agent_id, None)
+            self._pending.pop(agent_id, None)
+
+    def beat(self, agent_id: str, now: Optional[datetime] = None) -> Optional[datetime]:
+        """
+        Record a heartbeat for a tracked agent.
+
+        Args:
+            agent_id: Agent identifier
+            now: Heartbeat time (default: utcnow)
+
+        Returns:
+            The recorded timestamp, or None if the agent is not tracked
+        """
+        now = now or datetime.utcnow()
+        with self._lock:
+            if agent_id not in self._heartbeats:
+                return None
+            self._heartbeats[agent_id] = now
+            self._pending[agent_id] = now
+            return now
+
+    def last_heartbeat(self, agent_id: str) -> Optional[datetime]:
+        """Latest known heartbeat of an agent (None if not tracked)."""
+        return self._heartbeats.get(agent_id)
+
+    def is_alive(self, agent_id: str, now: Optional[datetime] = None) -> Optional[bool]:
+        """
+        Check an agent's TTL.
+
+        Args:
+            agent_id: Agent identifier
+            now: Reference time (default: utcnow)
+
+        Returns:
+            True/False, or None if the agent is not tracked
+        """
+        with self._lock:
+            if agent_id not in self._heartbeats:
+                return None
+            return (now or datetime.utcnow()) < self._expires_at(agent_id)
+
+    def alive_ids(self, now: Optional[datetime] = None) -> Set[str]:
+        """IDs of tracked agents whose TTL has not expired."""
+        now = now or datetime.utcnow()
+        with self._lock:
+            return {a for a in self._heartbeats if now < self._expires_at(a)}
+
+    def expired_ids(self, now: Optional[datetime] = None) -> List[str]:
+        """IDs of tracked agents whose TTL has expired."""
+        now = now or datetime.utcnow()
+        with self._lock:
+            return [a for a in self._heartbeats if now >= self._expires_at(a)]
+
+    def drain(self) -> Dict[str, datetime]:
+        """
+        Take the pending heartbeats for writing.
+
+        Returns:
+            Dict mapping agent_id to its latest heartbeat timestamp
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            return pending
+
+    def restore(self, pending: Dict[str, datetime]) -> None:
+        """
+        Put back heartbeats whose write failed (newer beats win).
+
+        Args:
+            pending: Heartbeats returned by drain()
+        """
+        with self._lock:
+            for agent_id, timestamp in pending.items():
+                if agent_id not in self._heartbeats:
+                    continue
+                current = self._pending.get(agent_id)
+                if current is None or current < timestamp:
+                    self._pending[agent_id] = timestamp
+
+    def _track(self, agent_id: str, last_heartbeat: datetime, ttl_seconds: Optional[int]) -> None:
+        self._heartbeats[agent_id] = last_heartbeat
+        self._ttls[agent_id] = ttl_seconds if ttl_seconds is not None else 60
+
+    def _expires_at(self, agent_id: str) -> datetime:
+        return self._heartbeats[agent_id] + timedelta(seconds=self._ttls[agent_id])
@@ -7,7 +7,7 @@ These models map between HTTP JSON and the AgentRecord ORM model.
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -68,6 +68,23 @@ class AgentInfo(BaseModel):
     metadata: Optional[str] = None
 
 
+class AgentQueryRequest(BaseModel):
+    """Request model for capability queries.
+
+    Attributes:
+        filters: Metadata filters, AND-ed ("*" wildcards, dot-path keys,
+            list values match any item)
+        include_dead: Include agents whose TTL has expired
+    """
+
+    filters: Dict[str, Any] = Field(
+        default_factory=dict, description="Metadata filters (AND-ed)"
+    )
+    include_dead: bool = Field(
+        default=False, description="Include expired agents in response"
+    )
+
+
 class HeartbeatResponse(BaseModel):
     """Response model for heartbeat endpoint.
 
@@ -82,6 +99,32 @@ class HeartbeatResponse(BaseModel):
     last_heartbeat: datetime
 
 
+class BatchHeartbeatRequest(BaseModel):
+    """Request model for the batch heartbeat endpoint.
+
+    Attributes:
+        agent_ids: Agents to renew (typically all agents on one host)
+    """
+
+    agent_ids: List[str] = Field(..., max_length=10000, description="Agent IDs to renew")
+
+
+class BatchHeartbeatResponse(BaseModel):
+    """Response model for the batch heartbeat endpoint.
+
+    Attributes:
+        status: Confirmation message
+        last_heartbeat: Timestamp recorded for the renewed agents
+        renewed: Agent IDs whose TTL was refreshed
+        unknown: Agent IDs not found in the registry
+    """
+
+    status: str
+    last_heartbeat: datetime
+    renewed: List[str]
+    unknown: List[str]
+
+
 class HealthResponse(BaseModel):
     """Response model for health check endpoint.
 
@@ -91,11 +134,13 @@ class HealthResponse(BaseModel):
         status: Health status (should be "healthy")
         registered_agents: Number of agents currently registered
         active_agents: Number of agents with valid TTL
+        retention: Purge metrics per cleanup job (see RetentionMetrics)
     """
 
     status: str
     registered_agents: int
     active_agents: int
+    retention: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
 
 
 class OrchestratorRegistrationRequest(BaseModel):
@@ -1,7 +1,22 @@
 """Agent registry FastAPI server.
 
 Provides HTTP endpoints for agent registration, heartbeat, listing,
-and health checks. Runs a background cleanup task to remove expired agents.
+capability queries and health checks. A retention scheduler removes
+expired agents and orchestrators in the background and reports rows
+purged per table in /health.
+
+Capability queries (POST /agents/query) are answered from an in-memory
+inverted index of agent metadata kept current by register/delete calls,
+loaded from the repository on startup and after expired-agent cleanup.
+
+Heartbeats (single or batched via POST /agents/heartbeat) only update an
+in-memory liveness table; a background task writes them to the database
+in one batched transaction every heartbeat_flush_interval seconds.
+Listing, health and cleanup read liveness from that table. The database
+stays the source of truth for agents registered, heartbeating or deleted
+through other processes: listing, queries and health reload the table
+and index from the repository at most every state_refresh_interval
+seconds (pending local heartbeats newer than the stored ones are kept).
 
 Example:
     >>> from configurable_agents.registry import AgentRegistryServer
@@ -11,8 +26,10 @@ Example:
 """
 
 import asyncio
+import logging
+import time
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import JSONResponse
@@ -21,16 +38,34 @@ from configurable_agents.config.schema import StorageConfig
 from configurable_agents.storage.base import AgentRegistryRepository, OrchestratorRepository
 from configurable_agents.storage.factory import create_storage_backend
 from configurable_agents.storage.models import AgentRecord, OrchestratorRecord
+from configurable_agents.storage.retention import RetentionScheduler
 
+from configurable_agents.registry.index import CapabilityIndex
+from configurable_agents.registry.liveness import LivenessTable
 from configurable_agents.registry.models import (
     AgentInfo,
+    AgentQueryRequest,
     AgentRegistrationRequest,
+    BatchHeartbeatRequest,
+    BatchHeartbeatResponse,
     HealthResponse,
     HeartbeatResponse,
     OrchestratorRegistrationRequest,
     OrchestratorInfo,
 )
 
+logger = logging.getLogger(__name__)
+
+# Seconds between batched heartbeat writes
+DEFAULT_HEARTBEAT_FLUSH_INTERVAL = 5.0
+
+# Seconds between expired agent/orchestrator cleanup runs
+DEFAULT_CLEANUP_INTERVAL = 60.0
+
+# Seconds a read may serve in-memory registry state before reloading it
+# from the repository (picks up other processes' changes)
+DEFAULT_STATE_REFRESH_INTERVAL = 10.0
+
 
 class AgentRegistryServer:
     """Agent registry server using FastAPI.
@@ -42,22 +77,47 @@ class AgentRegistryServer:
     Attributes:
         registry_url: Database URL for storage backend
         repo: Agent registry repository instance
+        capability_index: In-memory metadata index for capability queries
+        liveness: In-memory heartbeat/TTL table (pending writes included)
+        heartbeat_flush_interval: Seconds between batched heartbeat writes
+            (0 = write every heartbeat immediately)
+        state_refresh_interval: Seconds between reloads of the in-memory
+            state from the repository (0 = reload on every read)
+        retention: Scheduler purging expired agents and orchestrators
         app: FastAPI application instance
-        _cleanup_task: Background task for expired agent cleanup
+        _cleanup_task: Background task running the retention scheduler
+        _flush_task: Background task writing pending heartbeats
     """
 
-    def __init__(self, registry_url: str, repo: Optional[AgentRegistryRepository] = None, orchestrator_repo: Optional[OrchestratorRepository] = None):
+    def __init__(
+        self,
+        registry_url: str,
+        repo: Optional[AgentRegistryRepository] = None,
+        orchestrator_repo: Optional[OrchestratorRepository] = None,
+        heartbeat_flush_interval: float = DEFAULT_HEARTBEAT_FLUSH_INTERVAL,
+        state_refresh_interval: float = DEFAULT_STATE_REFRESH_INTERVAL,
+    ):
         """Initialize the agent registry server.
 
         Args:
             registry_url: Database URL (e.g., "sqlite:///agents.db")
             repo: Optional pre-configured repository (for testing)
             orchestrator_repo: Optional pre-configured orchestrator repository (for testing)
+            heartbeat_flush_interval: Seconds between batched heartbeat
+                writes (0 = write-through)
+            state_refresh_interval: Seconds between reloads of the
+                in-memory state from the repository (0 = every read)
         """
         self.registry_url = registry_url
         self.app: Optional[FastAPI] = None
         self._cleanup_task: Optional[asyncio.Task] = None
-        self._orchestrator_cleanup_task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self.capability_index = CapabilityIndex()
+        self.liveness = LivenessTable()
+        self.heartbeat_flush_interval = heartbeat_flush_interval
+        self.state_refresh_interval = state_refresh_interval
+        self._state_loaded = False
+        self._state_loaded_at = 0.0
 
         # Parse URL to create storage config
         if registry_url.startswith("sqlite:///"):
@@ -74,6 +134,10 @@ class AgentRegistryServer:
         if orchestrator_repo is not None:
             self.orchestrator_repo = orchestrator_repo
 
+        self.retention = RetentionScheduler(interval_seconds=DEFAULT_CLEANUP_INTERVAL)
+        self.retention.add_job("agents", self.purge_expired_agents)
+        self.retention.add_job("orchestrators", self.orchestrator_repo.delete_expired)
+
     def create_app(self) -> FastAPI:
         """Create and configure the FastAPI application.
 
@@ -91,10 +155,12 @@ class AgentRegistryServer:
 
         # Register endpoints
         app.add_api_route("/agents/register", self.register_agent, methods=["POST"])
+        app.add_api_route("/agents/heartbeat", self.batch_heartbeat, methods=["POST"])
         app.add_api_route(
             "/agents/{agent_id}/heartbeat", self.heartbeat, methods=["POST"]
         )
         app.add_api_route("/agents", self.list_agents, methods=["GET"])
+        app.add_api_route("/agents/query", self.query_agents, methods=["POST"])
         app.add_api_route("/agents/{agent_id}", self.get_agent, methods=["GET"])
         app.add_api_route("/agents/{agent_id}", self.delete_agent, methods=["DELETE"])
 
@@ -116,61 +182,79 @@ class AgentRegistryServer:
         return app
 
     async def on_startup(self) -> None:
-        """Start background cleanup task when server starts."""
-        self._cleanup_task = asyncio.create_task(self._cleanup_loop())
-        self._orchestrator_cleanup_task = asyncio.create_task(self._orchestrator_cleanup_loop())
+        """Load in-memory registry state and start background tasks."""
+        self._load_registry_state()
+        self._cleanup_task = self.retention.start()
+        if self.heartbeat_flush_interval > 0:
+            self._flush_task = asyncio.create_task(self._heartbeat_flush_loop())
 
     async def on_shutdown(self) -> None:
-        """Cancel background cleanup task when server stops."""
-        if self._cleanup_task is not None:
-            self._cleanup_task.cancel()
+        """Cancel background tasks and write pending heartbeats."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
             try:
-                await self._cleanup_task
+                await self._flush_task
             except asyncio.CancelledError:
                 pass
+            self._flush_task = None
+        try:
+            self.flush_heartbeats()
+        except Exception as e:
+            logger.warning(f"Failed to write pending heartbeats on shutdown: {e}")
 
-        if self._orchestrator_cleanup_task is not None:
-            self._orchestrator_cleanup_task.cancel()
-            try:
-                await self._orchestrator_cleanup_task
-            except asyncio.CancelledError:
-                pass
+        await self.retention.stop()
+        self._cleanup_task = None
+
+    def purge_expired_agents(self) -> int:
+        """Delete expired agents (retention job, runs in a worker thread).
 
-    async def _cleanup_loop(self) -> None:
-        """Background task to periodically delete expired agents.
+        Expiry is checked in the liveness table; the database is only
+        swept (after writing pending heartbeats) when some agent actually
+        expired.
 
-        Runs every 60 seconds, removing agents whose TTL has expired.
+        Returns:
+            Number of agents deleted
         """
+        if not self._state_loaded:
+            self._load_registry_state()
+        if not self.liveness.expired_ids():
+            return 0
+        self.flush_heartbeats()
+        deleted = self.repo.delete_expired()
+        if deleted > 0:
+            self._load_registry_state()
+        return deleted
+
+    async def _heartbeat_flush_loop(self) -> None:
+        """Background task writing pending heartbeats in batches."""
         while True:
             try:
-                await asyncio.sleep(60)
-                deleted = self.repo.delete_expired()
-                if deleted > 0:
-                    # Log cleanup (in production, use proper logging)
-                    pass
+                await asyncio.sleep(self.heartbeat_flush_interval)
+                self.flush_heartbeats()
             except asyncio.CancelledError:
                 break
-            except Exception:
-                # Continue loop even if cleanup fails
-                pass
+            except Exception as e:
+                # Heartbeats stay pending and are retried next interval
+                logger.warning(f"Heartbeat flush failed: {e}")
+
+    def flush_heartbeats(self) -> int:
+        """Write pending heartbeats to the database in one batch.
 
-    async def _orchestrator_cleanup_loop(self) -> None:
-        """Background task to periodically delete expired orchestrators.
+        Returns:
+            Number of heartbeats written
 
-        Runs every 60 seconds, removing orchestrators whose TTL has expired.
+        Raises:
+            Exception: Repository errors (the heartbeats stay pending)
         """
-        while True:
-            try:
-                await asyncio.sleep(60)
-                deleted = self.orchestrator_repo.delete_expired()
-                if deleted > 0:
-                    # Log cleanup (in production, use proper logging)
-                    pass
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                # Continue loop even if cleanup fails
-                pass
+        pending = self.liveness.drain()
+        if not pending:
+            return 0
+        try:
+            self.repo.update_heartbeats(pending)
+        except Exception:
+            self.liveness.restore(pending)
+            raise
+        return len(pending)
 
     async def register_agent(self, request: AgentRegistrationRequest) -> AgentInfo:
         """Register or update an agent.
@@ -219,6 +303,10 @@ class AgentRegistryServer:
                 session.commit()
                 # Refresh to get database defaults and ensure record is attached
                 session.refresh(existing)
+                self.capability_index.add(request.agent_id, request.metadata)
+                self.liveness.track(
+                    existing.agent_id, existing.last_heartbeat, existing.ttl_seconds
+                )
                 return self._record_to_info(existing)
         else:
             # Generic implementation for other repo types
@@ -248,12 +336,17 @@ class AgentRegistryServer:
 
             # Re-fetch to get an attached instance
             agent_record = self.repo.get(request.agent_id)
+            self.capability_index.add(request.agent_id, request.metadata)
+            self.liveness.track(
+                agent_record.agent_id, agent_record.last_heartbeat, agent_record.ttl_seconds  # type: ignore
+            )
             return self._record_to_info(agent_record)  # type: ignore
 
     async def heartbeat(self, agent_id: str) -> HeartbeatResponse:
         """Refresh an agent's heartbeat timestamp.
 
-        Updates the agent's last_heartbeat to now, extending its TTL.
+        Updates the agent's last_heartbeat to now, extending its TTL. The
+        new timestamp is written to the database with the next batch.
 
         Args:
             agent_id: Unique identifier for the agent
@@ -264,14 +357,59 @@ class AgentRegistryServer:
         Raises:
             HTTPException: 404 if agent not found
         """
-        try:
-            self.repo.update_heartbeat(agent_id)
-            agent = self.repo.get(agent_id)
-            return HeartbeatResponse(
-                status="ok", last_heartbeat=agent.last_heartbeat  # type: ignore
-            )
-        except ValueError as e:
-            raise HTTPException(status_code=404, detail=str(e))
+        renewed, _ = self._renew([agent_id])
+        if agent_id not in renewed:
+            raise HTTPException(status_code=404, detail=f"Agent not found: {agent_id}")
+        return HeartbeatResponse(status="ok", last_heartbeat=renewed[agent_id])
+
+    async def batch_heartbeat(self, request: BatchHeartbeatRequest) -> BatchHeartbeatResponse:
+        """Refresh the heartbeats of many agents in one request.
+
+        Lets one host renew all the agents it runs; unknown agents are
+        reported instead of failing the request.
+
+        Args:
+            request: Agent IDs to renew
+
+        Returns:
+            BatchHeartbeatResponse with the renewed and unknown agent IDs
+        """
+        renewed, unknown = self._renew(request.agent_ids)
+        return BatchHeartbeatResponse(
+            status="ok",
+            last_heartbeat=max(renewed.values(), default=datetime.utcnow()),
+            renewed=list(renewed),
+            unknown=unknown,
+        )
+
+    def _renew(self, agent_ids: List[str]) -> Tuple[Dict[str, datetime], List[str]]:
+        """Record heartbeats in the liveness table.
+
+        Agents not tracked yet (e.g. registered by another process) are
+        looked up in the repository once and tracked from then on.
+
+        Returns:
+            Tuple of (renewed agent_id -> heartbeat time, unknown agent IDs)
+        """
+        if not self._state_loaded:
+            self._load_registry_state()
+        now = datetime.utcnow()
+        renewed: Dict[str, datetime] = {}
+        untracked: List[str] = []
+        for agent_id in dict.fromkeys(agent_ids):
+            timestamp = self.liveness.beat(agent_id, now)
+            if timestamp is None:
+                untracked.append(agent_id)
+            else:
+                renewed[agent_id] = timestamp
+        if untracked:
+            for agent in self.repo.get_many(untracked):
+                self.liveness.track(agent.agent_id, agent.last_heartbeat, agent.ttl_seconds)
+                self.capability_index.add(agent.agent_id, agent.agent_metadata)
+                renewed[agent.agent_id] = self.liveness.beat(agent.agent_id, now)  # type: ignore
+        if self.heartbeat_flush_interval <= 0:
+            self.flush_heartbeats()
+        return renewed, [agent_id for agent_id in untracked if agent_id not in renewed]
 
     async def list_agents(
         self,
@@ -281,15 +419,51 @@ class AgentRegistryServer:
     ) -> list[AgentInfo]:
         """List all registered agents.
 
+        Liveness and heartbeat times come from the liveness table, so
+        heartbeats not yet written to the database are reflected; the
+        table is refreshed from the repository first if it is older than
+        state_refresh_interval.
+
         Args:
             include_dead: If False, only return agents with valid TTL
 
         Returns:
             List of AgentInfo objects
         """
-        agents = self.repo.list_all(include_dead=include_dead)
+        self._refresh_registry_state()
+        if include_dead:
+            agents = self.repo.list_all(include_dead=True)
+        else:
+            agents = self.repo.get_many(list(self.liveness.alive_ids()))
+            agents.sort(key=lambda a: a.registered_at, reverse=True)
         return [self._record_to_info(a) for a in agents]
 
+    async def query_agents(self, request: AgentQueryRequest) -> list[AgentInfo]:
+        """Find agents by metadata/capabilities.
+
+        Matching runs on the in-memory capability index; only the matched
+        agents are loaded from the repository.
+
+        Args:
+            request: Metadata filters and liveness flag
+
+        Returns:
+            List of matching AgentInfo objects, newest registration first
+        """
+        self._refresh_registry_state()
+        agent_ids = self.capability_index.query(request.filters)
+        agents = self.repo.get_many(list(agent_ids))
+        if len(agents) < len(agent_ids):
+            # Deleted behind the server's back (e.g. another process)
+            found = {a.agent_id for a in agents}
+            for agent_id in agent_ids - found:
+                self.capability_index.remove(agent_id)
+        agents.sort(key=lambda a: a.registered_at, reverse=True)
+        infos = [self._record_to_info(a) for a in agents]
+        if not request.include_dead:
+            infos = [info for info in infos if info.is_alive]
+        return infos
+
     # Fix: make this a proper method with self parameter
     async def get_agent(self, agent_id: str) -> AgentInfo:
         """Get information about a specific agent.
@@ -322,6 +496,8 @@ class AgentRegistryServer:
         """
         try:
             self.repo.delete(agent_id)
+            self.capability_index.remove(agent_id)
+            self.liveness.forget(agent_id)
             return JSONResponse(
                 status_code=200, content={"status": "deleted", "agent_id": agent_id}
             )
@@ -336,14 +512,33 @@ class AgentRegistryServer:
         Returns:
             HealthResponse with status and metrics
         """
-        all_agents = self.repo.list_all(include_dead=False)
-        active_count = len(all_agents)
-        total_agents = len(self.repo.list_all(include_dead=True))
+        self._refresh_registry_state()
+        active_count = len(self.liveness.alive_ids())
+        total_agents = len(self.liveness)
 
         return HealthResponse(
-            status="healthy", registered_agents=total_agents, active_agents=active_count
+            status="healthy",
+            registered_agents=total_agents,
+            active_agents=active_count,
+            retention=self.retention.metrics(),
         )
 
+    def _load_registry_state(self) -> None:
+        """(Re)build the capability index and liveness table from storage."""
+        agents = self.repo.list_all(include_dead=True)
+        self.capability_index.rebuild(agents)
+        self.liveness.load(agents)
+        self._state_loaded = True
+        self._state_loaded_at = time.monotonic()
+
+    def _refresh_registry_state(self) -> None:
+        """Reload registry state if never loaded or older than state_refresh_interval."""
+        if (
+            not self._state_loaded
+            or time.monotonic() - self._state_loaded_at >= self.state_refresh_interval
+        ):
+            self._load_registry_state()
+
     def _record_to_info(self, record: AgentRecord) -> AgentInfo:
         """Convert AgentRecord ORM model to AgentInfo Pydantic model.
 
@@ -351,15 +546,16 @@ class AgentRegistryServer:
             record: AgentRecord instance
 
         Returns:
-            AgentInfo instance
+            AgentInfo instance (liveness from the liveness table if tracked)
         """
+        is_alive = self.liveness.is_alive(record.agent_id)
         return AgentInfo(
             agent_id=record.agent_id,
             agent_name=record.agent_name,
             host=record.host,
             port=record.port,
-            is_alive=record.is_alive(),
-            last_heartbeat=record.last_heartbeat,
+            is_alive=record.is_alive() if is_alive is None else is_alive,
+            last_heartbeat=self.liveness.last_heartbeat(record.agent_id) or record.last_heartbeat,
             registered_at=record.registered_at,
             ttl_seconds=record.ttl_seconds,  # type: ignore
             metadata=record.agent_metadata,
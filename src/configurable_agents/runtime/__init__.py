@@ -8,7 +8,9 @@ from configurable_agents.runtime.executor import (
     StateInitializationError,
     WorkflowExecutionError,
     run_workflow,
+    run_workflow_async,
     run_workflow_from_config,
+    run_workflow_from_config_async,
     validate_workflow,
 )
 from configurable_agents.runtime.feature_gate import (
@@ -17,11 +19,20 @@ from configurable_agents.runtime.feature_gate import (
     get_supported_features,
     validate_runtime_support,
 )
+from configurable_agents.runtime.workflow_cache import (
+    CompiledWorkflow,
+    WorkflowCache,
+    clear_workflow_cache,
+    compute_config_hash,
+    get_workflow_cache,
+)
 
 __all__ = [
     # Executor functions
     "run_workflow",
     "run_workflow_from_config",
+    "run_workflow_async",
+    "run_workflow_from_config_async",
     "validate_workflow",
     # Executor exceptions
     "ExecutionError",
@@ -35,4 +46,10 @@ __all__ = [
     "validate_runtime_support",
     "get_supported_features",
     "check_feature_support",
+    # Compiled-workflow cache
+    "CompiledWorkflow",
+    "WorkflowCache",
+    "get_workflow_cache",
+    "clear_workflow_cache",
+    "compute_config_hash",
 ]
@@ -5,6 +5,7 @@ import json
 import logging
 import time
 import uuid
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, Optional
@@ -17,19 +18,24 @@ from configurable_agents.config import (
     validate_config,
     ValidationError,
 )
-from configurable_agents.core import build_graph, build_state_model
-from configurable_agents.observability import MLFlowTracker
+from configurable_agents.core import build_graph, build_output_model, build_state_model
+from configurable_agents.observability import MLFlowTracker, UsageAccumulator
 from configurable_agents.runtime.feature_gate import (
     UnsupportedFeatureError,
     validate_runtime_support,
 )
+from configurable_agents.runtime.workflow_cache import (
+    CompiledWorkflow,
+    compute_config_hash,
+    get_workflow_cache,
+)
 from configurable_agents.runtime.profiler import (
     BottleneckAnalyzer,
     clear_profiler,
     get_profiler,
     set_profiler,
 )
-from configurable_agents.storage import create_storage_backend
+from configurable_agents.storage import get_checkpoint_writer, get_storage_backend
 from configurable_agents.storage.models import WorkflowRunRecord
 
 logger = logging.getLogger(__name__)
@@ -110,6 +116,20 @@ def run_workflow(
     if verbose:
         logging.getLogger("configurable_agents").setLevel(logging.DEBUG)
 
+    config = _load_config(config_path)
+
+    # Phase 3: Run workflow from config
+    return run_workflow_from_config(config, inputs, verbose=verbose)
+
+
+def _load_config(config_path: str) -> WorkflowConfig:
+    """
+    Load, parse and schema-validate a workflow config file.
+
+    Raises:
+        ConfigLoadError: Failed to load or parse config file
+        ConfigValidationError: Config schema validation failed
+    """
     logger.info(f"Loading workflow config from: {config_path}")
 
     # Phase 1: Load and parse config
@@ -138,22 +158,27 @@ def run_workflow(
             original_error=e,
         )
 
-    # Phase 3: Run workflow from config
-    return run_workflow_from_config(config, inputs, verbose=verbose)
+    return config
 
 
 def run_workflow_from_config(
     config: WorkflowConfig,
     inputs: Dict[str, Any],
     verbose: bool = False,
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """
     Execute workflow from pre-loaded config and return final state.
 
+    Validation, state model and graph compilation are cached by config
+    content (see runtime.workflow_cache), so repeated runs of the same
+    config only pay for state initialization and graph.invoke.
+
     Args:
         config: Validated WorkflowConfig instance
         inputs: Initial state inputs as dict
         verbose: Enable verbose logging (DEBUG level)
+        use_cache: Reuse/store the compiled workflow in the process-wide cache
 
     Returns:
         Final workflow state as dict
@@ -168,6 +193,133 @@ def run_workflow_from_config(
         >>> config = WorkflowConfig(**config_dict)
         >>> result = run_workflow_from_config(config, {"topic": "AI"})
     """
+    run = _prepare_run(config, inputs, verbose=verbose, use_cache=use_cache)
+
+    # Phase 7: Execute graph with MLFlow 3.9 auto-tracing
+    try:
+        logger.info(f"Starting workflow execution: {run.workflow_name}")
+        logger.debug(f"Initial state: {run.initial_state}")
+
+        # Define traced execution function (MLflow 3.9 @mlflow.trace)
+        @run.tracker.get_trace_decorator(
+            name=f"workflow_{run.workflow_name}",
+            workflow_name=run.workflow_name,
+            workflow_version=config.flow.version or "unversioned",
+            node_count=len(config.nodes),
+        )
+        def _execute_workflow():
+            """Execute workflow (automatically traced by MLflow via autolog)."""
+            # LangGraph's invoke() returns dict, not BaseModel
+            # Auto-traced via mlflow.langchain.autolog() - no manual tracking needed!
+            return run.graph.invoke(run.initial_state, config=run.invoke_config)
+
+        # Execute workflow (tracing happens automatically)
+        final_state = _execute_workflow()
+
+        return _complete_run(run, final_state)
+
+    except Exception as e:
+        raise _fail_run(run, e)
+
+
+async def run_workflow_from_config_async(
+    config: WorkflowConfig,
+    inputs: Dict[str, Any],
+    verbose: bool = False,
+    use_cache: bool = True,
+) -> Dict[str, Any]:
+    """
+    Execute workflow from pre-loaded config natively on the event loop.
+
+    Same phases, caching and error semantics as run_workflow_from_config,
+    but the graph runs via graph.ainvoke: LLM nodes await
+    call_llm_structured_async, so many concurrent runs share one event
+    loop instead of holding one thread each. Setup (compile, run record
+    insert) and completion bookkeeping (checkpoint barrier, run record
+    update, cost ledger) do blocking storage I/O, so they run in a worker
+    thread via asyncio.to_thread.
+
+    Args:
+        config: Validated WorkflowConfig instance
+        inputs: Initial state inputs as dict
+        verbose: Enable verbose logging (DEBUG level)
+        use_cache: Reuse/store the compiled workflow in the process-wide cache
+
+    Returns:
+        Final workflow state as dict
+
+    Raises:
+        ConfigValidationError: Config validation failed
+        StateInitializationError: Failed to initialize state
+        GraphBuildError: Failed to build execution graph
+        WorkflowExecutionError: Workflow execution failed
+
+    Example:
+        >>> results = await asyncio.gather(
+        ...     *(run_workflow_from_config_async(config, {"topic": t}) for t in topics)
+        ... )
+    """
+    run = await asyncio.to_thread(
+        _prepare_run, config, inputs, verbose=verbose, use_cache=use_cache
+    )
+    # The profiler context set in the worker thread does not propagate back
+    set_profiler(run.profiler_analyzer)
+
+    try:
+        logger.info(f"Starting async workflow execution: {run.workflow_name}")
+
+        @run.tracker.get_trace_decorator(
+            name=f"workflow_{run.workflow_name}",
+            workflow_name=run.workflow_name,
+            workflow_version=config.flow.version or "unversioned",
+            node_count=len(config.nodes),
+        )
+        async def _execute_workflow():
+            """Execute workflow on the event loop (traced like the sync path)."""
+            return await run.graph.ainvoke(run.initial_state, config=run.invoke_config)
+
+        final_state = await _execute_workflow()
+
+        return await asyncio.to_thread(_complete_run, run, final_state)
+
+    except Exception as e:
+        raise await asyncio.to_thread(_fail_run, run, e)
+    finally:
+        clear_profiler()
+
+
+@dataclass
+class _WorkflowRun:
+    """Per-run state shared by the sync and async execution paths."""
+
+    config: WorkflowConfig
+    workflow_name: str
+    start_time: float
+    graph: Any
+    initial_state: Any
+    invoke_config: Dict[str, Any]
+    tracker: MLFlowTracker
+    profiler_analyzer: BottleneckAnalyzer
+    usage: UsageAccumulator
+    workflow_run_repo: Any = None
+    execution_state_repo: Any = None
+    run_id: Optional[str] = None
+
+
+def _prepare_run(
+    config: WorkflowConfig,
+    inputs: Dict[str, Any],
+    verbose: bool = False,
+    use_cache: bool = True,
+) -> _WorkflowRun:
+    """
+    Run phases 1-6: compile (cached), storage, state, run record, tracker, profiler.
+
+    Raises:
+        ConfigValidationError: Config validation failed
+        StateInitializationError: Failed to initialize state
+        GraphBuildError: Failed to build execution graph
+    """
     # Set log level
     if verbose:
         logging.getLogger("configurable_agents").setLevel(logging.DEBUG)
@@ -177,31 +329,11 @@ def run_workflow_from_config(
 
     start_time = time.time()
 
-    # Phase 1: Validate config (comprehensive validation)
-    try:
-        logger.debug("Validating config...")
-        validate_config(config)
-        logger.debug("Config validation passed")
-    except ValidationError as e:
-        raise ConfigValidationError(
-            f"Config validation failed: {e}",
-            phase="config_validation",
-            original_error=e,
-        )
+    # Phases 1-3: Validate, feature-gate and compile (cached by config content)
+    compiled = _get_compiled_workflow(config, use_cache=use_cache)
+    state_model = compiled.state_model
 
-    # Phase 2: Check runtime support (feature gating)
-    try:
-        logger.debug("Checking runtime support...")
-        validate_runtime_support(config)
-        logger.debug("Runtime support check passed")
-    except UnsupportedFeatureError as e:
-        raise ConfigValidationError(
-            f"Unsupported features detected: {e}",
-            phase="feature_gating",
-            original_error=e,
-        )
-
-    # Phase 2.5: Initialize storage backend (optional, graceful degradation)
+    # Phase 3.5: Initialize storage backend (optional, graceful degradation)
     workflow_run_repo = None
     execution_state_repo = None
     memory_repo = None
@@ -209,23 +341,12 @@ def run_workflow_from_config(
     if config.config and config.config.storage:
         storage_config = config.config.storage
     try:
-        workflow_run_repo, execution_state_repo, _, _, _, memory_repo = create_storage_backend(storage_config)
-        logger.debug("Storage backend initialized")
+        workflow_run_repo, _, _, _, _, memory_repo, _, _ = get_storage_backend(storage_config)
+        execution_state_repo = get_checkpoint_writer(storage_config)
+        logger.debug("Storage backend ready")
     except Exception as e:
         logger.warning(f"Storage backend initialization failed, continuing without persistence: {e}")
 
-    # Phase 3: Build state model
-    try:
-        logger.debug("Building state model...")
-        state_model = build_state_model(config.state)
-        logger.debug(f"State model built: {state_model.__name__}")
-    except Exception as e:
-        raise GraphBuildError(
-            f"Failed to build state model: {e}",
-            phase="state_model_build",
-            original_error=e,
-        )
-
     # Phase 4: Initialize state with inputs
     try:
         logger.debug(f"Initializing state with inputs: {list(inputs.keys())}")
@@ -255,7 +376,7 @@ def run_workflow_from_config(
                 id=run_id,
                 workflow_name=workflow_name,
                 status="running",
-                config_snapshot=json.dumps(config.model_dump(), default=str),
+                config_snapshot=compiled.config_snapshot,
                 inputs=json.dumps(inputs, default=str),
                 started_at=datetime.now(timezone.utc),
             )
@@ -272,6 +393,10 @@ def run_workflow_from_config(
 
     tracker = MLFlowTracker(mlflow_config, config)
 
+    # Per-run usage accumulator, filled by node executors via the tracker
+    usage = UsageAccumulator(workflow_name, config.flow.version)
+    tracker.usage = usage
+
     # Attach storage repos to tracker for node executor access
     if run_id:
         if execution_state_repo:
@@ -283,243 +408,445 @@ def run_workflow_from_config(
         tracker.workflow_id = run_id
         logger.debug(f"Attached storage repos to tracker for run {run_id}")
 
-    # Phase 6: Build and compile graph (with tracker for node instrumentation)
-    try:
-        logger.debug("Building execution graph...")
-        graph = build_graph(config, state_model, config.config, tracker)
-        logger.debug("Graph built and compiled successfully")
-    except Exception as e:
-        raise GraphBuildError(
-            f"Failed to build execution graph: {e}",
-            phase="graph_build",
-            original_error=e,
-        )
+    # Phase 6: Bind run-specific tracker to the (possibly cached) compiled graph
+    graph = compiled.graph
+    invoke_config = {"configurable": {"tracker": tracker}}
 
     # Phase 6.5: Initialize BottleneckAnalyzer for profiling
     profiler_analyzer = BottleneckAnalyzer()
     set_profiler(profiler_analyzer)
     logger.debug("BottleneckAnalyzer initialized for workflow profiling")
 
-    # Phase 7: Execute graph with MLFlow 3.9 auto-tracing
-    try:
-        logger.info(f"Starting workflow execution: {workflow_name}")
-        logger.debug(f"Initial state: {initial_state}")
+    return _WorkflowRun(
+        config=config,
+        workflow_name=workflow_name,
+        start_time=start_time,
+        graph=graph,
+        initial_state=initial_state,
+        invoke_config=invoke_config,
+        tracker=tracker,
+        profiler_analyzer=profiler_analyzer,
+        usage=usage,
+        workflow_run_repo=workflow_run_repo,
+        execution_state_repo=execution_state_repo,
+        run_id=run_id,
+    )
 
-        # Define traced execution function (MLflow 3.9 @mlflow.trace)
-        @tracker.get_trace_decorator(
-            name=f"workflow_{workflow_name}",
-            workflow_name=workflow_name,
-            workflow_version=config.flow.version or "unversioned",
-            node_count=len(config.nodes),
-        )
-        def _execute_workflow():
-            """Execute workflow (automatically traced by MLflow via autolog)."""
-            # LangGraph's invoke() returns dict, not BaseModel
-            # Auto-traced via mlflow.langchain.autolog() - no manual tracking needed!
-            return graph.invoke(initial_state)
 
-        # Execute workflow (tracing happens automatically)
-        final_state = _execute_workflow()
+def _complete_run(run: _WorkflowRun, final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Finish a successful run: checkpoints, cost/bottleneck logging, gates, run record.
 
-        # Post-process: Calculate and log cost summary
-        if tracker.enabled:
-            cost_summary = tracker.get_workflow_cost_summary()
-            if cost_summary:
-                tracker.log_workflow_summary(cost_summary)
-                logger.info(
-                    f"Workflow cost: ${cost_summary.get('total_cost_usd', 0):.6f}, "
-                    f"{cost_summary.get('total_tokens', {}).get('total_tokens', 0)} tokens"
-                )
+    Args:
+        run: Prepared run
+        final_state: State returned by the graph
+
+    Returns:
+        Final workflow state as dict
+    """
+    config = run.config
+    workflow_name = run.workflow_name
+    start_time = run.start_time
+    tracker = run.tracker
+    profiler_analyzer = run.profiler_analyzer
+    workflow_run_repo = run.workflow_run_repo
+    execution_state_repo = run.execution_state_repo
+    run_id = run.run_id
+
+    # Run-completion barrier for batched checkpoint writes
+    _complete_checkpoints(execution_state_repo, run_id)
+
+    # Post-process: Build the cost summary from this run's recorded usage
+    cost_summary = run.usage.summary()
+    total_tokens = cost_summary["total_tokens"]["total_tokens"]
+    total_cost = cost_summary["total_cost_usd"]
+    if cost_summary["node_breakdown"]:
+        logger.info(f"Workflow cost: ${total_cost:.6f}, {total_tokens} tokens")
+
+    # MLflow is an optional sink for the summary (written in the background)
+    if tracker.enabled:
+        tracker.submit_workflow_summary(cost_summary)
+
+    execution_time = time.time() - start_time
+    logger.info(
+        f"Workflow completed successfully: {workflow_name} "
+        f"(duration: {execution_time:.2f}s)"
+    )
+    logger.debug(f"Final state: {final_state}")
 
-        execution_time = time.time() - start_time
+    # Post-process: Log bottleneck analysis
+    bottleneck_summary = profiler_analyzer.get_summary()
+    if bottleneck_summary["node_count"] > 0:
         logger.info(
-            f"Workflow completed successfully: {workflow_name} "
-            f"(duration: {execution_time:.2f}s)"
+            f"Bottleneck analysis: {bottleneck_summary['node_count']} nodes, "
+            f"total node time: {bottleneck_summary['total_time_ms']:.2f}ms"
         )
-        logger.debug(f"Final state: {final_state}")
 
-        # Post-process: Log bottleneck analysis
-        bottleneck_summary = profiler_analyzer.get_summary()
-        if bottleneck_summary["node_count"] > 0:
+        # Log slowest node
+        slowest = bottleneck_summary.get("slowest_node")
+        if slowest:
             logger.info(
-                f"Bottleneck analysis: {bottleneck_summary['node_count']} nodes, "
-                f"total node time: {bottleneck_summary['total_time_ms']:.2f}ms"
+                f"Slowest node: {slowest['node_id']} "
+                f"({slowest['avg_duration_ms']:.2f}ms avg, "
+                f"{slowest['call_count']} calls, "
+                f"{slowest['total_duration_ms']:.2f}ms total)"
             )
 
-            # Log slowest node
-            slowest = bottleneck_summary.get("slowest_node")
-            if slowest:
+        # Log bottlenecks (>50% threshold)
+        bottlenecks = bottleneck_summary.get("bottlenecks", [])
+        if bottlenecks:
+            logger.info(f"Bottlenecks (>{50.0}% of total time):")
+            for b in bottlenecks:
                 logger.info(
-                    f"Slowest node: {slowest['node_id']} "
-                    f"({slowest['avg_duration_ms']:.2f}ms avg, "
-                    f"{slowest['call_count']} calls, "
-                    f"{slowest['total_duration_ms']:.2f}ms total)"
+                    f"  - {b['node_id']}: {b['percent_of_total']:.1f}% "
+                    f"({b['total_duration_ms']:.2f}ms total, "
+                    f"{b['avg_duration_ms']:.2f}ms avg, "
+                    f"{b['call_count']} calls)"
                 )
 
-            # Log bottlenecks (>50% threshold)
-            bottlenecks = bottleneck_summary.get("bottlenecks", [])
-            if bottlenecks:
-                logger.info(f"Bottlenecks (>{50.0}% of total time):")
-                for b in bottlenecks:
-                    logger.info(
-                        f"  - {b['node_id']}: {b['percent_of_total']:.1f}% "
-                        f"({b['total_duration_ms']:.2f}ms total, "
-                        f"{b['avg_duration_ms']:.2f}ms avg, "
-                        f"{b['call_count']} calls)"
+    # Clear profiler context
+    clear_profiler()
+
+    # Phase 7.5: Check quality gates (v0.4+)
+    if config.config and config.config.gates:
+        from configurable_agents.optimization.gates import (
+            check_gates,
+            take_action,
+            GateAction,
+        )
+
+        # Collect metrics for gate checking
+        gate_metrics = {}
+
+        gate_metrics["cost_usd"] = total_cost
+        gate_metrics["total_tokens"] = total_tokens
+
+        # Add execution time
+        gate_metrics["duration_ms"] = execution_time * 1000
+
+        # Add bottleneck info if available
+        if bottleneck_summary["node_count"] > 0:
+            gate_metrics["bottleneck_node"] = bottleneck_summary.get("slowest_node", {}).get("node_id", "")
+            gate_metrics["bottleneck_percent"] = bottleneck_summary.get("slowest_node", {}).get("percent_of_total", 0)
+
+        # Parse on_fail action
+        on_fail_str = config.config.gates.on_fail
+        try:
+            if on_fail_str == "warn":
+                gate_action = GateAction.WARN
+            elif on_fail_str == "fail":
+                gate_action = GateAction.FAIL
+            elif on_fail_str == "block_deploy":
+                gate_action = GateAction.BLOCK_DEPLOY
+            else:
+                gate_action = GateAction.WARN
+        except Exception:
+            gate_action = GateAction.WARN
+
+        # Convert schema GatesModel to optimization GatesConfig
+        from configurable_agents.optimization.gates import QualityGate, GatesConfig
+        quality_gates = [
+            QualityGate(
+                metric=gm.metric,
+                max=gm.max,
+                min=gm.min,
+                description=gm.metric,
+            )
+            for gm in config.config.gates.gates
+        ]
+        gates_config = GatesConfig(gates=quality_gates, on_fail=gate_action)
+
+        # Check gates
+        logger.info("Checking quality gates...")
+        gate_results = check_gates(gate_metrics, gates_config)
+
+        # Log results
+        for result in gate_results:
+            if result.passed:
+                logger.debug(f"Gate passed: {result.gate.metric}")
+            else:
+                logger.warning(f"Gate failed: {result.message}")
+
+        # Take action based on results
+        try:
+            take_action(gate_results, gate_action, context=workflow_name)
+        except Exception as gate_error:
+            # Gate check failed with FAIL action
+            logger.error(f"Quality gate check failed: {gate_error}")
+            # Still update run record with failure status
+            if workflow_run_repo and run_id:
+                try:
+                    workflow_run_repo.update_run_completion(
+                        run_id=run_id,
+                        status="failed",
+                        duration_seconds=execution_time,
+                        total_tokens=total_tokens,
+                        total_cost_usd=total_cost,
+                        error_message=f"Quality gates failed: {str(gate_error)}"[:500],
                     )
+                except Exception:
+                    pass
+            raise
 
-        # Clear profiler from thread-local context
-        clear_profiler()
+    # Update workflow run record with completion metrics (including bottleneck info)
+    if workflow_run_repo and run_id:
+        try:
+            # Convert final state to JSON for outputs
+            outputs_json = json.dumps(final_state, default=str)
+
+            # Serialize bottleneck summary to JSON for storage
+            bottleneck_json = json.dumps(bottleneck_summary, default=str) if bottleneck_summary["node_count"] > 0 else None
+
+            workflow_run_repo.update_run_completion(
+                run_id=run_id,
+                status="completed",
+                duration_seconds=execution_time,
+                total_tokens=total_tokens,
+                total_cost_usd=total_cost,
+                outputs=outputs_json,
+                bottleneck_info=bottleneck_json,
+            )
+            logger.debug(f"Updated workflow run record: {run_id} -> completed")
+        except Exception as e:
+            logger.warning(f"Failed to update workflow run record on completion: {e}")
 
-        # Phase 7.5: Check quality gates (v0.4+)
-        if config.config and config.config.gates:
-            from configurable_agents.optimization.gates import (
-                check_gates,
-                take_action,
-                GateAction,
+        _record_cost_ledger(run, "success", execution_time)
+
+    return final_state
+
+
+def _fail_run(run: _WorkflowRun, e: Exception) -> WorkflowExecutionError:
+    """
+    Record a failed run and build the error to raise.
+
+    Args:
+        run: Prepared run
+        e: Error raised while executing the graph
+
+    Returns:
+        WorkflowExecutionError wrapping e
+    """
+    workflow_name = run.workflow_name
+    start_time = run.start_time
+    workflow_run_repo = run.workflow_run_repo
+    execution_state_repo = run.execution_state_repo
+    run_id = run.run_id
+
+    execution_time = time.time() - start_time
+    logger.error(
+        f"Workflow execution failed: {workflow_name} "
+        f"(duration: {execution_time:.2f}s)"
+    )
+
+    # Clear profiler context (even on failure)
+    clear_profiler()
+
+    # Persist checkpoints written before the failure (incl. error state)
+    _complete_checkpoints(execution_state_repo, run_id)
+
+    # Update workflow run record with failure status (and the usage spent before it)
+    if workflow_run_repo and run_id:
+        try:
+            cost_summary = run.usage.summary()
+            workflow_run_repo.update_run_completion(
+                run_id=run_id,
+                status="failed",
+                duration_seconds=execution_time,
+                total_tokens=cost_summary["total_tokens"]["total_tokens"],
+                total_cost_usd=cost_summary["total_cost_usd"],
+                error_message=str(e)[:500],  # Truncate long error messages
             )
+            logger.debug(f"Updated workflow run record: {run_id} -> failed")
+        except Exception as exc:
+            logger.warning(f"Failed to update workflow run record on failure: {exc}")
 
-            # Collect metrics for gate checking
-            gate_metrics = {}
-
-            # Get cost summary from tracker
-            if tracker.enabled:
-                cost_summary = tracker.get_workflow_cost_summary()
-                if cost_summary:
-                    gate_metrics["cost_usd"] = cost_summary.get("total_cost_usd", 0.0)
-                    gate_metrics["total_tokens"] = cost_summary.get("total_tokens", {}).get("total_tokens", 0)
-
-            # Add execution time
-            gate_metrics["duration_ms"] = execution_time * 1000
-
-            # Add bottleneck info if available
-            if bottleneck_summary["node_count"] > 0:
-                gate_metrics["bottleneck_node"] = bottleneck_summary.get("slowest_node", {}).get("node_id", "")
-                gate_metrics["bottleneck_percent"] = bottleneck_summary.get("slowest_node", {}).get("percent_of_total", 0)
-
-            # Parse on_fail action
-            on_fail_str = config.config.gates.on_fail
-            try:
-                if on_fail_str == "warn":
-                    gate_action = GateAction.WARN
-                elif on_fail_str == "fail":
-                    gate_action = GateAction.FAIL
-                elif on_fail_str == "block_deploy":
-                    gate_action = GateAction.BLOCK_DEPLOY
-                else:
-                    gate_action = GateAction.WARN
-            except Exception:
-                gate_action = GateAction.WARN
+        _record_cost_ledger(run, "failure", execution_time)
 
-            # Convert schema GatesModel to optimization GatesConfig
-            from configurable_agents.optimization.gates import QualityGate, GatesConfig
-            quality_gates = [
-                QualityGate(
-                    metric=gm.metric,
-                    max=gm.max,
-                    min=gm.min,
-                    description=gm.metric,
-                )
-                for gm in config.config.gates.gates
-            ]
-            gates_config = GatesConfig(gates=quality_gates, on_fail=gate_action)
-
-            # Check gates
-            logger.info("Checking quality gates...")
-            gate_results = check_gates(gate_metrics, gates_config)
-
-            # Log results
-            for result in gate_results:
-                if result.passed:
-                    logger.debug(f"Gate passed: {result.gate.metric}")
-                else:
-                    logger.warning(f"Gate failed: {result.message}")
-
-            # Take action based on results
-            try:
-                take_action(gate_results, gate_action, context=workflow_name)
-            except Exception as gate_error:
-                # Gate check failed with FAIL action
-                logger.error(f"Quality gate check failed: {gate_error}")
-                # Still update run record with failure status
-                if workflow_run_repo and run_id:
-                    try:
-                        workflow_run_repo.update_run_completion(
-                            run_id=run_id,
-                            status="failed",
-                            duration_seconds=execution_time,
-                            total_tokens=0,
-                            total_cost_usd=0.0,
-                            error_message=f"Quality gates failed: {str(gate_error)}"[:500],
-                        )
-                    except Exception:
-                        pass
-                raise
-
-        # Update workflow run record with completion metrics (including bottleneck info)
-        if workflow_run_repo and run_id:
-            try:
-                # Get cost summary from tracker if available
-                total_tokens = 0
-                total_cost = 0.0
-                if tracker.enabled:
-                    cost_summary = tracker.get_workflow_cost_summary()
-                    if cost_summary:
-                        total_tokens = cost_summary.get('total_tokens', {}).get('total_tokens', 0)
-                        total_cost = cost_summary.get('total_cost_usd', 0.0)
-
-                # Convert final state to JSON for outputs
-                outputs_json = json.dumps(final_state, default=str)
-
-                # Serialize bottleneck summary to JSON for storage
-                bottleneck_json = json.dumps(bottleneck_summary, default=str) if bottleneck_summary["node_count"] > 0 else None
-
-                workflow_run_repo.update_run_completion(
-                    run_id=run_id,
-                    status="completed",
-                    duration_seconds=execution_time,
-                    total_tokens=total_tokens,
-                    total_cost_usd=total_cost,
-                    outputs=outputs_json,
-                    bottleneck_info=bottleneck_json,
-                )
-                logger.debug(f"Updated workflow run record: {run_id} -> completed")
-            except Exception as e:
-                logger.warning(f"Failed to update workflow run record on completion: {e}")
+    return WorkflowExecutionError(
+        f"Workflow execution failed: {e}",
+        phase="workflow_execution",
+        original_error=e,
+    )
+
+
+def _record_cost_ledger(run: _WorkflowRun, status: str, duration_seconds: float) -> None:
+    """
+    Append the run's cost rows to the local cost ledger (one per provider/model).
 
-        return final_state
+    Cost reports read the ledger instead of scanning MLFlow, so every
+    finished run is recorded, including failed and zero-cost ones.
 
+    Args:
+        run: Finished run
+        status: "success" or "failure"
+        duration_seconds: Wall-clock run duration
+    """
+    ledger = getattr(run.workflow_run_repo, "cost_ledger", None)
+    if ledger is None or not run.run_id:
+        return
+
+    try:
+        from configurable_agents.storage.base import CostLedgerEntry
+
+        observability = run.config.config.observability if run.config.config else None
+        experiment = "configurable_agents"
+        if observability and observability.mlflow:
+            experiment = observability.mlflow.experiment_name
+
+        groups = run.usage.by_model() or {
+            ("unknown", "unknown"): {
+                "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0, "calls": 0,
+            }
+        }
+        started_at = datetime.fromtimestamp(run.start_time, timezone.utc).replace(tzinfo=None)
+        ledger.append([
+            CostLedgerEntry(
+                run_id=run.run_id,
+                workflow_name=run.workflow_name,
+                started_at=started_at,
+                status=status,
+                model=model,
+                provider=provider,
+                experiment=experiment,
+                duration_seconds=duration_seconds,
+                **usage,
+            )
+            for (provider, model), usage in groups.items()
+        ])
     except Exception as e:
-        execution_time = time.time() - start_time
-        logger.error(
-            f"Workflow execution failed: {workflow_name} "
-            f"(duration: {execution_time:.2f}s)"
+        logger.warning(f"Failed to append run to cost ledger: {e}")
+
+
+def _complete_checkpoints(execution_state_repo: Any, run_id: Optional[str]) -> None:
+    """
+    Wait for a run's queued checkpoints if the repository batches writes.
+
+    Args:
+        execution_state_repo: Execution state repository (or None)
+        run_id: Finished run (None = storage disabled for this run)
+    """
+    run_completed = getattr(execution_state_repo, "run_completed", None)
+    if not run_id or run_completed is None:
+        return
+    try:
+        run_completed(run_id)
+    except Exception as e:
+        logger.warning(f"Failed to flush execution checkpoints for run {run_id}: {e}")
+
+
+def _get_compiled_workflow(config: WorkflowConfig, use_cache: bool = True) -> CompiledWorkflow:
+    """
+    Get the compiled workflow for a config, compiling it on cache miss.
+
+    Args:
+        config: Workflow configuration
+        use_cache: Look up and store the result in the process-wide cache
+
+    Returns:
+        CompiledWorkflow artifact
+
+    Raises:
+        ConfigValidationError: Config validation or feature gating failed
+        GraphBuildError: Failed to build state model or execution graph
+    """
+    if not use_cache:
+        return _compile_workflow(config, compute_config_hash(config))
+
+    cache = get_workflow_cache()
+    config_hash = compute_config_hash(config)
+    compiled = cache.get(config_hash)
+    if compiled is not None:
+        logger.debug(f"Using cached compiled workflow: {config_hash[:12]}")
+        return compiled
+
+    compiled = _compile_workflow(config, config_hash)
+    return cache.put(config_hash, compiled)
+
+
+def _compile_workflow(config: WorkflowConfig, config_hash: str) -> CompiledWorkflow:
+    """
+    Validate config and build all run-independent artifacts.
+
+    Args:
+        config: Workflow configuration
+        config_hash: Content hash from compute_config_hash()
+
+    Returns:
+        CompiledWorkflow artifact
+
+    Raises:
+        ConfigValidationError: Config validation or feature gating failed
+        GraphBuildError: Failed to build state model or execution graph
+    """
+    # Phase 1: Validate config (comprehensive validation)
+    try:
+        logger.debug("Validating config...")
+        validate_config(config)
+        logger.debug("Config validation passed")
+    except ValidationError as e:
+        raise ConfigValidationError(
+            f"Config validation failed: {e}",
+            phase="config_validation",
+            original_error=e,
         )
 
-        # Clear profiler from thread-local context (even on failure)
-        clear_profiler()
+    # Phase 2: Check runtime support (feature gating)
+    try:
+        logger.debug("Checking runtime support...")
+        validate_runtime_support(config)
+        logger.debug("Runtime support check passed")
+    except UnsupportedFeatureError as e:
+        raise ConfigValidationError(
+            f"Unsupported features detected: {e}",
+            phase="feature_gating",
+            original_error=e,
+        )
 
-        # Update workflow run record with failure status
-        if workflow_run_repo and run_id:
-            try:
-                workflow_run_repo.update_run_completion(
-                    run_id=run_id,
-                    status="failed",
-                    duration_seconds=execution_time,
-                    total_tokens=0,
-                    total_cost_usd=0.0,
-                    error_message=str(e)[:500],  # Truncate long error messages
-                )
-                logger.debug(f"Updated workflow run record: {run_id} -> failed")
-            except Exception as exc:
-                logger.warning(f"Failed to update workflow run record on failure: {exc}")
+    # Phase 3: Build state model
+    try:
+        logger.debug("Building state model...")
+        state_model = build_state_model(config.state)
+        logger.debug(f"State model built: {state_model.__name__}")
+    except Exception as e:
+        raise GraphBuildError(
+            f"Failed to build state model: {e}",
+            phase="state_model_build",
+            original_error=e,
+        )
 
-        raise WorkflowExecutionError(
-            f"Workflow execution failed: {e}",
-            phase="workflow_execution",
+    # Phase 3.1: Prebuild per-node output models (failures surface at node execution)
+    output_models = {}
+    for node_config in config.nodes:
+        if node_config.code:
+            continue
+        try:
+            output_models[node_config.id] = build_output_model(
+                node_config.output_schema, node_config.id
+            )
+        except Exception as e:
+            logger.debug(f"Skipping output model prebuild for node '{node_config.id}': {e}")
+
+    # Phase 3.2: Build and compile graph (tracker is bound per invocation)
+    try:
+        logger.debug("Building execution graph...")
+        graph = build_graph(config, state_model, config.config, output_models=output_models)
+        logger.debug("Graph built and compiled successfully")
+    except Exception as e:
+        raise GraphBuildError(
+            f"Failed to build execution graph: {e}",
+            phase="graph_build",
             original_error=e,
         )
 
+    return CompiledWorkflow(
+        config_hash=config_hash,
+        config=config,
+        state_model=state_model,
+        graph=graph,
+        output_models=output_models,
+        config_snapshot=json.dumps(config.model_dump(), default=str),
+    )
+
 
 def validate_workflow(config_path: str) -> bool:
     """
@@ -601,9 +928,10 @@ async def run_workflow_async(
     """
     Execute workflow from config file asynchronously.
 
-    Wraps the synchronous run_workflow() function in an async wrapper
-    using asyncio.to_thread(), enabling background task execution from
-    FastAPI endpoints without blocking the event loop.
+    Runs natively on the event loop via run_workflow_from_config_async
+    (graph.ainvoke), so FastAPI endpoints and background tasks can drive
+    many concurrent runs without one thread per run. Only the config file
+    read is offloaded to a thread.
 
     Args:
         config_path: Path to YAML or JSON config file
@@ -624,10 +952,8 @@ async def run_workflow_async(
         >>> result = await run_workflow_async("article_writer.yaml", {"topic": "AI Safety"})
         >>> print(result["article"])
     """
-    # Run the synchronous workflow function in a thread pool
-    # This prevents blocking the async event loop during workflow execution
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,  # Use default thread pool executor
-        lambda: run_workflow(config_path, inputs, verbose=verbose),
-    )
+    if verbose:
+        logging.getLogger("configurable_agents").setLevel(logging.DEBUG)
+
+    config = await asyncio.to_thread(_load_config, config_path)
+    return await run_workflow_from_config_async(config, inputs, verbose=verbose)
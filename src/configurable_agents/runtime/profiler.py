@@ -4,20 +4,20 @@ Provides:
 - profile_node decorator: Times node execution using time.perf_counter()
 - NodeTimings: Dataclass for storing timing data
 - BottleneckAnalyzer: Identifies nodes consuming disproportionate time
-- Thread-local context: Stores analyzer for decorator access
+- Context-local storage: Stores analyzer for decorator access
 
 Key features:
 - Works with both sync and async functions
 - Captures timing even on exceptions (try/finally)
 - Logs duration_ms to MLFlow as metric: node_{node_id}_duration_ms
-- Thread-local storage for parallel execution safety
+- Context-local storage (contextvars) for parallel and async execution safety
 """
 
 import asyncio
 import functools
 import logging
-import threading
 import time
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Any, Callable, Optional
@@ -237,14 +237,17 @@ class BottleneckAnalyzer:
         }
 
 
-# Thread-local storage for profiler context
-# Enables safe parallel execution by storing analyzer per thread
-_context = threading.local()
+# Context-local storage for profiler context
+# Isolated per thread and per asyncio task, so concurrent runs (threads or
+# coroutines on one event loop) never share an analyzer
+_analyzer: ContextVar[Optional[BottleneckAnalyzer]] = ContextVar(
+    "bottleneck_analyzer", default=None
+)
 
 
 def get_profiler() -> Optional[BottleneckAnalyzer]:
     """
-    Get the BottleneckAnalyzer for the current thread.
+    Get the BottleneckAnalyzer for the current context (thread or asyncio task).
 
     Returns:
         BottleneckAnalyzer instance if set, None otherwise
@@ -254,34 +257,33 @@ def get_profiler() -> Optional[BottleneckAnalyzer]:
         >>> if analyzer:
         ...     summary = analyzer.get_summary()
     """
-    return getattr(_context, "analyzer", None)
+    return _analyzer.get()
 
 
 def set_profiler(analyzer: BottleneckAnalyzer) -> None:
     """
-    Set the BottleneckAnalyzer for the current thread.
+    Set the BottleneckAnalyzer for the current context (thread or asyncio task).
 
     Args:
-        analyzer: BottleneckAnalyzer instance to use for this thread
+        analyzer: BottleneckAnalyzer instance to use for this context
 
     Example:
         >>> analyzer = BottleneckAnalyzer()
         >>> set_profiler(analyzer)
         >>> # Now @profile_node decorator will use this analyzer
     """
-    _context.analyzer = analyzer
+    _analyzer.set(analyzer)
 
 
 def clear_profiler() -> None:
-    """Remove the BottleneckAnalyzer from the current thread.
+    """Remove the BottleneckAnalyzer from the current context.
 
     Example:
         >>> clear_profiler()
         >>> get_profiler() is None
         True
     """
-    if hasattr(_context, "analyzer"):
-        delattr(_context, "analyzer")
+    _analyzer.set(None)
 
 
 def profile_node(node_id: str) -> Callable:
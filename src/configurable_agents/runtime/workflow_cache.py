@@ -0,0 +1,223 @@
+"""Compiled-workflow cache for repeated executions.
+
+Validating a config, building its state model and compiling its LangGraph
+are pure functions of the config content, yet the executor used to redo all
+of them on every run. This module stores the compiled artifact keyed by a
+content hash of the config so repeat runs of the same workflow skip straight
+to ``graph.invoke``.
+
+Key features:
+- Content-hash keys (identical YAML → identical key, regardless of origin)
+- Bounded LRU eviction
+- Explicit invalidation (single key or everything)
+- Thread-safe (one cache is shared by all server request threads)
+
+Run-specific objects (MLFlow tracker, storage repos, run_id) are NOT part of
+the artifact; they are passed to the compiled graph per invocation through
+the LangGraph ``configurable`` mapping (see ``core.graph_builder``).
+
+Example:
+    >>> cache = get_workflow_cache()
+    >>> key = compute_config_hash(config)
+    >>> compiled = cache.get(key)
+    >>> if compiled is None:
+    ...     compiled = cache.put(key, CompiledWorkflow(...))
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Type
+
+from pydantic import BaseModel
+
+from configurable_agents.config import WorkflowConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 64
+
+
+@dataclass
+class CompiledWorkflow:
+    """
+    Reusable, run-independent artifacts for one workflow config.
+
+    Attributes:
+        config_hash: Content hash the artifact is stored under
+        config: Validated workflow config
+        state_model: Dynamic Pydantic state model class
+        graph: Compiled LangGraph (tracker supplied per invocation)
+        output_models: Per-node output model classes, keyed by node ID
+        config_snapshot: JSON snapshot of the config for run records
+    """
+
+    config_hash: str
+    config: WorkflowConfig
+    state_model: Type[BaseModel]
+    graph: Any
+    output_models: Dict[str, Type[BaseModel]] = field(default_factory=dict)
+    config_snapshot: str = ""
+
+
+def compute_config_hash(config: WorkflowConfig) -> str:
+    """
+    Compute a stable content hash for a workflow config.
+
+    Args:
+        config: Workflow configuration
+
+    Returns:
+        Hex-encoded SHA-256 digest of the canonical JSON form of the config
+    """
+    canonical = json.dumps(
+        config.model_dump(mode="json", by_alias=True),
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class WorkflowCache:
+    """
+    Bounded LRU cache of CompiledWorkflow artifacts.
+
+    Attributes:
+        max_entries: Maximum number of compiled workflows kept in memory
+        hits: Number of successful lookups
+        misses: Number of failed lookups
+        evictions: Number of entries dropped due to the size bound
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Initialize workflow cache.
+
+        Args:
+            max_entries: Maximum number of entries (must be >= 1)
+
+        Raises:
+            ValueError: If max_entries is less than 1
+        """
+        if max_entries < 1:
+            raise ValueError(f"max_entries must be >= 1, got {max_entries}")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CompiledWorkflow]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, config_hash: str) -> Optional[CompiledWorkflow]:
+        """
+        Look up a compiled workflow, marking it most recently used.
+
+        Args:
+            config_hash: Key from compute_config_hash()
+
+        Returns:
+            CompiledWorkflow if cached, None otherwise
+        """
+        with self._lock:
+            compiled = self._entries.get(config_hash)
+            if compiled is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(config_hash)
+            self.hits += 1
+            return compiled
+
+    def put(self, config_hash: str, compiled: CompiledWorkflow) -> CompiledWorkflow:
+        """
+        Store a compiled workflow, evicting the least recently used entry if full.
+
+        If another thread stored the same key first, the existing entry wins
+        and is returned so that all callers share one artifact.
+
+        Args:
+            config_hash: Key from compute_config_hash()
+            compiled: Artifact to store
+
+        Returns:
+            The cached artifact for config_hash
+        """
+        with self._lock:
+            existing = self._entries.get(config_hash)
+            if existing is not None:
+                self._entries.move_to_end(config_hash)
+                return existing
+            self._entries[config_hash] = compiled
+            while len(self._entries) > self.max_entries:
+                evicted_hash, _ = self._entries.popitem(last=False)
+                self.evictions += 1
+                logger.debug(f"Evicted compiled workflow: {evicted_hash[:12]}")
+            return compiled
+
+    def invalidate(self, config_hash: Optional[str] = None) -> int:
+        """
+        Drop cached entries.
+
+        Args:
+            config_hash: Key to drop (None = drop everything)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if config_hash is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                return removed
+            return 1 if self._entries.pop(config_hash, None) is not None else 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Dict with size, max_entries, hits, misses and evictions
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __contains__(self, config_hash: str) -> bool:
+        with self._lock:
+            return config_hash in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# Process-wide cache shared by all executor calls
+_workflow_cache = WorkflowCache()
+
+
+def get_workflow_cache() -> WorkflowCache:
+    """
+    Get the process-wide workflow cache.
+
+    Returns:
+        Shared WorkflowCache instance
+    """
+    return _workflow_cache
+
+
+def clear_workflow_cache() -> int:
+    """
+    Invalidate every entry in the process-wide workflow cache.
+
+    Returns:
+        Number of entries removed
+    """
+    return _workflow_cache.invalidate()
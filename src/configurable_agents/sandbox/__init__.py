@@ -8,10 +8,14 @@ This module provides two sandbox execution strategies:
    - Blocks unsafe operations via AST transformation
    - Suitable for local development and trusted environments
 
+   - Optional warm SandboxWorkerPool runs code in worker processes
+     (process isolation, hard timeouts, memory limits)
+
 2. **DockerSandboxExecutor** (opt-in): Container-based isolation
    - Requires Docker daemon
    - Full OS-level isolation with resource limits
    - Suitable for production and untrusted code
+   - Optional warm ContainerPool reuses locked-down containers
 
 Usage:
     from configurable_agents.sandbox import PythonSandboxExecutor, execute_code
@@ -26,7 +30,13 @@ Usage:
 """
 
 from .base import SafetyError, SandboxExecutor, SandboxResult
-from .python_executor import PythonSandboxExecutor, execute_code
+from .python_executor import PythonSandboxExecutor, compile_sandboxed, execute_code
+from .worker_pool import (
+    SandboxWorkerPool,
+    get_sandbox_pool,
+    parse_memory_limit,
+    shutdown_sandbox_pools,
+)
 
 __all__ = [
     # Base types
@@ -35,23 +45,39 @@ __all__ = [
     "SandboxResult",
     # Python executor
     "PythonSandboxExecutor",
+    "compile_sandboxed",
     "execute_code",
+    # Worker pool
+    "SandboxWorkerPool",
+    "get_sandbox_pool",
+    "parse_memory_limit",
+    "shutdown_sandbox_pools",
 ]
 
 # Try to import Docker executor if available
 try:
+    from .container_pool import (
+        ContainerPool,
+        get_container_pool,
+        shutdown_container_pools,
+    )
     from .docker_executor import (
         DockerSandboxExecutor,
         RESOURCE_PRESETS,
         execute_in_container,
+        get_docker_client,
         get_preset,
     )
 
     __all__.extend([
+        "ContainerPool",
         "DockerSandboxExecutor",
         "RESOURCE_PRESETS",
         "execute_in_container",
+        "get_container_pool",
+        "get_docker_client",
         "get_preset",
+        "shutdown_container_pools",
     ])
 except ImportError:
     # Docker not available - this is normal
@@ -0,0 +1,452 @@
+"""
+Warm container pool for the Docker sandbox.
+
+A cold DockerSandboxExecutor run checks the image, writes a temp file and
+starts a new container per execution; container start-up dominates latency.
+ContainerPool keeps a few locked-down containers running a small job loop
+and sends them jobs over stdin instead.
+
+Design decisions:
+- Same isolation as cold runs: cap_drop ALL, no-new-privileges, read-only
+  root filesystem, CPU/memory limits, optional network "none"
+- One JSON line per job on stdin, one JSON line per reply on stdout (read
+  through Docker's multiplexed attach stream)
+- Each job gets a fresh namespace; the container (its interpreter and any
+  imported modules) is shared by up to max_uses jobs, then replaced
+- A container that misses its timeout is killed and replaced
+- Health check (status + ping job) before handing out a container that
+  has been idle longer than health_check_interval
+- Only the docker-py client API is used (containers.run, attach_socket,
+  reload, kill), so any stand-in client with that API works
+"""
+
+import atexit
+import json
+import logging
+import queue
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .base import SandboxResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_USES = 100
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+PING_TIMEOUT = 5.0
+
+# Job loop run by every pooled container (stdlib only)
+RUNNER_SOURCE = r"""
+import contextlib, io, json, sys
+_compiled = {}
+for _line in sys.stdin:
+    _job = json.loads(_line)
+    if _job.get("ping"):
+        _reply = {"pong": True}
+    else:
+        _buffer = io.StringIO()
+        try:
+            _code = _compiled.get(_job["code"])
+            if _code is None:
+                _code = _compiled[_job["code"]] = compile(_job["code"], "<sandbox>", "exec")
+            _namespace = {"__name__": "__sandbox__", "inputs": _job["inputs"]}
+            with contextlib.redirect_stdout(_buffer):
+                exec(_code, _namespace)
+            _result = _namespace.get("result")
+            _reply = {
+                "success": True,
+                "output": None if _result is None else str(_result),
+                "stdout": _buffer.getvalue(),
+            }
+        except BaseException as _e:
+            _reply = {"success": False, "error": f"{type(_e).__name__}: {_e}", "stdout": _buffer.getvalue()}
+    sys.stdout.write(json.dumps(_reply) + "\n")
+    sys.stdout.flush()
+"""
+
+
+def locked_down_config(
+    image: str,
+    cpu: float,
+    memory: str,
+    network_enabled: bool,
+) -> Dict[str, Any]:
+    """
+    Build the container settings shared by cold and pooled executions.
+
+    Args:
+        image: Docker image name
+        cpu: CPU limit in cores
+        memory: Memory limit (e.g. "512m"); swap is disabled
+        network_enabled: False to run with network mode "none"
+
+    Returns:
+        Keyword arguments for client.containers.run()
+    """
+    return {
+        "image": image,
+        "detach": True,
+        "mem_limit": memory,
+        "memswap_limit": memory,  # No swap
+        "cpu_quota": int(cpu * 100000),  # CPU quota in microseconds
+        "cpu_period": 100000,  # CPU period in microseconds
+        "read_only": True,  # Read-only root filesystem
+        "security_opt": ["no-new-privileges"],  # Prevent privilege escalation
+        "cap_drop": ["ALL"],  # Drop all capabilities
+        "network_mode": "default" if network_enabled else "none",
+    }
+
+
+class _Channel:
+    """Line-oriented reader/writer over a Docker attach socket."""
+
+    def __init__(self, sock: Any):
+        # docker-py wraps the raw socket in a SocketIO object
+        self._sock = getattr(sock, "_sock", sock)
+        self._buffer = b""
+
+    def send_line(self, line: str) -> None:
+        self._sock.sendall(line.encode("utf-8") + b"\n")
+
+    def read_line(self, timeout: float) -> Dict[str, Any]:
+        """
+        Read one JSON line from the container's stdout.
+
+        Raises:
+            TimeoutError: If no full line arrives in time
+            EOFError: If the container closed the stream
+        """
+        deadline = time.monotonic() + timeout
+        while b"\n" not in self._buffer:
+            # Multiplexed frame: stream type (1 byte), 3 padding, size (4 bytes)
+            header = self._recv_exact(8, deadline)
+            stream_type = header[0]
+            size = struct.unpack(">I", header[4:])[0]
+            payload = self._recv_exact(size, deadline)
+            if stream_type == 1:  # stdout; stderr frames are dropped
+                self._buffer += payload
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return json.loads(line)
+
+    def _recv_exact(self, size: int, deadline: float) -> bytes:
+        data = b""
+        while len(data) < size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError
+            self._sock.settimeout(remaining)
+            # socket.timeout is TimeoutError on Python 3.10+
+            chunk = self._sock.recv(size - len(data))
+            if not chunk:
+                raise EOFError("container closed its output stream")
+            data += chunk
+        return data
+
+    def close(self) -> None:
+        try:
+            self._sock.close()
+        except OSError:
+            pass
+
+
+class _PooledContainer:
+    """A running job-loop container and its attach channel."""
+
+    def __init__(self, client: Any, config: Dict[str, Any]):
+        self.container = client.containers.run(**config)
+        self.channel = _Channel(
+            self.container.attach_socket(
+                params={"stdin": 1, "stdout": 1, "stderr": 1, "stream": 1}
+            )
+        )
+        self.uses = 0
+        self.last_used = time.monotonic()
+
+    def healthy(self) -> bool:
+        """Container is running and answers a ping."""
+        try:
+            self.container.reload()
+            if getattr(self.container, "status", "running") != "running":
+                return False
+            self.channel.send_line('{"ping": true}')
+            return self.channel.read_line(PING_TIMEOUT).get("pong") is True
+        except Exception:
+            return False
+
+    def stop(self) -> None:
+        self.channel.close()
+        try:
+            self.container.kill()
+        except Exception:
+            pass  # Already exited
+        try:
+            self.container.remove(force=True)
+        except Exception:
+            pass  # Auto-removed
+
+
+class ContainerPool:
+    """
+    Pool of warm, locked-down job-loop containers for one resource profile.
+
+    Attributes:
+        image: Docker image
+        size: Number of containers kept running
+        max_uses: Jobs per container before it is replaced
+        health_check_interval: Idle seconds after which a container is
+            checked before reuse
+
+    Example:
+        >>> pool = ContainerPool(docker.from_env(), "python:3.11-slim", size=2)
+        >>> pool.execute("result = 6 * 7", {}).output
+        '42'
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        image: str,
+        cpu: float = 1.0,
+        memory: str = "512m",
+        network_enabled: bool = True,
+        size: int = DEFAULT_POOL_SIZE,
+        max_uses: int = DEFAULT_MAX_USES,
+        health_check_interval: float = DEFAULT_HEALTH_CHECK_INTERVAL,
+    ):
+        """
+        Initialize the pool and start its containers.
+
+        Args:
+            client: docker-py client (or stand-in with the same API)
+            image: Image to run (must contain python)
+            cpu: CPU limit per container in cores
+            memory: Memory limit per container
+            network_enabled: False to disable networking
+            size: Number of containers (must be >= 1)
+            max_uses: Jobs per container before recycling (must be >= 1)
+            health_check_interval: Idle seconds before a pre-use health check
+
+        Raises:
+            ValueError: If size or max_uses is less than 1
+        """
+        if size < 1:
+            raise ValueError(f"size must be >= 1, got {size}")
+        if max_uses < 1:
+            raise ValueError(f"max_uses must be >= 1, got {max_uses}")
+
+        self.client = client
+        self.image = image
+        self.size = size
+        self.max_uses = max_uses
+        self.health_check_interval = health_check_interval
+        self._config = {
+            **locked_down_config(image, cpu, memory, network_enabled),
+            "command": ["python", "-u", "-c", RUNNER_SOURCE],
+            "stdin_open": True,
+            "remove": True,
+        }
+        self._idle: "queue.LifoQueue[_PooledContainer]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._counters = {"executions": 0, "recycled": 0, "timeouts": 0, "unhealthy": 0}
+
+        for _ in range(size):
+            self._idle.put(_PooledContainer(client, self._config))
+
+    def execute(self, code: str, inputs: Dict[str, Any], timeout: int = 30) -> SandboxResult:
+        """
+        Run code in a warm container, waiting for one if all are busy.
+
+        Args:
+            code: Python code to execute
+            inputs: JSON-serializable inputs, exposed as 'inputs'
+            timeout: Maximum execution time in seconds
+
+        Returns:
+            SandboxResult (output is str(result), as for cold runs)
+
+        Raises:
+            RuntimeError: If the pool has been closed
+        """
+        start_time = time.time()
+        try:
+            job = json.dumps({"code": code, "inputs": inputs})
+        except (TypeError, ValueError) as e:
+            return SandboxResult(
+                success=False,
+                output=None,
+                error=f"Inputs are not JSON-serializable: {e}",
+                execution_time=time.time() - start_time,
+            )
+
+        pooled = self._acquire()
+        try:
+            pooled.channel.send_line(job)
+            reply = pooled.channel.read_line(timeout)
+        except TimeoutError:
+            self._replace(pooled, counter="timeouts")
+            error_msg = f"Execution exceeded timeout of {timeout} seconds"
+            logger.warning(error_msg)
+            return SandboxResult(
+                success=False,
+                output=None,
+                error=error_msg,
+                execution_time=time.time() - start_time,
+            )
+        except Exception as e:
+            self._replace(pooled, counter="unhealthy")
+            return SandboxResult(
+                success=False,
+                output=None,
+                error=f"Container execution error: {type(e).__name__}: {e}",
+                execution_time=time.time() - start_time,
+            )
+
+        pooled.uses += 1
+        pooled.last_used = time.monotonic()
+        with self._lock:
+            self._counters["executions"] += 1
+        if pooled.uses >= self.max_uses:
+            self._replace(pooled, counter="recycled")
+        else:
+            self._release(pooled)
+
+        execution_time = time.time() - start_time
+        if reply.get("success"):
+            return SandboxResult(
+                success=True,
+                output=reply.get("output"),
+                error=None,
+                execution_time=execution_time,
+                stdout=reply.get("stdout", ""),
+            )
+        return SandboxResult(
+            success=False,
+            output=None,
+            error=reply.get("error", "Unknown error"),
+            execution_time=execution_time,
+            stdout=reply.get("stdout", ""),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict with size, idle, executions, recycled, timeouts and unhealthy
+        """
+        with self._lock:
+            return {"size": self.size, "idle": self._idle.qsize(), **self._counters}
+
+    def close(self) -> None:
+        """Stop all containers. Busy containers are stopped when returned."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> "ContainerPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _acquire(self) -> _PooledContainer:
+        while True:
+            if self._closed:
+                raise RuntimeError("ContainerPool is closed")
+            pooled = self._idle.get()
+            idle_for = time.monotonic() - pooled.last_used
+            if idle_for < self.health_check_interval or pooled.healthy():
+                return pooled
+            logger.info("Replacing unhealthy sandbox container")
+            self._replace(pooled, counter="unhealthy")
+
+    def _release(self, pooled: _PooledContainer) -> None:
+        if self._closed:
+            pooled.stop()
+        else:
+            self._idle.put(pooled)
+
+    def _replace(self, pooled: _PooledContainer, counter: Optional[str] = None) -> None:
+        pooled.stop()
+        if counter:
+            with self._lock:
+                self._counters[counter] += 1
+        if not self._closed:
+            self._idle.put(_PooledContainer(self.client, self._config))
+
+
+# Process-wide pools keyed by client, image and resource profile (executors
+# without an injected client all use get_docker_client(), so keys match)
+_pools: Dict[Hashable, ContainerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_container_pool(
+    client: Any,
+    image: str,
+    resources: Optional[Dict[str, Any]] = None,
+    prepare: Optional[Callable[[Any], None]] = None,
+) -> ContainerPool:
+    """
+    Get (or start) the shared container pool for a resource profile.
+
+    Args:
+        client: docker-py client (or stand-in)
+        image: Docker image
+        resources: Resource dict (cpu, memory, network, pool_size, max_uses),
+            usually a preset from get_preset() plus overrides
+        prepare: Optional callable(client) run once before a new pool starts
+            (e.g. pulling the image)
+
+    Returns:
+        Shared ContainerPool
+    """
+    resources = resources or {}
+    cpu = resources.get("cpu", 1.0)
+    memory = resources.get("memory", "512m")
+    network_enabled = bool(resources.get("network", True))
+    key = (client, image, cpu, memory, network_enabled)
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            if prepare is not None:
+                prepare(client)
+            pool = _pools[key] = ContainerPool(
+                client,
+                image,
+                cpu=cpu,
+                memory=memory,
+                network_enabled=network_enabled,
+                size=resources.get("pool_size", DEFAULT_POOL_SIZE),
+                max_uses=resources.get("max_uses", DEFAULT_MAX_USES),
+            )
+        return pool
+
+
+def shutdown_container_pools() -> int:
+    """
+    Stop every shared container pool.
+
+    Returns:
+        Number of pools stopped
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+    return len(pools)
+
+
+atexit.register(shutdown_container_pools)
@@ -10,42 +10,53 @@ Design decisions:
 - Resource presets (low/medium/high/max) for common use cases
 - Network isolation via "none" mode
 - Automatic temp file cleanup in finally blocks
+- Optional warm container pool per resource profile (see container_pool.py);
+  presets carry the pool size
+- One process-wide docker client for executors created without a client,
+  so per-run executors share (rather than duplicate) warm pools
 """
 
 import logging
 import os
 import tempfile
+import threading
 import time
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Any
 
-from .base import SandboxExecutor, SandboxResult
+from .base import SafetyError, SandboxExecutor, SandboxResult
+from .container_pool import get_container_pool, locked_down_config
 
 logger = logging.getLogger(__name__)
 
 # Resource presets for different use cases
-# Each preset defines CPU, memory, and timeout limits
+# Each preset defines CPU, memory, and timeout limits, plus the number of
+# warm containers kept per profile when pooling is enabled
 RESOURCE_PRESETS: dict[str, dict[str, Any]] = {
     "low": {
         "cpu": 0.5,  # 50% of one CPU core
         "memory": "256m",  # 256 MB RAM
         "timeout": 30,  # 30 seconds
+        "pool_size": 4,  # Warm containers (pooled mode)
     },
     "medium": {
         "cpu": 1.0,  # 1 CPU core
         "memory": "512m",  # 512 MB RAM
         "timeout": 60,  # 60 seconds
+        "pool_size": 2,
     },
     "high": {
         "cpu": 2.0,  # 2 CPU cores
         "memory": "1g",  # 1 GB RAM
         "timeout": 120,  # 120 seconds
+        "pool_size": 1,
     },
     "max": {
         "cpu": 4.0,  # 4 CPU cores
         "memory": "2g",  # 2 GB RAM
         "timeout": 300,  # 300 seconds (5 minutes)
+        "pool_size": 1,
     },
 }
 
@@ -58,7 +69,7 @@ def get_preset(name: str) -> dict[str, Any]:
         name: Preset name ('low', 'medium', 'high', 'max')
 
     Returns:
-        Dict with cpu, memory, and timeout values
+        Dict with cpu, memory, timeout and pool_size values
 
     Raises:
         ValueError: If preset name is unknown
@@ -71,6 +82,29 @@ def get_preset(name: str) -> dict[str, Any]:
     return RESOURCE_PRESETS[name].copy()
 
 
+# Process-wide docker client shared by executors without an injected client
+_shared_client: Any = None
+_shared_client_lock = threading.Lock()
+
+
+def get_docker_client() -> Any:
+    """
+    Get the process-wide docker client (created on first use).
+
+    Container pools are keyed by client, so executors sharing this client
+    also share warm pools for the same image and resource profile.
+
+    Returns:
+        docker-py client from docker.from_env()
+    """
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            import docker
+            _shared_client = docker.from_env()
+        return _shared_client
+
+
 def _docker_available() -> bool:
     """
     Check if Docker daemon is available.
@@ -79,8 +113,7 @@ def _docker_available() -> bool:
         True if Docker is available and running, False otherwise
     """
     try:
-        import docker
-        client = docker.from_env()
+        client = get_docker_client()
         client.ping()
         return True
     except Exception:
@@ -159,21 +192,32 @@ class DockerSandboxExecutor(SandboxExecutor):
             timeout=30,
             resources={"cpu": 1.0, "memory": "512m"}
         )
+
+        # Warm containers, reused across executions with the same resources
+        executor = DockerSandboxExecutor(pooled=True)
     """
 
     def __init__(
         self,
         image_name: str = "python:3.11-slim",
+        client: Any = None,
+        pooled: bool = False,
     ) -> None:
         """
         Initialize Docker sandbox executor.
 
         Args:
             image_name: Docker image to use for execution
+            client: Docker client to use (default: the process-wide client
+                from get_docker_client()). Any object with the docker-py
+                containers/images API works.
+            pooled: Run code in shared warm containers (see ContainerPool)
+                instead of starting a container per execution
         """
         self.image_name = image_name
-        self._docker_client = None
-        self._available = None  # Cached availability check
+        self.pooled = pooled
+        self._docker_client = client
+        self._available = True if client is not None else None  # Cached availability check
 
     def _check_available(self) -> bool:
         """
@@ -207,11 +251,18 @@ class DockerSandboxExecutor(SandboxExecutor):
             )
 
         if self._docker_client is None:
-            import docker
-            self._docker_client = docker.from_env()
+            self._docker_client = get_docker_client()
 
         return self._docker_client
 
+    def _ensure_image(self, client: Any) -> None:
+        """Pull the image if it is not present locally."""
+        try:
+            client.images.get(self.image_name)
+        except Exception:
+            logger.info(f"Pulling Docker image {self.image_name}...")
+            client.images.pull(self.image_name)
+
     def _validate_code(self, code: str) -> None:
         """
         Validate code for execution in Docker.
@@ -248,7 +299,8 @@ class DockerSandboxExecutor(SandboxExecutor):
             code: Python code to execute
             inputs: Input variables available as 'inputs' dict
             timeout: Maximum execution time in seconds
-            resources: Resource limits dict (cpu, memory, network)
+            resources: Resource limits dict (cpu, memory, network; pooled
+                mode also reads pool_size and max_uses)
 
         Returns:
             SandboxResult with execution outcome
@@ -271,29 +323,25 @@ class DockerSandboxExecutor(SandboxExecutor):
             # Check Docker availability
             client = self._get_client()
 
+            if self.pooled:
+                pool = get_container_pool(
+                    client,
+                    self.image_name,
+                    {**resources, "cpu": cpu, "memory": memory, "network": network_enabled},
+                    prepare=self._ensure_image,
+                )
+                return pool.execute(code, inputs, timeout)
+
             # Ensure image is available
-            try:
-                client.images.get(self.image_name)
-            except Exception:
-                logger.info(f"Pulling Docker image {self.image_name}...")
-                client.images.pull(self.image_name)
+            self._ensure_image(client)
 
             # Create temp file with code
             with _temp_code_file(code, inputs) as code_file:
                 # Configure container
                 container_config = {
-                    "image": self.image_name,
+                    **locked_down_config(self.image_name, cpu, memory, network_enabled),
                     "command": ["python", str(code_file)],
-                    "detach": True,
                     "remove": True,  # Automatically remove container on exit
-                    "mem_limit": memory,
-                    "memswap_limit": memory,  # No swap
-                    "cpu_quota": int(cpu * 100000),  # CPU quota in microseconds
-                    "cpu_period": 100000,  # CPU period in microseconds
-                    "read_only": True,  # Read-only root filesystem
-                    "security_opt": ["no-new-privileges"],  # Prevent privilege escalation
-                    "cap_drop": ["ALL"],  # Drop all capabilities
-                    "network_mode": "default" if network_enabled else "none",
                     # Mount temp directory as read-write volume
                     "volumes": {
                         str(code_file.parent): {
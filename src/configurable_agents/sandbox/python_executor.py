@@ -7,16 +7,21 @@ Python functionality for legitimate use cases.
 
 Design decisions:
 - Uses RestrictedPython.compile_restricted() for AST-based safety
+- Validation + compilation cached per code string (code nodes rerun the
+  same code on every execution)
 - Safe builtins only (no file I/O, subprocess, eval, etc.)
-- Timeout via func_timeout library (cross-platform)
+- Timeout via func_timeout library (cross-platform) in-process, or via a
+  warm SandboxWorkerPool of worker processes (see worker_pool.py)
 - Return value via 'result' variable (user code should assign to 'result')
-- Captures stdout/stderr for debugging
+- print() output captured per execution (no global sys.stdout swap, so
+  concurrent executions in different threads do not mix output)
 """
 
 import io
 import logging
 import time
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
 
 # RestrictedPython for AST-based code restriction
 from RestrictedPython import compile_restricted
@@ -29,6 +34,9 @@ from func_timeout import FunctionTimedOut, func_timeout
 
 from .base import SafetyError, SandboxExecutor, SandboxResult
 
+if TYPE_CHECKING:
+    from .worker_pool import SandboxWorkerPool
+
 logger = logging.getLogger(__name__)
 
 
@@ -90,17 +98,26 @@ class _SafePrint:
     """Safe print wrapper for RestrictedPython.
 
     RestrictedPython's print transformation instantiates this class
-    and then calls _call_print on the instance.
+    and then calls _call_print on the instance. Output goes to the class'
+    stream (sys.stdout unless bound to a buffer via _bind_print).
     """
 
+    stream: Optional[io.StringIO] = None
+
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         """Initialize (called by RestrictedPython's bytecode)."""
         pass
 
     def _call_print(self, *args: Any, **kwargs: Any) -> None:
         """Print function that RestrictedPython will call."""
+        kwargs.setdefault("file", self.stream)
         print(*args, **kwargs)
 
+
+def _bind_print(stream: io.StringIO) -> type:
+    """Create a _SafePrint class that writes to one execution's buffer."""
+    return type("_SafePrint", (_SafePrint,), {"stream": stream})
+
 # Safe builtins available in sandbox execution
 # Excludes: open, __import__, eval, exec, compile, etc.
 SAFE_BUILTINS: dict[str, Any] = {
@@ -159,6 +176,111 @@ SAFE_BUILTINS: dict[str, Any] = {
 _SANDBOX_BUILTINS = {**safe_builtins, **SAFE_BUILTINS}
 
 
+# Maximum number of distinct code strings kept compiled
+COMPILE_CACHE_SIZE = 256
+
+_DANGEROUS_PATTERNS = (
+    "__import__",
+    "__builtins__",
+    "globals()",
+    "locals()",
+    "vars()",
+)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def compile_sandboxed(code: str) -> Any:
+    """
+    Validate and compile code with RestrictedPython (cached per code string).
+
+    Failures are not cached, so a rejected snippet raises on every call.
+
+    Args:
+        code: Python code to compile
+
+    Returns:
+        Restricted code object
+
+    Raises:
+        SafetyError: If code contains unsafe or invalid operations
+    """
+    # compile_restricted raises SyntaxError if there are security violations
+    try:
+        code_obj = compile_restricted(
+            code,
+            filename="<sandbox>",
+            mode="exec",
+        )
+    except SyntaxError as e:
+        # Convert SyntaxError to SafetyError
+        raise SafetyError(
+            f"Code contains unsafe or invalid operations: {e}",
+            code_snippet=code[:200],
+        )
+
+    # Additional validation: check for explicit attempts to access builtins
+    # Note: RestrictedPython already blocks most of these at compile time
+    # This is an extra layer for patterns that might slip through
+    code_lower = code.lower()
+    for pattern in _DANGEROUS_PATTERNS:
+        if pattern in code_lower:
+            raise SafetyError(
+                f"Code contains potentially dangerous pattern: '{pattern}'",
+                code_snippet=code[:200],
+            )
+
+    # Check for eval/exec (these might not always be caught by AST)
+    if "eval(" in code_lower or "exec(" in code_lower:
+        raise SafetyError(
+            "Code contains potentially dangerous function: eval() or exec()",
+            code_snippet=code[:200],
+        )
+
+    return code_obj
+
+
+def build_restricted_globals() -> dict[str, Any]:
+    """
+    Build the restricted globals dict for code execution.
+
+    Returns:
+        Dict with safe builtins and RestrictedPython guards
+    """
+    return {
+        "__builtins__": _SANDBOX_BUILTINS,
+        "__name__": "__sandbox__",
+        "_getattr_": _safe_getattr,  # Custom getattr that allows _call_print
+        "_getiter_": iter,  # Safe iteration
+        "_iter_unpack_sequence_": guarded_iter_unpack_sequence,
+        "_unpack_sequence_": guarded_unpack_sequence,
+        "_getitem_": lambda x, i: x[i],  # Safe item access for subscript
+        "_print_": _SafePrint,  # RestrictedPython-compatible print class (not instance!)
+    }
+
+
+def prepare_globals(
+    base_globals: dict[str, Any],
+    inputs: dict[str, Any],
+    stdout: io.StringIO,
+) -> dict[str, Any]:
+    """
+    Copy the restricted globals for one execution.
+
+    Args:
+        base_globals: Result of build_restricted_globals()
+        inputs: Input variables exposed as 'inputs'
+        stdout: Buffer that receives print() output
+
+    Returns:
+        Fresh globals dict
+    """
+    exec_globals = base_globals.copy()
+    exec_globals["_print_"] = _bind_print(stdout)
+    exec_globals["inputs"] = inputs
+    exec_globals["result"] = None  # Initialize result variable
+    return exec_globals
+
+
 def _execute_with_timeout(
     code_obj: Any,
     globals_dict: dict[str, Any],
@@ -207,7 +329,7 @@ class PythonSandboxExecutor(SandboxExecutor):
     - Blocks: import statements, file I/O, subprocess, eval, exec
     - Safe builtins only (no open, __import__, compile, etc.)
     - Attribute access guarded (prevents access to dangerous attributes)
-    - Timeout enforcement via func_timeout
+    - Timeout enforcement via func_timeout (or worker kill when pooled)
 
     Usage:
         Code should assign its return value to 'result' variable:
@@ -217,9 +339,17 @@ class PythonSandboxExecutor(SandboxExecutor):
     so we use 'result' instead of '__result'.
     """
 
-    def __init__(self) -> None:
-        """Initialize the Python sandbox executor."""
+    def __init__(self, pool: Optional["SandboxWorkerPool"] = None) -> None:
+        """
+        Initialize the Python sandbox executor.
+
+        Args:
+            pool: Optional warm worker pool. When given, code runs in a pooled
+                worker process (process isolation, hard timeouts, memory
+                limits) instead of in this process.
+        """
         self._restricted_globals = self._build_restricted_globals()
+        self._pool = pool
 
     def _build_restricted_globals(self) -> dict[str, Any]:
         """
@@ -228,23 +358,14 @@ class PythonSandboxExecutor(SandboxExecutor):
         Returns:
             Dict with safe builtins and RestrictedPython guards
         """
-        return {
-            "__builtins__": _SANDBOX_BUILTINS,
-            "__name__": "__sandbox__",
-            "_getattr_": _safe_getattr,  # Custom getattr that allows _call_print
-            "_getiter_": iter,  # Safe iteration
-            "_iter_unpack_sequence_": guarded_iter_unpack_sequence,
-            "_unpack_sequence_": guarded_unpack_sequence,
-            "_getitem_": lambda x, i: x[i],  # Safe item access for subscript
-            "_print_": _SafePrint,  # RestrictedPython-compatible print class (not instance!)
-        }
+        return build_restricted_globals()
 
     def _validate_code(self, code: str) -> None:
         """
         Validate code for security issues before execution.
 
         Uses RestrictedPython's compile_restricted() to detect
-        unsafe operations at AST level.
+        unsafe operations at AST level. Results are cached per code string.
 
         Args:
             code: Python code to validate
@@ -252,46 +373,7 @@ class PythonSandboxExecutor(SandboxExecutor):
         Raises:
             SafetyError: If code contains unsafe operations
         """
-        # Try to compile with restrictions
-        # compile_restricted raises SyntaxError if there are security violations
-        try:
-            compile_restricted(
-                code,
-                filename="<sandbox>",
-                mode="exec",
-            )
-        except SyntaxError as e:
-            # Convert SyntaxError to SafetyError
-            raise SafetyError(
-                f"Code contains unsafe or invalid operations: {e}",
-                code_snippet=code[:200],
-            )
-
-        # Additional validation: check for explicit attempts to access builtins
-        # Note: RestrictedPython already blocks most of these at compile time
-        # This is an extra layer for patterns that might slip through
-        dangerous_patterns = [
-            "__import__",
-            "__builtins__",
-            "globals()",
-            "locals()",
-            "vars()",
-        ]
-
-        code_lower = code.lower()
-        for pattern in dangerous_patterns:
-            if pattern in code_lower:
-                raise SafetyError(
-                    f"Code contains potentially dangerous pattern: '{pattern}'",
-                    code_snippet=code[:200],
-                )
-
-        # Check for eval/exec (these might not always be caught by AST)
-        if "eval(" in code_lower or "exec(" in code_lower:
-            raise SafetyError(
-                "Code contains potentially dangerous function: eval() or exec()",
-                code_snippet=code[:200],
-            )
+        compile_sandboxed(code)
 
     def execute(
         self,
@@ -315,70 +397,50 @@ class PythonSandboxExecutor(SandboxExecutor):
         """
         start_time = time.time()
 
-        # Capture stdout/stderr
+        # Capture print() output for this execution only
         stdout_capture = io.StringIO()
         stderr_capture = io.StringIO()
 
         try:
-            # Step 1: Validate code for security issues
-            self._validate_code(code)
-
-            # Step 2: Compile with restrictions
-            # compile_restricted returns a code object on success
-            code_obj = compile_restricted(
-                code,
-                filename="<sandbox>",
-                mode="exec",
-            )
+            # Step 1: Validate and compile (cached per code string)
+            code_obj = compile_sandboxed(code)
 
-            # Step 3: Prepare execution environment
-            exec_globals = self._restricted_globals.copy()
-            exec_globals["inputs"] = inputs
-            exec_globals["result"] = None  # Initialize result variable
-
-            # Redirect stdout/stderr during execution
-            import sys
-
-            original_stdout = sys.stdout
-            original_stderr = sys.stderr
-            sys.stdout = stdout_capture
-            sys.stderr = stderr_capture
-
-            try:
-                # Step 4: Execute with timeout
-                success, _, error_msg = _execute_with_timeout(
-                    code_obj,
-                    exec_globals,
-                    timeout,
-                )
+            if self._pool is not None:
+                return self._pool.execute(code, inputs, timeout)
 
-                execution_time = time.time() - start_time
+            # Step 2: Prepare execution environment
+            exec_globals = prepare_globals(self._restricted_globals, inputs, stdout_capture)
 
-                if not success:
-                    return SandboxResult(
-                        success=False,
-                        output=None,
-                        error=error_msg,
-                        execution_time=execution_time,
-                        stderr=stderr_capture.getvalue(),
-                    )
+            # Step 3: Execute with timeout
+            success, _, error_msg = _execute_with_timeout(
+                code_obj,
+                exec_globals,
+                timeout,
+            )
 
-                # Step 5: Extract result from special 'result' variable
-                result_value = exec_globals.get("result", None)
+            execution_time = time.time() - start_time
 
+            if not success:
                 return SandboxResult(
-                    success=True,
-                    output=result_value,
-                    error=None,
+                    success=False,
+                    output=None,
+                    error=error_msg,
                     execution_time=execution_time,
                     stdout=stdout_capture.getvalue(),
                     stderr=stderr_capture.getvalue(),
                 )
 
-            finally:
-                # Restore stdout/stderr
-                sys.stdout = original_stdout
-                sys.stderr = original_stderr
+            # Step 4: Extract result from special 'result' variable
+            result_value = exec_globals.get("result", None)
+
+            return SandboxResult(
+                success=True,
+                output=result_value,
+                error=None,
+                execution_time=execution_time,
+                stdout=stdout_capture.getvalue(),
+                stderr=stderr_capture.getvalue(),
+            )
 
         except SafetyError as e:
             execution_time = time.time() - start_time
@@ -0,0 +1,417 @@
+"""
+Warm worker-process pool for the RestrictedPython sandbox.
+
+PythonSandboxExecutor runs code in the calling process: timeouts rely on a
+helper thread that cannot stop a runaway loop, and there is no memory limit.
+SandboxWorkerPool keeps a few worker processes started ahead of time and
+sends them code and inputs over a pipe instead.
+
+Design decisions:
+- Workers cache compiled code objects keyed by SHA-256 of the code; the
+  parent remembers which worker has which digest and sends the source only
+  on a worker's first execution of it
+- Timeouts are enforced by the parent: a worker that does not reply in
+  time is killed and replaced (the runaway code really stops)
+- Memory limit applied per worker via RLIMIT_AS (POSIX only; ignored
+  elsewhere)
+- Workers are recycled after max_tasks_per_worker executions to bound
+  leaks and cache growth
+- Idle workers are reused LIFO so the warmest caches stay hot
+- Inputs and results travel by pickle; unpicklable values fail the
+  execution with an error result instead of crashing the worker
+"""
+
+import atexit
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+
+from .base import SafetyError, SandboxResult
+from .python_executor import build_restricted_globals, compile_sandboxed, prepare_globals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_TASKS_PER_WORKER = 500
+
+_MEMORY_UNITS = {"k": 1 / 1024, "m": 1, "g": 1024}
+
+# Reply sent by workers: (success, output, error, stdout, cached), where
+# cached tells whether the worker now holds the compiled code
+_Reply = Tuple[bool, Any, Optional[str], str, bool]
+
+
+def parse_memory_limit(value: Any) -> Optional[int]:
+    """
+    Parse a Docker-style memory limit ("512m", "1g", 256) into megabytes.
+
+    Args:
+        value: String with k/m/g suffix, number of megabytes, or None
+
+    Returns:
+        Limit in megabytes, or None if value is empty
+
+    Raises:
+        ValueError: If the value cannot be parsed
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    text = str(value).strip().lower().rstrip("b")
+    unit = _MEMORY_UNITS.get(text[-1:]) if text else None
+    try:
+        if unit is not None:
+            return max(1, int(float(text[:-1]) * unit))
+        return int(text)
+    except ValueError:
+        raise ValueError(f"Invalid memory limit: {value!r}") from None
+
+
+def _apply_memory_limit(memory_limit_mb: Optional[int]) -> None:
+    """Cap this process' address space (no-op where unsupported)."""
+    if not memory_limit_mb:
+        return
+    try:
+        import resource
+    except ImportError:  # Windows
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    except (ValueError, OSError):
+        pass
+
+
+def _worker_main(conn: Any, memory_limit_mb: Optional[int]) -> None:
+    """
+    Worker process loop: receive (digest, code, inputs), reply with a _Reply.
+
+    code is None when the parent expects the digest to be cached already. A
+    None message or a closed pipe ends the loop.
+    """
+    _apply_memory_limit(memory_limit_mb)
+    base_globals = build_restricted_globals()
+    compiled: Dict[str, Any] = {}
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if message is None:
+            break
+
+        digest, code, inputs = message
+        stdout = io.StringIO()
+        code_obj = compiled.get(digest)
+        if code_obj is None:
+            if code is None:
+                conn.send((False, None, "Code is not cached in the sandbox worker", "", False))
+                continue
+            try:
+                code_obj = compiled[digest] = compile_sandboxed(code)
+            except SafetyError as e:
+                conn.send((False, None, f"Safety violation: {e.message}", "", False))
+                continue
+
+        exec_globals = prepare_globals(base_globals, inputs, stdout)
+        try:
+            exec(code_obj, exec_globals)
+            reply: _Reply = (True, exec_globals.get("result"), None, stdout.getvalue(), True)
+        except MemoryError:
+            reply = (False, None, "Code execution exceeded memory limits", stdout.getvalue(), True)
+        except Exception as e:
+            reply = (
+                False,
+                None,
+                f"Runtime error during execution: {type(e).__name__}: {e}",
+                stdout.getvalue(),
+                True,
+            )
+
+        try:
+            conn.send(reply)
+        except Exception as e:
+            conn.send(
+                (
+                    False,
+                    None,
+                    f"Result is not transferable: {type(e).__name__}: {e}",
+                    reply[3],
+                    True,
+                )
+            )
+
+
+class _Worker:
+    """Parent-side handle for one worker process."""
+
+    def __init__(self, context: Any, memory_limit_mb: Optional[int]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_mb),
+            daemon=True,
+            name="sandbox-worker",
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        self.known: Set[str] = set()
+
+    def stop(self, kill: bool = False) -> None:
+        """Stop the worker (politely unless kill is set)."""
+        if not kill:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                kill = True
+        if kill:
+            self.process.kill()
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1)
+        self.conn.close()
+
+
+class SandboxWorkerPool:
+    """
+    Pool of pre-started sandbox worker processes.
+
+    Attributes:
+        size: Number of worker processes
+        max_tasks_per_worker: Executions before a worker is replaced
+        memory_limit_mb: Address-space limit per worker (None for no limit)
+
+    Example:
+        >>> with SandboxWorkerPool(size=2) as pool:
+        ...     executor = PythonSandboxExecutor(pool=pool)
+        ...     executor.execute("result = 1 + 1", {}).output
+        2
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER,
+        memory_limit_mb: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize the pool and start its workers.
+
+        Args:
+            size: Number of worker processes (must be >= 1)
+            max_tasks_per_worker: Executions before recycling (must be >= 1)
+            memory_limit_mb: Optional per-worker memory limit in megabytes
+            start_method: multiprocessing start method (default: "forkserver"
+                where available, otherwise "spawn")
+
+        Raises:
+            ValueError: If size or max_tasks_per_worker is less than 1
+        """
+        if size < 1:
+            raise ValueError(f"size must be >= 1, got {size}")
+        if max_tasks_per_worker < 1:
+            raise ValueError(f"max_tasks_per_worker must be >= 1, got {max_tasks_per_worker}")
+
+        if start_method is None:
+            available = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in available else "spawn"
+
+        self.size = size
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.memory_limit_mb = memory_limit_mb
+        self._context = multiprocessing.get_context(start_method)
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._counters = {"executions": 0, "recycled": 0, "timeouts": 0, "crashes": 0}
+
+        for _ in range(size):
+            self._idle.put(self._spawn())
+
+    def execute(self, code: str, inputs: Dict[str, Any], timeout: int = 30) -> SandboxResult:
+        """
+        Run code in an idle worker, waiting for one if all are busy.
+
+        Args:
+            code: Python code (validated with RestrictedPython by the worker)
+            inputs: Picklable input variables, exposed as 'inputs'
+            timeout: Maximum execution time in seconds
+
+        Returns:
+            SandboxResult with execution outcome
+
+        Raises:
+            RuntimeError: If the pool has been closed
+        """
+        start_time = time.time()
+        digest = hashlib.sha256(code.encode("utf-8")).hexdigest()
+        worker = self._acquire()
+
+        try:
+            payload = None if digest in worker.known else code
+            try:
+                worker.conn.send((digest, payload, inputs))
+            except (OSError, ValueError) as e:
+                return self._crashed(worker, start_time, e)
+            except Exception as e:
+                # Pickling failed before anything was written; worker is fine
+                self._release(worker)
+                return SandboxResult(
+                    success=False,
+                    output=None,
+                    error=f"Inputs are not transferable: {type(e).__name__}: {e}",
+                    execution_time=time.time() - start_time,
+                )
+
+            if not worker.conn.poll(timeout):
+                self._replace(worker, kill=True, counter="timeouts")
+                error_msg = f"Code execution exceeded timeout of {timeout} seconds"
+                logger.warning(error_msg)
+                return SandboxResult(
+                    success=False,
+                    output=None,
+                    error=error_msg,
+                    execution_time=time.time() - start_time,
+                )
+
+            try:
+                success, output, error, stdout, cached = worker.conn.recv()
+            except (EOFError, OSError) as e:
+                return self._crashed(worker, start_time, e)
+        except BaseException:
+            self._replace(worker, kill=True)
+            raise
+
+        if cached:
+            worker.known.add(digest)
+        else:
+            worker.known.discard(digest)
+        worker.tasks += 1
+        with self._lock:
+            self._counters["executions"] += 1
+        if worker.tasks >= self.max_tasks_per_worker:
+            self._replace(worker, counter="recycled")
+        else:
+            self._release(worker)
+
+        return SandboxResult(
+            success=success,
+            output=output,
+            error=error,
+            execution_time=time.time() - start_time,
+            stdout=stdout,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Get pool statistics.
+
+        Returns:
+            Dict with size, idle, executions, recycled, timeouts and crashes
+        """
+        with self._lock:
+            return {"size": self.size, "idle": self._idle.qsize(), **self._counters}
+
+    def close(self) -> None:
+        """Stop all workers. Busy workers are stopped when they are returned."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
+
+    def __enter__(self) -> "SandboxWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.memory_limit_mb)
+
+    def _acquire(self) -> _Worker:
+        if self._closed:
+            raise RuntimeError("SandboxWorkerPool is closed")
+        return self._idle.get()
+
+    def _release(self, worker: _Worker) -> None:
+        if self._closed:
+            worker.stop()
+        else:
+            self._idle.put(worker)
+
+    def _replace(self, worker: _Worker, kill: bool = False, counter: Optional[str] = None) -> None:
+        """Stop a worker and put a fresh one in its place."""
+        worker.stop(kill=kill)
+        if counter:
+            with self._lock:
+                self._counters[counter] += 1
+        if not self._closed:
+            self._idle.put(self._spawn())
+
+    def _crashed(self, worker: _Worker, start_time: float, error: Exception) -> SandboxResult:
+        exit_code = worker.process.exitcode
+        self._replace(worker, kill=True, counter="crashes")
+        error_msg = f"Sandbox worker exited unexpectedly (exit code {exit_code}): {error}"
+        logger.warning(error_msg)
+        return SandboxResult(
+            success=False,
+            output=None,
+            error=error_msg,
+            execution_time=time.time() - start_time,
+        )
+
+
+# Process-wide pools, one per memory limit
+_pools: Dict[Optional[int], SandboxWorkerPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_sandbox_pool(memory_limit_mb: Optional[int] = None) -> SandboxWorkerPool:
+    """
+    Get (or start) the process-wide worker pool for a memory limit.
+
+    Args:
+        memory_limit_mb: Per-worker memory limit in megabytes (None for none)
+
+    Returns:
+        Shared SandboxWorkerPool
+    """
+    with _pools_lock:
+        pool = _pools.get(memory_limit_mb)
+        if pool is None:
+            pool = _pools[memory_limit_mb] = SandboxWorkerPool(memory_limit_mb=memory_limit_mb)
+        return pool
+
+
+def shutdown_sandbox_pools() -> int:
+    """
+    Stop every process-wide worker pool.
+
+    Returns:
+        Number of pools stopped
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+    return len(pools)
+
+
+atexit.register(shutdown_sandbox_pools)
@@ -13,17 +13,36 @@ Public API:
     - MemoryRepository: Interface for agent memory storage
     - WorkflowRegistrationRepository: Interface for webhook workflow registration
     - OrchestratorRepository: Interface for orchestrator registry storage
+    - MetricsRollupRepository: Interface for pre-aggregated run metrics
+    - CostLedgerRepository: Interface for the append-only cost ledger
+    - CostLedgerEntry: Per-run, per-model usage kept in the cost ledger
+    - CostLedgerFilter: Filters applied inside cost ledger queries
+    - WorkflowJobRepository: Interface for the webhook workflow job queue
+    - WorkflowJob: A queued webhook-triggered workflow run
+    - WorkflowRunSummary: Workflow run without payload columns (listings)
     - WorkflowRunRecord: ORM model for workflow runs
     - ExecutionStateRecord: ORM model for execution states
     - AgentRecord: ORM model for agent registry
+    - AgentCapabilityRecord: ORM model for the agent capability index
     - ChatSession: ORM model for chat sessions
     - ChatMessage: ORM model for chat messages
     - WebhookEventRecord: ORM model for webhook events
     - MemoryRecord: ORM model for agent memory
+    - MemoryChangeRecord: ORM model for the memory change log
     - WorkflowRegistrationRecord: ORM model for workflow registrations
     - OrchestratorRecord: ORM model for orchestrators
+    - MetricsRollupRecord: ORM model for run metrics rollups
+    - MetricsDurationBinRecord: ORM model for rollup duration histograms
+    - CostLedgerRecord: ORM model for cost ledger rows
+    - WorkflowJobRecord: ORM model for workflow job queue rows
     - Base: SQLAlchemy DeclarativeBase for all models
     - create_storage_backend: Factory function for creating repositories
+    - get_storage_backend: Process-wide shared repositories per storage location
+    - get_checkpoint_writer: Shared (batched) execution state writer
+    - get_job_repository: Shared webhook workflow job queue
+    - BatchedCheckpointWriter: Write-behind execution state repository
+    - RetentionScheduler: Background cleanup jobs with per-table purge metrics
+    - CachedWebhookEventRepository: Webhook idempotency with an in-memory recent-ID front
 
 Example:
     >>> from configurable_agents.storage import create_storage_backend
@@ -40,9 +59,27 @@ from configurable_agents.storage.base import (
     MemoryRepository,
     WorkflowRegistrationRepository,
     OrchestratorRepository,
+    MetricsRollupRepository,
+    CostLedgerRepository,
+    CostLedgerEntry,
+    CostLedgerFilter,
+    WorkflowRunSummary,
+    WorkflowJob,
+    WorkflowJobRepository,
+)
+from configurable_agents.storage.checkpoint import BatchedCheckpointWriter
+from configurable_agents.storage.factory import (
+    create_storage_backend,
+    dispose_storage_backends,
+    ensure_initialized,
+    get_checkpoint_writer,
+    get_job_repository,
+    get_pool_metrics,
+    get_storage_backend,
+    upgrade_schema,
 )
-from configurable_agents.storage.factory import create_storage_backend, ensure_initialized
 from configurable_agents.storage.models import (
+    AgentCapabilityRecord,
     AgentRecord,
     Base,
     ExecutionStateRecord,
@@ -51,9 +88,16 @@ from configurable_agents.storage.models import (
     ChatMessage,
     WebhookEventRecord,
     MemoryRecord,
+    MemoryChangeRecord,
     WorkflowRegistrationRecord,
     OrchestratorRecord,
+    MetricsRollupRecord,
+    MetricsDurationBinRecord,
+    CostLedgerRecord,
+    WorkflowJobRecord,
 )
+from configurable_agents.storage.idempotency import CachedWebhookEventRepository, RecentIdCache
+from configurable_agents.storage.retention import RetentionMetrics, RetentionScheduler
 
 __all__ = [
     # Abstract interfaces
@@ -65,18 +109,44 @@ __all__ = [
     "MemoryRepository",
     "WorkflowRegistrationRepository",
     "OrchestratorRepository",
+    "MetricsRollupRepository",
+    "CostLedgerRepository",
+    "CostLedgerEntry",
+    "CostLedgerFilter",
+    "WorkflowRunSummary",
+    "WorkflowJobRepository",
+    "WorkflowJob",
     # ORM models
     "Base",
     "WorkflowRunRecord",
     "ExecutionStateRecord",
     "AgentRecord",
+    "AgentCapabilityRecord",
     "ChatSession",
     "ChatMessage",
     "WebhookEventRecord",
     "MemoryRecord",
+    "MemoryChangeRecord",
     "WorkflowRegistrationRecord",
     "OrchestratorRecord",
+    "MetricsRollupRecord",
+    "MetricsDurationBinRecord",
+    "CostLedgerRecord",
+    "WorkflowJobRecord",
     # Factory
     "create_storage_backend",
     "ensure_initialized",
+    "upgrade_schema",
+    "get_storage_backend",
+    "get_checkpoint_writer",
+    "get_job_repository",
+    "BatchedCheckpointWriter",
+    "get_pool_metrics",
+    "dispose_storage_backends",
+    # Retention
+    "RetentionScheduler",
+    "RetentionMetrics",
+    # Webhook idempotency
+    "CachedWebhookEventRepository",
+    "RecentIdCache",
 ]
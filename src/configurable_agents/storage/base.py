@@ -9,8 +9,9 @@ reference.
 """
 
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 # Forward declarations for ORM models (avoiding circular import)
 # WorkflowRunRecord, ExecutionStateRecord, AgentRecord, ChatSession, and ChatMessage
@@ -84,6 +85,28 @@ class AgentRegistryRepository(ABC):
         """
         raise NotImplementedError
 
+    def update_heartbeats(self, heartbeats: Dict[str, datetime]) -> int:
+        """Write many agents' heartbeat timestamps at once.
+
+        The default implementation calls update_heartbeat() per agent (which
+        stamps the current time); backends should override it with a single
+        batched write of the given timestamps.
+
+        Args:
+            heartbeats: Dict mapping agent_id to its last heartbeat time
+
+        Returns:
+            Number of agents updated (unknown agents are skipped)
+        """
+        updated = 0
+        for agent_id in heartbeats:
+            try:
+                self.update_heartbeat(agent_id)
+                updated += 1
+            except ValueError:
+                pass
+        return updated
+
     @abstractmethod
     def delete(self, agent_id: str) -> None:
         """Delete an agent from the registry.
@@ -129,6 +152,21 @@ class AgentRegistryRepository(ABC):
         """
         raise NotImplementedError
 
+    def get_many(self, agent_ids: List[str]) -> List[Any]:
+        """Get several agents by ID.
+
+        The default implementation calls get() per ID; backends should
+        override it with a single batched lookup.
+
+        Args:
+            agent_ids: Agent identifiers (unknown IDs are ignored)
+
+        Returns:
+            List of found AgentRecord instances
+        """
+        agents = [self.get(agent_id) for agent_id in dict.fromkeys(agent_ids)]
+        return [agent for agent in agents if agent is not None]
+
     @abstractmethod
     def get_active_agents(self, cutoff_seconds: int = 60) -> List[Any]:
         """Get only active (recently heartbeating) agents.
@@ -149,6 +187,26 @@ class AgentRegistryRepository(ABC):
         raise NotImplementedError
 
 
+@dataclass(frozen=True)
+class WorkflowRunSummary:
+    """Workflow run without its JSON payload columns, for listings.
+
+    Carries what run tables, counters and streams display; config_snapshot,
+    inputs, outputs and bottleneck_info are never loaded (fetch the full
+    record with get() when needed).
+    """
+
+    id: str
+    workflow_name: str
+    status: str
+    started_at: datetime
+    completed_at: Optional[datetime]
+    duration_seconds: Optional[float]
+    total_tokens: Optional[int]
+    total_cost_usd: Optional[float]
+    error_message: Optional[str]
+
+
 class AbstractWorkflowRunRepository(ABC):
     """Abstract repository for workflow run persistence.
 
@@ -159,6 +217,8 @@ class AbstractWorkflowRunRepository(ABC):
         add: Persist a new workflow run
         get: Retrieve a single run by ID
         list_by_workflow: List runs for a specific workflow
+        list_runs: Keyset-paginated run summaries (no payload columns)
+        count_runs: Count runs matching filters
         update_status: Change the status of a run
         delete: Remove a run from storage
     """
@@ -202,6 +262,52 @@ class AbstractWorkflowRunRepository(ABC):
         """
         raise NotImplementedError
 
+    def list_runs(
+        self,
+        workflow_name: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        started_after: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> Tuple[List[WorkflowRunSummary], Optional[str]]:
+        """List run summaries, newest first, one page at a time.
+
+        Pages are keyset-paginated on (started_at, id): each page starts
+        strictly after the cursor, so page cost does not grow with depth
+        and runs added meanwhile never shift later pages.
+
+        Args:
+            workflow_name: Only runs of this workflow (optional)
+            statuses: Only runs in one of these statuses (optional)
+            started_after: Only runs started at or after this time (optional)
+            limit: Maximum number of runs per page (default: 100)
+            cursor: Opaque cursor returned with the previous page
+
+        Returns:
+            Tuple of (summaries, next_cursor); next_cursor is None on the
+            last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        raise NotImplementedError
+
+    def count_runs(
+        self,
+        workflow_name: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> int:
+        """Count runs matching filters without loading them.
+
+        Args:
+            workflow_name: Only runs of this workflow (optional)
+            statuses: Only runs in one of these statuses (optional)
+
+        Returns:
+            Number of matching runs
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def update_status(self, run_id: str, status: str) -> None:
         """Update the status of a workflow run.
@@ -259,6 +365,228 @@ class AbstractWorkflowRunRepository(ABC):
         raise NotImplementedError
 
 
+class MetricsRollupRepository(ABC):
+    """Abstract repository for pre-aggregated run metrics.
+
+    Maintains per-workflow aggregates (run counts by status, tokens, cost,
+    duration percentiles) in minute, hour, day and all-time buckets, so
+    dashboards read metrics without scanning run history. Buckets are
+    updated incrementally as runs complete and can be rebuilt from history.
+
+    Methods:
+        record: Add one finished run to every granularity
+        query: Aggregates per time bucket over a range
+        totals: All-time aggregates
+        backfill: Rebuild all buckets from the run history
+        prune: Drop old buckets of one granularity
+    """
+
+    @abstractmethod
+    def record(
+        self,
+        workflow_name: str,
+        status: str,
+        finished_at: datetime,
+        duration_seconds: Optional[float],
+        total_tokens: Optional[int],
+        total_cost_usd: Optional[float],
+    ) -> None:
+        """Add one finished run to its buckets.
+
+        Args:
+            workflow_name: Workflow the run belongs to
+            status: Final run status
+            finished_at: Completion time (selects the buckets)
+            duration_seconds: Run duration (optional)
+            total_tokens: Tokens used (optional)
+            total_cost_usd: Cost in USD (optional)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def query(
+        self,
+        granularity: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        workflow_name: Optional[str] = None,
+        by_workflow: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get aggregates per time bucket.
+
+        Args:
+            granularity: "minute", "hour" or "day"
+            start: First bucket start to include (optional)
+            end: Only buckets starting before this time (optional)
+            workflow_name: Only this workflow (optional)
+            by_workflow: One entry per (bucket, workflow) instead of per bucket
+
+        Returns:
+            Aggregate dicts (bucket_start, runs, by_status, total_tokens,
+            total_cost_usd, avg/p50/p95_duration_seconds), oldest first
+
+        Raises:
+            ValueError: If granularity is unknown
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def totals(self, workflow_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get all-time aggregates.
+
+        Args:
+            workflow_name: Only this workflow (optional)
+
+        Returns:
+            Aggregate dict (runs, by_status, total_tokens, total_cost_usd,
+            avg/p50/p95_duration_seconds)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def backfill(self) -> int:
+        """Rebuild every bucket from the finished runs in history.
+
+        Returns:
+            Number of runs aggregated
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def prune(self, granularity: str, before: datetime) -> int:
+        """Delete buckets of one granularity that start before a time.
+
+        Args:
+            granularity: "minute", "hour" or "day"
+            before: Cutoff time
+
+        Returns:
+            Number of rollup rows deleted
+        """
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class CostLedgerEntry:
+    """Usage of one model in one workflow run, as kept in the cost ledger.
+
+    Ledger queries that aggregate per run return the same shape, with
+    model/provider set to None when the run used more than one.
+    """
+
+    run_id: str
+    workflow_name: str
+    started_at: datetime
+    status: str  # "success" or "failure"
+    model: Optional[str] = "unknown"
+    provider: Optional[str] = "unknown"
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    calls: int = 0
+    duration_seconds: float = 0.0
+    experiment: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class CostLedgerFilter:
+    """Filters applied by the cost ledger inside its queries.
+
+    Every field is optional; start/end are naive UTC datetimes bounding the
+    run start time (start inclusive, end inclusive).
+    """
+
+    workflow_name: Optional[str] = None
+    experiment: Optional[str] = None
+    model: Optional[str] = None
+    provider: Optional[str] = None
+    status: Optional[str] = None
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+
+
+class CostLedgerRepository(ABC):
+    """Abstract repository for the append-only cost ledger.
+
+    Holds per-run, per-model token usage and cost, written when runs finish.
+    Cost reports read from it with their filters applied in the query, so
+    report time depends on the matching data rather than total history.
+
+    Methods:
+        append: Add ledger entries
+        iter_runs: Stream per-run totals, newest first
+        summarize: Totals and breakdowns
+        aggregate_by_day: Cost per day
+        by_provider: Cost per provider and model
+    """
+
+    @abstractmethod
+    def append(self, entries: List[CostLedgerEntry]) -> None:
+        """Add ledger entries (one per run and model).
+
+        Args:
+            entries: Entries to append
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def iter_runs(
+        self, filters: Optional[CostLedgerFilter] = None, batch_size: int = 1000
+    ) -> Iterator[CostLedgerEntry]:
+        """Stream per-run totals matching filters, newest first.
+
+        Args:
+            filters: Query filters (optional)
+            batch_size: Runs fetched per query
+
+        Yields:
+            One CostLedgerEntry per run (model/provider None if mixed)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def summarize(self, filters: Optional[CostLedgerFilter] = None) -> Dict[str, Any]:
+        """Get totals and breakdowns for entries matching filters.
+
+        Args:
+            filters: Query filters (optional)
+
+        Returns:
+            Dict with total_cost_usd, total_runs, total_tokens,
+            successful_runs, failed_runs, first_started_at, last_started_at,
+            by_workflow, by_model and by_provider (name -> cost)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def aggregate_by_day(
+        self, filters: Optional[CostLedgerFilter] = None, local_time: bool = False
+    ) -> Dict[str, float]:
+        """Get cost per calendar day for entries matching filters.
+
+        Args:
+            filters: Query filters (optional)
+            local_time: Use local calendar days instead of UTC days
+
+        Returns:
+            Dict mapping YYYY-MM-DD to total cost
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def by_provider(self, filters: Optional[CostLedgerFilter] = None) -> Dict[str, Any]:
+        """Get cost per provider and model for entries matching filters.
+
+        Args:
+            filters: Query filters (optional)
+
+        Returns:
+            Dict mapping provider to {total_cost_usd, total_tokens, run_count,
+            models: {model: {total_cost_usd, total_tokens, run_count}}}
+        """
+        raise NotImplementedError
+
+
 class AbstractExecutionStateRepository(ABC):
     """Abstract repository for execution state persistence.
 
@@ -429,6 +757,7 @@ class WebhookEventRepository(ABC):
     Methods:
         is_processed: Check if webhook event was already processed
         mark_processed: Record webhook as processed
+        claim: Record webhook as processed unless it already was
         cleanup_old_events: Delete records older than N days
     """
 
@@ -457,6 +786,26 @@ class WebhookEventRepository(ABC):
         """
         raise NotImplementedError
 
+    def claim(self, webhook_id: str, provider: str) -> bool:
+        """Record webhook as processed if no one else has.
+
+        Exactly one caller wins for a given webhook_id; every later (or
+        concurrent) caller gets False and must treat the delivery as a
+        replay. This default checks then marks, which is not atomic;
+        backends should override it with a single conditional insert.
+
+        Args:
+            webhook_id: Unique identifier for the webhook event
+            provider: Name of the webhook provider (e.g., "whatsapp", "telegram")
+
+        Returns:
+            True if this call recorded the webhook, False if it was already processed
+        """
+        if self.is_processed(webhook_id):
+            return False
+        self.mark_processed(webhook_id, provider)
+        return True
+
     @abstractmethod
     def cleanup_old_events(self, days: int = 7) -> int:
         """Delete webhook event records older than N days.
@@ -470,6 +819,236 @@ class WebhookEventRepository(ABC):
         raise NotImplementedError
 
 
+# Job statuses; "succeeded" and "failed" are final
+JOB_STATUSES = ("queued", "running", "succeeded", "failed")
+
+# Seconds a claimed job stays leased to its worker without a renewal
+DEFAULT_JOB_LEASE_SECONDS = 60.0
+
+
+@dataclass(frozen=True)
+class WorkflowJob:
+    """A queued workflow run triggered by a webhook."""
+
+    id: str
+    workflow_name: str
+    inputs: Dict[str, Any]
+    source: str
+    status: str
+    priority: int = 0
+    attempts: int = 0
+    max_attempts: int = 3
+    reply_to: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    worker_id: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dict (reply_to and lease omitted)."""
+        return {
+            "job_id": self.id,
+            "workflow_name": self.workflow_name,
+            "source": self.source,
+            "status": self.status,
+            "priority": self.priority,
+            "attempts": self.attempts,
+            "max_attempts": self.max_attempts,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class WorkflowJobRepository(ABC):
+    """Abstract repository for the durable webhook workflow job queue.
+
+    Jobs survive restarts: queued jobs wait in storage until a worker
+    claims them. A claim leases the job to one worker, which renews the
+    lease while the job runs; jobs whose lease expired (the worker's
+    process died) are put back with requeue_expired(). Jobs running in
+    other live processes are never requeued.
+
+    Methods:
+        enqueue: Add a job
+        claim_next: Atomically take and lease the next runnable job
+        renew_leases: Extend the leases of a worker's running jobs
+        complete: Record a successful run
+        fail: Record a failed run (re-queued until max_attempts)
+        get: Get a job by ID
+        count_by_status: Number of jobs per status
+        requeue_expired: Return abandoned jobs to the queue
+        cleanup_finished: Delete finished jobs older than N days
+    """
+
+    @abstractmethod
+    def enqueue(
+        self,
+        workflow_name: str,
+        inputs: Dict[str, Any],
+        source: str = "generic",
+        reply_to: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 3,
+    ) -> WorkflowJob:
+        """Add a job to the queue.
+
+        Args:
+            workflow_name: Workflow to run
+            inputs: Workflow inputs (JSON-serializable)
+            source: Endpoint enqueuing the job ("generic", "whatsapp", "telegram")
+            reply_to: Where to deliver the result (phone number or chat ID)
+            priority: Higher runs first
+            max_attempts: Runs allowed before the job fails
+
+        Returns:
+            The queued job
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def claim_next(
+        self,
+        exclude_workflows: Sequence[str] = (),
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+    ) -> Optional[WorkflowJob]:
+        """Take the next runnable job, mark it running and lease it.
+
+        Picks the highest-priority, oldest queued job whose available_at
+        has passed. Concurrent callers never receive the same job.
+
+        Args:
+            exclude_workflows: Workflows not to claim (at their concurrency limit)
+            worker_id: Claiming worker (recorded as the lease owner)
+            lease_seconds: Seconds until the job counts as abandoned
+                unless the lease is renewed
+
+        Returns:
+            The claimed job (attempts incremented), or None if none is runnable
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def renew_leases(
+        self,
+        worker_id: str,
+        job_ids: Sequence[str],
+        lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+    ) -> int:
+        """Extend the leases of jobs a worker is still running.
+
+        Args:
+            worker_id: Lease owner
+            job_ids: Jobs to renew
+            lease_seconds: New lease length from now
+
+        Returns:
+            Number of leases renewed (jobs requeued or claimed by another
+            worker in the meantime are not)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def complete(
+        self, job_id: str, result: Dict[str, Any], worker_id: Optional[str] = None
+    ) -> bool:
+        """Mark a running job as succeeded.
+
+        Only the worker holding the job's lease may complete it.
+
+        Args:
+            job_id: Job ID
+            result: Workflow outputs (JSON-serializable)
+            worker_id: Lease owner (as passed to claim_next)
+
+        Returns:
+            False if the job is gone, no longer running or leased to another worker
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def fail(
+        self,
+        job_id: str,
+        error: str,
+        retry_delay: float = 0.0,
+        worker_id: Optional[str] = None,
+    ) -> Optional[WorkflowJob]:
+        """Record a failed attempt of a running job.
+
+        The job is queued again after retry_delay seconds if it has
+        attempts left, otherwise it is marked failed. Only the worker
+        holding the job's lease may fail it.
+
+        Args:
+            job_id: Job ID
+            error: Error message
+            retry_delay: Seconds before the job may be claimed again
+            worker_id: Lease owner (as passed to claim_next)
+
+        Returns:
+            The updated job, or None if the job is gone, no longer running
+            or leased to another worker
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id: str) -> Optional[WorkflowJob]:
+        """Get a job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job, or None if not found
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_by_status(self) -> Dict[str, int]:
+        """Count jobs per status.
+
+        Returns:
+            Dict mapping every status in JOB_STATUSES to its job count
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def requeue_expired(self) -> int:
+        """Put running jobs whose lease expired back in the queue.
+
+        Recovers jobs interrupted by a crash or restart without touching
+        jobs that live workers (in any process) keep leased. The
+        interrupted attempt is not counted.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def cleanup_finished(self, days: int = 7) -> int:
+        """Delete succeeded and failed jobs finished more than N days ago.
+
+        Args:
+            days: Number of days to retain finished jobs (default: 7)
+
+        Returns:
+            Number of jobs deleted
+        """
+        raise NotImplementedError
+
+
+# (namespace_key, JSON-serialized value, agent_id, workflow_id, node_id, key)
+MemoryEntry = tuple[str, str, str, Optional[str], Optional[str], str]
+
+
 class MemoryRepository(ABC):
     """Abstract repository for agent memory persistence.
 
@@ -479,11 +1058,23 @@ class MemoryRepository(ABC):
 
     Methods:
         get: Retrieve a value by namespace key
-        set: Store a value with namespace key (upsert semantics)
+        get_entry: Retrieve a value and its expiry time by namespace key
+        get_entries: Retrieve values and expiry times for many keys at once
+        get_many: Retrieve values for many keys at once
+        set: Store a value with namespace key (upsert semantics, optional TTL)
+        set_many: Store many values in one transaction
         delete: Remove a value by namespace key
+        delete_many: Remove many values in one transaction
         list: List all keys for an agent with optional prefix filtering
+        scan: Page through entries whose namespace key starts with a prefix
+        count: Count entries whose namespace key starts with a prefix
+        iter_scan: Stream entries under a namespace prefix page by page
         clear: Clear all memory for an agent
         clear_by_workflow: Clear all memory for a specific workflow
+        changes_since: Read the change log written by other repository instances
+        purge_expired: Delete expired entries and old change log rows
+
+    Expired entries are never returned, even before they are purged.
     """
 
     @abstractmethod
@@ -498,6 +1089,49 @@ class MemoryRepository(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def get_entry(self, namespace_key: str) -> Optional[tuple[str, Optional[datetime]]]:
+        """Get a value and its expiry time by namespace key.
+
+        Args:
+            namespace_key: Combined namespace key (agent:workflow:node:key)
+
+        Returns:
+            (JSON-serialized value, expires_at in UTC or None) if found,
+            None otherwise
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_entries(
+        self, namespace_keys: List[str]
+    ) -> Dict[str, tuple[str, Optional[datetime]]]:
+        """Get values and expiry times for many namespace keys at once.
+
+        Args:
+            namespace_keys: Combined namespace keys (agent:workflow:node:key)
+
+        Returns:
+            Dict of namespace_key -> (JSON-serialized value, expires_at in
+            UTC or None); keys not found are omitted
+        """
+        raise NotImplementedError
+
+    def get_many(self, namespace_keys: List[str]) -> Dict[str, str]:
+        """Get values for many namespace keys at once.
+
+        Args:
+            namespace_keys: Combined namespace keys (agent:workflow:node:key)
+
+        Returns:
+            Dict of namespace_key -> JSON-serialized value; keys not found
+            are omitted
+        """
+        return {
+            namespace_key: value
+            for namespace_key, (value, _) in self.get_entries(namespace_keys).items()
+        }
+
     @abstractmethod
     def set(
         self,
@@ -507,6 +1141,7 @@ class MemoryRepository(ABC):
         workflow_id: Optional[str],
         node_id: Optional[str],
         key: str,
+        ttl: Optional[int] = None,
     ) -> None:
         """Store a value with namespace key.
 
@@ -519,6 +1154,18 @@ class MemoryRepository(ABC):
             workflow_id: Workflow identifier (optional)
             node_id: Node identifier (optional)
             key: User-facing key name
+            ttl: Time-to-live in seconds (None for no expiry)
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def set_many(self, entries: List[MemoryEntry], ttl: Optional[int] = None) -> None:
+        """Store many values in one transaction (upsert semantics).
+
+        Args:
+            entries: (namespace_key, value, agent_id, workflow_id, node_id, key)
+                tuples, with values already JSON-serialized
+            ttl: Time-to-live in seconds for every entry (None for no expiry)
         """
         raise NotImplementedError
 
@@ -534,6 +1181,18 @@ class MemoryRepository(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def delete_many(self, namespace_keys: List[str]) -> int:
+        """Delete many values in one transaction.
+
+        Args:
+            namespace_keys: Combined namespace keys (agent:workflow:node:key)
+
+        Returns:
+            Number of records deleted (expired records are not counted)
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def list(self, agent_id: str, prefix: str = "") -> List[tuple[str, str]]:
         """List all keys for an agent with optional prefix filtering.
@@ -547,6 +1206,61 @@ class MemoryRepository(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def scan(
+        self,
+        namespace_prefix: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[tuple[str, str]]:
+        """Page through entries whose namespace key starts with a prefix.
+
+        The prefix is usually a scope ("agent:workflow:node:") optionally
+        followed by a key prefix, so one indexed range query returns exactly
+        the entries visible to that scope.
+
+        Args:
+            namespace_prefix: Namespace key prefix (e.g., "bot:*:*:user:")
+            after: Exclusive namespace key to resume after (keyset cursor)
+            limit: Maximum number of entries to return (None for all)
+
+        Returns:
+            List of (namespace_key, value) tuples ordered by namespace key
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def count(self, namespace_prefix: str) -> int:
+        """Count entries whose namespace key starts with a prefix.
+
+        Args:
+            namespace_prefix: Namespace key prefix (e.g., "bot:*:*:")
+
+        Returns:
+            Number of matching entries
+        """
+        raise NotImplementedError
+
+    def iter_scan(
+        self, namespace_prefix: str, batch_size: int = 500
+    ) -> Iterator[tuple[str, str]]:
+        """Stream entries under a namespace prefix, one page at a time.
+
+        Args:
+            namespace_prefix: Namespace key prefix (e.g., "bot:*:*:")
+            batch_size: Entries fetched per query
+
+        Yields:
+            (namespace_key, value) tuples ordered by namespace key
+        """
+        after: Optional[str] = None
+        while True:
+            page = self.scan(namespace_prefix, after=after, limit=batch_size)
+            yield from page
+            if len(page) < batch_size:
+                return
+            after = page[-1][0]
+
     @abstractmethod
     def clear(self, agent_id: str) -> int:
         """Clear all memory for an agent.
@@ -572,6 +1286,36 @@ class MemoryRepository(ABC):
         """
         raise NotImplementedError
 
+    @abstractmethod
+    def changes_since(
+        self, change_id: Optional[int], include_own: bool = False
+    ) -> tuple[int, List[tuple[str, bool]]]:
+        """Read memory changes made by other repository instances.
+
+        Used by in-process caches to evict entries that another process (or
+        another repository on the same database) has changed, and by
+        derived indexes to catch up with every change.
+
+        Args:
+            change_id: Last change id already seen (None to only fetch the
+                current latest id)
+            include_own: Also return changes made through this instance
+
+        Returns:
+            Tuple of (latest change id, [(namespace_key, is_prefix), ...]);
+            is_prefix means every key under namespace_key changed
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def purge_expired(self) -> int:
+        """Delete expired entries and change log rows past their retention.
+
+        Returns:
+            Number of expired memory entries deleted
+        """
+        raise NotImplementedError
+
 
 class WorkflowRegistrationRepository(ABC):
     """Abstract repository for webhook workflow registration.
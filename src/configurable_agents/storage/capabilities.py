@@ -0,0 +1,247 @@
+"""Normalized capability index entries for agent metadata.
+
+Agent metadata is a JSON blob. To find agents without parsing every blob,
+each agent's metadata is flattened into index entries when it is written:
+
+- Nested dict keys become dot paths ({"capabilities": {"llm": true}} ->
+  "capabilities.llm")
+- Scalars become one entry; every scalar item of a list becomes one entry
+  flagged in_list
+- Values are normalized to (value_type, value) text: strings keep their
+  text ("str"), numbers and booleans become canonical numeric text ("num")
+  so 1, 1.0 and True compare equal as they do in Python
+
+A query filter is compiled into a CapabilityMatch over those entries with
+the same semantics as the Python metadata matching (wildcards, list
+membership and overlap, dot-path keys). Filters that cannot be expressed
+that way (None, dicts, "[...]" patterns, lists of non-scalars) compile to
+None and are checked in Python on the narrowed candidates.
+
+Used by the SQLite agent registry (agent_capabilities table) and by the
+registry server's in-memory index.
+
+Example:
+    >>> index_entries('{"model": "gpt-4o", "tags": ["vision"]}')
+    [('model', 'str', 'gpt-4o', False), ('tags', 'str', 'vision', True)]
+    >>> compile_filter("model", "gpt-*").scalar_glob
+    'gpt-*'
+"""
+
+import fnmatch
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+# (key, value_type, value, in_list)
+CapabilityEntry = Tuple[str, str, str, bool]
+
+
+def normalize_value(value: Any) -> Optional[Tuple[str, str]]:
+    """
+    Normalize a scalar metadata value to (value_type, text).
+
+    Args:
+        value: Metadata value
+
+    Returns:
+        (value_type, text), or None if the value is not an indexable scalar
+    """
+    if isinstance(value, str):
+        return ("str", value)
+    if isinstance(value, bool):
+        return ("num", "1" if value else "0")
+    if isinstance(value, int):
+        return ("num", str(value))
+    if isinstance(value, float):
+        if value.is_integer():
+            return ("num", str(int(value)))
+        return ("num", repr(value))
+    return None
+
+
+def parse_metadata(metadata: Any) -> Optional[Dict[str, Any]]:
+    """
+    Parse an agent_metadata value (JSON string or dict).
+
+    Args:
+        metadata: Stored metadata
+
+    Returns:
+        Metadata dict, or None if empty, invalid or not a JSON object
+    """
+    if not metadata:
+        return None
+    if isinstance(metadata, str):
+        try:
+            metadata = json.loads(metadata)
+        except (json.JSONDecodeError, TypeError):
+            return None
+    return metadata if isinstance(metadata, dict) else None
+
+
+def index_entries(metadata: Any) -> List[CapabilityEntry]:
+    """
+    Flatten agent metadata into capability index entries.
+
+    Keys containing "." are skipped: dot-path lookups can never reach them.
+
+    Args:
+        metadata: Stored metadata (JSON string or dict)
+
+    Returns:
+        Distinct entries in first-seen order (empty for missing/invalid metadata)
+    """
+    parsed = parse_metadata(metadata)
+    if parsed is None:
+        return []
+    return list(dict.fromkeys(_walk("", parsed)))
+
+
+def _walk(prefix: str, value: Any) -> Iterator[CapabilityEntry]:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            if not isinstance(key, str) or not key or "." in key:
+                continue
+            yield from _walk(f"{prefix}.{key}" if prefix else key, item)
+    elif isinstance(value, list):
+        for item in value:
+            normalized = normalize_value(item)
+            if normalized is not None:
+                yield (prefix, normalized[0], normalized[1], True)
+    else:
+        normalized = normalize_value(value)
+        if normalized is not None:
+            yield (prefix, normalized[0], normalized[1], False)
+
+
+@dataclass(frozen=True)
+class CapabilityMatch:
+    """
+    One metadata filter compiled against index entries.
+
+    An agent matches if it has an entry for key that satisfies any of:
+    a non-list entry in scalar_values, a list entry in list_values, or a
+    non-list string entry matching scalar_glob.
+
+    Attributes:
+        key: Dot-path metadata key
+        scalar_values: (value_type, value) pairs matched against non-list entries
+        list_values: (value_type, value) pairs matched against list items
+        scalar_glob: fnmatch pattern for non-list string entries (optional)
+    """
+
+    key: str
+    scalar_values: FrozenSet[Tuple[str, str]] = frozenset()
+    list_values: FrozenSet[Tuple[str, str]] = frozenset()
+    scalar_glob: Optional[str] = None
+
+    def matches_entry(self, value_type: str, value: str, in_list: bool) -> bool:
+        """Check one index entry for this filter's key."""
+        if in_list:
+            return (value_type, value) in self.list_values
+        if (value_type, value) in self.scalar_values:
+            return True
+        return (
+            self.scalar_glob is not None
+            and value_type == "str"
+            and fnmatch.fnmatchcase(value, self.scalar_glob)
+        )
+
+
+def compile_filter(key: str, expected: Any) -> Optional[CapabilityMatch]:
+    """
+    Compile one metadata filter for index lookup.
+
+    Mirrors metadata_matches(): a string with "*" is a wildcard for string
+    values and a literal for list items; a plain string equals a string or
+    is a member of a list; a number/bool equals a non-list value; a list
+    matches a string it contains or a list it overlaps.
+
+    Args:
+        key: Dot-path metadata key
+        expected: Filter value
+
+    Returns:
+        CapabilityMatch, or None if the filter must be checked in Python
+    """
+    if isinstance(expected, str):
+        literal = frozenset({("str", expected)})
+        if "*" in expected:
+            if "[" in expected:
+                return None  # Character classes differ between fnmatch and SQL GLOB
+            return CapabilityMatch(key, list_values=literal, scalar_glob=expected)
+        return CapabilityMatch(key, scalar_values=literal, list_values=literal)
+
+    if isinstance(expected, list):
+        items = [normalize_value(item) for item in expected]
+        if any(item is None for item in items):
+            return None
+        return CapabilityMatch(
+            key,
+            scalar_values=frozenset(item for item in items if item[0] == "str"),
+            list_values=frozenset(items),
+        )
+
+    normalized = normalize_value(expected)
+    if normalized is None:
+        return None  # None matches missing keys; dicts compare whole objects
+    return CapabilityMatch(key, scalar_values=frozenset({normalized}))
+
+
+def split_filters(
+    filters: Dict[str, Any],
+) -> Tuple[List[CapabilityMatch], Dict[str, Any]]:
+    """
+    Split filters into index-compilable matches and Python-only filters.
+
+    Args:
+        filters: Metadata filters (AND-ed)
+
+    Returns:
+        Tuple of (compiled matches, remaining filters)
+    """
+    compiled: List[CapabilityMatch] = []
+    remaining: Dict[str, Any] = {}
+    for key, expected in filters.items():
+        match = compile_filter(key, expected)
+        if match is None:
+            remaining[key] = expected
+        else:
+            compiled.append(match)
+    return compiled, remaining
+
+
+def metadata_matches(metadata: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """
+    Check parsed metadata against filters in Python.
+
+    Args:
+        metadata: Agent metadata dict
+        filters: Metadata filters (AND-ed, dot-path keys)
+
+    Returns:
+        True if metadata matches all filters
+    """
+    for key, expected in filters.items():
+        actual: Any = metadata
+        for key_part in key.split("."):
+            if isinstance(actual, dict):
+                actual = actual.get(key_part)
+            else:
+                actual = None
+                break
+        if not _value_matches(actual, expected):
+            return False
+    return True
+
+
+def _value_matches(actual: Any, expected: Any) -> bool:
+    if isinstance(expected, str) and isinstance(actual, str) and "*" in expected:
+        return fnmatch.fnmatch(actual, expected)
+    if isinstance(expected, list) and isinstance(actual, str):
+        return actual in expected
+    if isinstance(expected, str) and isinstance(actual, list):
+        return expected in actual
+    if isinstance(expected, list) and isinstance(actual, list):
+        return any(item in actual for item in expected)
+    return actual == expected
@@ -0,0 +1,274 @@
+"""Write-behind checkpoint pipeline for execution state.
+
+SQLiteExecutionStateRepository.save_state opens a session, checks the run
+exists, inserts one row and commits - one fsync per node on the hot path.
+BatchedCheckpointWriter moves that work off the node: snapshots go into a
+bounded queue and a single background thread commits them in groups with
+one executemany INSERT per transaction.
+
+Durability modes:
+- "sync": write and commit inside save_state (previous behavior)
+- "group": queue and batch; the executor waits for the run's checkpoints
+  at run completion (run_completed barrier)
+- "async": queue and batch; run completion does not wait (best effort,
+  still drained on flush()/close())
+
+Example:
+    >>> writer = BatchedCheckpointWriter(states_repo, durability="group")
+    >>> writer.save_state(run_id, {"node_id": "a"}, "a")  # returns immediately
+    >>> writer.run_completed(run_id)  # blocks until committed
+"""
+
+import json
+import logging
+import queue
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert, select
+
+from configurable_agents.storage.base import AbstractExecutionStateRepository
+from configurable_agents.storage.models import ExecutionStateRecord, WorkflowRunRecord
+
+logger = logging.getLogger(__name__)
+
+DURABILITY_MODES = ("sync", "group", "async")
+
+
+class _FlushMarker:
+    """Queue item that is acknowledged once everything before it is committed."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+class BatchedCheckpointWriter(AbstractExecutionStateRepository):
+    """Execution state repository that batches checkpoint writes.
+
+    Reads are delegated to the wrapped repository after flushing pending
+    writes, so callers always see their own checkpoints.
+
+    Attributes:
+        repo: Wrapped repository (provides engine and read methods)
+        durability: One of "sync", "group", "async"
+        batch_size: Maximum checkpoints committed per transaction
+        rows_written: Checkpoints committed so far
+        batches_written: Transactions committed so far
+        rows_dropped: Checkpoints discarded (unknown run or write failure)
+    """
+
+    def __init__(
+        self,
+        repo: AbstractExecutionStateRepository,
+        durability: str = "group",
+        batch_size: int = 100,
+        max_queue_size: int = 10000,
+    ) -> None:
+        """Initialize writer.
+
+        Args:
+            repo: Repository with an ``engine`` attribute to write through
+            durability: Write mode ("sync", "group" or "async")
+            batch_size: Maximum checkpoints per transaction
+            max_queue_size: Queue bound; save_state blocks when full
+
+        Raises:
+            ValueError: If durability or sizes are invalid
+        """
+        if durability not in DURABILITY_MODES:
+            raise ValueError(
+                f"Invalid checkpoint durability '{durability}'. "
+                f"Must be one of: {', '.join(DURABILITY_MODES)}"
+            )
+        if batch_size < 1 or max_queue_size < 1:
+            raise ValueError("batch_size and max_queue_size must be >= 1")
+
+        self.repo = repo
+        self.engine = repo.engine
+        self.durability = durability
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self.batches_written = 0
+        self.rows_dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+        self._closed = False
+
+    def save_state(
+        self, run_id: str, state_data: Dict[str, Any], node_id: str
+    ) -> None:
+        """Save execution state checkpoint after a node.
+
+        In "sync" mode this writes immediately. Otherwise the checkpoint is
+        queued and this returns without waiting for the disk (blocking only
+        if the queue is full).
+
+        Args:
+            run_id: Unique identifier for the workflow run
+            state_data: Current workflow state as a dictionary
+            node_id: ID of the node that produced this state
+
+        Raises:
+            ValueError: If run_id not found ("sync" mode only)
+            RuntimeError: If the writer has been closed
+        """
+        if self.durability == "sync":
+            self.repo.save_state(run_id=run_id, state_data=state_data, node_id=node_id)
+            return
+        if self._closed:
+            raise RuntimeError("Checkpoint writer is closed")
+
+        self._ensure_thread()
+        self._queue.put(
+            {
+                "run_id": run_id,
+                "node_id": node_id,
+                "state_data": json.dumps(state_data),
+                "created_at": datetime.utcnow(),
+            }
+        )
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Block until every checkpoint queued so far is committed.
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+
+        Returns:
+            True if flushed, False on timeout
+        """
+        if self._thread is None:
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.done.wait(timeout)
+
+    def run_completed(self, run_id: str, timeout: Optional[float] = None) -> bool:
+        """Run-completion barrier.
+
+        Under "group" durability, waits for pending checkpoints (including
+        this run's) to be committed. No-op for "sync" and "async".
+
+        Args:
+            run_id: Run that just finished
+            timeout: Maximum seconds to wait (None = wait indefinitely)
+
+        Returns:
+            True if the run's checkpoints are committed or not waited for
+        """
+        if self.durability != "group":
+            return True
+        flushed = self.flush(timeout)
+        if not flushed:
+            logger.warning(f"Timed out flushing checkpoints for run {run_id}")
+        return flushed
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Flush pending checkpoints and stop the background thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the flush
+        """
+        if self._closed:
+            return
+        self.flush(timeout)
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def get_latest_state(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Get the latest state checkpoint for a run (after flushing)."""
+        self.flush()
+        return self.repo.get_latest_state(run_id)
+
+    def get_state_history(self, run_id: str) -> List[Dict[str, Any]]:
+        """Get all state checkpoints for a run (after flushing)."""
+        self.flush()
+        return self.repo.get_state_history(run_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get writer counters.
+
+        Returns:
+            Dict with durability, pending, rows_written, batches_written, rows_dropped
+        """
+        return {
+            "durability": self.durability,
+            "pending": self._queue.qsize(),
+            "rows_written": self.rows_written,
+            "batches_written": self.batches_written,
+            "rows_dropped": self.rows_dropped,
+        }
+
+    def _ensure_thread(self) -> None:
+        """Start the background writer on first use."""
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="checkpoint-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        """Background loop: drain queue into batches and commit them."""
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+
+            rows: List[Dict[str, Any]] = []
+            markers: List[_FlushMarker] = []
+            stop = False
+            while True:
+                if isinstance(item, _FlushMarker):
+                    markers.append(item)
+                else:
+                    rows.append(item)
+                if len(rows) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+
+            if rows:
+                self._write_batch(rows)
+            for marker in markers:
+                marker.done.set()
+            if stop:
+                return
+
+    def _write_batch(self, rows: List[Dict[str, Any]]) -> None:
+        """Commit one batch of checkpoints in a single transaction."""
+        try:
+            run_ids = {row["run_id"] for row in rows}
+            with self.engine.begin() as conn:
+                known = set(
+                    conn.scalars(
+                        select(WorkflowRunRecord.id).where(WorkflowRunRecord.id.in_(run_ids))
+                    )
+                )
+                valid = [row for row in rows if row["run_id"] in known]
+                if valid:
+                    conn.execute(insert(ExecutionStateRecord), valid)
+            dropped = len(rows) - len(valid)
+            if dropped:
+                logger.warning(
+                    f"Dropped {dropped} checkpoints for unknown runs: "
+                    f"{sorted(run_ids - known)}"
+                )
+            self.rows_written += len(valid)
+            self.rows_dropped += dropped
+            self.batches_written += 1
+        except Exception as e:
+            # Storage failure must not break execution
+            self.rows_dropped += len(rows)
+            logger.warning(f"Failed to write {len(rows)} checkpoints: {e}")
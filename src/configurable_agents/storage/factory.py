@@ -4,6 +4,10 @@ Provides a single entry point for creating repository instances based on
 configuration. Supports SQLite with extensible design for PostgreSQL,
 Redis, and other backends.
 
+Hot paths (workflow execution) should use get_storage_backend(), which
+keeps one initialized engine and repository set per storage location for
+the whole process instead of creating engines on every call.
+
 Example:
     >>> from configurable_agents.storage import create_storage_backend
     >>> runs_repo, states_repo, memory_repo = create_storage_backend()
@@ -11,13 +15,17 @@ Example:
     >>> from configurable_agents.config import StorageConfig
     >>> config = StorageConfig(backend="sqlite", path="./workflows.db")
     >>> runs_repo, states_repo, memory_repo = create_storage_backend(config)
+    >>> # Shared, process-wide backend
+    >>> runs_repo, *_ = get_storage_backend(config)
 """
 
 import logging
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import Engine, create_engine, event, inspect, text
 
 from configurable_agents.config.schema import StorageConfig
 
@@ -31,8 +39,10 @@ from configurable_agents.storage.base import (
     MemoryRepository,
     WorkflowRegistrationRepository,
     OrchestratorRepository,
+    WorkflowJobRepository,
 )
-from configurable_agents.storage.models import Base
+from configurable_agents.storage.checkpoint import BatchedCheckpointWriter
+from configurable_agents.storage.models import AgentCapabilityRecord, Base, MetricsRollupRecord
 from configurable_agents.storage.sqlite import (
     SQLiteExecutionStateRepository,
     SQLiteWorkflowRunRepository,
@@ -42,6 +52,8 @@ from configurable_agents.storage.sqlite import (
     SQLiteMemoryRepository,
     SqliteWorkflowRegistrationRepository,
     SqliteOrchestratorRepository,
+    SQLiteMetricsRollupRepository,
+    SqliteWorkflowJobRepository,
 )
 
 
@@ -66,27 +78,189 @@ def _check_tables_exist(engine) -> bool:
         "chat_messages",  # ChatMessage
         "webhook_events",  # WebhookEventRecord
         "memory_records",  # MemoryRecord
+        "memory_changes",  # MemoryChangeRecord
         "workflow_registrations",  # WorkflowRegistrationRecord
         "orchestrators",  # OrchestratorRecord
+        "cost_ledger",  # CostLedgerRecord
+        "workflow_jobs",  # WorkflowJobRecord
     ]
 
     return all(table in existing_tables for table in expected_tables)
 
 
+def upgrade_schema(engine: Engine) -> List[str]:
+    """Apply additive schema changes to an existing database.
+
+    create_all() skips tables that already exist, so databases created by
+    an older release miss tables, indexes and nullable columns added since.
+    This adds them; existing columns and data are never changed or dropped.
+    Newly added metrics rollup tables are backfilled from the run history
+    and a newly added agent capability index from the registered agents.
+
+    Args:
+        engine: SQLAlchemy engine instance
+
+    Returns:
+        Descriptions of the changes applied (empty if up to date)
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    applied: List[str] = []
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                table.create(connection)
+                applied.append(f"table {table.name}")
+                continue
+
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns or not column.nullable:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+                )
+                applied.append(f"column {table.name}.{column.name}")
+
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(connection)
+                    applied.append(f"index {index.name}")
+
+    if f"table {MetricsRollupRecord.__tablename__}" in applied:
+        runs = SQLiteMetricsRollupRepository(engine).backfill()
+        applied.append(f"backfill {MetricsRollupRecord.__tablename__} ({runs} runs)")
+
+    if f"table {AgentCapabilityRecord.__tablename__}" in applied:
+        agents = SqliteAgentRegistryRepository(engine).rebuild_capability_index()
+        applied.append(f"backfill {AgentCapabilityRecord.__tablename__} ({agents} agents)")
+
+    for change in applied:
+        logger.info(f"Schema upgrade: added {change}")
+    return applied
+
+
+def _create_schema(engine: Engine) -> None:
+    """Create the tables of a new database, then apply upgrade_schema.
+
+    A database created by an older release lacks some expected tables, so
+    it takes this path too. Its missing tables are left to upgrade_schema,
+    which also adds columns and indexes to the existing ones and backfills
+    the tables derived from existing data.
+
+    Args:
+        engine: SQLAlchemy engine instance
+    """
+    if not inspect(engine).get_table_names():
+        Base.metadata.create_all(engine)
+    upgrade_schema(engine)
+
+
+# SQLite connection tuning applied to every pooled connection
+SQLITE_BUSY_TIMEOUT_MS = 5000
+SQLITE_POOL_SIZE = 10
+SQLITE_MAX_OVERFLOW = 20
+
+
+@dataclass
+class PoolMetrics:
+    """Connection pool counters for one storage engine.
+
+    Attributes:
+        connects: New DBAPI connections opened
+        checkouts: Connections handed out by the pool
+        checkins: Connections returned to the pool
+    """
+
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def increment(self, counter: str) -> None:
+        """Increment a counter by name (thread-safe)."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def to_dict(self) -> Dict[str, int]:
+        """Return counters plus currently checked-out connections."""
+        with self._lock:
+            return {
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checkouts - self.checkins,
+            }
+
+
+def _is_memory_db(db_url: str) -> bool:
+    """Check whether a SQLite URL points to an in-memory database."""
+    return db_url in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in db_url
+
+
+def create_sqlite_engine(db_url: str, metrics: Optional[PoolMetrics] = None) -> Engine:
+    """Create a SQLAlchemy engine tuned for concurrent SQLite access.
+
+    File databases get a sized QueuePool and every new connection is set to
+    WAL journaling, synchronous=NORMAL and a busy timeout, so readers don't
+    block the writer and short lock contention waits instead of failing.
+
+    Args:
+        db_url: SQLAlchemy SQLite URL
+        metrics: Optional PoolMetrics to update from pool events
+
+    Returns:
+        Configured SQLAlchemy Engine
+    """
+    memory_db = _is_memory_db(db_url)
+    if memory_db:
+        engine = create_engine(db_url)
+    else:
+        engine = create_engine(
+            db_url,
+            pool_size=SQLITE_POOL_SIZE,
+            max_overflow=SQLITE_MAX_OVERFLOW,
+        )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            if not memory_db:
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+        finally:
+            cursor.close()
+
+    if metrics is not None:
+        event.listen(engine, "connect", lambda *_: metrics.increment("connects"))
+        event.listen(engine, "checkout", lambda *_: metrics.increment("checkouts"))
+        event.listen(engine, "checkin", lambda *_: metrics.increment("checkins"))
+
+    return engine
+
+
 def ensure_initialized(
     db_url: str,
     verbose: bool = False,
     show_progress: bool = True,
+    engine: Optional[Engine] = None,
 ) -> bool:
     """Ensure database tables exist, creating them if needed.
 
     This function is safe to call on every startup - it checks if tables
-    exist and only initializes if the database is new.
+    exist and only initializes if the database is new. Existing databases
+    get additive schema upgrades (see upgrade_schema).
 
     Args:
         db_url: SQLAlchemy database URL (e.g., "sqlite:///configurable_agents.db")
         verbose: Enable verbose logging
         show_progress: Show Rich progress spinner during initialization
+        engine: Existing engine for db_url to reuse (created if None)
 
     Returns:
         True if database is ready, False if running in degraded mode
@@ -115,12 +289,14 @@ def ensure_initialized(
             raise
 
     # Create engine
-    engine = create_engine(db_url)
+    if engine is None:
+        engine = create_engine(db_url)
 
     # Check if tables already exist
     if _check_tables_exist(engine):
         if verbose:
             logger.debug(f"Database already initialized: {db_url}")
+        upgrade_schema(engine)
         return True
 
     # Need to initialize - show progress if requested
@@ -136,17 +312,17 @@ def ensure_initialized(
                     console=console,
                     spinner="dots",
                 ):
-                    Base.metadata.create_all(engine)
+                    _create_schema(engine)
                 console.print("[green]+[/green] Database initialized successfully")
             except ImportError:
                 # Rich not available, initialize without spinner
                 logger.info("Initializing database...")
-                Base.metadata.create_all(engine)
+                _create_schema(engine)
                 logger.info("Database initialized successfully")
         else:
             # No progress display requested
             logger.info("Initializing database...")
-            Base.metadata.create_all(engine)
+            _create_schema(engine)
             logger.info("Database initialized successfully")
     except PermissionError as e:
         raise PermissionError(
@@ -216,27 +392,209 @@ def create_storage_backend(
 
     # Handle sqlite backend
     if backend == "sqlite" or backend.startswith("sqlite:///"):
-        # Ensure tables exist if auto_init is True
-        if auto_init:
-            ensure_initialized(db_url, show_progress=False)
-
         # Create SQLAlchemy engine
-        engine = create_engine(db_url)
+        engine = create_sqlite_engine(db_url)
 
-        # Create repositories
-        runs_repo = SQLiteWorkflowRunRepository(engine)
-        states_repo = SQLiteExecutionStateRepository(engine)
-        agents_repo = SqliteAgentRegistryRepository(engine)
-        chat_repo = SQLiteChatSessionRepository(engine)
-        webhook_repo = SqliteWebhookEventRepository(engine)
-        memory_repo = SQLiteMemoryRepository(engine)
-        workflow_reg_repo = SqliteWorkflowRegistrationRepository(engine)
-        orchestrator_repo = SqliteOrchestratorRepository(engine)
+        # Ensure tables exist if auto_init is True
+        if auto_init:
+            ensure_initialized(db_url, show_progress=False, engine=engine)
 
-        return runs_repo, states_repo, agents_repo, chat_repo, webhook_repo, memory_repo, workflow_reg_repo, orchestrator_repo
+        return _create_sqlite_repositories(engine)
 
     # Unsupported backend
     raise ValueError(
         f"Unsupported storage backend: {backend}. "
         f"Supported: 'sqlite'. PostgreSQL coming in Phase 2."
     )
+
+
+def _create_sqlite_repositories(engine: Engine) -> Tuple:
+    """Create the full set of SQLite repositories sharing one engine."""
+    runs_repo = SQLiteWorkflowRunRepository(engine)
+    states_repo = SQLiteExecutionStateRepository(engine)
+    agents_repo = SqliteAgentRegistryRepository(engine)
+    chat_repo = SQLiteChatSessionRepository(engine)
+    webhook_repo = SqliteWebhookEventRepository(engine)
+    memory_repo = SQLiteMemoryRepository(engine)
+    workflow_reg_repo = SqliteWorkflowRegistrationRepository(engine)
+    orchestrator_repo = SqliteOrchestratorRepository(engine)
+
+    return runs_repo, states_repo, agents_repo, chat_repo, webhook_repo, memory_repo, workflow_reg_repo, orchestrator_repo
+
+
+def _storage_key(config: StorageConfig) -> str:
+    """Build the registry key (database URL with resolved path) for a config."""
+    path = config.path
+    if path in ("", ":memory:"):
+        return "sqlite:///:memory:"
+    return f"sqlite:///{Path(path).resolve()}"
+
+
+@dataclass
+class _SharedBackend:
+    """Registry entry: one engine, its repositories and pool metrics."""
+
+    engine: Engine
+    repositories: Tuple
+    metrics: PoolMetrics
+    checkpoint_writers: Dict[str, BatchedCheckpointWriter] = field(default_factory=dict)
+    job_repo: Optional[WorkflowJobRepository] = None
+
+
+_backends: Dict[str, _SharedBackend] = {}
+_backends_lock = threading.Lock()
+
+
+def get_storage_backend(
+    config: Optional[StorageConfig] = None,
+) -> Tuple[
+    AbstractWorkflowRunRepository,
+    AbstractExecutionStateRepository,
+    AgentRegistryRepository,
+    ChatSessionRepository,
+    WebhookEventRepository,
+    MemoryRepository,
+    WorkflowRegistrationRepository,
+    OrchestratorRepository,
+]:
+    """Get process-wide shared storage repositories for a configuration.
+
+    The first call for a storage location creates one tuned engine,
+    initializes the schema once and builds the repositories; later calls
+    (from any thread) return the same objects. Use this instead of
+    create_storage_backend() on per-request or per-run paths.
+
+    Args:
+        config: StorageConfig instance. If None, uses defaults (sqlite, ./workflows.db)
+
+    Returns:
+        Same tuple layout as create_storage_backend()
+
+    Raises:
+        ValueError: If backend type is not supported
+    """
+    if config is None:
+        config = StorageConfig()
+
+    if not (config.backend == "sqlite" or config.backend.startswith("sqlite:///")):
+        raise ValueError(
+            f"Unsupported storage backend: {config.backend}. "
+            f"Supported: 'sqlite'. PostgreSQL coming in Phase 2."
+        )
+
+    key = _storage_key(config)
+    shared = _backends.get(key)
+    if shared is not None:
+        return shared.repositories
+
+    with _backends_lock:
+        shared = _backends.get(key)
+        if shared is None:
+            metrics = PoolMetrics()
+            engine = create_sqlite_engine(key, metrics=metrics)
+            ensure_initialized(key, show_progress=False, engine=engine)
+            shared = _SharedBackend(
+                engine=engine,
+                repositories=_create_sqlite_repositories(engine),
+                metrics=metrics,
+            )
+            _backends[key] = shared
+            logger.debug(f"Initialized shared storage backend: {key}")
+        return shared.repositories
+
+
+def get_checkpoint_writer(
+    config: Optional[StorageConfig] = None,
+) -> AbstractExecutionStateRepository:
+    """Get the shared execution state writer for a configuration.
+
+    Returns the plain execution state repository for "sync" durability,
+    otherwise one BatchedCheckpointWriter per storage location and mode.
+
+    Args:
+        config: StorageConfig instance. If None, uses defaults
+
+    Returns:
+        Execution state repository honoring config.checkpoint_durability
+
+    Raises:
+        ValueError: If backend type is not supported
+    """
+    if config is None:
+        config = StorageConfig()
+
+    states_repo = get_storage_backend(config)[1]
+    durability = config.checkpoint_durability
+    if durability == "sync":
+        return states_repo
+
+    with _backends_lock:
+        shared = _backends[_storage_key(config)]
+        writer = shared.checkpoint_writers.get(durability)
+        if writer is None:
+            writer = BatchedCheckpointWriter(
+                states_repo,
+                durability=durability,
+                batch_size=config.checkpoint_batch_size,
+                max_queue_size=config.checkpoint_queue_size,
+            )
+            shared.checkpoint_writers[durability] = writer
+        return writer
+
+
+def get_job_repository(config: Optional[StorageConfig] = None) -> WorkflowJobRepository:
+    """Get the shared webhook workflow job queue for a configuration.
+
+    Args:
+        config: StorageConfig instance. If None, uses defaults
+
+    Returns:
+        Job queue repository on the shared storage engine
+
+    Raises:
+        ValueError: If backend type is not supported
+    """
+    if config is None:
+        config = StorageConfig()
+
+    get_storage_backend(config)
+    with _backends_lock:
+        shared = _backends[_storage_key(config)]
+        if shared.job_repo is None:
+            shared.job_repo = SqliteWorkflowJobRepository(shared.engine)
+        return shared.job_repo
+
+
+def get_pool_metrics(config: Optional[StorageConfig] = None) -> Dict[str, Dict[str, int]]:
+    """Get connection pool metrics for shared storage backends.
+
+    Args:
+        config: Storage location to report on (None = all shared backends)
+
+    Returns:
+        Dict mapping database URL to pool counters (connects, checkouts,
+        checkins, checked_out)
+    """
+    with _backends_lock:
+        if config is None:
+            items = list(_backends.items())
+        else:
+            key = _storage_key(config)
+            items = [(key, _backends[key])] if key in _backends else []
+    return {key: shared.metrics.to_dict() for key, shared in items}
+
+
+def dispose_storage_backends() -> int:
+    """Flush checkpoint writers, dispose all shared engines and clear the registry.
+
+    Returns:
+        Number of backends disposed
+    """
+    with _backends_lock:
+        backends = list(_backends.values())
+        _backends.clear()
+    for shared in backends:
+        for writer in shared.checkpoint_writers.values():
+            writer.close()
+        shared.engine.dispose()
+    return len(backends)
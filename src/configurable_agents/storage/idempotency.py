@@ -0,0 +1,168 @@
+"""In-process front for webhook idempotency checks.
+
+Every webhook delivery with an ID claims it in the database
+(WebhookEventRepository.claim). Providers retry and replay floods repeat
+the same IDs, so CachedWebhookEventRepository remembers recently seen IDs
+in a bounded LRU set and rejects repeats without touching the database.
+Only IDs the database has confirmed as processed are cached, so a cache
+hit is always a correct rejection; a miss falls through to the atomic
+database claim.
+
+Example:
+    >>> repo = CachedWebhookEventRepository(webhook_repo, capacity=100_000)
+    >>> repo.claim("evt-1", "generic")
+    True
+    >>> repo.claim("evt-1", "generic")  # answered from memory
+    False
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict
+
+from configurable_agents.storage.base import WebhookEventRepository
+
+# Recently seen webhook IDs kept in memory per process
+DEFAULT_RECENT_ID_CAPACITY = 100_000
+
+
+class RecentIdCache:
+    """Thread-safe bounded set of IDs with least-recently-used eviction."""
+
+    def __init__(self, capacity: int = DEFAULT_RECENT_ID_CAPACITY) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            capacity: Maximum IDs kept (oldest evicted first)
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be positive, got {capacity}")
+        self.capacity = capacity
+        self._ids: "OrderedDict[str, None]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, item: str) -> bool:
+        with self._lock:
+            if item not in self._ids:
+                return False
+            self._ids.move_to_end(item)
+            return True
+
+    def add(self, item: str) -> None:
+        """Remember an ID (refreshing it if already present)."""
+        with self._lock:
+            self._ids[item] = None
+            self._ids.move_to_end(item)
+            if len(self._ids) > self.capacity:
+                self._ids.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget all IDs."""
+        with self._lock:
+            self._ids.clear()
+
+
+class CachedWebhookEventRepository(WebhookEventRepository):
+    """
+    Webhook event repository fronted by an in-memory recent-ID cache.
+
+    Attributes:
+        repo: Wrapped repository (source of truth)
+        recent: Cache of IDs known to be processed
+        memory_rejects: Replays rejected from memory
+        db_claims: Claims won in the database
+        db_conflicts: Claims lost in the database (first seen by this process)
+    """
+
+    def __init__(
+        self, repo: WebhookEventRepository, capacity: int = DEFAULT_RECENT_ID_CAPACITY
+    ) -> None:
+        """
+        Initialize the cached repository.
+
+        Args:
+            repo: Repository to wrap
+            capacity: Maximum recently seen IDs kept in memory
+        """
+        self.repo = repo
+        self.recent = RecentIdCache(capacity)
+        self.memory_rejects = 0
+        self.db_claims = 0
+        self.db_conflicts = 0
+        self._stats_lock = threading.Lock()
+
+    def is_processed(self, webhook_id: str) -> bool:
+        """Check if webhook event was already processed (memory first)."""
+        if webhook_id in self.recent:
+            return True
+        if self.repo.is_processed(webhook_id):
+            self.recent.add(webhook_id)
+            return True
+        return False
+
+    def mark_processed(self, webhook_id: str, provider: str) -> None:
+        """Record webhook as processed."""
+        self.repo.mark_processed(webhook_id, provider)
+        self.recent.add(webhook_id)
+
+    def claim(self, webhook_id: str, provider: str) -> bool:
+        """
+        Record webhook as processed if no one else has.
+
+        Args:
+            webhook_id: Unique identifier for the webhook event
+            provider: Name of the webhook provider
+
+        Returns:
+            True if this call recorded the webhook, False if it was already processed
+        """
+        if webhook_id in self.recent:
+            with self._stats_lock:
+                self.memory_rejects += 1
+            return False
+        claimed = self.repo.claim(webhook_id, provider)
+        self.recent.add(webhook_id)
+        with self._stats_lock:
+            if claimed:
+                self.db_claims += 1
+            else:
+                self.db_conflicts += 1
+        return claimed
+
+    def cleanup_old_events(self, days: int = 7, **kwargs: int) -> int:
+        """
+        Delete old records; the cache is cleared if any were deleted.
+
+        Args:
+            days: Number of days to retain records (default: 7)
+            **kwargs: Passed to the wrapped repository (e.g. batch_size)
+
+        Returns:
+            Number of records deleted
+        """
+        deleted = self.repo.cleanup_old_events(days=days, **kwargs)
+        if deleted:
+            self.recent.clear()
+        return deleted
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Idempotency counters.
+
+        Returns:
+            Dict with memory_rejects, db_claims, db_conflicts and cached_ids
+        """
+        with self._stats_lock:
+            return {
+                "memory_rejects": self.memory_rejects,
+                "db_claims": self.db_claims,
+                "db_conflicts": self.db_conflicts,
+                "cached_ids": len(self.recent),
+            }
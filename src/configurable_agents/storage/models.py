@@ -6,11 +6,14 @@ Uses SQLAlchemy 2.0 DeclarativeBase pattern with Mapped/mapped_column syntax.
 
 import json
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
-from sqlalchemy import DateTime, Float, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DateTime, Float, ForeignKey, Index, Integer, String, Text, delete, event
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from configurable_agents.storage.capabilities import index_entries
+
 
 class Base(DeclarativeBase):
     """Base class for all ORM models.
@@ -60,6 +63,14 @@ class WorkflowRunRecord(Base):
     total_cost_usd: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
     bottleneck_info: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Serve newest-first listings (optionally per workflow or status) and
+    # their (started_at, id) keyset cursors straight from the index
+    __table_args__ = (
+        Index("ix_workflow_runs_started_at", "started_at", "id"),
+        Index("ix_workflow_runs_workflow_name_started_at", "workflow_name", "started_at", "id"),
+        Index("ix_workflow_runs_status_started_at", "status", "started_at", "id"),
+    )
+
 
 class ExecutionStateRecord(Base):
     """ORM model for execution state checkpoints.
@@ -86,6 +97,111 @@ class ExecutionStateRecord(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
+class MetricsRollupRecord(Base):
+    """ORM model for pre-aggregated workflow run metrics.
+
+    One row per (granularity, time bucket, workflow, final status), updated
+    in the same transaction as the run's completion. Granularities are
+    "minute", "hour", "day" and "all" (a single all-time bucket).
+
+    Attributes:
+        granularity: Bucket size ("minute", "hour", "day" or "all")
+        bucket_start: Start of the time bucket (UTC, completion time)
+        workflow_name: Workflow the runs belong to
+        status: Final run status ("completed", "failed", ...)
+        run_count: Runs finished in the bucket
+        total_tokens: Sum of run tokens
+        total_cost_usd: Sum of run cost
+        duration_sum: Sum of run durations in seconds
+    """
+
+    __tablename__ = "metrics_rollups"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    workflow_name: Mapped[str] = mapped_column(String(256), primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    run_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    duration_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+
+
+class MetricsDurationBinRecord(Base):
+    """ORM model for run duration histograms behind rollup percentiles.
+
+    Durations are counted in fixed log-scale bins (see
+    storage.sqlite.DURATION_BIN_BOUNDS) per rollup bucket, so p50/p95 can be
+    estimated for any range by adding bin counts.
+
+    Attributes:
+        granularity: Bucket size, as in MetricsRollupRecord
+        bucket_start: Start of the time bucket
+        workflow_name: Workflow the runs belong to
+        status: Final run status
+        bin: Duration bin index
+        run_count: Runs whose duration falls in the bin
+    """
+
+    __tablename__ = "metrics_duration_bins"
+
+    granularity: Mapped[str] = mapped_column(String(8), primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    workflow_name: Mapped[str] = mapped_column(String(256), primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    bin: Mapped[int] = mapped_column(Integer, primary_key=True)
+    run_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class CostLedgerRecord(Base):
+    """ORM model for the append-only cost ledger.
+
+    One row per (run, provider, model), written when a run finishes. Cost
+    reports query this table instead of scanning MLFlow.
+
+    Attributes:
+        id: Auto-increment primary key
+        run_id: Workflow run the usage belongs to
+        workflow_name: Workflow name
+        experiment: MLFlow experiment the run was tracked under (optional)
+        status: "success" or "failure"
+        started_at: Run start time (UTC)
+        model: Model name ("unknown" if not reported)
+        provider: Provider name ("unknown" if not detected)
+        input_tokens: Input tokens for this model in the run
+        output_tokens: Output tokens for this model in the run
+        cost_usd: Estimated cost for this model in the run
+        calls: LLM calls to this model in the run
+        duration_seconds: Run duration (repeated on every row of the run)
+        recorded_at: When the row was written
+    """
+
+    __tablename__ = "cost_ledger"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    run_id: Mapped[str] = mapped_column(String(36), nullable=False, index=True)
+    workflow_name: Mapped[str] = mapped_column(String(256), nullable=False)
+    experiment: Mapped[Optional[str]] = mapped_column(String(256), nullable=True)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    started_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    model: Mapped[str] = mapped_column(String(128), nullable=False, default="unknown")
+    provider: Mapped[str] = mapped_column(String(32), nullable=False, default="unknown")
+    input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cost_usd: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    calls: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    duration_seconds: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    recorded_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_cost_ledger_started_at", "started_at", "run_id"),
+        Index("ix_cost_ledger_workflow_started_at", "workflow_name", "started_at"),
+        Index("ix_cost_ledger_experiment_started_at", "experiment", "started_at"),
+        Index("ix_cost_ledger_model_started_at", "model", "started_at"),
+        Index("ix_cost_ledger_provider_started_at", "provider", "started_at"),
+    )
+
+
 class AgentRecord(Base):
     """ORM model for agent registry records.
 
@@ -140,6 +256,71 @@ class AgentRecord(Base):
         return datetime.utcnow() < expiration_time
 
 
+class AgentCapabilityRecord(Base):
+    """ORM model for the agent capability index.
+
+    One row per flattened metadata entry of an agent (see
+    storage/capabilities.py), kept in sync with agents.agent_metadata by
+    mapper events so metadata queries run as indexed lookups instead of
+    parsing every agent's JSON.
+
+    Attributes:
+        id: Auto-increment primary key
+        agent_id: Agent the entry belongs to
+        key: Dot-path metadata key (e.g., "capabilities.llm")
+        value_type: "str" or "num" (numbers and booleans)
+        value: Normalized value text
+        in_list: Whether the value is an item of a list
+    """
+
+    __tablename__ = "agent_capabilities"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    agent_id: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    key: Mapped[str] = mapped_column(String(255), nullable=False)
+    value_type: Mapped[str] = mapped_column(String(8), nullable=False)
+    value: Mapped[str] = mapped_column(Text, nullable=False)
+    in_list: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    __table_args__ = (
+        Index("ix_agent_capabilities_key_value", "key", "value"),
+    )
+
+
+def capability_rows(agent_id: str, metadata: Any) -> List[Dict[str, Any]]:
+    """Build agent_capabilities rows for an agent's metadata."""
+    return [
+        {"agent_id": agent_id, "key": key, "value_type": value_type, "value": value, "in_list": in_list}
+        for key, value_type, value, in_list in index_entries(metadata)
+    ]
+
+
+def _write_capabilities(connection, agent_id: str, metadata: Any) -> None:
+    table = AgentCapabilityRecord.__table__
+    connection.execute(delete(table).where(table.c.agent_id == agent_id))
+    rows = capability_rows(agent_id, metadata)
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+@event.listens_for(AgentRecord, "after_insert")
+def _index_inserted_agent(mapper, connection, target: AgentRecord) -> None:
+    _write_capabilities(connection, target.agent_id, target.agent_metadata)
+
+
+@event.listens_for(AgentRecord, "after_update")
+def _index_updated_agent(mapper, connection, target: AgentRecord) -> None:
+    # Heartbeats update the row too; only reindex when the metadata changed
+    if sa_inspect(target).attrs.agent_metadata.history.has_changes():
+        _write_capabilities(connection, target.agent_id, target.agent_metadata)
+
+
+@event.listens_for(AgentRecord, "after_delete")
+def _unindex_deleted_agent(mapper, connection, target: AgentRecord) -> None:
+    table = AgentCapabilityRecord.__table__
+    connection.execute(delete(table).where(table.c.agent_id == target.agent_id))
+
+
 class ChatSession(Base):
     """ORM model for chat session storage.
 
@@ -244,7 +425,66 @@ class WebhookEventRecord(Base):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     webhook_id: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     provider: Mapped[str] = mapped_column(String(64), nullable=False)
-    processed_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    processed_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, nullable=False, index=True
+    )
+
+
+class WorkflowJobRecord(Base):
+    """ORM model for the webhook workflow job queue.
+
+    Webhook endpoints enqueue a row and return immediately; queue workers
+    claim queued rows (highest priority first, then oldest) and run them.
+    Failed runs go back to "queued" with a later available_at until
+    max_attempts is reached. A claimed job carries the claiming worker's ID
+    and a lease the worker keeps renewing; only running jobs whose lease
+    has expired (their worker died) are put back in the queue.
+
+    Attributes:
+        id: Job ID (UUID)
+        workflow_name: Workflow to run
+        inputs: Workflow inputs (JSON)
+        source: Endpoint that enqueued the job ("generic", "whatsapp", "telegram")
+        reply_to: Where to deliver the result (phone number or chat ID, optional)
+        priority: Higher runs first
+        status: "queued", "running", "succeeded" or "failed"
+        attempts: Runs started so far
+        max_attempts: Runs allowed before the job fails
+        available_at: Earliest time the job may be claimed (retry backoff)
+        result: Workflow outputs (JSON, when succeeded)
+        error: Last error message
+        created_at: When the job was enqueued
+        started_at: When the last attempt started
+        finished_at: When the job succeeded or finally failed
+        worker_id: Worker that claimed the job (last attempt)
+        lease_expires_at: While running, when the job counts as abandoned
+            unless its worker renews the lease
+    """
+
+    __tablename__ = "workflow_jobs"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    workflow_name: Mapped[str] = mapped_column(String(256), nullable=False)
+    inputs: Mapped[str] = mapped_column(Text, nullable=False)
+    source: Mapped[str] = mapped_column(String(32), nullable=False, default="generic")
+    reply_to: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
+    priority: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    status: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    max_attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=3)
+    available_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    result: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    worker_id: Mapped[Optional[str]] = mapped_column(String(128), nullable=True)
+    lease_expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_workflow_jobs_claim", "status", "priority", "available_at", "created_at"),
+        Index("ix_workflow_jobs_finished_at", "finished_at"),
+    )
 
 
 class MemoryRecord(Base):
@@ -260,13 +500,19 @@ class MemoryRecord(Base):
         workflow_id: Workflow identifier (optional, indexed for filtering)
         node_id: Node identifier (optional, indexed for filtering)
         key: User-facing key name (indexed)
-        namespace_key: Combined namespace key "agent:workflow:node:key" (unique, indexed)
+        namespace_key: Combined namespace key "agent:workflow:node:key" (unique,
+            indexed; scope and key-prefix listings are range scans on it)
         value: JSON-serialized value
         created_at: When the memory entry was created
         updated_at: When the memory entry was last updated
+        expires_at: When the entry expires (None for no expiry; indexed for purges)
     """
 
     __tablename__ = "memory_records"
+    __table_args__ = (
+        # Backs list(agent_id, prefix): equality on agent, range on key
+        Index("ix_memory_records_agent_key", "agent_id", "key"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     agent_id: Mapped[str] = mapped_column(String(255), index=True, nullable=False)
@@ -279,6 +525,33 @@ class MemoryRecord(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
     )
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, index=True, nullable=True)
+
+
+class MemoryChangeRecord(Base):
+    """ORM model for the memory change log.
+
+    Every memory write, delete and clear appends a row. Processes that cache
+    memory in-process poll this log to evict entries changed by other
+    processes sharing the same database.
+
+    Attributes:
+        id: Auto-increment primary key (monotonic change cursor)
+        namespace_key: Changed namespace key, or namespace prefix for clears
+        is_prefix: 1 if namespace_key is a prefix (every key under it changed)
+        origin: Identifier of the repository instance that made the change
+        created_at: When the change was made (old rows are purged)
+    """
+
+    __tablename__ = "memory_changes"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    namespace_key: Mapped[str] = mapped_column(String(1000), nullable=False)
+    is_prefix: Mapped[int] = mapped_column(Integer, nullable=False, default=0)  # Boolean as int
+    origin: Mapped[str] = mapped_column(String(32), nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.utcnow, index=True, nullable=False
+    )
 
 
 class WorkflowRegistrationRecord(Base):
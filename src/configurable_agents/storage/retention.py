@@ -0,0 +1,172 @@
+"""Background retention scheduler for storage cleanup jobs.
+
+Cleanup jobs (expired agents and orchestrators, old webhook events) are
+registered as named purge callables returning the number of rows removed.
+The scheduler runs them every interval_seconds in a worker thread, so the
+chunked repository deletes never block the event loop, and keeps per-table
+metrics of what was purged.
+
+Example:
+    >>> scheduler = RetentionScheduler(interval_seconds=3600)
+    >>> scheduler.add_job("webhook_events", lambda: repo.cleanup_old_events(days=7))
+    >>> scheduler.start()  # inside a running event loop
+    >>> scheduler.metrics()["webhook_events"]["rows_purged"]
+    0
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds between retention runs
+DEFAULT_RETENTION_INTERVAL = 3600.0
+
+
+@dataclass
+class RetentionMetrics:
+    """Purge statistics of one retention job.
+
+    Attributes:
+        rows_purged: Total rows deleted since the scheduler was created
+        runs: Completed runs (failed runs included)
+        errors: Runs that raised
+        last_purged: Rows deleted by the last successful run
+        last_run_at: When the last run finished
+        last_duration_ms: Duration of the last run in milliseconds
+        last_error: Message of the last failure (cleared on success)
+    """
+
+    rows_purged: int = 0
+    runs: int = 0
+    errors: int = 0
+    last_purged: int = 0
+    last_run_at: Optional[datetime] = None
+    last_duration_ms: float = 0.0
+    last_error: Optional[str] = None
+
+
+class RetentionScheduler:
+    """
+    Periodically runs named purge jobs and records rows purged per table.
+
+    Thread-safe: run_once() may be called from any thread, metrics() from
+    request handlers while a run is in progress.
+
+    Attributes:
+        interval_seconds: Seconds between runs of the background task
+    """
+
+    def __init__(self, interval_seconds: float = DEFAULT_RETENTION_INTERVAL) -> None:
+        """
+        Initialize a scheduler without jobs.
+
+        Args:
+            interval_seconds: Seconds between background runs
+        """
+        self.interval_seconds = interval_seconds
+        self._jobs: Dict[str, Callable[[], int]] = {}
+        self._metrics: Dict[str, RetentionMetrics] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def add_job(self, name: str, purge: Callable[[], int]) -> None:
+        """
+        Register (or replace) a purge job.
+
+        Args:
+            name: Job name, normally the table it cleans
+            purge: Callable deleting expired rows and returning their count
+        """
+        with self._lock:
+            self._jobs[name] = purge
+            self._metrics.setdefault(name, RetentionMetrics())
+
+    def run_once(self) -> Dict[str, int]:
+        """
+        Run every job once, in registration order.
+
+        A failing job is logged and counted; the other jobs still run.
+
+        Returns:
+            Dict mapping job name to rows purged (failed jobs omitted)
+        """
+        with self._lock:
+            jobs = list(self._jobs.items())
+        purged: Dict[str, int] = {}
+        for name, purge in jobs:
+            start = time.perf_counter()
+            try:
+                count = purge()
+            except Exception as e:
+                logger.warning(f"Retention job '{name}' failed: {e}")
+                self._record(name, start, error=str(e))
+                continue
+            purged[name] = count
+            self._record(name, start, count=count)
+            if count:
+                logger.info(f"Retention job '{name}' purged {count} rows")
+        return purged
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Snapshot of per-job purge metrics.
+
+        Returns:
+            Dict mapping job name to RetentionMetrics fields
+        """
+        with self._lock:
+            return {name: asdict(metrics) for name, metrics in self._metrics.items()}
+
+    @property
+    def running(self) -> bool:
+        """Whether the background task is active."""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> asyncio.Task:
+        """
+        Start the background task (must be called from a running event loop).
+
+        Returns:
+            The background task (the running one if already started)
+        """
+        if not self.running:
+            self._task = asyncio.create_task(self._run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            await asyncio.to_thread(self.run_once)
+
+    def _record(
+        self, name: str, start: float, count: int = 0, error: Optional[str] = None
+    ) -> None:
+        with self._lock:
+            metrics = self._metrics.setdefault(name, RetentionMetrics())
+            metrics.runs += 1
+            metrics.last_run_at = datetime.utcnow()
+            metrics.last_duration_ms = (time.perf_counter() - start) * 1000
+            if error is not None:
+                metrics.errors += 1
+                metrics.last_error = error
+                return
+            metrics.rows_purged += count
+            metrics.last_purged = count
+            metrics.last_error = None
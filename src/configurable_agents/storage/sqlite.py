@@ -8,48 +8,407 @@ All database operations use context manager pattern for automatic
 transaction handling and connection cleanup.
 """
 
+import bisect
 import json
 import logging
+import math
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
-
-from sqlalchemy import Engine, Select, create_engine, select, text
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import (
+    Engine,
+    Select,
+    and_,
+    bindparam,
+    case,
+    create_engine,
+    delete,
+    func,
+    insert,
+    or_,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 logger = logging.getLogger(__name__)
 
+# Rows deleted per retention cleanup transaction; each chunk commits on its
+# own so writers waiting on the database lock get in between chunks
+CLEANUP_BATCH_SIZE = 1000
+
 from configurable_agents.storage.base import (
     AbstractExecutionStateRepository,
     AbstractWorkflowRunRepository,
     AgentRegistryRepository,
     ChatSessionRepository,
+    CostLedgerEntry,
+    CostLedgerFilter,
+    CostLedgerRepository,
+    MetricsRollupRepository,
     WebhookEventRepository,
+    DEFAULT_JOB_LEASE_SECONDS,
+    JOB_STATUSES,
+    WorkflowJob,
+    WorkflowJobRepository,
+    MemoryEntry,
     MemoryRepository,
     WorkflowRegistrationRepository,
+    WorkflowRunSummary,
     OrchestratorRepository,
 )
+from configurable_agents.storage.capabilities import (
+    CapabilityMatch,
+    metadata_matches,
+    parse_metadata,
+    split_filters,
+)
 from configurable_agents.storage.models import (
     ExecutionStateRecord,
     WorkflowRunRecord,
+    MetricsRollupRecord,
+    MetricsDurationBinRecord,
+    CostLedgerRecord,
     AgentRecord,
+    AgentCapabilityRecord,
+    capability_rows,
     ChatSession,
     ChatMessage,
     WebhookEventRecord,
+    WorkflowJobRecord,
     MemoryRecord,
+    MemoryChangeRecord,
     WorkflowRegistrationRecord,
     OrchestratorRecord,
 )
 
 
+# Columns loaded for run listings (everything but the JSON payloads)
+_RUN_SUMMARY_COLUMNS = (
+    WorkflowRunRecord.id,
+    WorkflowRunRecord.workflow_name,
+    WorkflowRunRecord.status,
+    WorkflowRunRecord.started_at,
+    WorkflowRunRecord.completed_at,
+    WorkflowRunRecord.duration_seconds,
+    WorkflowRunRecord.total_tokens,
+    WorkflowRunRecord.total_cost_usd,
+    WorkflowRunRecord.error_message,
+)
+
+
+def _encode_run_cursor(summary: WorkflowRunSummary) -> str:
+    return f"{summary.started_at.isoformat()}|{summary.id}"
+
+
+def _decode_run_cursor(cursor: str) -> tuple[datetime, str]:
+    started_at, sep, run_id = cursor.partition("|")
+    try:
+        if not sep or not run_id:
+            raise ValueError
+        return datetime.fromisoformat(started_at), run_id
+    except ValueError:
+        raise ValueError(f"Invalid run cursor: {cursor!r}") from None
+
+
+# Statuses that end a run; a run is rolled up when it first reaches one
+TERMINAL_RUN_STATUSES = ("completed", "failed", "cancelled")
+
+ROLLUP_GRANULARITIES = ("minute", "hour", "day", "all")
+
+# Bucket start of the single all-time bucket
+_ALL_TIME_BUCKET = datetime(1970, 1, 1)
+
+# Upper bounds (seconds) of the duration histogram bins: log-scale from
+# 0.1s to ~20h, each bin ~41% wider than the previous one. Percentiles
+# estimated from the bins are accurate to about +/-20%.
+DURATION_BIN_BOUNDS = [0.1 * 2 ** (i / 2) for i in range(40)]
+
+ROLLUP_BACKFILL_BATCH_SIZE = 1000
+
+_rollup_insert = sqlite_insert(MetricsRollupRecord)
+_ROLLUP_UPSERT = _rollup_insert.on_conflict_do_update(
+    index_elements=["granularity", "bucket_start", "workflow_name", "status"],
+    set_={
+        "run_count": MetricsRollupRecord.run_count + _rollup_insert.excluded.run_count,
+        "total_tokens": MetricsRollupRecord.total_tokens + _rollup_insert.excluded.total_tokens,
+        "total_cost_usd": (
+            MetricsRollupRecord.total_cost_usd + _rollup_insert.excluded.total_cost_usd
+        ),
+        "duration_sum": MetricsRollupRecord.duration_sum + _rollup_insert.excluded.duration_sum,
+    },
+)
+_bin_insert = sqlite_insert(MetricsDurationBinRecord)
+_DURATION_BIN_UPSERT = _bin_insert.on_conflict_do_update(
+    index_elements=["granularity", "bucket_start", "workflow_name", "status", "bin"],
+    set_={"run_count": MetricsDurationBinRecord.run_count + _bin_insert.excluded.run_count},
+)
+
+
+def _bucket_start(granularity: str, ts: datetime) -> datetime:
+    if granularity == "minute":
+        return ts.replace(second=0, microsecond=0)
+    if granularity == "hour":
+        return ts.replace(minute=0, second=0, microsecond=0)
+    if granularity == "day":
+        return ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "all":
+        return _ALL_TIME_BUCKET
+    raise ValueError(
+        f"Unknown rollup granularity: {granularity!r} "
+        f"(expected one of {', '.join(ROLLUP_GRANULARITIES)})"
+    )
+
+
+class _RollupBatch:
+    """Rollup increments accumulated in memory, written with one upsert each."""
+
+    def __init__(self) -> None:
+        self.totals: Dict[tuple, List[float]] = {}
+        self.bins: Dict[tuple, int] = {}
+
+    def add(
+        self,
+        workflow_name: str,
+        status: str,
+        finished_at: datetime,
+        duration_seconds: Optional[float],
+        total_tokens: Optional[int],
+        total_cost_usd: Optional[float],
+        weight: int = 1,
+    ) -> None:
+        """Add one run (weight=-1 removes a previously recorded one)."""
+        duration_bin = None
+        if duration_seconds is not None:
+            duration_bin = bisect.bisect_left(DURATION_BIN_BOUNDS, duration_seconds)
+        for granularity in ROLLUP_GRANULARITIES:
+            key = (granularity, _bucket_start(granularity, finished_at), workflow_name, status)
+            entry = self.totals.setdefault(key, [0, 0, 0.0, 0.0])
+            entry[0] += weight
+            entry[1] += weight * (total_tokens or 0)
+            entry[2] += weight * (total_cost_usd or 0.0)
+            entry[3] += weight * (duration_seconds or 0.0)
+            if duration_bin is not None:
+                bin_key = key + (duration_bin,)
+                self.bins[bin_key] = self.bins.get(bin_key, 0) + weight
+
+    def flush(self, session: Session) -> None:
+        """Apply the accumulated increments in the session's transaction."""
+        if self.totals:
+            session.execute(
+                _ROLLUP_UPSERT,
+                [
+                    {
+                        "granularity": key[0],
+                        "bucket_start": key[1],
+                        "workflow_name": key[2],
+                        "status": key[3],
+                        "run_count": runs,
+                        "total_tokens": tokens,
+                        "total_cost_usd": cost,
+                        "duration_sum": duration,
+                    }
+                    for key, (runs, tokens, cost, duration) in self.totals.items()
+                ],
+            )
+        if self.bins:
+            session.execute(
+                _DURATION_BIN_UPSERT,
+                [
+                    {
+                        "granularity": key[0],
+                        "bucket_start": key[1],
+                        "workflow_name": key[2],
+                        "status": key[3],
+                        "bin": key[4],
+                        "run_count": count,
+                    }
+                    for key, count in self.bins.items()
+                ],
+            )
+        self.totals.clear()
+        self.bins.clear()
+
+
+def _rollup_transition(
+    session: Session, run: WorkflowRunRecord, previous: Optional[tuple]
+) -> None:
+    """Keep rollups in step with a run whose status just changed.
+
+    Args:
+        session: Session the run update is committed in
+        run: Updated run record
+        previous: (status, completed_at, duration, tokens, cost) before the
+            update, if the run was already rolled up under a terminal status
+    """
+    batch = _RollupBatch()
+    if previous is not None:
+        batch.add(run.workflow_name, previous[0], *previous[1:], weight=-1)
+    if run.status in TERMINAL_RUN_STATUSES:
+        batch.add(
+            run.workflow_name,
+            run.status,
+            run.completed_at or run.started_at or datetime.utcnow(),
+            run.duration_seconds,
+            run.total_tokens,
+            run.total_cost_usd,
+        )
+    batch.flush(session)
+
+
+def _rolled_up_state(run: WorkflowRunRecord) -> Optional[tuple]:
+    if run.status not in TERMINAL_RUN_STATUSES:
+        return None
+    return (
+        run.status,
+        run.completed_at or run.started_at,
+        run.duration_seconds,
+        run.total_tokens,
+        run.total_cost_usd,
+    )
+
+
+def _duration_percentile(bins: Dict[int, int], q: float) -> Optional[float]:
+    """Estimate a duration percentile from histogram bin counts."""
+    total = sum(bins.values())
+    if total <= 0:
+        return None
+    rank = q * total
+    seen = 0
+    for index in sorted(bins):
+        seen += bins[index]
+        if seen >= rank:
+            break
+    if index == 0:
+        return DURATION_BIN_BOUNDS[0]
+    if index >= len(DURATION_BIN_BOUNDS):
+        return DURATION_BIN_BOUNDS[-1]
+    # Geometric midpoint of the bin
+    return math.sqrt(DURATION_BIN_BOUNDS[index - 1] * DURATION_BIN_BOUNDS[index])
+
+
+def _rollup_aggregate(
+    status_rows: List[tuple], bins: Dict[int, int]
+) -> Dict[str, Any]:
+    """Build an aggregate dict from (status, runs, tokens, cost, duration) rows."""
+    by_status = {}
+    tokens = 0
+    cost = 0.0
+    duration = 0.0
+    for status, runs, row_tokens, row_cost, row_duration in status_rows:
+        if runs:
+            by_status[status] = by_status.get(status, 0) + runs
+        tokens += row_tokens or 0
+        cost += row_cost or 0.0
+        duration += row_duration or 0.0
+    timed_runs = sum(bins.values())
+    return {
+        "runs": sum(by_status.values()),
+        "by_status": by_status,
+        "total_tokens": int(tokens),
+        "total_cost_usd": cost,
+        "avg_duration_seconds": duration / timed_runs if timed_runs else None,
+        "p50_duration_seconds": _duration_percentile(bins, 0.50),
+        "p95_duration_seconds": _duration_percentile(bins, 0.95),
+    }
+
+
+def _delete_in_chunks(
+    engine: Engine,
+    key_column: Any,
+    condition: Any,
+    batch_size: int = CLEANUP_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    dependents: Sequence[Tuple[Any, Any]] = (),
+) -> int:
+    """Delete matching rows with set-based DELETEs of at most batch_size rows.
+
+    Each chunk is a single short write transaction of the form
+    DELETE FROM t WHERE key IN (SELECT key FROM t WHERE condition LIMIT n),
+    so no rows are loaded into Python and the lock is released (and the
+    thread sleeps pause_seconds) between chunks.
+
+    Args:
+        engine: SQLAlchemy Engine
+        key_column: Primary key column of the table to delete from
+        condition: Row selection predicate (should be index-backed)
+        batch_size: Maximum rows per chunk
+        pause_seconds: Sleep between chunks (0 still yields the lock)
+        dependents: (table, foreign key column) pairs whose rows for the
+            deleted keys are removed in the same transaction
+
+    Returns:
+        Number of rows deleted from key_column's table
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    table = key_column.table
+    chunk = select(key_column).where(condition).limit(batch_size).scalar_subquery()
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            for dependent_table, foreign_key in dependents:
+                conn.execute(delete(dependent_table).where(foreign_key.in_(chunk)))
+            deleted = conn.execute(delete(table).where(key_column.in_(chunk))).rowcount
+        total += deleted
+        if deleted < batch_size:
+            return total
+        time.sleep(pause_seconds)
+
+
+def _delete_expired_heartbeats(
+    engine: Engine,
+    key_column: Any,
+    heartbeat_column: Any,
+    ttl_column: Any,
+    default_ttl: int,
+    batch_size: int,
+    pause_seconds: float,
+    dependents: Sequence[Tuple[Any, Any]] = (),
+) -> int:
+    """Delete rows whose last heartbeat + TTL is not after now.
+
+    Rows are grouped by TTL so each group's predicate is a plain
+    last_heartbeat <= now - ttl range on the indexed heartbeat column,
+    compared exactly like is_alive() does in Python.
+
+    Returns:
+        Number of rows deleted
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be positive, got {batch_size}")
+    now = datetime.utcnow()
+    ttl = func.coalesce(ttl_column, default_ttl)
+    with engine.connect() as conn:
+        ttls = list(conn.scalars(select(ttl).distinct()))
+    total = 0
+    for seconds in ttls:
+        condition = and_(
+            ttl == seconds, heartbeat_column <= now - timedelta(seconds=seconds)
+        )
+        total += _delete_in_chunks(
+            engine, key_column, condition, batch_size, pause_seconds, dependents
+        )
+    return total
+
+
 class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
     """SQLite implementation of workflow run repository.
 
     Provides CRUD operations for WorkflowRunRecord using SQLite backend.
-    Uses context managers for automatic transaction handling.
+    Uses context managers for automatic transaction handling. Runs reaching
+    a terminal status are added to the metrics rollups in the same
+    transaction.
 
     Attributes:
         engine: SQLAlchemy Engine instance for database connections
+        rollups: Metrics rollup repository sharing the engine
+        cost_ledger: Cost ledger repository sharing the engine
     """
 
     def __init__(self, engine: Engine) -> None:
@@ -59,10 +418,14 @@ class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
             engine: SQLAlchemy Engine instance (created by factory)
         """
         self.engine = engine
+        self.rollups = SQLiteMetricsRollupRepository(engine)
+        self.cost_ledger = SQLiteCostLedgerRepository(engine)
 
     def add(self, run: WorkflowRunRecord) -> None:
         """Persist a new workflow run.
 
+        Runs added in a terminal status are recorded in the metrics rollups.
+
         Args:
             run: WorkflowRunRecord instance to persist
 
@@ -71,6 +434,9 @@ class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
         """
         with Session(self.engine) as session:
             session.add(run)
+            if run.status in TERMINAL_RUN_STATUSES:
+                session.flush()  # Applies started_at default
+                _rollup_transition(session, run, None)
             session.commit()
 
     def get(self, run_id: str) -> Optional[WorkflowRunRecord]:
@@ -106,14 +472,92 @@ class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
             )
             return list(session.scalars(stmt).all())
 
+    def list_runs(
+        self,
+        workflow_name: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+        started_after: Optional[datetime] = None,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+    ) -> tuple[List[WorkflowRunSummary], Optional[str]]:
+        """List run summaries, newest first, one page at a time.
+
+        Args:
+            workflow_name: Only runs of this workflow (optional)
+            statuses: Only runs in one of these statuses (optional)
+            started_after: Only runs started at or after this time (optional)
+            limit: Maximum number of runs per page (default: 100)
+            cursor: Opaque cursor returned with the previous page
+
+        Returns:
+            Tuple of (summaries, next_cursor); next_cursor is None on the
+            last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        stmt = self._filter_runs(select(*_RUN_SUMMARY_COLUMNS), workflow_name, statuses)
+        if started_after is not None:
+            stmt = stmt.where(WorkflowRunRecord.started_at >= started_after)
+        if cursor:
+            stmt = stmt.where(
+                tuple_(WorkflowRunRecord.started_at, WorkflowRunRecord.id)
+                < tuple_(*_decode_run_cursor(cursor))
+            )
+        # One extra row tells whether another page exists
+        stmt = stmt.order_by(
+            WorkflowRunRecord.started_at.desc(), WorkflowRunRecord.id.desc()
+        ).limit(limit + 1)
+
+        with Session(self.engine) as session:
+            rows = session.execute(stmt).all()
+
+        summaries = [WorkflowRunSummary(*row) for row in rows[:limit]]
+        next_cursor = (
+            _encode_run_cursor(summaries[-1]) if len(rows) > limit and summaries else None
+        )
+        return summaries, next_cursor
+
+    def count_runs(
+        self,
+        workflow_name: Optional[str] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> int:
+        """Count runs matching filters without loading them.
+
+        Args:
+            workflow_name: Only runs of this workflow (optional)
+            statuses: Only runs in one of these statuses (optional)
+
+        Returns:
+            Number of matching runs
+        """
+        stmt = self._filter_runs(
+            select(func.count()).select_from(WorkflowRunRecord), workflow_name, statuses
+        )
+        with Session(self.engine) as session:
+            return session.execute(stmt).scalar_one()
+
+    @staticmethod
+    def _filter_runs(
+        stmt: Select, workflow_name: Optional[str], statuses: Optional[List[str]]
+    ) -> Select:
+        if workflow_name is not None:
+            stmt = stmt.where(WorkflowRunRecord.workflow_name == workflow_name)
+        if statuses:
+            stmt = stmt.where(WorkflowRunRecord.status.in_(statuses))
+        return stmt
+
     def update_status(self, run_id: str, status: str) -> None:
         """Update the status of a workflow run.
 
-        Also sets completed_at timestamp when status is "completed" or "failed".
+        Also sets completed_at timestamp when status is "completed", "failed"
+        or "cancelled", and updates the metrics rollups.
 
         Args:
             run_id: Unique identifier for the workflow run
-            status: New status value ("pending", "running", "completed", "failed")
+            status: New status value ("pending", "running", "completed",
+                "failed", "cancelled")
 
         Raises:
             ValueError: If run_id not found
@@ -123,12 +567,15 @@ class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
             if run is None:
                 raise ValueError(f"Workflow run not found: {run_id}")
 
+            previous = _rolled_up_state(run)
             run.status = status
 
             # Set completed_at for terminal states
-            if status in ("completed", "failed"):
+            if status in TERMINAL_RUN_STATUSES:
                 run.completed_at = datetime.utcnow()
 
+            if previous is not None or status in TERMINAL_RUN_STATUSES:
+                _rollup_transition(session, run, previous)
             session.commit()
 
     def delete(self, run_id: str) -> None:
@@ -179,6 +626,7 @@ class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
             if run is None:
                 raise ValueError(f"Workflow run not found: {run_id}")
 
+            previous = _rolled_up_state(run)
             run.status = status
             run.completed_at = datetime.utcnow()
             run.duration_seconds = duration_seconds
@@ -192,7 +640,500 @@ class SQLiteWorkflowRunRepository(AbstractWorkflowRunRepository):
             if bottleneck_info is not None:
                 run.bottleneck_info = bottleneck_info
 
+            _rollup_transition(session, run, previous)
+            session.commit()
+
+
+class SQLiteMetricsRollupRepository(MetricsRollupRepository):
+    """SQLite implementation of the metrics rollup repository.
+
+    Reads touch only rollup rows (one per bucket, workflow and status), so
+    their cost depends on the range queried, not on the size of the run
+    history. Runs are recorded by SQLiteWorkflowRunRepository when they
+    finish; deleting a run does not remove it from the rollups.
+
+    Attributes:
+        engine: SQLAlchemy Engine instance for database connections
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """Initialize repository with database engine.
+
+        Args:
+            engine: SQLAlchemy Engine instance (created by factory)
+        """
+        self.engine = engine
+
+    def record(
+        self,
+        workflow_name: str,
+        status: str,
+        finished_at: datetime,
+        duration_seconds: Optional[float],
+        total_tokens: Optional[int],
+        total_cost_usd: Optional[float],
+    ) -> None:
+        """Add one finished run to its buckets.
+
+        Args:
+            workflow_name: Workflow the run belongs to
+            status: Final run status
+            finished_at: Completion time (selects the buckets)
+            duration_seconds: Run duration (optional)
+            total_tokens: Tokens used (optional)
+            total_cost_usd: Cost in USD (optional)
+        """
+        batch = _RollupBatch()
+        batch.add(
+            workflow_name, status, finished_at, duration_seconds, total_tokens, total_cost_usd
+        )
+        with Session(self.engine) as session:
+            batch.flush(session)
+            session.commit()
+
+    def query(
+        self,
+        granularity: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        workflow_name: Optional[str] = None,
+        by_workflow: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Get aggregates per time bucket.
+
+        Args:
+            granularity: "minute", "hour" or "day"
+            start: First bucket start to include (optional)
+            end: Only buckets starting before this time (optional)
+            workflow_name: Only this workflow (optional)
+            by_workflow: One entry per (bucket, workflow) instead of per bucket
+
+        Returns:
+            Aggregate dicts (bucket_start, runs, by_status, total_tokens,
+            total_cost_usd, avg/p50/p95_duration_seconds), oldest first;
+            by_workflow entries also carry workflow_name
+
+        Raises:
+            ValueError: If granularity is unknown
+        """
+        if granularity not in ROLLUP_GRANULARITIES[:-1]:
+            raise ValueError(
+                f"Unknown rollup granularity: {granularity!r} (expected minute, hour "
+                f"or day; use totals() for all-time aggregates)"
+            )
+        if start is not None:
+            start = _bucket_start(granularity, start)
+
+        def grouped(model: Any) -> tuple:
+            columns = [model.bucket_start]
+            if by_workflow:
+                columns.append(model.workflow_name)
+            conditions = [model.granularity == granularity]
+            if start is not None:
+                conditions.append(model.bucket_start >= start)
+            if end is not None:
+                conditions.append(model.bucket_start < end)
+            if workflow_name is not None:
+                conditions.append(model.workflow_name == workflow_name)
+            return columns, conditions
+
+        return self._aggregate(grouped, with_bucket=True, by_workflow=by_workflow)
+
+    def totals(self, workflow_name: Optional[str] = None) -> Dict[str, Any]:
+        """Get all-time aggregates.
+
+        Args:
+            workflow_name: Only this workflow (optional)
+
+        Returns:
+            Aggregate dict (runs, by_status, total_tokens, total_cost_usd,
+            avg/p50/p95_duration_seconds)
+        """
+
+        def grouped(model: Any) -> tuple:
+            conditions = [model.granularity == "all"]
+            if workflow_name is not None:
+                conditions.append(model.workflow_name == workflow_name)
+            return [], conditions
+
+        results = self._aggregate(grouped, with_bucket=False, by_workflow=False)
+        return results[0] if results else _rollup_aggregate([], {})
+
+    def backfill(self) -> int:
+        """Rebuild every bucket from the finished runs in history.
+
+        Runs are streamed in batches of ROLLUP_BACKFILL_BATCH_SIZE, so memory
+        use does not grow with history size.
+
+        Returns:
+            Number of runs aggregated
+        """
+        columns = (
+            WorkflowRunRecord.id,
+            WorkflowRunRecord.workflow_name,
+            WorkflowRunRecord.status,
+            func.coalesce(WorkflowRunRecord.completed_at, WorkflowRunRecord.started_at),
+            WorkflowRunRecord.duration_seconds,
+            WorkflowRunRecord.total_tokens,
+            WorkflowRunRecord.total_cost_usd,
+        )
+        count = 0
+        last_id = None
+        with Session(self.engine) as session:
+            session.execute(delete(MetricsRollupRecord))
+            session.execute(delete(MetricsDurationBinRecord))
+            while True:
+                stmt = select(*columns).where(
+                    WorkflowRunRecord.status.in_(TERMINAL_RUN_STATUSES)
+                )
+                if last_id is not None:
+                    stmt = stmt.where(WorkflowRunRecord.id > last_id)
+                rows = session.execute(
+                    stmt.order_by(WorkflowRunRecord.id).limit(ROLLUP_BACKFILL_BATCH_SIZE)
+                ).all()
+                if not rows:
+                    break
+                batch = _RollupBatch()
+                for _, workflow_name, status, finished_at, *metrics in rows:
+                    batch.add(workflow_name, status, finished_at, *metrics)
+                batch.flush(session)
+                count += len(rows)
+                last_id = rows[-1][0]
             session.commit()
+        return count
+
+    def prune(self, granularity: str, before: datetime) -> int:
+        """Delete buckets of one granularity that start before a time.
+
+        Args:
+            granularity: "minute", "hour" or "day"
+            before: Cutoff time
+
+        Returns:
+            Number of rollup rows deleted
+
+        Raises:
+            ValueError: If granularity is unknown or "all"
+        """
+        if granularity not in ROLLUP_GRANULARITIES[:-1]:
+            raise ValueError(
+                f"Unknown rollup granularity: {granularity!r} (expected minute, hour "
+                f"or day; the all-time bucket cannot be pruned)"
+            )
+        with Session(self.engine) as session:
+            deleted = 0
+            for model in (MetricsRollupRecord, MetricsDurationBinRecord):
+                result = session.execute(
+                    delete(model).where(
+                        model.granularity == granularity, model.bucket_start < before
+                    )
+                )
+                if model is MetricsRollupRecord:
+                    deleted = result.rowcount
+            session.commit()
+        return deleted
+
+    def _aggregate(
+        self, grouped: Any, with_bucket: bool, by_workflow: bool
+    ) -> List[Dict[str, Any]]:
+        """Run the totals and histogram queries and merge them per group."""
+        group_columns, conditions = grouped(MetricsRollupRecord)
+        totals_stmt = (
+            select(
+                *group_columns,
+                MetricsRollupRecord.status,
+                func.sum(MetricsRollupRecord.run_count),
+                func.sum(MetricsRollupRecord.total_tokens),
+                func.sum(MetricsRollupRecord.total_cost_usd),
+                func.sum(MetricsRollupRecord.duration_sum),
+            )
+            .where(*conditions)
+            .group_by(*group_columns, MetricsRollupRecord.status)
+        )
+        bin_columns, bin_conditions = grouped(MetricsDurationBinRecord)
+        bins_stmt = (
+            select(
+                *bin_columns,
+                MetricsDurationBinRecord.bin,
+                func.sum(MetricsDurationBinRecord.run_count),
+            )
+            .where(*bin_conditions)
+            .group_by(*bin_columns, MetricsDurationBinRecord.bin)
+        )
+        with Session(self.engine) as session:
+            total_rows = session.execute(totals_stmt).all()
+            bin_rows = session.execute(bins_stmt).all()
+
+        width = len(group_columns)
+        groups: Dict[tuple, List[tuple]] = {}
+        for row in total_rows:
+            groups.setdefault(tuple(row[:width]), []).append(tuple(row[width:]))
+        bins: Dict[tuple, Dict[int, int]] = {}
+        for row in bin_rows:
+            if row[-1]:
+                bins.setdefault(tuple(row[:width]), {})[row[width]] = row[-1]
+
+        results = []
+        for key in sorted(groups):
+            aggregate = _rollup_aggregate(groups[key], bins.get(key, {}))
+            if aggregate["runs"] == 0:
+                continue  # Every run moved to another bucket or status
+            if with_bucket:
+                aggregate = {"bucket_start": key[0], **aggregate}
+            if by_workflow:
+                aggregate["workflow_name"] = key[1]
+            results.append(aggregate)
+        return results
+
+
+class SQLiteCostLedgerRepository(CostLedgerRepository):
+    """SQLite implementation of the cost ledger.
+
+    Filters become WHERE clauses on indexed columns and aggregates are
+    computed by SQLite, so only matching rows are read and only results
+    are returned. iter_runs pages with a (started_at, run_id) keyset.
+
+    Attributes:
+        engine: SQLAlchemy Engine instance for database connections
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """Initialize repository with database engine.
+
+        Args:
+            engine: SQLAlchemy Engine instance (created by factory)
+        """
+        self.engine = engine
+
+    def append(self, entries: List[CostLedgerEntry]) -> None:
+        """Add ledger entries (one per run and model).
+
+        Args:
+            entries: Entries to append
+        """
+        if not entries:
+            return
+        rows = [
+            {
+                "run_id": entry.run_id,
+                "workflow_name": entry.workflow_name,
+                "experiment": entry.experiment,
+                "status": entry.status,
+                "started_at": entry.started_at,
+                "model": entry.model or "unknown",
+                "provider": entry.provider or "unknown",
+                "input_tokens": entry.input_tokens,
+                "output_tokens": entry.output_tokens,
+                "cost_usd": entry.cost_usd,
+                "calls": entry.calls,
+                "duration_seconds": entry.duration_seconds,
+                "recorded_at": datetime.utcnow(),
+            }
+            for entry in entries
+        ]
+        with Session(self.engine) as session:
+            session.execute(insert(CostLedgerRecord), rows)
+            session.commit()
+
+    def iter_runs(
+        self, filters: Optional[CostLedgerFilter] = None, batch_size: int = 1000
+    ) -> Iterator[CostLedgerEntry]:
+        """Stream per-run totals matching filters, newest first.
+
+        Each batch is a separate short query, so no connection is held
+        while the caller processes entries.
+
+        Args:
+            filters: Query filters (optional)
+            batch_size: Runs fetched per query
+
+        Yields:
+            One CostLedgerEntry per run (model/provider None if mixed)
+        """
+        ledger = CostLedgerRecord
+
+        def single(column: Any) -> Any:
+            return case((func.count(func.distinct(column)) == 1, func.min(column)), else_=None)
+
+        columns = (
+            ledger.run_id,
+            func.min(ledger.workflow_name),
+            ledger.started_at,
+            func.min(ledger.status),
+            single(ledger.model),
+            single(ledger.provider),
+            func.sum(ledger.input_tokens),
+            func.sum(ledger.output_tokens),
+            func.sum(ledger.cost_usd),
+            func.sum(ledger.calls),
+            func.max(ledger.duration_seconds),
+            func.min(ledger.experiment),
+        )
+        cursor = None
+        while True:
+            stmt = self._filter(select(*columns), filters)
+            if cursor is not None:
+                stmt = stmt.where(tuple_(ledger.started_at, ledger.run_id) < tuple_(*cursor))
+            stmt = (
+                stmt.group_by(ledger.started_at, ledger.run_id)
+                .order_by(ledger.started_at.desc(), ledger.run_id.desc())
+                .limit(batch_size)
+            )
+            with Session(self.engine) as session:
+                rows = session.execute(stmt).all()
+
+            for row in rows:
+                yield CostLedgerEntry(
+                    run_id=row[0],
+                    workflow_name=row[1],
+                    started_at=row[2],
+                    status=row[3],
+                    model=row[4],
+                    provider=row[5],
+                    input_tokens=row[6] or 0,
+                    output_tokens=row[7] or 0,
+                    cost_usd=row[8] or 0.0,
+                    calls=row[9] or 0,
+                    duration_seconds=row[10] or 0.0,
+                    experiment=row[11],
+                )
+            if len(rows) < batch_size:
+                return
+            cursor = (rows[-1][2], rows[-1][0])
+
+    def summarize(self, filters: Optional[CostLedgerFilter] = None) -> Dict[str, Any]:
+        """Get totals and breakdowns for entries matching filters.
+
+        Args:
+            filters: Query filters (optional)
+
+        Returns:
+            Dict with total_cost_usd, total_runs, total_tokens,
+            successful_runs, failed_runs, first_started_at, last_started_at,
+            by_workflow, by_model and by_provider (name -> cost)
+        """
+        ledger = CostLedgerRecord
+        totals_stmt = self._filter(
+            select(
+                func.sum(ledger.cost_usd),
+                func.count(func.distinct(ledger.run_id)),
+                func.sum(ledger.input_tokens + ledger.output_tokens),
+                func.count(func.distinct(case((ledger.status == "success", ledger.run_id)))),
+                func.min(ledger.started_at),
+                func.max(ledger.started_at),
+            ),
+            filters,
+        )
+
+        def breakdown(session: Session, column: Any) -> Dict[str, float]:
+            stmt = self._filter(
+                select(column, func.sum(ledger.cost_usd)).where(column != "unknown"), filters
+            ).group_by(column)
+            return {name: cost or 0.0 for name, cost in session.execute(stmt).all()}
+
+        with Session(self.engine) as session:
+            cost, runs, tokens, successful, first, last = session.execute(totals_stmt).one()
+            by_workflow = breakdown(session, ledger.workflow_name)
+            by_model = breakdown(session, ledger.model)
+            by_provider = breakdown(session, ledger.provider)
+
+        return {
+            "total_cost_usd": cost or 0.0,
+            "total_runs": runs,
+            "total_tokens": tokens or 0,
+            "successful_runs": successful,
+            "failed_runs": runs - successful,
+            "first_started_at": first,
+            "last_started_at": last,
+            "by_workflow": by_workflow,
+            "by_model": by_model,
+            "by_provider": by_provider,
+        }
+
+    def aggregate_by_day(
+        self, filters: Optional[CostLedgerFilter] = None, local_time: bool = False
+    ) -> Dict[str, float]:
+        """Get cost per calendar day for entries matching filters.
+
+        Args:
+            filters: Query filters (optional)
+            local_time: Use local calendar days instead of UTC days
+
+        Returns:
+            Dict mapping YYYY-MM-DD to total cost
+        """
+        ledger = CostLedgerRecord
+        if local_time:
+            day = func.date(ledger.started_at, "localtime")
+        else:
+            day = func.date(ledger.started_at)
+        stmt = self._filter(select(day, func.sum(ledger.cost_usd)), filters).group_by(day)
+        with Session(self.engine) as session:
+            return {key: cost or 0.0 for key, cost in session.execute(stmt).all()}
+
+    def by_provider(self, filters: Optional[CostLedgerFilter] = None) -> Dict[str, Any]:
+        """Get cost per provider and model for entries matching filters.
+
+        Args:
+            filters: Query filters (optional)
+
+        Returns:
+            Dict mapping provider to {total_cost_usd, total_tokens, run_count,
+            models: {model: {total_cost_usd, total_tokens, run_count}}}
+        """
+        ledger = CostLedgerRecord
+        aggregates = (
+            func.sum(ledger.cost_usd),
+            func.sum(ledger.input_tokens + ledger.output_tokens),
+            func.count(func.distinct(ledger.run_id)),
+        )
+        provider_stmt = self._filter(
+            select(ledger.provider, *aggregates), filters
+        ).group_by(ledger.provider)
+        model_stmt = self._filter(
+            select(ledger.provider, ledger.model, *aggregates), filters
+        ).group_by(ledger.provider, ledger.model)
+
+        with Session(self.engine) as session:
+            provider_rows = session.execute(provider_stmt).all()
+            model_rows = session.execute(model_stmt).all()
+
+        report: Dict[str, Any] = {
+            provider: {
+                "total_cost_usd": cost or 0.0,
+                "total_tokens": tokens or 0,
+                "run_count": runs,
+                "models": {},
+            }
+            for provider, cost, tokens, runs in provider_rows
+        }
+        for provider, model, cost, tokens, runs in model_rows:
+            report[provider]["models"][model] = {
+                "total_cost_usd": cost or 0.0,
+                "total_tokens": tokens or 0,
+                "run_count": runs,
+            }
+        return report
+
+    @staticmethod
+    def _filter(stmt: Select, filters: Optional[CostLedgerFilter]) -> Select:
+        if filters is None:
+            return stmt
+        ledger = CostLedgerRecord
+        for column, value in (
+            (ledger.workflow_name, filters.workflow_name),
+            (ledger.experiment, filters.experiment),
+            (ledger.model, filters.model),
+            (ledger.provider, filters.provider),
+            (ledger.status, filters.status),
+        ):
+            if value is not None:
+                stmt = stmt.where(column == value)
+        if filters.start is not None:
+            stmt = stmt.where(ledger.started_at >= filters.start)
+        if filters.end is not None:
+            stmt = stmt.where(ledger.started_at <= filters.end)
+        return stmt
 
 
 class SQLiteExecutionStateRepository(AbstractExecutionStateRepository):
@@ -379,6 +1320,34 @@ class SqliteAgentRegistryRepository(AgentRegistryRepository):
             agent.last_heartbeat = datetime.utcnow()
             session.commit()
 
+    def update_heartbeats(self, heartbeats: Dict[str, datetime]) -> int:
+        """Write many agents' heartbeat timestamps in one transaction.
+
+        Runs a single executemany UPDATE (no ORM loads), so the metadata
+        index is left untouched.
+
+        Args:
+            heartbeats: Dict mapping agent_id to its last heartbeat time
+
+        Returns:
+            Number of agents updated (unknown agents are skipped)
+        """
+        if not heartbeats:
+            return 0
+        agents = AgentRecord.__table__
+        stmt = (
+            update(agents)
+            .where(agents.c.agent_id == bindparam("b_agent_id"))
+            .values(last_heartbeat=bindparam("b_last_heartbeat"))
+        )
+        params = [
+            {"b_agent_id": agent_id, "b_last_heartbeat": timestamp}
+            for agent_id, timestamp in heartbeats.items()
+        ]
+        with self.engine.begin() as connection:
+            result = connection.execute(stmt, params)
+        return result.rowcount
+
     def delete(self, agent_id: str) -> None:
         """Delete an agent from the registry.
 
@@ -396,41 +1365,62 @@ class SqliteAgentRegistryRepository(AgentRegistryRepository):
             session.delete(agent)
             session.commit()
 
-    def delete_expired(self) -> int:
+    def delete_expired(
+        self,
+        batch_size: int = CLEANUP_BATCH_SIZE,
+        pause_seconds: float = 0.0,
+    ) -> int:
         """Delete all expired agents from the registry.
 
         An agent is considered expired if the current time is after
-        its expiration time (last_heartbeat + ttl_seconds).
+        its expiration time (last_heartbeat + ttl_seconds). Agents and
+        their capability index rows are removed with chunked set-based
+        DELETEs, one short transaction per chunk.
+
+        Args:
+            batch_size: Maximum agents deleted per transaction
+            pause_seconds: Sleep between chunks
 
         Returns:
             Number of agents deleted
         """
-        with Session(self.engine) as session:
-            # Calculate the cutoff time for expired agents
-            now = datetime.utcnow()
-
-            # Query all agents
-            stmt: Select[AgentRecord] = select(AgentRecord)
-            agents = list(session.scalars(stmt).all())
+        return _delete_expired_heartbeats(
+            self.engine,
+            AgentRecord.agent_id,
+            AgentRecord.last_heartbeat,
+            AgentRecord.ttl_seconds,
+            60,
+            batch_size,
+            pause_seconds,
+            dependents=[(AgentCapabilityRecord.__table__, AgentCapabilityRecord.agent_id)],
+        )
+
+    def get_many(self, agent_ids: List[str]) -> List[AgentRecord]:
+        """Get several agents by ID in one round trip per chunk.
 
-            # Filter and delete expired agents
-            expired_agents = [
-                a for a in agents if not a.is_alive()
-            ]
-
-            count = 0
-            for agent in expired_agents:
-                session.delete(agent)
-                count += 1
+        Args:
+            agent_ids: Agent identifiers (unknown IDs are ignored)
 
-            session.commit()
-            return count
+        Returns:
+            Found AgentRecord instances, newest registration first
+        """
+        agents: List[AgentRecord] = []
+        ids = list(dict.fromkeys(agent_ids))
+        with Session(self.engine) as session:
+            for chunk in _chunks(ids):
+                stmt = select(AgentRecord).where(AgentRecord.agent_id.in_(chunk))
+                agents.extend(session.scalars(stmt).all())
+        agents.sort(key=lambda a: a.registered_at, reverse=True)
+        return agents
 
     def query_by_metadata(self, metadata_filter: Dict[str, Any]) -> List[AgentRecord]:
         """Query agents by metadata/capabilities.
 
         Allows filtering agents by their metadata JSON blob using
-        key-value matching with wildcard support.
+        key-value matching with wildcard support. Equality, list membership
+        and "*"/"?" wildcard filters run as lookups on the agent_capabilities
+        index; only filters it cannot express (None, dicts, "[...]"
+        patterns) are checked in Python, on the already narrowed agents.
 
         Args:
             metadata_filter: Dictionary of metadata filters
@@ -440,28 +1430,76 @@ class SqliteAgentRegistryRepository(AgentRegistryRepository):
         Returns:
             List of AgentRecord instances matching the criteria
         """
-        # Get all agents first
-        agents = self.list_all(include_dead=False)
+        compiled, remaining = split_filters(metadata_filter)
+
+        with Session(self.engine) as session:
+            stmt: Select[AgentRecord] = select(AgentRecord).order_by(
+                AgentRecord.registered_at.desc()
+            )
+            for match in compiled:
+                stmt = stmt.where(AgentRecord.agent_id.in_(self._capability_subquery(match)))
+            agents = [a for a in session.scalars(stmt).all() if a.is_alive()]
+
+        if compiled and not remaining:
+            return agents
 
-        # Filter by metadata
+        # Filters the index can't express (or no filters at all)
         filtered = []
         for agent in agents:
-            metadata_str = agent.agent_metadata
-            if not metadata_str:
+            metadata = parse_metadata(agent.agent_metadata)
+            if metadata is None:
+                if agent.agent_metadata:
+                    logger.warning(f"Failed to parse metadata for agent {agent.agent_id}")
                 continue
+            if self._matches_filters(metadata, remaining):
+                filtered.append(agent)
+        return filtered
 
-            try:
-                metadata = json.loads(metadata_str) if isinstance(metadata_str, str) else metadata_str
-
-                # Check if agent matches all filters
-                if self._matches_filters(metadata, metadata_filter):
-                    filtered.append(agent)
+    def rebuild_capability_index(self) -> int:
+        """Rebuild the agent_capabilities index from stored agent metadata.
 
-            except (json.JSONDecodeError, TypeError):
-                logger.warning(f"Failed to parse metadata for agent {agent.agent_id}")
-                continue
+        Used to backfill databases created before the index existed.
 
-        return filtered
+        Returns:
+            Number of agents indexed
+        """
+        table = AgentCapabilityRecord.__table__
+        count = 0
+        with self.engine.begin() as connection:
+            connection.execute(delete(table))
+            result = connection.execute(
+                select(AgentRecord.agent_id, AgentRecord.agent_metadata)
+            )
+            for agent_id, metadata in result.all():
+                rows = capability_rows(agent_id, metadata)
+                if rows:
+                    connection.execute(table.insert(), rows)
+                count += 1
+        return count
+
+    @staticmethod
+    def _capability_subquery(match: CapabilityMatch) -> Select:
+        """Build the agent_id subquery for one compiled metadata filter."""
+        cap = AgentCapabilityRecord
+        conditions = []
+        for in_list, values in ((False, match.scalar_values), (True, match.list_values)):
+            for value_type in sorted({t for t, _ in values}):
+                conditions.append(
+                    and_(
+                        cap.in_list == in_list,
+                        cap.value_type == value_type,
+                        cap.value.in_(sorted(v for t, v in values if t == value_type)),
+                    )
+                )
+        if match.scalar_glob is not None:
+            conditions.append(
+                and_(
+                    cap.in_list == False,  # noqa: E712
+                    cap.value_type == "str",
+                    cap.value.op("GLOB")(match.scalar_glob),
+                )
+            )
+        return select(cap.agent_id).where(cap.key == match.key, or_(*conditions))
 
     def get_active_agents(self, cutoff_seconds: int = 60) -> List[AgentRecord]:
         """Get only active (recently heartbeating) agents.
@@ -500,53 +1538,7 @@ class SqliteAgentRegistryRepository(AgentRegistryRepository):
         Returns:
             True if metadata matches all filters, False otherwise
         """
-        for key, value in filters.items():
-            # Support nested keys with dot notation
-            metadata_value = metadata
-            for key_part in key.split("."):
-                if isinstance(metadata_value, dict):
-                    metadata_value = metadata_value.get(key_part)
-                else:
-                    metadata_value = None
-                    break
-
-            # Check if value matches (with wildcard support for strings)
-            if not self._value_matches(metadata_value, value):
-                return False
-
-        return True
-
-    def _value_matches(self, actual: Any, expected: Any) -> bool:
-        """Check if actual value matches expected value (with wildcard support).
-
-        Args:
-            actual: The actual value from metadata
-            expected: The expected filter value
-
-        Returns:
-            True if values match, False otherwise
-        """
-        import fnmatch
-
-        # Handle wildcard matching for strings
-        if isinstance(expected, str) and isinstance(actual, str):
-            if "*" in expected:
-                return fnmatch.fnmatch(actual, expected)
-
-        # Handle list matching (actual contains expected)
-        if isinstance(expected, list) and isinstance(actual, str):
-            return actual in expected
-
-        # Handle list matching (actual list contains expected)
-        if isinstance(expected, str) and isinstance(actual, list):
-            return expected in actual
-
-        # Handle list-to-list matching (any match)
-        if isinstance(expected, list) and isinstance(actual, list):
-            return any(item in actual for item in expected)
-
-        # Direct comparison
-        return actual == expected
+        return metadata_matches(metadata, filters)
 
 
 class SQLiteChatSessionRepository(ChatSessionRepository):
@@ -720,6 +1712,12 @@ class SQLiteChatSessionRepository(ChatSessionRepository):
             return [s.to_dict() for s in sessions]
 
 
+# Conditional insert used to claim a webhook_id (rowcount 0 = already claimed)
+_WEBHOOK_CLAIM = sqlite_insert(WebhookEventRecord.__table__).on_conflict_do_nothing(
+    index_elements=[WebhookEventRecord.__table__.c.webhook_id]
+)
+
+
 class SqliteWebhookEventRepository(WebhookEventRepository):
     """SQLite implementation of webhook event repository.
 
@@ -778,44 +1776,456 @@ class SqliteWebhookEventRepository(WebhookEventRepository):
             )
             session.commit()
 
-    def cleanup_old_events(self, days: int = 7) -> int:
+    def claim(self, webhook_id: str, provider: str) -> bool:
+        """Record webhook as processed if no one else has.
+
+        One INSERT ... ON CONFLICT DO NOTHING statement: the unique
+        webhook_id constraint decides the winner, so concurrent
+        deliveries of the same webhook cannot both claim it.
+
+        Args:
+            webhook_id: Unique identifier for the webhook event
+            provider: Name of the webhook provider (e.g., "whatsapp", "telegram")
+
+        Returns:
+            True if this call recorded the webhook, False if it was already processed
+        """
+        stmt = _WEBHOOK_CLAIM.values(
+            webhook_id=webhook_id, provider=provider, processed_at=datetime.utcnow()
+        )
+        with self.engine.begin() as conn:
+            return conn.execute(stmt).rowcount == 1
+
+    def cleanup_old_events(
+        self,
+        days: int = 7,
+        batch_size: int = CLEANUP_BATCH_SIZE,
+        pause_seconds: float = 0.0,
+    ) -> int:
         """Delete webhook event records older than N days.
 
+        Uses chunked set-based DELETEs on the processed_at index, one
+        short transaction per chunk.
+
         Args:
             days: Number of days to retain records (default: 7)
+            batch_size: Maximum records deleted per transaction
+            pause_seconds: Sleep between chunks
 
         Returns:
             Number of records deleted
         """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return _delete_in_chunks(
+            self.engine,
+            WebhookEventRecord.id,
+            WebhookEventRecord.processed_at < cutoff,
+            batch_size,
+            pause_seconds,
+        )
+
+
+def _to_workflow_job(record: WorkflowJobRecord) -> WorkflowJob:
+    """Convert a job row to a WorkflowJob."""
+    return WorkflowJob(
+        id=record.id,
+        workflow_name=record.workflow_name,
+        inputs=json.loads(record.inputs),
+        source=record.source,
+        status=record.status,
+        priority=record.priority,
+        attempts=record.attempts,
+        max_attempts=record.max_attempts,
+        reply_to=record.reply_to,
+        result=json.loads(record.result) if record.result else None,
+        error=record.error,
+        created_at=record.created_at,
+        started_at=record.started_at,
+        finished_at=record.finished_at,
+        worker_id=record.worker_id,
+        lease_expires_at=record.lease_expires_at,
+    )
+
+
+def _holds_lease(job_id: str, worker_id: Optional[str]):
+    """Filter matching the job only while it runs under worker_id's lease."""
+    return and_(
+        WorkflowJobRecord.id == job_id,
+        WorkflowJobRecord.status == "running",
+        WorkflowJobRecord.worker_id.is_(None)
+        if worker_id is None
+        else WorkflowJobRecord.worker_id == worker_id,
+    )
+
+
+class SqliteWorkflowJobRepository(WorkflowJobRepository):
+    """SQLite implementation of the webhook workflow job queue.
+
+    Claims use a conditional UPDATE (status still "queued") on the row
+    picked through the (status, priority, available_at, created_at) index,
+    so concurrent workers, in this or other processes, never run the same
+    job twice. Claimed jobs are leased to their worker; requeue_expired()
+    only recovers running jobs whose lease ran out (or that predate
+    leases), and complete()/fail() only apply while the caller still holds
+    the lease.
+
+    Attributes:
+        engine: SQLAlchemy Engine instance for database connections
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        """Initialize repository with database engine.
+
+        Args:
+            engine: SQLAlchemy Engine instance (created by factory)
+        """
+        self.engine = engine
+
+    def enqueue(
+        self,
+        workflow_name: str,
+        inputs: Dict[str, Any],
+        source: str = "generic",
+        reply_to: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: int = 3,
+    ) -> WorkflowJob:
+        """Add a job to the queue.
+
+        Args:
+            workflow_name: Workflow to run
+            inputs: Workflow inputs (JSON-serializable)
+            source: Endpoint enqueuing the job ("generic", "whatsapp", "telegram")
+            reply_to: Where to deliver the result (phone number or chat ID)
+            priority: Higher runs first
+            max_attempts: Runs allowed before the job fails
+
+        Returns:
+            The queued job
+
+        Raises:
+            ValueError: If max_attempts is not positive
+        """
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be positive, got {max_attempts}")
+        now = datetime.utcnow()
+        record = WorkflowJobRecord(
+            id=str(uuid.uuid4()),
+            workflow_name=workflow_name,
+            inputs=json.dumps(inputs),
+            source=source,
+            reply_to=reply_to,
+            priority=priority,
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts,
+            available_at=now,
+            created_at=now,
+        )
+        job = _to_workflow_job(record)
         with Session(self.engine) as session:
-            # Calculate cutoff time
-            from datetime import timedelta
-            cutoff = datetime.utcnow() - timedelta(days=days)
+            session.add(record)
+            session.commit()
+        return job
 
-            # Delete old records
-            stmt: Select[WebhookEventRecord] = (
-                select(WebhookEventRecord)
-                .where(WebhookEventRecord.processed_at < cutoff)
+    def claim_next(
+        self,
+        exclude_workflows: Sequence[str] = (),
+        worker_id: Optional[str] = None,
+        lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+    ) -> Optional[WorkflowJob]:
+        """Take the next runnable job, mark it running and lease it.
+
+        Args:
+            exclude_workflows: Workflows not to claim (at their concurrency limit)
+            worker_id: Claiming worker (recorded as the lease owner)
+            lease_seconds: Seconds until the job counts as abandoned
+
+        Returns:
+            The claimed job (attempts incremented), or None if none is runnable
+        """
+        jobs = WorkflowJobRecord
+        while True:
+            now = datetime.utcnow()
+            candidate = (
+                select(jobs.id)
+                .where(jobs.status == "queued", jobs.available_at <= now)
+                .order_by(jobs.priority.desc(), jobs.created_at, jobs.id)
+                .limit(1)
             )
-            records = list(session.scalars(stmt).all())
+            if exclude_workflows:
+                candidate = candidate.where(jobs.workflow_name.not_in(list(exclude_workflows)))
+            with Session(self.engine) as session:
+                job_id = session.scalar(candidate)
+                if job_id is None:
+                    return None
+                claimed = session.execute(
+                    update(jobs)
+                    .where(jobs.id == job_id, jobs.status == "queued")
+                    .values(
+                        status="running",
+                        attempts=jobs.attempts + 1,
+                        started_at=now,
+                        worker_id=worker_id,
+                        lease_expires_at=now + timedelta(seconds=lease_seconds),
+                    )
+                ).rowcount
+                if not claimed:
+                    # Another worker took it first; pick again
+                    session.rollback()
+                    continue
+                session.commit()
+                return _to_workflow_job(session.get(jobs, job_id))
+
+    def renew_leases(
+        self,
+        worker_id: str,
+        job_ids: Sequence[str],
+        lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+    ) -> int:
+        """Extend the leases of jobs a worker is still running.
 
-            count = 0
-            for record in records:
-                session.delete(record)
-                count += 1
+        Args:
+            worker_id: Lease owner
+            job_ids: Jobs to renew
+            lease_seconds: New lease length from now
+
+        Returns:
+            Number of leases renewed
+        """
+        if not job_ids:
+            return 0
+        jobs = WorkflowJobRecord
+        with Session(self.engine) as session:
+            renewed = session.execute(
+                update(jobs)
+                .where(
+                    jobs.id.in_(list(job_ids)),
+                    jobs.status == "running",
+                    jobs.worker_id == worker_id,
+                )
+                .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+            ).rowcount
+            session.commit()
+        return renewed
 
+    def complete(
+        self, job_id: str, result: Dict[str, Any], worker_id: Optional[str] = None
+    ) -> bool:
+        """Mark a running job as succeeded.
+
+        Args:
+            job_id: Job ID
+            result: Workflow outputs (JSON-serializable)
+            worker_id: Lease owner (as passed to claim_next)
+
+        Returns:
+            False if the job is gone, no longer running or leased to another worker
+        """
+        with Session(self.engine) as session:
+            completed = session.execute(
+                update(WorkflowJobRecord)
+                .where(_holds_lease(job_id, worker_id))
+                .values(
+                    status="succeeded",
+                    result=json.dumps(result, default=str),
+                    error=None,
+                    finished_at=datetime.utcnow(),
+                    lease_expires_at=None,
+                )
+            ).rowcount
             session.commit()
-            return count
+        return completed > 0
+
+    def fail(
+        self,
+        job_id: str,
+        error: str,
+        retry_delay: float = 0.0,
+        worker_id: Optional[str] = None,
+    ) -> Optional[WorkflowJob]:
+        """Record a failed attempt of a running job.
+
+        Args:
+            job_id: Job ID
+            error: Error message
+            retry_delay: Seconds before the job may be claimed again
+            worker_id: Lease owner (as passed to claim_next)
+
+        Returns:
+            The updated job, or None if the job is gone, no longer running
+            or leased to another worker
+        """
+        now = datetime.utcnow()
+        retry = WorkflowJobRecord.attempts < WorkflowJobRecord.max_attempts
+        with Session(self.engine) as session:
+            # One conditional UPDATE, so a worker whose lease lapsed cannot
+            # overwrite a job another process has claimed since
+            failed = session.execute(
+                update(WorkflowJobRecord)
+                .where(_holds_lease(job_id, worker_id))
+                .values(
+                    error=error,
+                    lease_expires_at=None,
+                    status=case((retry, "queued"), else_="failed"),
+                    available_at=case(
+                        (retry, now + timedelta(seconds=retry_delay)),
+                        else_=WorkflowJobRecord.available_at,
+                    ),
+                    finished_at=case((retry, None), else_=now),
+                )
+            ).rowcount
+            session.commit()
+            if not failed:
+                return None
+            return _to_workflow_job(session.get(WorkflowJobRecord, job_id))
+
+    def get(self, job_id: str) -> Optional[WorkflowJob]:
+        """Get a job by ID.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job, or None if not found
+        """
+        with Session(self.engine) as session:
+            record = session.get(WorkflowJobRecord, job_id)
+            return _to_workflow_job(record) if record is not None else None
+
+    def count_by_status(self) -> Dict[str, int]:
+        """Count jobs per status.
+
+        Returns:
+            Dict mapping every status in JOB_STATUSES to its job count
+        """
+        counts = dict.fromkeys(JOB_STATUSES, 0)
+        with Session(self.engine) as session:
+            rows = session.execute(
+                select(WorkflowJobRecord.status, func.count()).group_by(WorkflowJobRecord.status)
+            )
+            counts.update({status: count for status, count in rows})
+        return counts
+
+    def requeue_expired(self) -> int:
+        """Put running jobs whose lease expired back in the queue.
+
+        Returns:
+            Number of jobs re-queued
+        """
+        jobs = WorkflowJobRecord
+        now = datetime.utcnow()
+        with Session(self.engine) as session:
+            requeued = session.execute(
+                update(jobs)
+                .where(
+                    jobs.status == "running",
+                    or_(jobs.lease_expires_at.is_(None), jobs.lease_expires_at < now),
+                )
+                .values(
+                    status="queued",
+                    attempts=case((jobs.attempts > 0, jobs.attempts - 1), else_=0),
+                    available_at=now,
+                    worker_id=None,
+                    lease_expires_at=None,
+                )
+            ).rowcount
+            session.commit()
+        return requeued
+
+    def cleanup_finished(
+        self,
+        days: int = 7,
+        batch_size: int = CLEANUP_BATCH_SIZE,
+        pause_seconds: float = 0.0,
+    ) -> int:
+        """Delete succeeded and failed jobs finished more than N days ago.
+
+        Args:
+            days: Number of days to retain finished jobs (default: 7)
+            batch_size: Maximum jobs deleted per transaction
+            pause_seconds: Sleep between chunks
+
+        Returns:
+            Number of jobs deleted
+        """
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        return _delete_in_chunks(
+            self.engine,
+            WorkflowJobRecord.id,
+            WorkflowJobRecord.finished_at < cutoff,
+            batch_size,
+            pause_seconds,
+        )
+
+
+# How long memory change log rows are kept; caches that have not synced for
+# longer than this must drop everything (see MemoryCache.max_sync_gap)
+MEMORY_CHANGE_RETENTION_SECONDS = 3600
+
+
+# Keys per IN (...) query, well below SQLite's bound-parameter limit
+MEMORY_BATCH_SIZE = 500
+
+# Native upsert: keeps the row (id, created_at) and updates it in place
+_memory_insert = sqlite_insert(MemoryRecord.__table__)
+_MEMORY_UPSERT = _memory_insert.on_conflict_do_update(
+    index_elements=[MemoryRecord.__table__.c.namespace_key],
+    set_={
+        "value": _memory_insert.excluded.value,
+        "agent_id": _memory_insert.excluded.agent_id,
+        "workflow_id": _memory_insert.excluded.workflow_id,
+        "node_id": _memory_insert.excluded.node_id,
+        "key": _memory_insert.excluded.key,
+        "updated_at": _memory_insert.excluded.updated_at,
+        "expires_at": _memory_insert.excluded.expires_at,
+    },
+)
+
+
+def _chunks(items: List[Any], size: int = MEMORY_BATCH_SIZE) -> Iterator[List[Any]]:
+    """Split a list into consecutive slices of at most size items."""
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def _not_expired() -> Any:
+    """Condition excluding memory entries whose TTL has passed."""
+    return or_(MemoryRecord.expires_at.is_(None), MemoryRecord.expires_at > datetime.utcnow())
+
+
+def _prefix_range(column: Any, prefix: str) -> List[Any]:
+    """Build index-friendly range conditions for column LIKE 'prefix%'.
+
+    SQLite compares text byte-wise, so every string starting with prefix
+    sorts in [prefix, prefix with its last character incremented). Unlike
+    LIKE, this needs no escaping and can use a B-tree index.
+
+    Args:
+        column: String column to filter
+        prefix: Required prefix (empty for no filter)
+
+    Returns:
+        List of SQLAlchemy conditions (empty if prefix is empty)
+    """
+    if not prefix:
+        return []
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return [column >= prefix, column < upper]
 
 
 class SQLiteMemoryRepository(MemoryRepository):
     """SQLite implementation of memory repository.
 
     Provides key-value storage for agent memory with namespaced keys.
-    Uses INSERT OR REPLACE for upsert semantics when storing values.
+    Uses native INSERT ... ON CONFLICT DO UPDATE upserts (executemany for
+    bulk writes) when storing values.
+    Every write, delete and clear also appends to the memory_changes log
+    (in the same transaction) so caches in other processes can invalidate.
 
     Attributes:
         engine: SQLAlchemy Engine instance for database connections
+        origin: Identifier written to the change log for this instance
     """
 
     def __init__(self, engine: Engine) -> None:
@@ -825,6 +2235,7 @@ class SQLiteMemoryRepository(MemoryRepository):
             engine: SQLAlchemy Engine instance (created by factory)
         """
         self.engine = engine
+        self.origin = uuid.uuid4().hex
 
     def get(self, namespace_key: str) -> Optional[str]:
         """Get a value by namespace key.
@@ -835,14 +2246,53 @@ class SQLiteMemoryRepository(MemoryRepository):
         Returns:
             JSON-serialized value if found, None otherwise
         """
+        entry = self.get_entry(namespace_key)
+        return entry[0] if entry else None
+
+    def get_entry(self, namespace_key: str) -> Optional[tuple[str, Optional[datetime]]]:
+        """Get a value and its expiry time by namespace key.
+
+        Args:
+            namespace_key: Combined namespace key (agent:workflow:node:key)
+
+        Returns:
+            (JSON-serialized value, expires_at in UTC or None) if found,
+            None otherwise
+        """
+        stmt = (
+            select(MemoryRecord.value, MemoryRecord.expires_at)
+            .where(MemoryRecord.namespace_key == namespace_key, _not_expired())
+            .limit(1)
+        )
         with Session(self.engine) as session:
-            stmt: Select[MemoryRecord] = (
-                select(MemoryRecord)
-                .where(MemoryRecord.namespace_key == namespace_key)
-                .limit(1)
-            )
-            record = session.scalar(stmt)
-            return record.value if record else None
+            row = session.execute(stmt).first()
+            return (row.value, row.expires_at) if row else None
+
+    def get_entries(
+        self, namespace_keys: List[str]
+    ) -> Dict[str, tuple[str, Optional[datetime]]]:
+        """Get values and expiry times for many namespace keys at once.
+
+        Runs one IN query per MEMORY_BATCH_SIZE keys in a single session.
+
+        Args:
+            namespace_keys: Combined namespace keys (agent:workflow:node:key)
+
+        Returns:
+            Dict of namespace_key -> (JSON-serialized value, expires_at in
+            UTC or None); keys not found are omitted
+        """
+        entries: Dict[str, tuple[str, Optional[datetime]]] = {}
+        with Session(self.engine) as session:
+            for chunk in _chunks(list(dict.fromkeys(namespace_keys))):
+                rows = session.execute(
+                    select(
+                        MemoryRecord.namespace_key, MemoryRecord.value, MemoryRecord.expires_at
+                    ).where(MemoryRecord.namespace_key.in_(chunk), _not_expired())
+                )
+                for row in rows:
+                    entries[row.namespace_key] = (row.value, row.expires_at)
+        return entries
 
     def set(
         self,
@@ -852,11 +2302,10 @@ class SQLiteMemoryRepository(MemoryRepository):
         workflow_id: Optional[str],
         node_id: Optional[str],
         key: str,
+        ttl: Optional[int] = None,
     ) -> None:
         """Store a value with namespace key (upsert).
 
-        Uses raw SQL with INSERT OR REPLACE for upsert semantics.
-
         Args:
             namespace_key: Combined namespace key (agent:workflow:node:key)
             value: JSON-serialized value to store
@@ -864,26 +2313,42 @@ class SQLiteMemoryRepository(MemoryRepository):
             workflow_id: Workflow identifier (optional)
             node_id: Node identifier (optional)
             key: User-facing key name
+            ttl: Time-to-live in seconds (None for no expiry)
+        """
+        self.set_many([(namespace_key, value, agent_id, workflow_id, node_id, key)], ttl=ttl)
+
+    def set_many(self, entries: List[MemoryEntry], ttl: Optional[int] = None) -> None:
+        """Store many values in one transaction (upsert).
+
+        Uses INSERT ... ON CONFLICT (namespace_key) DO UPDATE run through
+        executemany; created_at of existing entries is preserved.
+
+        Args:
+            entries: (namespace_key, value, agent_id, workflow_id, node_id, key)
+                tuples, with values already JSON-serialized
+            ttl: Time-to-live in seconds for every entry (None for no expiry)
         """
+        if not entries:
+            return
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=ttl) if ttl is not None else None
+        rows = [
+            {
+                "namespace_key": namespace_key,
+                "value": value,
+                "agent_id": agent_id,
+                "workflow_id": workflow_id,
+                "node_id": node_id,
+                "key": key,
+                "created_at": now,
+                "updated_at": now,
+                "expires_at": expires_at,
+            }
+            for namespace_key, value, agent_id, workflow_id, node_id, key in entries
+        ]
         with Session(self.engine) as session:
-            # Use INSERT OR REPLACE for upsert semantics
-            session.execute(
-                text(
-                    "INSERT OR REPLACE INTO memory_records "
-                    "(namespace_key, value, agent_id, workflow_id, node_id, key, created_at, updated_at) "
-                    "VALUES (:namespace_key, :value, :agent_id, :workflow_id, :node_id, :key, "
-                    "COALESCE((SELECT created_at FROM memory_records WHERE namespace_key = :namespace_key), datetime('now')), "
-                    "datetime('now'))"
-                ),
-                {
-                    "namespace_key": namespace_key,
-                    "value": value,
-                    "agent_id": agent_id,
-                    "workflow_id": workflow_id,
-                    "node_id": node_id,
-                    "key": key,
-                },
-            )
+            session.execute(_MEMORY_UPSERT, rows)
+            self._log_changes(session, [row["namespace_key"] for row in rows])
             session.commit()
 
     def delete(self, namespace_key: str) -> bool:
@@ -893,7 +2358,7 @@ class SQLiteMemoryRepository(MemoryRepository):
             namespace_key: Combined namespace key (agent:workflow:node:key)
 
         Returns:
-            True if record was deleted, False if not found
+            True if record was deleted, False if not found (or expired)
         """
         with Session(self.engine) as session:
             stmt: Select[MemoryRecord] = (
@@ -906,9 +2371,36 @@ class SQLiteMemoryRepository(MemoryRepository):
             if record is None:
                 return False
 
+            expired = record.expires_at is not None and record.expires_at <= datetime.utcnow()
             session.delete(record)
+            self._log_change(session, namespace_key)
             session.commit()
-            return True
+            return not expired
+
+    def delete_many(self, namespace_keys: List[str]) -> int:
+        """Delete many values in one transaction.
+
+        Args:
+            namespace_keys: Combined namespace keys (agent:workflow:node:key)
+
+        Returns:
+            Number of records deleted (expired records are not counted)
+        """
+        unique_keys = list(dict.fromkeys(namespace_keys))
+        if not unique_keys:
+            return 0
+        deleted = 0
+        with Session(self.engine) as session:
+            for chunk in _chunks(unique_keys):
+                deleted += session.scalar(
+                    select(func.count()).where(
+                        MemoryRecord.namespace_key.in_(chunk), _not_expired()
+                    )
+                ) or 0
+                session.execute(delete(MemoryRecord).where(MemoryRecord.namespace_key.in_(chunk)))
+            self._log_changes(session, unique_keys)
+            session.commit()
+        return deleted
 
     def list(self, agent_id: str, prefix: str = "") -> List[tuple[str, str]]:
         """List all keys for an agent with optional prefix filtering.
@@ -920,20 +2412,61 @@ class SQLiteMemoryRepository(MemoryRepository):
         Returns:
             List of (key, value) tuples matching the criteria
         """
-        with Session(self.engine) as session:
-            stmt: Select[MemoryRecord] = (
-                select(MemoryRecord)
-                .where(MemoryRecord.agent_id == agent_id)
-                .order_by(MemoryRecord.key.asc())
+        stmt = (
+            select(MemoryRecord.key, MemoryRecord.value)
+            .where(
+                MemoryRecord.agent_id == agent_id,
+                *_prefix_range(MemoryRecord.key, prefix),
+                _not_expired(),
             )
+            .order_by(MemoryRecord.key.asc())
+        )
+        with Session(self.engine) as session:
+            return [(key, value) for key, value in session.execute(stmt)]
 
-            records = list(session.scalars(stmt).all())
+    def scan(
+        self,
+        namespace_prefix: str,
+        after: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[tuple[str, str]]:
+        """Page through entries whose namespace key starts with a prefix.
 
-            # Filter by prefix if provided (case-sensitive)
-            if prefix:
-                records = [r for r in records if r.key.startswith(prefix)]
+        Runs as a single range scan on the unique namespace_key index.
 
-            return [(r.key, r.value) for r in records]
+        Args:
+            namespace_prefix: Namespace key prefix (e.g., "bot:*:*:user:")
+            after: Exclusive namespace key to resume after (keyset cursor)
+            limit: Maximum number of entries to return (None for all)
+
+        Returns:
+            List of (namespace_key, value) tuples ordered by namespace key
+        """
+        stmt = select(MemoryRecord.namespace_key, MemoryRecord.value).where(
+            *_prefix_range(MemoryRecord.namespace_key, namespace_prefix), _not_expired()
+        )
+        if after is not None:
+            stmt = stmt.where(MemoryRecord.namespace_key > after)
+        stmt = stmt.order_by(MemoryRecord.namespace_key.asc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        with Session(self.engine) as session:
+            return [(namespace_key, value) for namespace_key, value in session.execute(stmt)]
+
+    def count(self, namespace_prefix: str) -> int:
+        """Count entries whose namespace key starts with a prefix.
+
+        Args:
+            namespace_prefix: Namespace key prefix (e.g., "bot:*:*:")
+
+        Returns:
+            Number of matching entries
+        """
+        stmt = select(func.count()).where(
+            *_prefix_range(MemoryRecord.namespace_key, namespace_prefix), _not_expired()
+        )
+        with Session(self.engine) as session:
+            return session.scalar(stmt) or 0
 
     def clear(self, agent_id: str) -> int:
         """Clear all memory for an agent.
@@ -945,19 +2478,12 @@ class SQLiteMemoryRepository(MemoryRepository):
             Number of records deleted
         """
         with Session(self.engine) as session:
-            stmt: Select[MemoryRecord] = (
-                select(MemoryRecord)
-                .where(MemoryRecord.agent_id == agent_id)
+            result = session.execute(
+                delete(MemoryRecord).where(MemoryRecord.agent_id == agent_id)
             )
-            records = list(session.scalars(stmt).all())
-
-            count = 0
-            for record in records:
-                session.delete(record)
-                count += 1
-
+            self._log_change(session, f"{agent_id}:", is_prefix=True)
             session.commit()
-            return count
+            return result.rowcount
 
     def clear_by_workflow(self, agent_id: str, workflow_id: str) -> int:
         """Clear all memory for a specific workflow.
@@ -970,22 +2496,91 @@ class SQLiteMemoryRepository(MemoryRepository):
             Number of records deleted
         """
         with Session(self.engine) as session:
-            stmt: Select[MemoryRecord] = (
-                select(MemoryRecord)
-                .where(
+            result = session.execute(
+                delete(MemoryRecord).where(
                     MemoryRecord.agent_id == agent_id,
                     MemoryRecord.workflow_id == workflow_id,
                 )
             )
-            records = list(session.scalars(stmt).all())
+            self._log_change(session, f"{agent_id}:{workflow_id}:", is_prefix=True)
+            session.commit()
+            return result.rowcount
 
-            count = 0
-            for record in records:
-                session.delete(record)
-                count += 1
+    def changes_since(
+        self, change_id: Optional[int], include_own: bool = False
+    ) -> tuple[int, List[tuple[str, bool]]]:
+        """Read memory changes made by other repository instances.
 
+        Args:
+            change_id: Last change id already seen (None to only fetch the
+                current latest id)
+            include_own: Also return changes made through this instance
+
+        Returns:
+            Tuple of (latest change id, [(namespace_key, is_prefix), ...])
+        """
+        with Session(self.engine) as session:
+            if change_id is None:
+                return session.scalar(select(func.max(MemoryChangeRecord.id))) or 0, []
+
+            rows = session.execute(
+                select(
+                    MemoryChangeRecord.id,
+                    MemoryChangeRecord.namespace_key,
+                    MemoryChangeRecord.is_prefix,
+                    MemoryChangeRecord.origin,
+                )
+                .where(MemoryChangeRecord.id > change_id)
+                .order_by(MemoryChangeRecord.id.asc())
+            ).all()
+
+        latest = rows[-1].id if rows else change_id
+        return latest, [
+            (row.namespace_key, bool(row.is_prefix))
+            for row in rows
+            if include_own or row.origin != self.origin
+        ]
+
+    def purge_expired(self) -> int:
+        """Delete expired entries and change log rows past their retention.
+
+        Returns:
+            Number of expired memory entries deleted
+        """
+        now = datetime.utcnow()
+        with Session(self.engine) as session:
+            result = session.execute(
+                delete(MemoryRecord).where(MemoryRecord.expires_at <= now)
+            )
+            session.execute(
+                delete(MemoryChangeRecord).where(
+                    MemoryChangeRecord.created_at
+                    < now - timedelta(seconds=MEMORY_CHANGE_RETENTION_SECONDS)
+                )
+            )
             session.commit()
-            return count
+            return result.rowcount
+
+    def _log_change(self, session: Session, namespace_key: str, is_prefix: bool = False) -> None:
+        """Append a change log row in the caller's transaction."""
+        session.add(
+            MemoryChangeRecord(
+                namespace_key=namespace_key,
+                is_prefix=int(is_prefix),
+                origin=self.origin,
+            )
+        )
+
+    def _log_changes(self, session: Session, namespace_keys: List[str]) -> None:
+        """Append one change log row per key (executemany) in the caller's transaction."""
+        now = datetime.utcnow()
+        session.execute(
+            insert(MemoryChangeRecord),
+            [
+                {"namespace_key": key, "is_prefix": 0, "origin": self.origin, "created_at": now}
+                for key in namespace_keys
+            ],
+        )
 
 
 class SqliteWorkflowRegistrationRepository(WorkflowRegistrationRepository):
@@ -1218,32 +2813,30 @@ class SqliteOrchestratorRepository(OrchestratorRepository):
             session.delete(orchestrator)
             session.commit()
 
-    def delete_expired(self) -> int:
+    def delete_expired(
+        self,
+        batch_size: int = CLEANUP_BATCH_SIZE,
+        pause_seconds: float = 0.0,
+    ) -> int:
         """Delete all expired orchestrators from the registry.
 
         An orchestrator is considered expired if the current time is after
-        its expiration time (last_heartbeat + ttl_seconds).
+        its expiration time (last_heartbeat + ttl_seconds). Rows are
+        removed with chunked set-based DELETEs.
+
+        Args:
+            batch_size: Maximum orchestrators deleted per transaction
+            pause_seconds: Sleep between chunks
 
         Returns:
             Number of orchestrators deleted
         """
-        with Session(self.engine) as session:
-            # Calculate the cutoff time for expired orchestrators
-            now = datetime.utcnow()
-
-            # Query all orchestrators
-            stmt: Select[OrchestratorRecord] = select(OrchestratorRecord)
-            orchestrators = list(session.scalars(stmt).all())
-
-            # Filter and delete expired orchestrators
-            expired_orchestrators = [
-                o for o in orchestrators if not o.is_alive()
-            ]
-
-            count = 0
-            for orchestrator in expired_orchestrators:
-                session.delete(orchestrator)
-                count += 1
-
-            session.commit()
-            return count
+        return _delete_expired_heartbeats(
+            self.engine,
+            OrchestratorRecord.orchestrator_id,
+            OrchestratorRecord.last_heartbeat,
+            OrchestratorRecord.ttl_seconds,
+            300,
+            batch_size,
+            pause_seconds,
+        )
@@ -13,14 +13,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import HTMLResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import Engine, Select, create_engine, select
-from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy import Engine, create_engine
+from sqlalchemy.orm import sessionmaker
 
 from configurable_agents.storage.base import (
     AbstractWorkflowRunRepository,
     AgentRegistryRepository,
+    WorkflowRunSummary,
 )
-from configurable_agents.storage.models import WorkflowRunRecord, AgentRecord
 
 
 class DashboardApp:
@@ -97,6 +97,12 @@ class DashboardApp:
             except Exception as e:
                 logger.warning(f"Failed to list agents on startup: {e}")
 
+        @self.app.on_event("shutdown")
+        async def shutdown_event():
+            """Stop the shared SSE publishers."""
+            for publisher in getattr(self.app.state, "sse_publishers", {}).values():
+                await publisher.close()
+
         # Include routers
         self._include_routers()
 
@@ -233,9 +239,18 @@ class DashboardApp:
             """Render main dashboard page."""
             # Get summary statistics for status panel
             try:
-                all_runs = self._get_all_runs()
-                total_workflows = len(all_runs)
-                active_workflows = sum(1 for r in all_runs if r.status == "running")
+                if isinstance(self.workflow_repo, AbstractWorkflowRunRepository):
+                    from configurable_agents.ui.dashboard.routes.status import (
+                        get_active_workflow_count,
+                    )
+
+                    active_workflows, total_workflows = await get_active_workflow_count(
+                        self.workflow_repo
+                    )
+                else:
+                    all_runs = self._get_all_runs()
+                    total_workflows = len(all_runs)
+                    active_workflows = sum(1 for r in all_runs if r.status == "running")
             except Exception:
                 total_workflows = 0
                 active_workflows = 0
@@ -284,37 +299,25 @@ class DashboardApp:
                 {"request": request}
             )
 
-    def _get_all_runs(self, limit: int = 100) -> List[WorkflowRunRecord]:
-        """Get all workflow runs from repository.
+    def _get_all_runs(self, limit: int = 100) -> List[WorkflowRunSummary]:
+        """Get the most recent workflow runs from repository.
 
         Args:
             limit: Maximum number of runs to return
 
         Returns:
-            List of WorkflowRunRecord instances
+            List of WorkflowRunSummary instances (no payload columns)
         """
-        # Try different methods based on repository implementation
         try:
-            # For SQLite repository with engine access
-            if hasattr(self.workflow_repo, 'engine'):
-                engine = self.workflow_repo.engine
-                with Session(engine) as session:
-                    stmt: Select[WorkflowRunRecord] = (
-                        select(WorkflowRunRecord)
-                        .order_by(WorkflowRunRecord.started_at.desc())
-                        .limit(limit)
-                    )
-                    return list(session.scalars(stmt).all())
+            if isinstance(self.workflow_repo, AbstractWorkflowRunRepository):
+                runs, _ = self.workflow_repo.list_runs(limit=limit)
+                return runs
+            # Fall back to list_all on duck-typed repositories
+            if hasattr(self.workflow_repo, 'list_all'):
+                return self.workflow_repo.list_all(limit=limit)
         except Exception:
             pass
 
-        # Fall back to trying list_all if it exists
-        if hasattr(self.workflow_repo, 'list_all'):
-            try:
-                return self.workflow_repo.list_all(limit=limit)
-            except Exception:
-                pass
-
         return []
 
     def get_app(self) -> FastAPI:
@@ -0,0 +1,250 @@
+"""Shared, change-detecting publishers behind the dashboard SSE streams.
+
+Each SSE topic (active workflow runs, live agents) has one publisher per
+dashboard process. The publisher polls its source once per interval no
+matter how many clients are connected, diffs the result against the last
+snapshot and fans out only what changed.
+
+Wire protocol per client:
+- On connect: one "<event>" message with the full snapshot (list of items)
+- Afterwards: "<event>_delta" messages with {"changed": [...], "removed": [ids]}
+- Every message carries an SSE id; a reconnecting client sends it back as
+  Last-Event-ID and receives only the deltas it missed (or a fresh
+  snapshot if they are no longer buffered)
+- ": heartbeat" comments keep idle connections open
+
+Backpressure: each client has a bounded queue. A client too slow to drain
+it is not allowed to hold memory or stall others; its backlog is dropped
+and it is sent a fresh snapshot once it catches up.
+
+Example:
+    >>> publisher = SSEPublisher("workflow_update", fetch_active_runs, interval=5)
+    >>> return StreamingResponse(publisher.stream(request.headers.get("last-event-id")))
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 256
+DEFAULT_QUEUE_SIZE = 64
+DEFAULT_HEARTBEAT_INTERVAL = 15.0
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    """One connected client."""
+
+    queue: "asyncio.Queue[str]"
+    resync: bool = False
+
+
+class SSEPublisher:
+    """
+    Polls a source once per interval and fans out deltas to SSE subscribers.
+
+    Attributes:
+        event: SSE event name for snapshots (deltas use "<event>_delta")
+        interval: Seconds between polls while at least one client is connected
+    """
+
+    def __init__(
+        self,
+        event: str,
+        fetch: Callable[[], List[Dict[str, Any]]],
+        interval: float = 5.0,
+        key: str = "id",
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+        heartbeat_interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+    ):
+        """
+        Initialize the publisher (polling starts with the first subscriber).
+
+        Args:
+            event: SSE event name for snapshots
+            fetch: Blocking callable returning the current items as
+                JSON-serializable dicts (run in a worker thread)
+            interval: Seconds between polls
+            key: Item field identifying an item across polls
+            history_size: Deltas kept for Last-Event-ID resume
+            queue_size: Messages buffered per client before it is resynced
+            heartbeat_interval: Seconds of silence before a heartbeat comment
+        """
+        self.event = event
+        self.interval = interval
+        self._fetch = fetch
+        self._key = key
+        self._queue_size = queue_size
+        self._heartbeat_interval = heartbeat_interval
+
+        # Ids are "<epoch>-<seq>" so ids from before a restart never match
+        self._epoch = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._items: Dict[Any, Dict[str, Any]] = {}
+        self._loaded = False
+        self._history: Deque[Tuple[int, str]] = deque(maxlen=history_size)
+        self._subscribers: set = set()
+        self._poller: Optional[asyncio.Task] = None
+        self._poke = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._stats = {"polls": 0, "deltas": 0, "resyncs": 0}
+
+    @property
+    def last_event_id(self) -> str:
+        """Id of the latest published state."""
+        return f"{self._epoch}-{self._seq}"
+
+    def stats(self) -> Dict[str, int]:
+        """Counters: polls, deltas published, slow-client resyncs, subscribers."""
+        return {**self._stats, "subscribers": len(self._subscribers)}
+
+    def notify(self) -> None:
+        """Poll now instead of waiting for the interval (e.g. after a known change)."""
+        self._poke.set()
+
+    async def refresh(self) -> Optional[str]:
+        """
+        Poll the source once and publish a delta if anything changed.
+
+        Returns:
+            The published message, or None if nothing changed
+        """
+        async with self._lock:
+            items = await asyncio.to_thread(self._fetch)
+            self._stats["polls"] += 1
+            current = {item[self._key]: item for item in items}
+            if not self._loaded:
+                self._items, self._loaded = current, True
+                return None
+
+            changed = [item for k, item in current.items() if self._items.get(k) != item]
+            removed = [k for k in self._items if k not in current]
+            self._items = current
+            if not changed and not removed:
+                return None
+
+            self._seq += 1
+            message = self._format(
+                f"{self.event}_delta", {"changed": changed, "removed": removed}
+            )
+            self._history.append((self._seq, message))
+            self._stats["deltas"] += 1
+            for subscriber in self._subscribers:
+                self._deliver(subscriber, message)
+            return message
+
+    async def stream(self, last_event_id: Optional[str] = None) -> AsyncGenerator[str, None]:
+        """
+        Yield SSE messages for one client until it disconnects.
+
+        Args:
+            last_event_id: Last-Event-ID header sent by a reconnecting client
+
+        Yields:
+            SSE-formatted message strings
+        """
+        subscriber = _Subscriber(queue=asyncio.Queue(maxsize=self._queue_size))
+        async with self._lock:
+            if not self._loaded:
+                self._items = {
+                    item[self._key]: item for item in await asyncio.to_thread(self._fetch)
+                }
+                self._loaded = True
+            missed = self._missed_since(last_event_id)
+            initial = missed if missed is not None else [self._snapshot()]
+            self._subscribers.add(subscriber)
+            self._ensure_poller()
+
+        try:
+            for message in initial:
+                yield message
+            while True:
+                if subscriber.resync:
+                    subscriber.resync = False
+                    while not subscriber.queue.empty():
+                        subscriber.queue.get_nowait()  # The wake-up marker
+                    yield self._snapshot()
+                    continue
+                try:
+                    message = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=self._heartbeat_interval
+                    )
+                except asyncio.TimeoutError:
+                    yield ": heartbeat\n\n"
+                    continue
+                yield message
+        finally:
+            self._subscribers.discard(subscriber)
+
+    async def close(self) -> None:
+        """Stop polling (connected clients keep their open streams)."""
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._poller = None
+
+    def _deliver(self, subscriber: _Subscriber, message: str) -> None:
+        if subscriber.resync:
+            return  # A snapshot is already owed; it supersedes the message
+        try:
+            subscriber.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Slow client: drop its backlog and send a snapshot instead
+            while not subscriber.queue.empty():
+                subscriber.queue.get_nowait()
+            subscriber.resync = True
+            subscriber.queue.put_nowait(": resync\n\n")  # Wakes a stream waiting on get()
+            self._stats["resyncs"] += 1
+
+    def _missed_since(self, last_event_id: Optional[str]) -> Optional[List[str]]:
+        """Buffered messages after last_event_id, or None if a snapshot is needed."""
+        if not last_event_id:
+            return None
+        epoch, _, seq = last_event_id.partition("-")
+        if epoch != self._epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self._seq:
+            return None
+        if seq == self._seq:
+            return []
+        oldest = self._history[0][0] if self._history else self._seq + 1
+        if seq < oldest - 1:
+            return None  # Gap no longer buffered
+        return [message for message_seq, message in self._history if message_seq > seq]
+
+    def _snapshot(self) -> str:
+        return self._format(self.event, list(self._items.values()))
+
+    def _format(self, event: str, data: Any) -> str:
+        return f"id: {self.last_event_id}\nevent: {event}\ndata: {json.dumps(data)}\n\n"
+
+    def _ensure_poller(self) -> None:
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.get_running_loop().create_task(self._poll_loop())
+
+    async def _poll_loop(self) -> None:
+        # Poll only while someone is listening
+        while self._subscribers:
+            try:
+                await asyncio.wait_for(self._poke.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._poke.clear()
+            if not self._subscribers:
+                break
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"SSE publisher '{self.event}' poll failed: {e}")
+        self._poller = None
@@ -2,128 +2,128 @@
 
 Provides SSE endpoints for workflow and agent updates that
 push data to connected clients for dynamic dashboard updates.
+Each stream is served by one shared SSEPublisher per app, which polls
+once per interval and sends clients only what changed.
 """
 
-import asyncio
-import json
-from datetime import datetime
-from typing import AsyncGenerator
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, Request
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from sqlalchemy import Select, select
-from sqlalchemy.orm import Session
 
 from configurable_agents.storage.base import (
     AbstractWorkflowRunRepository,
     AgentRegistryRepository,
+    MetricsRollupRepository,
+    WorkflowRunSummary,
 )
-from configurable_agents.storage.models import WorkflowRunRecord, AgentRecord
+from configurable_agents.ui.dashboard.publisher import SSEPublisher
+from configurable_agents.ui.dashboard.routes.status import get_active_workflow_count
 
 
 router = APIRouter(prefix="/metrics")
 
 
-async def _workflow_event_stream(
-    workflow_repo: AbstractWorkflowRunRepository,
-) -> AsyncGenerator[str, None]:
-    """Generate SSE events for workflow updates.
+# Poll intervals of the shared SSE publishers (seconds)
+WORKFLOW_STREAM_INTERVAL = 5.0
+AGENT_STREAM_INTERVAL = 10.0
+
+
+def _workflow_items(workflow_repo: AbstractWorkflowRunRepository) -> List[Dict[str, Any]]:
+    """Active runs as SSE payload items.
 
     Args:
         workflow_repo: Workflow repository for querying runs
 
-    Yields:
-        SSE-formatted event strings
+    Returns:
+        One JSON-serializable dict per running/pending run
     """
-    try:
-        while True:
-            # Get active runs
-            active_runs = _get_active_runs(workflow_repo)
-
-            # Format as JSON
-            data = [
-                {
-                    "id": run.id,
-                    "name": run.workflow_name,
-                    "status": run.status,
-                    "started_at": run.started_at.isoformat() if run.started_at else None,
-                    "duration_seconds": run.duration_seconds,
-                    "total_tokens": run.total_tokens,
-                    "total_cost_usd": run.total_cost_usd,
-                }
-                for run in active_runs
-            ]
-
-            # Send SSE event
-            event = f"event: workflow_update\n"
-            event += f"data: {json.dumps(data)}\n\n"
-            yield event
-
-            # Wait before next update
-            await asyncio.sleep(5)
-
-            # Send heartbeat to keep connection alive
-            yield ": heartbeat\n\n"
-
-    except asyncio.CancelledError:
-        # Client disconnected
-        raise
-    except Exception:
-        # Log error and send heartbeat
-        yield ": error\n\n"
-        await asyncio.sleep(5)
+    return [
+        {
+            "id": run.id,
+            "name": run.workflow_name,
+            "status": run.status,
+            "started_at": run.started_at.isoformat() if run.started_at else None,
+            "duration_seconds": run.duration_seconds,
+            "total_tokens": run.total_tokens,
+            "total_cost_usd": run.total_cost_usd,
+        }
+        for run in _get_active_runs(workflow_repo)
+    ]
+
+
+def _agent_items(agent_repo: AgentRegistryRepository) -> List[Dict[str, Any]]:
+    """Live agents as SSE payload items.
 
+    Args:
+        agent_repo: Agent repository for querying agents
 
-async def _agent_event_stream(
-    agent_repo: AgentRegistryRepository,
-) -> AsyncGenerator[str, None]:
-    """Generate SSE events for agent updates.
+    Returns:
+        One JSON-serializable dict per alive agent
+    """
+    return [
+        {
+            "id": agent.agent_id,
+            "name": agent.agent_name,
+            "host": agent.host,
+            "port": agent.port,
+            "is_alive": agent.is_alive(),
+            "last_heartbeat": agent.last_heartbeat.isoformat() if agent.last_heartbeat else None,
+        }
+        for agent in agent_repo.list_all(include_dead=False)
+    ]
+
+
+def _get_publisher(request: Request, topic: str) -> SSEPublisher:
+    """Get (or create) the app-wide publisher for an SSE topic.
 
     Args:
-        agent_repo: Agent repository for querying agents
+        request: Incoming request (publishers live on app.state)
+        topic: "workflows" or "agents"
 
-    Yields:
-        SSE-formatted event strings
+    Returns:
+        Shared SSEPublisher for the topic
     """
-    try:
-        while True:
-            # Get all alive agents
-            agents = agent_repo.list_all(include_dead=False)
-
-            # Format as JSON
-            data = [
-                {
-                    "id": agent.agent_id,
-                    "name": agent.agent_name,
-                    "host": agent.host,
-                    "port": agent.port,
-                    "is_alive": agent.is_alive(),
-                    "last_heartbeat": agent.last_heartbeat.isoformat() if agent.last_heartbeat else None,
-                }
-                for agent in agents
-            ]
-
-            # Send SSE event
-            event = f"event: agent_update\n"
-            event += f"data: {json.dumps(data)}\n\n"
-            yield event
-
-            # Wait before next update
-            await asyncio.sleep(10)
-
-            # Send heartbeat to keep connection alive
-            yield ": heartbeat\n\n"
-
-    except asyncio.CancelledError:
-        # Client disconnected
-        raise
-    except Exception:
-        # Log error and send heartbeat
-        yield ": error\n\n"
-        await asyncio.sleep(10)
+    state = request.app.state
+    publishers: Dict[str, SSEPublisher] = getattr(state, "sse_publishers", None)
+    if publishers is None:
+        publishers = state.sse_publishers = {}
+
+    if topic not in publishers:
+        if topic == "workflows":
+            workflow_repo = state.workflow_repo
+            publishers[topic] = SSEPublisher(
+                "workflow_update",
+                lambda: _workflow_items(workflow_repo),
+                interval=WORKFLOW_STREAM_INTERVAL,
+            )
+        else:
+            agent_repo = state.agent_registry_repo
+            publishers[topic] = SSEPublisher(
+                "agent_update",
+                lambda: _agent_items(agent_repo),
+                interval=AGENT_STREAM_INTERVAL,
+            )
+    return publishers[topic]
+
+
+def _sse_response(request: Request, topic: str) -> StreamingResponse:
+    publisher = _get_publisher(request, topic)
+    return StreamingResponse(
+        publisher.stream(request.headers.get("last-event-id")),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",
+        },
+    )
 
 
-def _get_active_runs(repo: AbstractWorkflowRunRepository, limit: int = 100) -> list:
+def _get_active_runs(
+    repo: AbstractWorkflowRunRepository, limit: int = 100
+) -> List[WorkflowRunSummary]:
     """Get active workflow runs from repository.
 
     Args:
@@ -131,34 +131,18 @@ def _get_active_runs(repo: AbstractWorkflowRunRepository, limit: int = 100) -> l
         limit: Maximum number of runs to return
 
     Returns:
-        List of active WorkflowRunRecord instances
+        List of running/pending WorkflowRunSummary instances, newest first
     """
-    # Try different methods based on repository implementation
     try:
-        # For SQLite repository with engine access
-        if hasattr(repo, 'engine'):
-            engine = repo.engine
-            with Session(engine) as session:
-                stmt: Select[WorkflowRunRecord] = (
-                    select(WorkflowRunRecord)
-                    .where(
-                        WorkflowRunRecord.status.in_(["running", "pending"])
-                    )
-                    .order_by(WorkflowRunRecord.started_at.desc())
-                    .limit(limit)
-                )
-                return list(session.scalars(stmt).all())
+        if isinstance(repo, AbstractWorkflowRunRepository):
+            runs, _ = repo.list_runs(statuses=["running", "pending"], limit=limit)
+            return runs
+        # Fall back to list_all on duck-typed repositories
+        if hasattr(repo, 'list_all'):
+            return [r for r in repo.list_all(limit=limit) if r.status in ("running", "pending")]
     except Exception:
         pass
 
-    # Fall back to trying list_all if it exists
-    if hasattr(repo, 'list_all'):
-        try:
-            all_runs = repo.list_all(limit=limit)
-            return [r for r in all_runs if r.status in ("running", "pending")]
-        except Exception:
-            pass
-
     return []
 
 
@@ -166,8 +150,10 @@ def _get_active_runs(repo: AbstractWorkflowRunRepository, limit: int = 100) -> l
 async def workflows_stream(request: Request):
     """SSE endpoint for workflow updates.
 
-    Returns a streaming response with workflow update events every 5 seconds.
-    Clients can listen for 'workflow_update' events to receive real-time data.
+    Sends a 'workflow_update' event with all active runs on connect, then
+    'workflow_update_delta' events ({"changed": [...], "removed": [ids]})
+    when runs change. One shared poll (every 5 seconds) serves all clients;
+    reconnecting clients resume from their Last-Event-ID.
 
     Headers:
         Cache-Control: no-cache
@@ -175,29 +161,20 @@ async def workflows_stream(request: Request):
         X-Accel-Buffering: no (disable nginx buffering)
 
     Example client-side usage (with HTMX SSE extension):
-        <div hx-ext="sse" sse-connect="/metrics/workflows/stream"
-             sse-swap="workflow_update">
+        <div hx-ext="sse" sse-connect="/metrics/workflows/stream">
+            <div hx-get="/workflows/table" hx-trigger="sse:workflow_update_delta"></div>
         </div>
     """
-    workflow_repo = request.app.state.workflow_repo
-
-    return StreamingResponse(
-        _workflow_event_stream(workflow_repo),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return _sse_response(request, "workflows")
 
 
 @router.get("/agents/stream")
 async def agents_stream(request: Request):
     """SSE endpoint for agent updates.
 
-    Returns a streaming response with agent update events every 10 seconds.
-    Clients can listen for 'agent_update' events to receive real-time data.
+    Sends an 'agent_update' event with all live agents on connect, then
+    'agent_update_delta' events when agents change (shared poll every 10
+    seconds, Last-Event-ID resume).
 
     Headers:
         Cache-Control: no-cache
@@ -205,21 +182,11 @@ async def agents_stream(request: Request):
         X-Accel-Buffering: no (disable nginx buffering)
 
     Example client-side usage (with HTMX SSE extension):
-        <div hx-ext="sse" sse-connect="/metrics/agents/stream"
-             sse-swap="agent_update">
+        <div hx-ext="sse" sse-connect="/metrics/agents/stream">
+            <div hx-get="/agents/table" hx-trigger="sse:agent_update_delta"></div>
         </div>
     """
-    agent_repo = request.app.state.agent_registry_repo
-
-    return StreamingResponse(
-        _agent_event_stream(agent_repo),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+    return _sse_response(request, "agents")
 
 
 @router.get("/summary")
@@ -227,16 +194,27 @@ async def metrics_summary(request: Request):
     """Get summary metrics for the dashboard.
 
     Returns a JSON summary of current system metrics including
-    workflow counts, agent counts, and cost totals.
+    workflow counts, agent counts, and cost totals. Totals come from the
+    metrics rollups when the repository has them (constant time);
+    otherwise cost covers the latest 1000 runs.
     """
     workflow_repo = request.app.state.workflow_repo
     agent_repo = request.app.state.agent_registry_repo
 
-    # Get workflow stats
-    all_runs = _get_all_runs_limit(workflow_repo, limit=1000)
-    total_workflows = len(all_runs)
-    running_workflows = sum(1 for r in all_runs if r.status == "running")
-    total_cost = sum(r.total_cost_usd or 0 for r in all_runs)
+    rollups = _get_rollups(workflow_repo)
+    if rollups is not None:
+        running_workflows, total_workflows = await get_active_workflow_count(workflow_repo)
+        total_cost = rollups.totals()["total_cost_usd"]
+    else:
+        all_runs = _get_all_runs_limit(workflow_repo, limit=1000)
+        total_cost = sum(r.total_cost_usd or 0 for r in all_runs)
+        if isinstance(workflow_repo, AbstractWorkflowRunRepository):
+            # Exact counts without loading runs
+            total_workflows = workflow_repo.count_runs()
+            running_workflows = workflow_repo.count_runs(statuses=["running"])
+        else:
+            total_workflows = len(all_runs)
+            running_workflows = sum(1 for r in all_runs if r.status == "running")
 
     # Get agent stats
     agents = agent_repo.list_all(include_dead=False)
@@ -251,38 +229,82 @@ async def metrics_summary(request: Request):
     }
 
 
-def _get_all_runs_limit(repo: AbstractWorkflowRunRepository, limit: int = 1000) -> list:
-    """Get all workflow runs from repository.
+# Default lookback of /metrics/rollups per granularity (hours)
+ROLLUP_DEFAULT_HOURS = {"minute": 1, "hour": 24, "day": 30 * 24}
+
+
+@router.get("/rollups")
+async def metrics_rollups(
+    request: Request,
+    granularity: str = "hour",
+    hours: Optional[int] = None,
+    workflow: Optional[str] = None,
+    by_workflow: bool = False,
+):
+    """Get pre-aggregated run metrics per time bucket.
+
+    Query params:
+        granularity: "minute", "hour" or "day" (default: hour)
+        hours: Lookback window in hours (default: 1 / 24 / 720 by granularity)
+        workflow: Only this workflow (optional)
+        by_workflow: One entry per bucket and workflow
+
+    Returns:
+        JSON with the buckets (runs by status, tokens, cost, avg/p50/p95
+        duration) and all-time totals
+    """
+    rollups = _get_rollups(request.app.state.workflow_repo)
+    if rollups is None:
+        raise HTTPException(status_code=404, detail="Metrics rollups not available")
+    if granularity not in ROLLUP_DEFAULT_HOURS:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown granularity: {granularity}"
+        )
+
+    start = datetime.utcnow() - timedelta(
+        hours=hours if hours is not None else ROLLUP_DEFAULT_HOURS[granularity]
+    )
+    buckets = rollups.query(
+        granularity, start=start, workflow_name=workflow, by_workflow=by_workflow
+    )
+    return {
+        "granularity": granularity,
+        "buckets": [
+            {**bucket, "bucket_start": bucket["bucket_start"].isoformat()}
+            for bucket in buckets
+        ],
+        "totals": rollups.totals(workflow_name=workflow),
+    }
+
+
+def _get_rollups(repo: AbstractWorkflowRunRepository) -> Optional[MetricsRollupRepository]:
+    """Metrics rollups attached to a workflow repository, if any."""
+    rollups = getattr(repo, "rollups", None)
+    return rollups if isinstance(rollups, MetricsRollupRepository) else None
+
+
+def _get_all_runs_limit(
+    repo: AbstractWorkflowRunRepository, limit: int = 1000
+) -> List[WorkflowRunSummary]:
+    """Get the most recent workflow runs from repository.
 
     Args:
         repo: Workflow repository
         limit: Maximum number of runs to return
 
     Returns:
-        List of WorkflowRunRecord instances
+        List of WorkflowRunSummary instances, newest first
     """
-    # Try different methods based on repository implementation
     try:
-        # For SQLite repository with engine access
-        if hasattr(repo, 'engine'):
-            engine = repo.engine
-            with Session(engine) as session:
-                stmt: Select[WorkflowRunRecord] = (
-                    select(WorkflowRunRecord)
-                    .order_by(WorkflowRunRecord.started_at.desc())
-                    .limit(limit)
-                )
-                return list(session.scalars(stmt).all())
+        if isinstance(repo, AbstractWorkflowRunRepository):
+            runs, _ = repo.list_runs(limit=limit)
+            return runs
+        # Fall back to list_all on duck-typed repositories
+        if hasattr(repo, 'list_all'):
+            return repo.list_all(limit=limit)
     except Exception:
         pass
 
-    # Fall back to trying list_all if it exists
-    if hasattr(repo, 'list_all'):
-        try:
-            return repo.list_all(limit=limit)
-        except Exception:
-            pass
-
     return []
 
 
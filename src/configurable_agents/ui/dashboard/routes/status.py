@@ -10,14 +10,12 @@ from typing import Dict, List, Optional, Tuple
 
 from fastapi import APIRouter, Request
 from fastapi.responses import HTMLResponse
-from sqlalchemy import select, desc
-from sqlalchemy.orm import Session
 
 from configurable_agents.storage.base import (
     AbstractWorkflowRunRepository,
     AgentRegistryRepository,
+    MetricsRollupRepository,
 )
-from configurable_agents.storage.models import WorkflowRunRecord
 
 router = APIRouter()
 
@@ -65,6 +63,9 @@ class StatusMetrics:
 async def get_active_workflow_count(repo: AbstractWorkflowRunRepository) -> Tuple[int, int]:
     """Get count of active and total workflows.
 
+    With metrics rollups, the total is the finished runs from the all-time
+    rollup plus the (indexed) unfinished ones, independent of history size.
+
     Args:
         repo: Workflow run repository
 
@@ -72,18 +73,18 @@ async def get_active_workflow_count(repo: AbstractWorkflowRunRepository) -> Tupl
         Tuple of (active_count, total_count)
     """
     try:
-        # Try to get all runs
-        if hasattr(repo, 'engine'):
-            with Session(repo.engine) as session:
-                total_stmt = select(WorkflowRunRecord)
-                active_stmt = select(WorkflowRunRecord).where(
-                    WorkflowRunRecord.status == "running"
+        if isinstance(repo, AbstractWorkflowRunRepository):
+            active_count = repo.count_runs(statuses=["running"])
+            rollups = getattr(repo, "rollups", None)
+            if isinstance(rollups, MetricsRollupRepository):
+                total_count = (
+                    rollups.totals()["runs"]
+                    + active_count
+                    + repo.count_runs(statuses=["pending"])
                 )
-
-                total_count = len(list(session.scalars(total_stmt).all()))
-                active_count = len(list(session.scalars(active_stmt).all()))
-
-                return active_count, total_count
+            else:
+                total_count = repo.count_runs()
+            return active_count, total_count
         else:
             # Fallback: try list_all method
             runs = repo.list_all(limit=1000)
@@ -126,30 +127,21 @@ async def get_recent_errors(
         List of error dictionaries with message and timestamp
     """
     try:
-        if hasattr(repo, 'engine'):
-            with Session(repo.engine) as session:
-                cutoff = datetime.utcnow() - timedelta(hours=24)
-                stmt = (
-                    select(WorkflowRunRecord)
-                    .where(
-                        WorkflowRunRecord.status == "failed",
-                        WorkflowRunRecord.started_at >= cutoff
-                    )
-                    .order_by(desc(WorkflowRunRecord.started_at))
-                    .limit(count)
-                )
-
-                failed_runs = list(session.scalars(stmt).all())
-
-                return [
-                    {
-                        "message": run.error_message or "Unknown error",
-                        "workflow": run.workflow_name,
-                        "timestamp": run.started_at.strftime("%H:%M") if run.started_at else "??:??",
-                    }
-                    for run in failed_runs
-                ]
-        return []
+        if not isinstance(repo, AbstractWorkflowRunRepository):
+            return []
+        failed_runs, _ = repo.list_runs(
+            statuses=["failed"],
+            started_after=datetime.utcnow() - timedelta(hours=24),
+            limit=count,
+        )
+        return [
+            {
+                "message": run.error_message or "Unknown error",
+                "workflow": run.workflow_name,
+                "timestamp": run.started_at.strftime("%H:%M") if run.started_at else "??:??",
+            }
+            for run in failed_runs
+        ]
     except Exception as e:
         logger.warning(f"Failed to get recent errors: {e}")
         return []
@@ -9,22 +9,22 @@ import json
 import os
 import tempfile
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import yaml
 from fastapi import APIRouter, BackgroundTasks, Request, Response, Depends
 from fastapi.responses import HTMLResponse, JSONResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import Select, create_engine, select
-from sqlalchemy.orm import Session
 
 from configurable_agents.runtime.executor import run_workflow_async
-from configurable_agents.storage.base import AbstractWorkflowRunRepository
-from configurable_agents.storage.models import WorkflowRunRecord
+from configurable_agents.storage.base import AbstractWorkflowRunRepository, WorkflowRunSummary
 
 
 router = APIRouter(prefix="/workflows")
 
+# Runs per page in the workflow tables
+RUNS_PAGE_SIZE = 50
+
 
 def _format_duration(seconds: Optional[float]) -> str:
     """Format duration in seconds as human-readable string.
@@ -137,17 +137,16 @@ async def _get_workflow_repo(request: Request) -> AbstractWorkflowRunRepository:
 async def workflows_list(
     request: Request,
     status_filter: Optional[str] = None,
+    cursor: Optional[str] = None,
     workflow_repo: AbstractWorkflowRunRepository = Depends(_get_workflow_repo),
 ):
     """Render workflows list page."""
     templates: Jinja2Templates = request.app.state.templates
 
-    # Get all runs
-    runs = _get_all_runs(workflow_repo, limit=100)
-
-    # Filter by status if specified
-    if status_filter:
-        runs = [r for r in runs if r.status == status_filter]
+    # One page of runs (status filter applied in the query)
+    runs, next_cursor = _get_runs_page(
+        workflow_repo, status_filter=status_filter, cursor=cursor
+    )
 
     return templates.TemplateResponse(
         "workflows.html",
@@ -155,6 +154,8 @@ async def workflows_list(
             "request": request,
             "workflows": runs,
             "status_filter": status_filter or "all",
+            "cursor": cursor,
+            "next_cursor": next_cursor,
         },
     )
 
@@ -164,25 +165,23 @@ async def workflows_table(
     request: Request,
     status_filter: Optional[str] = None,
     agent: Optional[str] = None,
+    cursor: Optional[str] = None,
     workflow_repo: AbstractWorkflowRunRepository = Depends(_get_workflow_repo),
 ):
     """Render workflows table partial for HTMX refresh."""
     templates: Jinja2Templates = request.app.state.templates
 
-    # Get all runs
-    runs = _get_all_runs(workflow_repo, limit=100)
-
-    # Filter by status if specified
-    if status_filter:
-        runs = [r for r in runs if r.status == status_filter]
+    # One page of runs (status and specific-agent filters applied in the query)
+    runs, next_cursor = _get_runs_page(
+        workflow_repo,
+        status_filter=status_filter,
+        workflow_name=agent if agent and agent != "orchestrator" else None,
+        cursor=cursor,
+    )
 
-    # Filter by agent if specified
     if agent == "orchestrator":
         # Show only orchestrator agent executions (workflow_name contains "-agent" or looks like agent ID)
         runs = [r for r in runs if r.workflow_name and ("-" in r.workflow_name or r.workflow_name.endswith("-agent"))]
-    elif agent:
-        # Filter by specific agent ID
-        runs = [r for r in runs if r.workflow_name == agent]
 
     return templates.TemplateResponse(
         "workflows_table.html",
@@ -191,6 +190,8 @@ async def workflows_table(
             "workflows": runs,
             "status_filter": status_filter or "all",
             "agent_filter": agent or "",
+            "cursor": cursor,
+            "next_cursor": next_cursor,
         },
     )
 
@@ -259,6 +260,7 @@ async def workflow_detail(
 @router.post("/{run_id}/cancel")
 async def workflow_cancel(
     run_id: str,
+    request: Request,
     workflow_repo: AbstractWorkflowRunRepository = Depends(_get_workflow_repo),
 ):
     """Cancel a running workflow (best-effort)."""
@@ -277,6 +279,7 @@ async def workflow_cancel(
     # Update status to cancelled
     try:
         workflow_repo.update_status(run_id, "cancelled")
+        _notify_workflow_stream(request)
         return Response(content="Workflow cancelled", status_code=200)
     except Exception as e:
         return Response(
@@ -288,6 +291,7 @@ async def workflow_cancel(
 @router.post("/{run_id}/restart")
 async def workflow_restart(
     run_id: str,
+    request: Request,
     background_tasks: BackgroundTasks,
     workflow_repo: AbstractWorkflowRunRepository = Depends(_get_workflow_repo),
 ):
@@ -360,6 +364,7 @@ async def workflow_restart(
                 # Error is logged by run_workflow_async, workflow record will show failed status
                 pass
             finally:
+                _notify_workflow_stream(request)
                 # Clean up temporary config file
                 try:
                     os.unlink(temp_config_path)
@@ -392,39 +397,52 @@ async def workflow_restart(
         )
 
 
-def _get_all_runs(repo: AbstractWorkflowRunRepository, limit: int = 100) -> List[WorkflowRunRecord]:
-    """Get all workflow runs from repository.
+def _notify_workflow_stream(request: Request) -> None:
+    """Push run changes made by this process to SSE clients without waiting for the next poll."""
+    publisher = getattr(request.app.state, "sse_publishers", {}).get("workflows")
+    if publisher is not None:
+        publisher.notify()
+
+
+def _get_runs_page(
+    repo: AbstractWorkflowRunRepository,
+    limit: int = RUNS_PAGE_SIZE,
+    status_filter: Optional[str] = None,
+    workflow_name: Optional[str] = None,
+    cursor: Optional[str] = None,
+) -> Tuple[List[WorkflowRunSummary], Optional[str]]:
+    """Get one page of workflow run summaries from repository.
 
     Args:
         repo: Workflow repository
         limit: Maximum number of runs to return
+        status_filter: Only runs with this status (optional)
+        workflow_name: Only runs of this workflow (optional)
+        cursor: Cursor of the page to show (None for the newest runs)
 
     Returns:
-        List of WorkflowRunRecord instances
+        Tuple of (WorkflowRunSummary list, cursor of the next page or None)
     """
-    # Try different methods based on repository implementation
     try:
-        # For SQLite repository with engine access
-        if hasattr(repo, 'engine'):
-            engine = repo.engine
-            with Session(engine) as session:
-                stmt: Select[WorkflowRunRecord] = (
-                    select(WorkflowRunRecord)
-                    .order_by(WorkflowRunRecord.started_at.desc())
-                    .limit(limit)
-                )
-                return list(session.scalars(stmt).all())
+        if isinstance(repo, AbstractWorkflowRunRepository):
+            return repo.list_runs(
+                workflow_name=workflow_name,
+                statuses=[status_filter] if status_filter else None,
+                limit=limit,
+                cursor=cursor,
+            )
+        # Fall back to list_all on duck-typed repositories (single page)
+        if hasattr(repo, 'list_all') and not cursor:
+            runs = repo.list_all(limit=limit)
+            return [
+                r for r in runs
+                if (not status_filter or r.status == status_filter)
+                and (not workflow_name or r.workflow_name == workflow_name)
+            ], None
     except Exception:
         pass
 
-    # Fall back to trying list_all if it exists
-    if hasattr(repo, 'list_all'):
-        try:
-            return repo.list_all(limit=limit)
-        except Exception:
-            pass
-
-    return []
+    return [], None
 
 
 # Export helper functions for use in templates
@@ -152,10 +152,9 @@ class WebhookHandler:
         Processes webhook payload with the following steps:
         1. Read raw request body
         2. Extract and verify HMAC signature (if present or required)
-        3. Check for replay attack using webhook_id (if provided)
-        4. Parse JSON payload
+        3. Parse JSON payload
+        4. Claim webhook_id (if provided); a lost claim is a replay
         5. Call handler function with validated data
-        6. Mark webhook as processed (if webhook_id provided)
 
         Args:
             request: FastAPI Request object
@@ -199,16 +198,13 @@ class WebhookHandler:
             logger.error(f"Failed to parse webhook JSON: {e}")
             raise WebhookError(f"Invalid JSON payload: {e}")
 
-        # 4. Check for replay attack using webhook_id
+        # 4. Claim webhook_id atomically (check and mark in one operation)
         webhook_id = data.get("webhook_id") or data.get("id")
         if webhook_id and webhook_repo:
-            if webhook_repo.is_processed(webhook_id):
+            provider = data.get("provider", "unknown")
+            if not webhook_repo.claim(webhook_id, provider):
                 logger.info(f"Replay attack detected: webhook_id={webhook_id}")
                 raise ReplayAttackError(f"Webhook event {webhook_id} already processed")
-
-            # Mark as processed before calling handler
-            provider = data.get("provider", "unknown")
-            webhook_repo.mark_processed(webhook_id, provider)
             logger.debug(f"Marked webhook {webhook_id} as processed")
 
         # 5. Call handler function
@@ -0,0 +1,420 @@
+"""Worker pool draining the webhook workflow job queue.
+
+Webhook endpoints enqueue a job in the durable job queue
+(WorkflowJobRepository) and return at once with its ID; a fixed pool of
+worker tasks on the event loop claims jobs (highest priority first) and
+runs them. Per-workflow concurrency limits keep one slow workflow from
+occupying every worker, and failed runs are retried with exponential
+backoff until the job's max_attempts is reached.
+
+When a job finishes (succeeded, or failed with no attempts left) the
+notifier registered for its source is called, which is how WhatsApp and
+Telegram deliver results back to the sender.
+
+Several processes (e.g. uvicorn workers) may drain the same queue. Each
+claimed job is leased to the claiming queue, which renews the lease while
+the job runs; jobs whose lease expired (their process died) are re-queued
+at startup and periodically afterwards, while jobs other live processes
+are running are left alone.
+
+Example:
+    >>> queue = WorkflowJobQueue(get_job_repository(), workers=4,
+    ...                          concurrency_limits={"article_writer.yaml": 1})
+    >>> queue.start()  # inside a running event loop
+    >>> job = await queue.enqueue("article_writer.yaml", {"topic": "AI"}, priority=5)
+    >>> queue.get(job.id).status
+    'queued'
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from configurable_agents.storage.base import (
+    DEFAULT_JOB_LEASE_SECONDS,
+    WorkflowJob,
+    WorkflowJobRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+# Worker tasks per queue
+DEFAULT_QUEUE_WORKERS = 4
+
+# Runs allowed per job before it fails
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Seconds before the first retry (doubled for each further attempt)
+DEFAULT_RETRY_BACKOFF = 5.0
+
+# Seconds an idle worker waits before polling the queue again (jobs
+# enqueued in this process wake workers immediately)
+DEFAULT_POLL_INTERVAL = 1.0
+
+# Runs a workflow: async func(workflow_name, inputs) -> outputs
+JobRunner = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+# Delivers the outcome of a finished job
+JobNotifier = Callable[[WorkflowJob], Awaitable[None]]
+
+
+def parse_concurrency_limits(spec: Optional[str]) -> Dict[str, int]:
+    """
+    Parse per-workflow concurrency limits.
+
+    Args:
+        spec: Comma-separated "workflow=limit" pairs (e.g. "a.yaml=1,b=2")
+
+    Returns:
+        Dict mapping workflow name to its limit
+
+    Raises:
+        ValueError: If a pair is malformed or a limit is not positive
+
+    Example:
+        >>> parse_concurrency_limits("article_writer.yaml=1, summarize=2")
+        {'article_writer.yaml': 1, 'summarize': 2}
+    """
+    limits: Dict[str, int] = {}
+    for pair in (spec or "").split(","):
+        if not pair.strip():
+            continue
+        name, sep, value = pair.partition("=")
+        if not sep or not name.strip():
+            raise ValueError(f"Invalid concurrency limit '{pair.strip()}', expected workflow=limit")
+        limit = int(value)
+        if limit < 1:
+            raise ValueError(f"Concurrency limit for '{name.strip()}' must be positive, got {limit}")
+        limits[name.strip()] = limit
+    return limits
+
+
+async def _run_workflow(workflow_name: str, inputs: Dict[str, Any]) -> Any:
+    """Default runner: execute the workflow config named by the job."""
+    from configurable_agents.runtime.executor import run_workflow_async
+
+    return await run_workflow_async(workflow_name, inputs)
+
+
+class WorkflowJobQueue:
+    """
+    Job queue front end with a worker pool running queued workflows.
+
+    enqueue() may be awaited from any coroutine (the insert runs in a
+    thread); workers run as tasks on the loop that called start().
+
+    Attributes:
+        repo: Durable job storage
+        workers: Number of worker tasks
+        concurrency_limits: Maximum running jobs per workflow name
+        max_attempts: Default runs allowed per job
+        retry_backoff: Seconds before the first retry
+        poll_interval: Idle worker polling interval in seconds
+        lease_seconds: Lease on claimed jobs (renewed every third of it)
+        worker_id: Lease owner ID of this queue (host, PID and a random suffix)
+    """
+
+    def __init__(
+        self,
+        repo: WorkflowJobRepository,
+        runner: Optional[JobRunner] = None,
+        workers: int = DEFAULT_QUEUE_WORKERS,
+        concurrency_limits: Optional[Dict[str, int]] = None,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_backoff: float = DEFAULT_RETRY_BACKOFF,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        lease_seconds: float = DEFAULT_JOB_LEASE_SECONDS,
+    ) -> None:
+        """
+        Initialize a stopped queue.
+
+        Args:
+            repo: Durable job storage
+            runner: Workflow runner (default: run_workflow_async)
+            workers: Number of worker tasks
+            concurrency_limits: Maximum running jobs per workflow name
+            max_attempts: Default runs allowed per job
+            retry_backoff: Seconds before the first retry
+            poll_interval: Idle worker polling interval in seconds
+            lease_seconds: Seconds a claimed job stays leased without renewal
+
+        Raises:
+            ValueError: If workers, max_attempts or lease_seconds is not positive
+        """
+        if workers < 1:
+            raise ValueError(f"workers must be positive, got {workers}")
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be positive, got {max_attempts}")
+        if lease_seconds <= 0:
+            raise ValueError(f"lease_seconds must be positive, got {lease_seconds}")
+        self.repo = repo
+        self.runner = runner or _run_workflow
+        self.workers = workers
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._notifiers: Dict[str, JobNotifier] = {}
+        self._running: Dict[str, int] = {}
+        self._leased: Set[str] = set()
+        self._claim_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: List[asyncio.Task] = []
+        self._succeeded = 0
+        self._failed = 0
+        self._retried = 0
+
+    def register_notifier(self, source: str, notifier: JobNotifier) -> None:
+        """
+        Register (or replace) the result notifier for a job source.
+
+        Args:
+            source: Job source ("generic", "whatsapp", "telegram")
+            notifier: Coroutine function called with each finished job
+        """
+        self._notifiers[source] = notifier
+
+    async def enqueue(
+        self,
+        workflow_name: str,
+        inputs: Dict[str, Any],
+        source: str = "generic",
+        reply_to: Optional[str] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+    ) -> WorkflowJob:
+        """
+        Add a job and wake an idle worker.
+
+        Args:
+            workflow_name: Workflow to run
+            inputs: Workflow inputs (JSON-serializable)
+            source: Endpoint enqueuing the job
+            reply_to: Where the source's notifier delivers the result
+            priority: Higher runs first
+            max_attempts: Runs allowed (default: the queue's max_attempts)
+
+        Returns:
+            The queued job
+        """
+        job = await asyncio.to_thread(
+            self.repo.enqueue,
+            workflow_name,
+            inputs,
+            source=source,
+            reply_to=reply_to,
+            priority=priority,
+            max_attempts=max_attempts or self.max_attempts,
+        )
+        logger.info(f"Queued job {job.id} for workflow '{workflow_name}' from {source}")
+        self._wake()
+        return job
+
+    def get(self, job_id: str) -> Optional[WorkflowJob]:
+        """
+        Look up a job.
+
+        Args:
+            job_id: Job ID
+
+        Returns:
+            The job, or None if not found
+        """
+        return self.repo.get(job_id)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether worker tasks are active."""
+        return any(not task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        """
+        Start the worker tasks and the lease keeper on the running event loop.
+
+        Jobs whose lease expired (left running by a process that died) are
+        re-queued first. Does nothing if the workers are already running.
+        """
+        if self.is_running:
+            return
+        requeued = self.repo.requeue_expired()
+        if requeued:
+            logger.info(f"Re-queued {requeued} interrupted workflow jobs")
+        self._loop = asyncio.get_running_loop()
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"workflow-job-worker-{i}")
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._keep_leases(), name="workflow-job-leases"))
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks; interrupted jobs are re-queued once their lease expires."""
+        self._stopping = True
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_once(self) -> Optional[WorkflowJob]:
+        """
+        Claim and run one job, respecting the concurrency limits.
+
+        Returns:
+            The job as stored after the attempt, or None if none was runnable
+        """
+        async with self._claim_lock:
+            saturated = [
+                name
+                for name, limit in self.concurrency_limits.items()
+                if self._running.get(name, 0) >= limit
+            ]
+            job = await asyncio.to_thread(
+                self.repo.claim_next, saturated, self.worker_id, self.lease_seconds
+            )
+            if job is None:
+                return None
+            self._running[job.workflow_name] = self._running.get(job.workflow_name, 0) + 1
+            self._leased.add(job.id)
+        try:
+            return await self._execute(job)
+        finally:
+            self._leased.discard(job.id)
+            self._running[job.workflow_name] -= 1
+            if not self._running[job.workflow_name]:
+                del self._running[job.workflow_name]
+            self._wake()
+
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Snapshot of queue state.
+
+        Returns:
+            Dict with workers, worker_running, running (per workflow),
+            jobs (count per status), succeeded, failed and retried
+        """
+        return {
+            "workers": self.workers,
+            "worker_running": self.is_running,
+            "running": dict(self._running),
+            "jobs": self.repo.count_by_status(),
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "retried": self._retried,
+        }
+
+    async def _worker(self) -> None:
+        """Run jobs until stopped, sleeping while the queue is empty."""
+        while not self._stopping:
+            try:
+                job = await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Workflow job worker error: {e}")
+                job = None
+            if job is not None:
+                continue
+            self._wakeup.clear()
+            # asyncio.wait never swallows a cancel from stop(), unlike
+            # wait_for on Python < 3.12 when the wakeup fires concurrently
+            waiter = asyncio.ensure_future(self._wakeup.wait())
+            try:
+                await asyncio.wait({waiter}, timeout=self.poll_interval)
+            finally:
+                waiter.cancel()
+
+    async def _keep_leases(self) -> None:
+        """Renew leases of running jobs and re-queue abandoned ones until stopped."""
+        while not self._stopping:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                leased = list(self._leased)
+                renewed = await asyncio.to_thread(
+                    self.repo.renew_leases, self.worker_id, leased, self.lease_seconds
+                )
+                if renewed < len(leased):
+                    logger.warning(
+                        f"{len(leased) - renewed} workflow job leases lapsed; "
+                        f"those jobs may run again elsewhere"
+                    )
+                requeued = await asyncio.to_thread(self.repo.requeue_expired)
+                if requeued:
+                    logger.info(f"Re-queued {requeued} abandoned workflow jobs")
+                    self._wake()
+            except Exception as e:
+                logger.error(f"Workflow job lease renewal failed: {e}")
+
+    async def _execute(self, job: WorkflowJob) -> WorkflowJob:
+        """
+        Run a claimed job and record its outcome.
+
+        If the job was deleted, or its lease lapsed and another worker
+        re-claimed it, nothing is recorded or delivered and the job is
+        returned as claimed.
+        """
+        logger.info(
+            f"Running job {job.id} (workflow '{job.workflow_name}', "
+            f"attempt {job.attempts}/{job.max_attempts})"
+        )
+        try:
+            result = await self.runner(job.workflow_name, job.inputs)
+        except Exception as e:
+            delay = self.retry_backoff * 2 ** (job.attempts - 1)
+            updated = await asyncio.to_thread(
+                self.repo.fail, job.id, str(e), delay, self.worker_id
+            )
+            if updated is None:
+                logger.warning(f"Job {job.id} failed after its lease was lost: {e}")
+                return job
+            if updated.status == "queued":
+                self._retried += 1
+                logger.warning(f"Job {job.id} failed, retrying in {delay:.0f}s: {e}")
+                return updated
+            self._failed += 1
+            logger.error(f"Job {job.id} failed after {job.attempts} attempts: {e}")
+            await self._notify(updated)
+            return updated
+
+        if not isinstance(result, dict):
+            result = {"result": result}
+        if not await asyncio.to_thread(self.repo.complete, job.id, result, self.worker_id):
+            logger.warning(f"Job {job.id} finished after its lease was lost; result dropped")
+            return job
+        self._succeeded += 1
+        logger.info(f"Job {job.id} succeeded")
+        updated = await asyncio.to_thread(self.repo.get, job.id)
+        if updated is None:
+            logger.warning(f"Job {job.id} was deleted after it succeeded")
+            return job
+        await self._notify(updated)
+        return updated
+
+    async def _notify(self, job: WorkflowJob) -> None:
+        """Call the notifier for the job's source (errors are logged)."""
+        notifier = self._notifiers.get(job.source)
+        if notifier is None or job.reply_to is None:
+            return
+        try:
+            await notifier(job)
+        except Exception as e:
+            logger.error(f"Failed to deliver result of job {job.id} to {job.source}: {e}")
+
+    def _wake(self) -> None:
+        """Wake idle workers (safe from any thread)."""
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._wakeup.set()
+        else:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
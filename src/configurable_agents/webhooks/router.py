@@ -1,8 +1,25 @@
 """FastAPI router for webhook endpoints.
 
 Provides generic webhook endpoint with HMAC validation, idempotency
-protection, and async workflow execution. Includes platform-specific
+protection, and queued workflow execution. Includes platform-specific
 handlers for WhatsApp and Telegram.
+
+Webhook-triggered workflows go through one durable job queue: endpoints
+enqueue a job and return at once (the generic endpoint with 202 and the
+job ID, pollable at GET /webhooks/jobs/{job_id}), and a worker pool
+started with the app runs the jobs. The pool is configured with
+WEBHOOK_QUEUE_WORKERS (default 4), WEBHOOK_QUEUE_MAX_ATTEMPTS (default 3)
+and WEBHOOK_QUEUE_CONCURRENCY, comma-separated per-workflow limits such
+as "article_writer.yaml=1,summarize=2". WhatsApp and Telegram results are
+sent back to the sender when the job finishes.
+
+Webhook IDs are claimed atomically in the database, behind an in-memory
+cache of recently seen IDs (WEBHOOK_DEDUP_CACHE_SIZE, default 100000) that
+rejects replays without a database round trip.
+
+Idempotency records and finished jobs are purged by a retention scheduler
+started with the app: records older than WEBHOOK_RETENTION_DAYS (default 7)
+are deleted every WEBHOOK_RETENTION_INTERVAL seconds (default 3600).
 """
 
 import logging
@@ -12,8 +29,22 @@ from typing import Any, Dict, Optional
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 
-from configurable_agents.storage import create_storage_backend, WebhookEventRepository, WorkflowRegistrationRepository
+from configurable_agents.storage import (
+    create_storage_backend,
+    get_job_repository,
+    WebhookEventRepository,
+    WorkflowJob,
+    WorkflowRegistrationRepository,
+)
+from configurable_agents.storage.idempotency import DEFAULT_RECENT_ID_CAPACITY, CachedWebhookEventRepository
+from configurable_agents.storage.retention import DEFAULT_RETENTION_INTERVAL, RetentionScheduler
 from configurable_agents.webhooks.base import InvalidSignatureError, ReplayAttackError, WebhookHandler
+from configurable_agents.webhooks.queue import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_QUEUE_WORKERS,
+    WorkflowJobQueue,
+    parse_concurrency_limits,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +57,15 @@ _webhook_repo: Optional[WebhookEventRepository] = None
 # Global workflow registration repository (initialized on startup)
 _workflow_reg_repo: Optional[WorkflowRegistrationRepository] = None
 
+# Days webhook idempotency records are kept
+DEFAULT_WEBHOOK_RETENTION_DAYS = 7
+
+# Global retention scheduler for webhook events (started with the app)
+_retention_scheduler: Optional[RetentionScheduler] = None
+
+# Global workflow job queue and worker pool (started with the app)
+_job_queue: Optional[WorkflowJobQueue] = None
+
 # Global platform handlers (initialized lazily)
 _whatsapp_handler: Optional["WhatsAppWebhookHandler"] = None
 _telegram_bot: Optional["Bot"] = None
@@ -40,11 +80,80 @@ def get_webhook_repository() -> WebhookEventRepository:
     """
     global _webhook_repo
     if _webhook_repo is None:
-        # Get repository from storage backend
-        _, _, _, _, _webhook_repo, _, _, _ = create_storage_backend()
+        # Get repository from storage backend, fronted by the recent-ID cache
+        _, _, _, _, repo, _, _, _ = create_storage_backend()
+        capacity = int(os.getenv("WEBHOOK_DEDUP_CACHE_SIZE", str(DEFAULT_RECENT_ID_CAPACITY)))
+        _webhook_repo = CachedWebhookEventRepository(repo, capacity=capacity)
     return _webhook_repo
 
 
+def get_retention_scheduler() -> RetentionScheduler:
+    """Get or create the webhook event retention scheduler.
+
+    Returns:
+        RetentionScheduler with "webhook_events" and "workflow_jobs" jobs
+    """
+    global _retention_scheduler
+    if _retention_scheduler is None:
+        days = int(os.getenv("WEBHOOK_RETENTION_DAYS", str(DEFAULT_WEBHOOK_RETENTION_DAYS)))
+        interval = float(os.getenv("WEBHOOK_RETENTION_INTERVAL", str(DEFAULT_RETENTION_INTERVAL)))
+        _retention_scheduler = RetentionScheduler(interval_seconds=interval)
+        _retention_scheduler.add_job(
+            "webhook_events", lambda: get_webhook_repository().cleanup_old_events(days=days)
+        )
+        _retention_scheduler.add_job(
+            "workflow_jobs", lambda: get_job_queue().repo.cleanup_finished(days=days)
+        )
+    return _retention_scheduler
+
+
+def get_job_queue() -> WorkflowJobQueue:
+    """Get or create the webhook workflow job queue.
+
+    Returns:
+        WorkflowJobQueue with WhatsApp and Telegram result notifiers
+    """
+    global _job_queue
+    if _job_queue is None:
+        _job_queue = WorkflowJobQueue(
+            get_job_repository(),
+            workers=int(os.getenv("WEBHOOK_QUEUE_WORKERS", str(DEFAULT_QUEUE_WORKERS))),
+            concurrency_limits=parse_concurrency_limits(os.getenv("WEBHOOK_QUEUE_CONCURRENCY")),
+            max_attempts=int(os.getenv("WEBHOOK_QUEUE_MAX_ATTEMPTS", str(DEFAULT_MAX_ATTEMPTS))),
+        )
+        _job_queue.register_notifier("whatsapp", _notify_whatsapp)
+        _job_queue.register_notifier("telegram", _notify_telegram)
+    return _job_queue
+
+
+async def _start_retention() -> None:
+    """Start purging old webhook events in the background."""
+    get_retention_scheduler().start()
+
+
+async def _stop_retention() -> None:
+    """Stop the webhook event retention scheduler."""
+    if _retention_scheduler is not None:
+        await _retention_scheduler.stop()
+
+
+async def _start_job_queue() -> None:
+    """Start the workflow job workers."""
+    get_job_queue().start()
+
+
+async def _stop_job_queue() -> None:
+    """Stop the workflow job workers."""
+    if _job_queue is not None:
+        await _job_queue.stop()
+
+
+router.add_event_handler("startup", _start_retention)
+router.add_event_handler("startup", _start_job_queue)
+router.add_event_handler("shutdown", _stop_retention)
+router.add_event_handler("shutdown", _stop_job_queue)
+
+
 def get_workflow_registration_repository() -> WorkflowRegistrationRepository:
     """Get or create workflow registration repository.
 
@@ -199,16 +308,19 @@ def _get_telegram_dispatcher() -> Optional["Dispatcher"]:
                     create_dispatcher,
                     register_workflow_handlers,
                 )
-                from configurable_agents.runtime.executor import run_workflow_async
 
                 _telegram_dispatcher = create_dispatcher()
 
-                # Register workflow handlers
-                async def workflow_runner(workflow_name: str, inputs: dict) -> dict:
-                    """Wrapper for workflow execution."""
-                    return await run_workflow_async(f"{workflow_name}.yaml", inputs)
+                # Register workflow handlers (workflows run from the job queue)
+                async def enqueue_workflow(
+                    workflow_name: str, inputs: dict, chat_id: int
+                ) -> WorkflowJob:
+                    """Queue a workflow job answered to the chat."""
+                    return await get_job_queue().enqueue(
+                        f"{workflow_name}.yaml", inputs, source="telegram", reply_to=str(chat_id)
+                    )
 
-                register_workflow_handlers(_telegram_dispatcher, workflow_runner)
+                register_workflow_handlers(_telegram_dispatcher, enqueue_func=enqueue_workflow)
                 logger.info("Telegram dispatcher initialized with workflow handlers")
             except ImportError:
                 logger.warning("aiogram not installed, Telegram webhooks unavailable")
@@ -216,31 +328,55 @@ def _get_telegram_dispatcher() -> Optional["Dispatcher"]:
     return _telegram_dispatcher
 
 
+async def _notify_whatsapp(job: WorkflowJob) -> None:
+    """Send a finished job's result (or error) to the WhatsApp sender."""
+    handler = _get_whatsapp_handler()
+    if handler is None:
+        logger.warning(f"WhatsApp not configured, result of job {job.id} not delivered")
+        return
+    if job.status == "succeeded":
+        await handler.send_message(job.reply_to, handler.format_result(job.result))
+    else:
+        await handler.send_message(job.reply_to, f"Error: {job.error}")
+
+
+async def _notify_telegram(job: WorkflowJob) -> None:
+    """Send a finished job's result (or error) to the Telegram chat."""
+    bot = _get_telegram_bot()
+    if bot is None:
+        logger.warning(f"Telegram not configured, result of job {job.id} not delivered")
+        return
+    from configurable_agents.webhooks.telegram import send_telegram_message
+
+    text = str(job.result) if job.status == "succeeded" else f"Error: {job.error}"
+    await send_telegram_message(bot, int(job.reply_to), text)
+
+
 async def _process_generic_webhook(data: Dict[str, Any]) -> Dict[str, Any]:
     """
-    Process generic webhook payload and trigger workflow.
+    Process generic webhook payload and queue the workflow.
 
     Expected payload format:
     {
         "workflow_name": str,  # Name of workflow to execute
         "inputs": dict,         # Workflow inputs
-        "webhook_id": str       # Optional idempotency key
+        "webhook_id": str,      # Optional idempotency key
+        "priority": int         # Optional, higher runs first (default 0)
     }
 
     Args:
         data: Validated webhook payload
 
     Returns:
-        Workflow execution result
+        Queued job status with job_id
 
     Raises:
-        HTTPException: If workflow_name or inputs missing
+        HTTPException: If workflow_name or inputs missing, or priority invalid
     """
-    from configurable_agents.runtime.executor import run_workflow_async
-
     # Extract workflow trigger parameters
     workflow_name = data.get("workflow_name")
     inputs = data.get("inputs")
+    priority = data.get("priority", 0)
 
     if not workflow_name:
         raise HTTPException(status_code=400, detail="Missing 'workflow_name' in payload")
@@ -248,20 +384,20 @@ async def _process_generic_webhook(data: Dict[str, Any]) -> Dict[str, Any]:
     if inputs is None:
         raise HTTPException(status_code=400, detail="Missing 'inputs' in payload")
 
-    logger.info(f"Triggering workflow '{workflow_name}' from generic webhook")
+    if not isinstance(priority, int) or isinstance(priority, bool):
+        raise HTTPException(status_code=400, detail="Invalid 'priority' in payload, expected integer")
 
-    try:
-        # Run workflow asynchronously
-        result = await run_workflow_async(workflow_name, inputs)
+    logger.info(f"Queueing workflow '{workflow_name}' from generic webhook")
 
-        return {
-            "status": "success",
-            "workflow_name": workflow_name,
-            "result": result,
-        }
-    except Exception as e:
-        logger.error(f"Workflow execution failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Workflow execution failed: {e}")
+    job = await get_job_queue().enqueue(
+        workflow_name, inputs, source="generic", priority=priority
+    )
+
+    return {
+        "status": "queued",
+        "job_id": job.id,
+        "workflow_name": workflow_name,
+    }
 
 
 @router.get("/whatsapp")
@@ -306,21 +442,18 @@ async def whatsapp_verify_webhook(
 
 
 @router.post("/whatsapp")
-async def whatsapp_webhook(
-    request: Request, background_tasks: BackgroundTasks
-) -> Dict[str, str]:
+async def whatsapp_webhook(request: Request) -> Dict[str, str]:
     """
     Handle incoming WhatsApp webhook message.
 
     Receives messages from WhatsApp Business API, parses workflow
-    commands, and executes workflows asynchronously.
+    commands, and queues them on the workflow job queue.
 
     Message format:
         /workflow_name <input>
 
     Args:
         request: FastAPI Request object with Meta webhook payload
-        background_tasks: FastAPI BackgroundTasks for async execution
 
     Returns:
         Acknowledgment response
@@ -330,7 +463,7 @@ async def whatsapp_webhook(
 
     Example:
         # User sends WhatsApp message: "/article_writer AI Safety"
-        # Message is parsed, workflow executed, result sent back
+        # Message is parsed, workflow queued, result sent back when the job finishes
     """
     handler = _get_whatsapp_handler()
 
@@ -351,8 +484,13 @@ async def whatsapp_webhook(
 
     logger.info(f"Received WhatsApp message from {phone}: {message[:50]}...")
 
-    # Handle message and queue background workflow execution
-    ack = await handler.handle_message(phone, message, background_tasks.add_task)
+    # Queue the workflow job; the WhatsApp notifier replies when it finishes
+    async def enqueue_workflow(workflow_name: str, inputs: dict, reply_to: str) -> WorkflowJob:
+        return await get_job_queue().enqueue(
+            f"{workflow_name}.yaml", inputs, source="whatsapp", reply_to=reply_to
+        )
+
+    ack = await handler.queue_message(phone, message, enqueue_workflow)
 
     return {"status": "received", "message": ack}
 
@@ -379,7 +517,7 @@ async def telegram_webhook(request: Request) -> Dict[str, str]:
 
     Example:
         # User sends Telegram message: "/article_writer AI Safety"
-        # Update is fed to dispatcher, workflow executed, result sent back
+        # Update is fed to dispatcher, workflow queued, result sent back
     """
     bot = _get_telegram_bot()
     dispatcher = _get_telegram_dispatcher()
@@ -399,7 +537,7 @@ async def telegram_webhook(request: Request) -> Dict[str, str]:
         raise HTTPException(status_code=503, detail="aiogram not installed")
 
 
-@router.post("/generic")
+@router.post("/generic", status_code=202)
 async def generic_webhook(
     request: Request,
     background_tasks: BackgroundTasks,
@@ -408,13 +546,16 @@ async def generic_webhook(
     Generic webhook endpoint for triggering workflows.
 
     Accepts POST requests with JSON payload containing workflow_name and inputs.
-    Optionally validates HMAC signature via X-Signature header.
+    Optionally validates HMAC signature via X-Signature header. The workflow
+    is queued and the response (202 Accepted) carries its job_id; poll
+    GET /webhooks/jobs/{job_id} for status and result.
 
     Payload format:
     {
         "workflow_name": "article_writer",
         "inputs": {"topic": "AI Safety"},
-        "webhook_id": "unique-id-123"  // Optional, for idempotency
+        "webhook_id": "unique-id-123",  // Optional, for idempotency
+        "priority": 0                   // Optional, higher runs first
     }
 
     Signature validation (if X-Signature header present):
@@ -431,13 +572,13 @@ async def generic_webhook(
         background_tasks: FastAPI BackgroundTasks for async execution
 
     Returns:
-        Response with status and workflow execution result
+        Response with status "queued", job_id and workflow_name
 
     Raises:
         HTTPException 400: Invalid payload
         HTTPException 403: Invalid signature
         HTTPException 409: Duplicate webhook_id (replay attack)
-        HTTPException 500: Workflow execution failed
+        HTTPException 500: Job could not be queued
     """
     # Get webhook repository for idempotency tracking
     webhook_repo = get_webhook_repository()
@@ -459,12 +600,13 @@ async def generic_webhook(
             data = await request.json()
             webhook_id = data.get("webhook_id") or data.get("id")
             if webhook_id and webhook_repo:
-                if webhook_repo.is_processed(webhook_id):
+                if not webhook_repo.claim(webhook_id, "generic"):
                     raise HTTPException(status_code=409, detail=f"Webhook {webhook_id} already processed")
-                webhook_repo.mark_processed(webhook_id, "generic")
 
             result = await _process_generic_webhook(data)
             return result
+        except HTTPException:
+            raise
         except ReplayAttackError:
             raise HTTPException(status_code=409, detail="Duplicate webhook_id")
         except Exception as e:
@@ -493,6 +635,28 @@ async def generic_webhook(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/jobs/{job_id}")
+async def get_webhook_job(job_id: str) -> Dict[str, Any]:
+    """
+    Get status and result of a queued workflow job.
+
+    Args:
+        job_id: Job ID returned when the webhook was accepted
+
+    Returns:
+        Job status, attempts, timestamps, and result or error
+
+    Raises:
+        HTTPException 404: Job not found
+    """
+    job = get_job_queue().get(job_id)
+
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+
+    return job.to_dict()
+
+
 @router.get("/health")
 async def webhook_health() -> Dict[str, Any]:
     """
@@ -502,14 +666,20 @@ async def webhook_health() -> Dict[str, Any]:
         Health status with webhook repository info and platform availability
     """
     webhook_repo = get_webhook_repository()
+    idempotency = (
+        webhook_repo.stats() if isinstance(webhook_repo, CachedWebhookEventRepository) else {}
+    )
 
     return {
         "status": "healthy",
         "service": "webhooks",
         "repository": type(webhook_repo).__name__,
+        "idempotency": idempotency,
         "signature_configured": bool(_get_webhook_secret("generic")),
         "whatsapp_configured": _get_whatsapp_handler() is not None,
         "telegram_configured": _get_telegram_bot() is not None,
+        "retention": get_retention_scheduler().metrics(),
+        "queue": get_job_queue().metrics(),
     }
 
 
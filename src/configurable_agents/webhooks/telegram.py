@@ -40,6 +40,7 @@ except ImportError:
     Request = None
 
 from configurable_agents.runtime.executor import run_workflow_async
+from configurable_agents.storage.base import WorkflowJob
 
 logger = logging.getLogger(__name__)
 
@@ -101,7 +102,9 @@ def create_dispatcher() -> Dispatcher:
 
 
 def register_workflow_handlers(
-    dispatcher: Dispatcher, run_workflow_func: Callable[[str, dict], Awaitable[dict]]
+    dispatcher: Dispatcher,
+    run_workflow_func: Optional[Callable[[str, dict], Awaitable[dict]]] = None,
+    enqueue_func: Optional[Callable[[str, dict, int], Awaitable[WorkflowJob]]] = None,
 ):
     """
     Register workflow message handlers with the dispatcher.
@@ -110,9 +113,18 @@ def register_workflow_handlers(
     1. /start command - Sends welcome message with usage instructions
     2. All messages - Handles workflow trigger messages
 
+    With enqueue_func, workflow messages are queued as jobs and answered
+    with the job ID; the job queue's Telegram notifier sends the result.
+    Otherwise the workflow runs inline through run_workflow_func.
+
     Args:
         dispatcher: aiogram Dispatcher instance
         run_workflow_func: Async function to run workflows (signature: async func(name, inputs) -> result)
+        enqueue_func: Async function queueing a workflow job (signature: async func(name, inputs, chat_id) -> job)
+
+    Raises:
+        ImportError: If aiogram is not installed
+        ValueError: If neither run_workflow_func nor enqueue_func is given
 
     Example:
         >>> dp = create_dispatcher()
@@ -124,6 +136,8 @@ def register_workflow_handlers(
         raise ImportError(
             "aiogram is not installed. Install with: pip install aiogram>=3.0.0"
         )
+    if run_workflow_func is None and enqueue_func is None:
+        raise ValueError("register_workflow_handlers needs run_workflow_func or enqueue_func")
 
     @dispatcher.message(Command("start"))
     async def cmd_start(message: types.Message):
@@ -165,6 +179,11 @@ def register_workflow_handlers(
 
         logger.info(f"Chat {message.chat.id} triggering workflow: {workflow_name}")
 
+        if enqueue_func is not None:
+            job = await enqueue_func(workflow_name, {"input": workflow_input}, message.chat.id)
+            await message.answer(f"Queued workflow: {workflow_name} (job {job.id})")
+            return
+
         # Send "typing" indicator
         try:
             await message.bot.send_chat_action(message.chat.id, "typing")
@@ -5,7 +5,8 @@ Provides webhook handler for WhatsApp Business API Cloud with:
 - Message and phone extraction from webhook payload
 - Workflow command parsing for "/workflow_name input" format
 - Async message sending via WhatsApp Cloud API
-- Background workflow execution with result delivery
+- Workflow job queueing (queue_message) or background execution
+  (handle_message) with result delivery
 
 Environment variables required:
     WHATSAPP_PHONE_ID: Phone ID from WhatsApp Business App
@@ -26,11 +27,12 @@ Example:
 """
 
 import logging
-from typing import Optional, Tuple
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 import httpx
 
 from configurable_agents.runtime.executor import run_workflow_async
+from configurable_agents.storage.base import WorkflowJob
 
 logger = logging.getLogger(__name__)
 
@@ -279,6 +281,71 @@ class WhatsAppWebhookHandler:
 
         logger.info(f"WhatsApp message sent to {phone_number}")
 
+    @staticmethod
+    def format_result(result: Any) -> str:
+        """
+        Format a workflow result as a WhatsApp reply.
+
+        Truncates to WhatsApp's 4096 character limit, including the
+        "Result:" prefix.
+
+        Args:
+            result: Workflow outputs
+
+        Returns:
+            Reply text
+
+        Example:
+            >>> WhatsAppWebhookHandler.format_result({"article": "..."})
+            "Result:\n{'article': '...'}"
+        """
+        result_text = str(result)
+        prefix = "Result:\n"
+        max_length = 4096
+        max_result_length = max_length - len(prefix)
+        if len(result_text) > max_result_length:
+            result_text = result_text[: max_result_length - 3] + "..."
+        return f"{prefix}{result_text}"
+
+    async def queue_message(
+        self,
+        phone: str,
+        message: str,
+        enqueue_func: Callable[[str, Dict[str, Any], str], Awaitable[WorkflowJob]],
+    ) -> str:
+        """
+        Handle incoming WhatsApp message by queueing a workflow job.
+
+        The job's result is sent back to the phone by the job queue's
+        WhatsApp notifier once the workflow has run.
+
+        Args:
+            phone: Sender's phone number
+            message: Message text
+            enqueue_func: Async function queueing a workflow job (signature:
+                async func(name, inputs, phone) -> job)
+
+        Returns:
+            Acknowledgment message to send immediately
+
+        Example:
+            >>> ack = await handler.queue_message(
+            ...     "1234567890",
+            ...     "/article_writer AI Safety",
+            ...     lambda name, inputs, phone: queue.enqueue(
+            ...         f"{name}.yaml", inputs, source="whatsapp", reply_to=phone
+            ...     ),
+            ... )
+        """
+        command = self.parse_workflow_command(message)
+
+        if command is None:
+            return "Usage: /workflow_name <input>"
+
+        workflow_name, workflow_input = command
+        job = await enqueue_func(workflow_name, {"input": workflow_input}, phone)
+        return f"Queued workflow: {workflow_name} (job {job.id})"
+
     async def handle_message(
         self, phone: str, message: str, background_tasks_func
     ) -> str:
@@ -321,21 +388,7 @@ class WhatsAppWebhookHandler:
                     f"{workflow_name}.yaml", {"input": workflow_input}
                 )
 
-                # Format result as text
-                if isinstance(result, dict):
-                    result_text = str(result)
-                else:
-                    result_text = str(result)
-
-                # Truncate if too long for WhatsApp (4096 char limit)
-                # Account for "Result:\n" prefix in the limit
-                prefix = "Result:\n"
-                max_length = 4096
-                max_result_length = max_length - len(prefix)
-                if len(result_text) > max_result_length:
-                    result_text = result_text[: max_result_length - 3] + "..."
-
-                await self.send_message(phone, f"{prefix}{result_text}")
+                await self.send_message(phone, self.format_result(result))
                 logger.info(f"Workflow {workflow_name} completed, result sent to {phone}")
 
             except Exception as e:
@@ -765,6 +765,45 @@ def test_invalid_conditional_edge_unknown_field():
     assert "unknown_field" in str(exc_info.value)
 
 
+@pytest.mark.parametrize(
+    "logic",
+    ["state.score > ", "(state.score > 0.5", "state.score > len('x')", "state.score ** 2 > 1"],
+)
+def test_invalid_conditional_edge_malformed_condition(logic):
+    """Malformed route conditions fail at validation, not mid-run."""
+    from configurable_agents.config.schema import Route, RouteCondition
+
+    config = make_minimal_config(
+        state=StateSchema(
+            fields={
+                "input": StateFieldConfig(type="str", required=True),
+                "score": StateFieldConfig(type="float", default=0.0),
+            }
+        ),
+        nodes=[
+            NodeConfig(
+                id="process",
+                prompt="Process {input}",
+                outputs=["score"],
+                output_schema=OutputSchema(type="float"),
+            )
+        ],
+        edges=[
+            EdgeConfig(from_="START", to="process"),
+            EdgeConfig(
+                from_="process",
+                routes=[
+                    Route(condition=RouteCondition(logic=logic), to="END"),
+                    Route(condition=RouteCondition(logic="default"), to="END"),
+                ],
+            ),
+        ],
+    )
+    with pytest.raises(ValidationError) as exc_info:
+        validate_config(config)
+    assert "Invalid condition" in str(exc_info.value)
+
+
 # ============================================
 # Loop Edge Tests
 # ============================================
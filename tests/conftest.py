@@ -54,3 +54,25 @@ def sample_config():
             {"from": "process", "to": "END"},
         ],
     }
+
+
+@pytest.fixture(autouse=True)
+def clear_compiled_workflow_cache():
+    """Drop compiled workflows and cached runnables so patched builders are always hit."""
+    from configurable_agents.core.runnable_cache import clear_runnable_cache
+    from configurable_agents.runtime.workflow_cache import clear_workflow_cache
+
+    clear_workflow_cache()
+    clear_runnable_cache()
+    yield
+    clear_workflow_cache()
+    clear_runnable_cache()
+
+
+@pytest.fixture(autouse=True)
+def dispose_shared_storage_backends():
+    """Release process-wide storage engines so each test sees its own databases."""
+    yield
+    from configurable_agents.storage.factory import dispose_storage_backends
+
+    dispose_storage_backends()
@@ -151,6 +151,95 @@ class TestEvaluateCondition:
             _evaluate_condition("lambda x: x", {})
 
 
+class TestCompiledCondition:
+    """Test conditions compiled once and evaluated against state attributes."""
+
+    def test_nested_parentheses_and_precedence(self):
+        from configurable_agents.config import compile_condition
+
+        cond = compile_condition(
+            '(state.score > 0.8 or state.approved) and not (state.status == "rejected")'
+        )
+        assert cond.evaluate({"score": 0.9, "approved": False, "status": "ok"})
+        assert cond.evaluate({"score": 0.1, "approved": True, "status": "ok"})
+        assert not cond.evaluate({"score": 0.9, "approved": True, "status": "rejected"})
+        assert cond.fields == ("score", "approved", "status")
+
+    def test_evaluates_pydantic_state_without_dump(self):
+        from configurable_agents.config import compile_condition
+
+        class NoDumpState(SimpleState):
+            def model_dump(self, *args, **kwargs):
+                raise AssertionError("state should not be dumped")
+
+        cond = compile_condition("state.count >= 3 and state.status == pending")
+        assert cond.evaluate(NoDumpState(count=3))
+        assert not cond.evaluate(NoDumpState(count=2))
+
+    def test_chained_comparison_and_negative_literals(self):
+        from configurable_agents.config import compile_condition
+
+        cond = compile_condition("-1 < state.count <= 10")
+        assert cond.evaluate({"count": 0})
+        assert not cond.evaluate({"count": 11})
+        assert not cond.evaluate({})
+
+    def test_nested_field_reference(self):
+        from configurable_agents.config import compile_condition
+
+        cond = compile_condition("state.result.score > 0.5")
+        assert cond.evaluate({"result": {"score": 0.7}})
+        assert not cond.evaluate({"result": None})
+        assert cond.fields == ("result",)
+
+    def test_membership_against_literal_list(self):
+        from configurable_agents.config import compile_condition
+
+        cond = compile_condition("state.status in ['approved', 'pending']")
+        assert cond.evaluate({"status": "pending"})
+        assert not cond.evaluate({"status": "rejected"})
+        assert compile_condition("state.status not in ('a', 'b')").evaluate({"status": "c"})
+
+    def test_unquoted_hyphenated_literals_are_strings(self):
+        from configurable_agents.config import compile_condition
+
+        cond = compile_condition("state.status == in-progress and state.day != 2024-01-01")
+        assert cond.evaluate({"status": "in-progress", "day": "2024-01-02"})
+        assert not cond.evaluate({"status": "in-review", "day": "2024-01-02"})
+        assert cond.source == "state.status == in-progress and state.day != 2024-01-01"
+        assert compile_condition("state.mode == pass").evaluate({"mode": "pass"})
+        assert compile_condition('state.note == "a == b-c"').evaluate({"note": "a == b-c"})
+
+    def test_compiled_once_per_source(self):
+        from configurable_agents.config import compile_condition
+
+        assert compile_condition("state.score > 0.1") is compile_condition("state.score > 0.1")
+
+    @pytest.mark.parametrize(
+        "logic",
+        [
+            "state.score >",
+            "state.score > 0.5)",
+            "state.items[0] == 1",
+            "state.score + 1 > 2",
+            "state.__class__",
+            "score > 0.5",
+            "1 < 2",
+        ],
+    )
+    def test_malformed_conditions_rejected_at_compile(self, logic):
+        from configurable_agents.config import ConditionError, compile_condition
+
+        with pytest.raises(ConditionError, match="Invalid condition"):
+            compile_condition(logic)
+
+    def test_type_error_surfaces_as_condition_error(self):
+        from configurable_agents.config import ConditionError, compile_condition
+
+        with pytest.raises(ConditionError):
+            compile_condition("state.score > 0.5").evaluate({"score": "high"})
+
+
 class TestCreateRoutingFunction:
     """Test routing function creation."""
 
@@ -218,6 +307,28 @@ class TestCreateRoutingFunction:
         with pytest.raises(ControlFlowError, match="must include a default route"):
             create_routing_function(routes, {})
 
+    def test_routing_with_malformed_condition_fails_at_build(self):
+        """Malformed conditions fail when the routing function is created."""
+        routes = [
+            Route(condition=RouteCondition(logic="state.score >> 1"), to="x"),
+            Route(condition=RouteCondition(logic="default"), to="default_node"),
+        ]
+
+        with pytest.raises(ControlFlowError, match="Invalid condition"):
+            create_routing_function(routes, {})
+
+    def test_routing_skips_condition_with_type_error(self):
+        """A route whose comparison fails at runtime falls through to the next."""
+        routes = [
+            Route(condition=RouteCondition(logic="state.status > 1"), to="broken"),
+            Route(condition=RouteCondition(logic="state.score > 0.1"), to="ok"),
+            Route(condition=RouteCondition(logic="default"), to="default_node"),
+        ]
+
+        routing_fn = create_routing_function(routes, {})
+
+        assert routing_fn(SimpleState(score=0.5)) == "ok"
+
     def test_routing_with_pydantic_state(self):
         """Test routing works with Pydantic state models."""
         routes = [
@@ -321,3 +432,34 @@ class TestLoopIterationHelpers:
         state = {"_loop_iteration_my_node": 5}
         new_count = increment_loop_iteration(state, "my_node")
         assert new_count == 6
+
+
+def test_routing_reads_only_referenced_fields_of_wide_state():
+    """Routing over a wide Pydantic state never dumps the whole model."""
+    from pydantic import create_model
+
+    WideState = create_model(
+        "WideState",
+        score=(float, 0.4),
+        approved=(bool, False),
+        **{f"field_{i}": (str, "x" * 100) for i in range(100)},
+    )
+
+    class NoDumpWideState(WideState):
+        def model_dump(self, *args, **kwargs):
+            raise AssertionError("state should not be dumped")
+
+    routes = [
+        Route(
+            condition=RouteCondition(logic="(state.score > 0.8 and state.approved) or state.score > 0.9"),
+            to="high",
+        ),
+        Route(condition=RouteCondition(logic='state.field_0 == "y"'), to="other"),
+        Route(condition=RouteCondition(logic="default"), to="low"),
+    ]
+    routing_fn = create_routing_function(routes, {})
+
+    assert routing_fn(NoDumpWideState()) == "low"
+    assert routing_fn(NoDumpWideState(score=0.95)) == "high"
+    assert routing_fn(NoDumpWideState(score=0.85, approved=True)) == "high"
+    assert routing_fn(NoDumpWideState(field_0="y")) == "other"
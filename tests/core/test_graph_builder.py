@@ -704,3 +704,149 @@ def test_parallel_edge_supported(mock_execute):
 
     # Assert - graph compiled successfully
     assert graph is not None
+
+
+@patch("configurable_agents.core.graph_builder.execute_node")
+def test_parallel_max_concurrency_bounds_target_node(mock_execute):
+    """Fan-out target runs at most max_concurrency branches at once."""
+    import threading
+    import time
+
+    from configurable_agents.config.schema import ParallelConfig
+
+    class ParallelState(BaseModel):
+        items: list[str]
+        result: str = ""
+        results: list[str] = []
+
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def slow_execute(nc, state, gc, tracker):
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight -= 1
+        return {}
+
+    mock_execute.side_effect = slow_execute
+
+    config = WorkflowConfig(
+        schema_version="1.0",
+        flow=FlowMetadata(name="test"),
+        state=StateSchema(
+            fields={
+                "items": StateFieldConfig(type="list[str]", required=True),
+                "result": StateFieldConfig(type="str", default=""),
+                "results": StateFieldConfig(type="list[str]", default=[]),
+            }
+        ),
+        nodes=[
+            NodeConfig(
+                id="worker",
+                prompt="Process {state.result}",
+                outputs=["result"],
+                output_schema=OutputSchema(type="str"),
+            )
+        ],
+        edges=[
+            EdgeConfig(
+                from_="START",
+                parallel=ParallelConfig(
+                    items_field="items",
+                    target_node="worker",
+                    collect_field="results",
+                    max_concurrency=2,
+                    projection="referenced",
+                ),
+            ),
+            EdgeConfig(from_="worker", to="END"),
+        ],
+    )
+
+    graph = build_graph(config, ParallelState)
+    graph.invoke(ParallelState(items=[str(i) for i in range(12)]))
+
+    assert mock_execute.call_count == 12
+    assert peak == 2
+
+    # Concurrent invocations of the same compiled graph get their own windows
+    peak = 0
+    threads = [
+        threading.Thread(
+            target=graph.invoke,
+            args=(ParallelState(items=[f"{run}{i}" for i in range(12)]),),
+        )
+        for run in "ab"
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert mock_execute.call_count == 36
+    assert 2 < peak <= 4
+
+
+@patch("configurable_agents.core.graph_builder.execute_node")
+def test_parallel_projection_does_not_overwrite_unprojected_fields(mock_execute):
+    """A branch returning its whole (projected) state leaves other fields alone."""
+    from configurable_agents.config.schema import ParallelConfig
+
+    class ParallelState(BaseModel):
+        items: list[str]
+        topic: str = ""
+        notes: str = ""
+        results: list[str] = []
+
+    branch_states = []
+
+    def return_full_state(nc, state, gc, tracker):
+        branch_states.append(dict(state))
+        return {**state, "topic": state["topic"].upper()}
+
+    mock_execute.side_effect = return_full_state
+
+    config = WorkflowConfig(
+        schema_version="1.0",
+        flow=FlowMetadata(name="test"),
+        state=StateSchema(
+            fields={
+                "items": StateFieldConfig(type="list[str]", required=True),
+                "topic": StateFieldConfig(type="str", default=""),
+                "notes": StateFieldConfig(type="str", default=""),
+                "results": StateFieldConfig(type="list[str]", default=[]),
+            }
+        ),
+        nodes=[
+            NodeConfig(
+                id="worker",
+                prompt="Process {state.topic}",
+                outputs=["topic"],
+                output_schema=OutputSchema(type="str"),
+            )
+        ],
+        edges=[
+            EdgeConfig(
+                from_="START",
+                parallel=ParallelConfig(
+                    items_field="items",
+                    target_node="worker",
+                    collect_field="results",
+                    projection="referenced",
+                ),
+            ),
+            EdgeConfig(from_="worker", to="END"),
+        ],
+    )
+
+    graph = build_graph(config, ParallelState)
+    final = graph.invoke(ParallelState(items=["a"], topic="ai", notes="parent notes"))
+
+    assert "notes" not in branch_states[0]
+    assert final["topic"] == "AI"
+    assert final["notes"] == "parent notes"
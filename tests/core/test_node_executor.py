@@ -25,10 +25,7 @@ from configurable_agents.config.schema import (
     OutputSchemaField,
 )
 from configurable_agents.core import execute_node
-from configurable_agents.core.node_executor import (
-    NodeExecutionError,
-    _strip_state_prefix,
-)
+from configurable_agents.core.node_executor import NodeExecutionError
 from configurable_agents.llm import LLMUsageMetadata
 
 
@@ -70,60 +67,6 @@ class ObjectOutput(BaseModel):
     sources: list
 
 
-# ============================================
-# Test: _strip_state_prefix helper
-# ============================================
-
-
-def test_strip_state_prefix_basic():
-    """Should strip {state.field} → {field}"""
-    template = "{state.topic}"
-    result = _strip_state_prefix(template)
-    assert result == "{topic}"
-
-
-def test_strip_state_prefix_multiple():
-    """Should strip multiple {state.X} references"""
-    template = "Process {state.input} and {state.metadata.author}"
-    result = _strip_state_prefix(template)
-    assert result == "Process {input} and {metadata.author}"
-
-
-def test_strip_state_prefix_no_prefix():
-    """Should leave {field} unchanged"""
-    template = "{query}"
-    result = _strip_state_prefix(template)
-    assert result == "{query}"
-
-
-def test_strip_state_prefix_mixed():
-    """Should handle mixed {state.X} and {field} references"""
-    template = "Topic: {state.topic}, Query: {query}"
-    result = _strip_state_prefix(template)
-    assert result == "Topic: {topic}, Query: {query}"
-
-
-def test_strip_state_prefix_nested():
-    """Should handle nested state references"""
-    template = "Author: {state.metadata.author}"
-    result = _strip_state_prefix(template)
-    assert result == "Author: {metadata.author}"
-
-
-def test_strip_state_prefix_no_placeholders():
-    """Should leave templates without placeholders unchanged"""
-    template = "No placeholders here"
-    result = _strip_state_prefix(template)
-    assert result == "No placeholders here"
-
-
-def test_strip_state_prefix_empty():
-    """Should handle empty template"""
-    template = ""
-    result = _strip_state_prefix(template)
-    assert result == ""
-
-
 # ============================================
 # Test: Basic node execution
 # ============================================
@@ -714,3 +657,52 @@ def test_execute_node_state_is_copied(
     # Verify updated state has changes
     assert updated_state.research == "new research"
     assert updated_state.score == 5  # Unchanged fields preserved
+
+
+# ============================================
+# Test: Memory recall
+# ============================================
+
+
+@patch("configurable_agents.core.node_executor.call_llm_structured")
+@patch("configurable_agents.core.node_executor.create_llm")
+@patch("configurable_agents.core.node_executor.build_output_model")
+def test_execute_node_injects_recalled_memories(
+    mock_build_output, mock_create_llm, mock_call_llm
+):
+    """Should append the most relevant memories to the prompt"""
+    from types import SimpleNamespace
+
+    from sqlalchemy import create_engine
+
+    from configurable_agents.config.schema import MemoryConfig
+    from configurable_agents.memory import AgentMemory
+    from configurable_agents.storage.models import Base
+    from configurable_agents.storage.sqlite import SQLiteMemoryRepository
+
+    engine = create_engine("sqlite:///:memory:")
+    Base.metadata.create_all(engine)
+    memory_repo = SQLiteMemoryRepository(engine)
+    memory = AgentMemory(
+        agent_id="assistant", workflow_id="wf-1", node_id="answer", repo=memory_repo
+    )
+    memory.write("favorite_color", "The user's favorite color is green")
+    memory.write("home_city", "The user lives in Lisbon")
+    tracker = SimpleNamespace(memory_repo=memory_repo, workflow_name="assistant", workflow_id="wf-1")
+
+    node_config = NodeConfig(
+        id="answer",
+        prompt="Answer: {topic}",
+        output_schema=OutputSchema(type="str"),
+        outputs=["research"],
+        memory=MemoryConfig(enabled=True, recall_k=1, recall_query="{topic}"),
+    )
+    mock_build_output.return_value = SimpleOutput
+    mock_call_llm.return_value = (SimpleOutput(result="Green"), make_usage())
+
+    execute_node(node_config, SimpleState(topic="what is my favorite color"), tracker=tracker)
+
+    prompt = mock_call_llm.call_args[1]["prompt"]
+    assert prompt.startswith("Answer: what is my favorite color\n\nRelevant memories:")
+    assert "- favorite_color: The user's favorite color is green" in prompt
+    assert "Lisbon" not in prompt
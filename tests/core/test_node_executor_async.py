@@ -0,0 +1,268 @@
+"""
+Tests for the native async node execution path.
+
+Covers:
+- execute_node_async (LLM path, error handling, code nodes)
+- Async node functions registered by build_graph (graph.ainvoke)
+- Many concurrent nodes sharing one event loop
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from configurable_agents.config.schema import (
+    EdgeConfig,
+    FlowMetadata,
+    LLMConfig,
+    MemoryConfig,
+    NodeConfig,
+    OutputSchema,
+    StateFieldConfig,
+    StateSchema,
+    WorkflowConfig,
+)
+from configurable_agents.core import build_graph, execute_node_async
+from configurable_agents.core.control_flow import get_loop_iteration_key
+from configurable_agents.core.graph_builder import _wrap_with_loop_counter_async
+from configurable_agents.core.node_executor import NodeExecutionError
+from configurable_agents.llm import LLMAPIError, LLMUsageMetadata
+
+
+class SimpleState(BaseModel):
+    topic: str
+    research: str = ""
+
+
+class SimpleOutput(BaseModel):
+    result: str
+
+
+def make_node(node_id: str = "research") -> NodeConfig:
+    return NodeConfig(
+        id=node_id,
+        prompt="Research {topic}",
+        output_schema=OutputSchema(type="str"),
+        outputs=["research"],
+        llm=LLMConfig(provider="openai", model="gpt-4o-mini"),
+    )
+
+
+def make_config() -> WorkflowConfig:
+    edges = [
+        EdgeConfig(from_="START", to="research"),
+        EdgeConfig(from_="research", to="END"),
+    ]
+    return WorkflowConfig(
+        schema_version="1.0",
+        flow=FlowMetadata(name="async_flow"),
+        state=StateSchema(
+            fields={
+                "topic": StateFieldConfig(type="str", required=True),
+                "research": StateFieldConfig(type="str", default=""),
+            }
+        ),
+        nodes=[make_node()],
+        edges=edges,
+    )
+
+
+def llm_result(text: str = "findings"):
+    return SimpleOutput(result=text), LLMUsageMetadata(input_tokens=10, output_tokens=5)
+
+
+# ============================================
+# Test: execute_node_async
+# ============================================
+
+
+@pytest.mark.asyncio
+@patch("configurable_agents.core.node_executor.call_llm_structured")
+@patch("configurable_agents.core.node_executor.call_llm_structured_async", new_callable=AsyncMock)
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_execute_node_async_uses_async_llm_call(mock_create_llm, mock_async_call, mock_sync_call):
+    mock_create_llm.return_value = MagicMock()
+    mock_async_call.return_value = llm_result("AI findings")
+
+    state = SimpleState(topic="AI")
+    updated = await execute_node_async(make_node(), state)
+
+    assert updated.research == "AI findings"
+    assert state.research == ""  # copy-on-write
+    assert mock_async_call.await_args.kwargs["prompt"] == "Research AI"
+    assert mock_async_call.await_args.kwargs["structured_llm"] is not None
+    mock_sync_call.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("configurable_agents.core.node_executor.call_llm_structured_async", new_callable=AsyncMock)
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_execute_node_async_wraps_llm_errors(mock_create_llm, mock_async_call):
+    mock_create_llm.return_value = MagicMock()
+    mock_async_call.side_effect = LLMAPIError("quota exceeded")
+
+    with pytest.raises(NodeExecutionError, match="Node 'research': LLM call failed"):
+        await execute_node_async(make_node(), SimpleState(topic="AI"))
+
+
+@pytest.mark.asyncio
+async def test_execute_node_async_template_error():
+    node = make_node()
+    node.prompt = "Research {missing}"
+
+    with pytest.raises(NodeExecutionError, match="Prompt template resolution failed"):
+        await execute_node_async(node, SimpleState(topic="AI"))
+
+
+@pytest.mark.asyncio
+async def test_execute_node_async_runs_code_node_off_loop():
+    class CodeState(BaseModel):
+        value: int = 0
+
+    node = NodeConfig(
+        id="compute",
+        prompt="Compute value",
+        code="result = 41 + 1",
+        outputs=["value"],
+        output_schema=OutputSchema(type="int"),
+        sandbox={"enabled": False},
+    )
+
+    with patch(
+        "configurable_agents.core.node_executor.asyncio.to_thread",
+        wraps=asyncio.to_thread,
+    ) as mock_to_thread:
+        updated = await execute_node_async(node, CodeState())
+
+    assert updated.value == 42
+    assert mock_to_thread.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("fails", [False, True])
+@patch("configurable_agents.core.node_executor.AgentMemory")
+@patch("configurable_agents.core.node_executor.call_llm_structured_async", new_callable=AsyncMock)
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_execute_node_async_storage_off_loop(
+    mock_create_llm, mock_async_call, mock_memory, fails
+):
+    """Memory recall and execution state saves run in worker threads."""
+    threads = {}
+
+    def record(name, value):
+        def call(*args, **kwargs):
+            threads[name] = threading.get_ident()
+            return value
+
+        return call
+
+    mock_create_llm.return_value = MagicMock()
+    mock_async_call.side_effect = LLMAPIError("down") if fails else None
+    mock_async_call.return_value = llm_result()
+    mock_memory.return_value.search.side_effect = record("recall", [])
+    tracker = MagicMock(run_id="run-1", execution_state_repo=MagicMock())
+    tracker.execution_state_repo.save_state.side_effect = record("save", None)
+    node = make_node()
+    node.memory = MemoryConfig(enabled=True, recall_k=3)
+
+    if fails:
+        with pytest.raises(NodeExecutionError, match="LLM call failed"):
+            await execute_node_async(node, SimpleState(topic="AI"), tracker=tracker)
+    else:
+        await execute_node_async(node, SimpleState(topic="AI"), tracker=tracker)
+
+    loop_thread = threading.get_ident()
+    assert set(threads) == {"recall", "save"}
+    assert loop_thread not in threads.values()
+    saved = tracker.execution_state_repo.save_state.call_args.kwargs
+    assert saved["state_data"]["status"] == ("failed" if fails else "completed")
+
+
+# ============================================
+# Test: async graph execution
+# ============================================
+
+
+@pytest.mark.asyncio
+@patch("configurable_agents.core.node_executor.call_llm_structured")
+@patch("configurable_agents.core.node_executor.call_llm_structured_async", new_callable=AsyncMock)
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_graph_ainvoke_uses_async_nodes(mock_create_llm, mock_async_call, mock_sync_call):
+    """One compiled graph serves ainvoke (async nodes) and invoke (sync nodes)."""
+    from configurable_agents.core import build_state_model
+
+    mock_create_llm.return_value = MagicMock()
+    mock_async_call.return_value = llm_result("async")
+    mock_sync_call.return_value = llm_result("sync")
+    config = make_config()
+    state_model = build_state_model(config.state)
+    graph = build_graph(config, state_model)
+
+    async_result = await graph.ainvoke(state_model(topic="AI"))
+    sync_result = graph.invoke(state_model(topic="AI"))
+
+    assert async_result["research"] == "async"
+    assert sync_result["research"] == "sync"
+
+
+@pytest.mark.asyncio
+@patch("configurable_agents.core.node_executor.call_llm_structured_async", new_callable=AsyncMock)
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_graph_ainvoke_tracker_from_config(mock_create_llm, mock_async_call):
+    from configurable_agents.core import build_state_model
+
+    mock_create_llm.return_value = MagicMock()
+    mock_async_call.return_value = llm_result()
+    config = make_config()
+    state_model = build_state_model(config.state)
+    graph = build_graph(config, state_model)
+    tracker = MagicMock(run_id="run-1", execution_state_repo=MagicMock())
+
+    await graph.ainvoke(state_model(topic="AI"), config={"configurable": {"tracker": tracker}})
+
+    saved = tracker.execution_state_repo.save_state.call_args.kwargs
+    assert saved["run_id"] == "run-1"
+    assert saved["node_id"] == "research"
+
+
+@pytest.mark.asyncio
+async def test_async_loop_counter_wrapper():
+    seen = []
+
+    async def node_fn(state, config=None):
+        seen.append((dict(state), config))
+        return state
+
+    wrapped = _wrap_with_loop_counter_async(node_fn, "research")
+    await wrapped({get_loop_iteration_key("research"): 1}, {"configurable": {}})
+
+    assert seen == [({get_loop_iteration_key("research"): 2}, {"configurable": {}})]
+    assert wrapped.__name__ == "loop_wrapped_node_fn"
+
+
+@pytest.mark.asyncio
+@patch("configurable_agents.core.node_executor.call_llm_structured_async")
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_concurrent_nodes_share_event_loop(mock_create_llm, mock_async_call):
+    """100 nodes waiting 50ms each on the provider finish in well under 100 * 50ms."""
+    mock_create_llm.return_value = MagicMock()
+
+    async def slow_llm(**kwargs):
+        await asyncio.sleep(0.05)
+        return llm_result()
+
+    mock_async_call.side_effect = slow_llm
+    node = make_node()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(execute_node_async(node, SimpleState(topic=f"t{i}")) for i in range(100))
+    )
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 100
+    assert elapsed < 2.5
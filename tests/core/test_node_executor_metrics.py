@@ -104,12 +104,12 @@ def test_node_saves_execution_state(
     assert "cost_usd" in state_data
 
 
-@patch("configurable_agents.observability.cost_estimator.CostEstimator")
+@patch("configurable_agents.core.node_executor.get_cost_estimator")
 @patch("configurable_agents.core.node_executor.call_llm_structured")
 @patch("configurable_agents.core.node_executor.create_llm")
 @patch("configurable_agents.core.node_executor.build_output_model")
 def test_node_saves_cost_metrics(
-    mock_build_output, mock_create_llm, mock_call_llm, MockCostEstimator
+    mock_build_output, mock_create_llm, mock_call_llm, mock_get_estimator
 ):
     """Test that node saves cost metrics using CostEstimator."""
     # Setup state
@@ -134,7 +134,7 @@ def test_node_saves_cost_metrics(
     # Mock cost estimator
     mock_estimator = Mock()
     mock_estimator.estimate_cost.return_value = 0.00015
-    MockCostEstimator.return_value = mock_estimator
+    mock_get_estimator.return_value = mock_estimator
 
     # Create mock tracker with storage repos
     tracker = Mock()
@@ -1,15 +1,25 @@
 """Tests for parallel execution functions."""
 
+import asyncio
+import threading
+import time
+
 import pytest
 from pydantic import BaseModel, PrivateAttr
+from pydantic import ValidationError as PydanticValidationError
 
-from configurable_agents.config.schema import ParallelConfig
+from configurable_agents.config.schema import NodeConfig, OutputSchema, ParallelConfig
 from configurable_agents.core import (
+    ConcurrencyLimiter,
     create_fan_out_function,
     get_parallel_item,
     get_parallel_index,
+    get_referenced_fields,
     is_parallel_execution,
+    limit_branches,
+    limit_branches_async,
 )
+from configurable_agents.core.parallel import PARALLEL_WINDOW_KEY
 
 
 class TestCreateFanOutFunction:
@@ -103,6 +113,180 @@ class TestCreateFanOutFunction:
         assert result[0].arg["count"] == 5
 
 
+class TestProjection:
+    """Test projection="referenced" fan-out payloads."""
+
+    class State(BaseModel):
+        items: list[str]
+        topic: str
+        big_document: str = ""
+        notes: str = ""
+
+    def make_node(self, prompt="Review {state._parallel_item} about {topic}", inputs=None):
+        return NodeConfig(
+            id="worker",
+            prompt=prompt,
+            inputs=inputs,
+            outputs=["notes"],
+            output_schema=OutputSchema(type="str"),
+        )
+
+    def test_referenced_fields_from_prompt_and_inputs(self):
+        node = self.make_node(
+            prompt="Summarize {doc} for {state.audience} ({meta.author})",
+            inputs={"doc": "{state.big_document}"},
+        )
+
+        assert get_referenced_fields(node) == {"audience", "meta", "big_document"}
+
+    def test_branch_receives_only_referenced_and_required_fields(self):
+        config = ParallelConfig(
+            items_field="items",
+            target_node="worker",
+            collect_field="results",
+            projection="referenced",
+        )
+        fan_out_fn = create_fan_out_function(config, self.make_node())
+        state = self.State(items=["a", "b"], topic="AI", big_document="x" * 10_000)
+
+        sends = fan_out_fn(state)
+
+        assert set(sends[0].arg) == {
+            "items",  # required
+            "topic",
+            "_parallel_item",
+            "_parallel_index",
+            "_parallel_source",
+        }
+        assert [s.arg["_parallel_item"] for s in sends] == ["a", "b"]
+        # Projected payload still validates against the state model
+        assert self.State(**sends[1].arg).topic == "AI"
+
+    def test_full_projection_is_default(self):
+        config = ParallelConfig(items_field="items", target_node="worker", collect_field="results")
+        fan_out_fn = create_fan_out_function(config, self.make_node())
+
+        sends = fan_out_fn(self.State(items=["a"], topic="AI", big_document="doc"))
+
+        assert sends[0].arg["big_document"] == "doc"
+
+    def test_large_fan_out(self):
+        config = ParallelConfig(
+            items_field="items",
+            target_node="worker",
+            collect_field="results",
+            projection="referenced",
+        )
+        fan_out_fn = create_fan_out_function(config, self.make_node())
+
+        sends = fan_out_fn(self.State(items=[str(i) for i in range(5000)], topic="AI"))
+
+        assert len(sends) == 5000
+        assert sends[-1].arg["_parallel_index"] == 4999
+
+
+class TestParallelConfigOptions:
+    def test_max_concurrency_must_be_positive(self):
+        with pytest.raises(PydanticValidationError):
+            ParallelConfig(
+                items_field="items", target_node="w", collect_field="r", max_concurrency=0
+            )
+
+    def test_invalid_projection(self):
+        with pytest.raises(PydanticValidationError):
+            ParallelConfig(
+                items_field="items", target_node="w", collect_field="r", projection="some"
+            )
+
+
+class TestConcurrencyLimiter:
+    def test_fan_out_sends_one_window_per_dispatch(self):
+        config = ParallelConfig(
+            items_field="items", target_node="w", collect_field="r", max_concurrency=2
+        )
+        fan_out_fn = create_fan_out_function(config)
+
+        first = fan_out_fn({"items": [1, 2, 3]})
+        second = fan_out_fn({"items": [1, 2, 3]})
+
+        windows = {id(send.arg[PARALLEL_WINDOW_KEY]) for send in first}
+        assert len(windows) == 1
+        assert first[0].arg[PARALLEL_WINDOW_KEY].limit == 2
+        assert first[0].arg[PARALLEL_WINDOW_KEY] is not second[0].arg[PARALLEL_WINDOW_KEY]
+
+    def test_unbounded_fan_out_sends_no_window(self):
+        config = ParallelConfig(items_field="items", target_node="w", collect_field="r")
+
+        sends = create_fan_out_function(config)({"items": [1]})
+
+        assert PARALLEL_WINDOW_KEY not in sends[0].arg
+
+    def test_sync_window_bounds_in_flight(self):
+        limiter = ConcurrencyLimiter(3)
+        in_flight = 0
+        peak = 0
+        seen = []
+        lock = threading.Lock()
+
+        def node_fn(state, config=None):
+            nonlocal in_flight, peak
+            with lock:
+                in_flight += 1
+                peak = max(peak, in_flight)
+                seen.append(state)
+            time.sleep(0.01)
+            with lock:
+                in_flight -= 1
+            return state
+
+        limited = limit_branches(node_fn)
+        threads = [
+            threading.Thread(target=limited, args=({PARALLEL_WINDOW_KEY: limiter, "n": i},))
+            for i in range(20)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert peak == 3
+        assert all(PARALLEL_WINDOW_KEY not in state for state in seen)
+
+    def test_async_window_bounds_in_flight(self):
+        in_flight = 0
+        peak = 0
+
+        async def node_fn(state, config=None):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.005)
+            in_flight -= 1
+            return state
+
+        limited = limit_branches_async(node_fn)
+
+        async def dispatch():
+            limiter = ConcurrencyLimiter(4)
+            await asyncio.gather(*(limited({PARALLEL_WINDOW_KEY: limiter}) for _ in range(50)))
+
+        async def main():
+            # Two concurrent dispatches each get their own window
+            await asyncio.gather(dispatch(), dispatch())
+
+        asyncio.run(main())
+        assert peak == 8
+
+    def test_state_without_window_runs_directly(self):
+        limited = limit_branches(lambda state, config=None: state)
+
+        assert limited({"n": 1}) == {"n": 1}
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            ConcurrencyLimiter(0)
+
+
 class TestGetParallelItem:
     """Test get_parallel_item helper."""
 
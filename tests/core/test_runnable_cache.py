@@ -0,0 +1,166 @@
+"""
+Tests for the node runnable cache.
+
+Covers:
+- LRU behavior and statistics
+- Key derivation from config content
+- Reuse of LLM clients, output models, tools and bound runnables by execute_node
+"""
+
+import threading
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from configurable_agents.config.schema import LLMConfig, NodeConfig, OutputSchema
+from configurable_agents.core import RunnableCache, execute_node, get_runnable_cache
+from configurable_agents.llm import LLMUsageMetadata
+
+
+class SimpleState(BaseModel):
+    topic: str
+    research: str = ""
+
+
+class SimpleOutput(BaseModel):
+    result: str
+
+
+def make_node(node_id: str = "research", tools=None) -> NodeConfig:
+    return NodeConfig(
+        id=node_id,
+        prompt="Research {topic}",
+        output_schema=OutputSchema(type="str"),
+        outputs=["research"],
+        llm=LLMConfig(provider="openai", model="gpt-4o-mini"),
+        tools=tools,
+    )
+
+
+# ============================================
+# Test: RunnableCache
+# ============================================
+
+
+def test_get_llm_reuses_instance_for_equal_configs():
+    cache = RunnableCache()
+    factory = Mock(side_effect=lambda cfg: object())
+
+    first = cache.get_llm(LLMConfig(model="a", temperature=0.1), factory)
+    second = cache.get_llm(LLMConfig(model="a", temperature=0.1), factory)
+    third = cache.get_llm(LLMConfig(model="a", temperature=0.9), factory)
+
+    assert first is second
+    assert third is not first
+    assert factory.call_count == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_output_model_keyed_on_node_and_schema():
+    cache = RunnableCache()
+    factory = Mock(side_effect=lambda schema, node_id: type(f"M_{node_id}", (BaseModel,), {}))
+
+    a1 = cache.get_output_model(OutputSchema(type="str"), "a", factory)
+    a2 = cache.get_output_model(OutputSchema(type="str"), "a", factory)
+    b = cache.get_output_model(OutputSchema(type="str"), "b", factory)
+
+    assert a1 is a2
+    assert b is not a1
+
+
+def test_structured_runnable_keyed_on_tools():
+    cache = RunnableCache()
+    tool_a, tool_b = Mock(), Mock()
+    tool_a.name, tool_b.name = "a", "b"
+    config = LLMConfig(model="m")
+
+    r1 = cache.get_structured_llm(config, SimpleOutput, [tool_a], object)
+    r2 = cache.get_structured_llm(config, SimpleOutput, [tool_a], object)
+    r3 = cache.get_structured_llm(config, SimpleOutput, [tool_b], object)
+
+    assert r1 is r2
+    assert r3 is not r1
+
+
+def test_size_cap_evicts_least_recently_used():
+    cache = RunnableCache(max_entries=2)
+    cache.get_tool("a", lambda name: name)
+    cache.get_tool("b", lambda name: name)
+    cache.get_tool("a", lambda name: name)
+    cache.get_tool("c", lambda name: name)
+
+    factory = Mock(side_effect=lambda name: name)
+    cache.get_tool("a", factory)
+    cache.get_tool("b", factory)
+
+    assert factory.call_count == 1  # only "b" was evicted
+    assert cache.stats()["size"] == 2
+
+
+def test_factory_errors_not_cached():
+    cache = RunnableCache()
+    factory = Mock(side_effect=[ValueError("boom"), "ok"])
+
+    with pytest.raises(ValueError):
+        cache.get_tool("t", factory)
+
+    assert cache.get_tool("t", factory) == "ok"
+
+
+def test_concurrent_misses_share_one_instance():
+    cache = RunnableCache()
+    barrier = threading.Barrier(8)
+    results = []
+
+    def factory(name):
+        return object()
+
+    def worker():
+        barrier.wait()
+        results.append(cache.get_tool("shared", factory))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len({id(r) for r in results}) == 1
+
+
+def test_invalid_max_entries():
+    with pytest.raises(ValueError):
+        RunnableCache(max_entries=0)
+
+
+# ============================================
+# Test: execute_node integration
+# ============================================
+
+
+@patch("configurable_agents.core.node_executor.call_llm_structured")
+@patch("configurable_agents.core.node_executor.create_llm")
+@patch("configurable_agents.core.node_executor.get_tool")
+def test_execute_node_reuses_cached_objects(mock_get_tool, mock_create_llm, mock_call_llm):
+    """Repeated node executions build LLM, tools and bound runnable once."""
+    tool = Mock()
+    tool.name = "serper_search"
+    mock_get_tool.return_value = tool
+    llm = MagicMock()
+    mock_create_llm.return_value = llm
+    mock_call_llm.return_value = (
+        Mock(result="done"),
+        LLMUsageMetadata(input_tokens=1, output_tokens=1),
+    )
+    node = make_node(tools=["serper_search"])
+
+    for _ in range(5):
+        execute_node(node, SimpleState(topic="AI"))
+
+    assert mock_create_llm.call_count == 1
+    assert mock_get_tool.call_count == 1
+    assert llm.bind_tools.call_count == 1
+    structured = [c.kwargs["structured_llm"] for c in mock_call_llm.call_args_list]
+    assert all(s is structured[0] for s in structured)
+    assert get_runnable_cache().stats()["hits"] > 0
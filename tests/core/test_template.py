@@ -3,10 +3,11 @@ Tests for prompt template resolution.
 """
 
 import pytest
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
 from configurable_agents.core import (
     TemplateResolutionError,
+    compile_template,
     resolve_prompt,
     extract_variables,
 )
@@ -539,3 +540,86 @@ def test_full_integration_error_recovery():
     assert "Did you mean 'topic'?" in str(error)
     assert "Available inputs" in str(error)
     assert "Available state fields" in str(error)
+
+
+
+# ============================================
+# Test: compile_template
+# ============================================
+
+
+def test_compile_template_segments_and_variables():
+    """Compiled template exposes variables in order, state. prefix stripped"""
+    compiled = compile_template("A {state.topic} B {metadata.author} C {topic}")
+
+    assert compiled.variables == ("topic", "metadata.author", "topic")
+
+
+def test_compile_template_cached():
+    """Same template text compiles once"""
+    assert compile_template("Hello {name}") is compile_template("Hello {name}")
+
+
+def test_resolve_prompt_state_prefix_native():
+    """{state.x} resolves like {x}, including nested paths"""
+    state = NestedState(topic="AI", metadata=NestedMetadata(author="Bob", timestamp=1))
+
+    result = resolve_prompt("{state.topic} by {state.metadata.author}", {}, state)
+
+    assert result == "AI by Bob"
+
+
+def test_resolve_prompt_values_not_re_expanded():
+    """Resolved values containing braces are emitted literally"""
+    state = SimpleState(topic="{score}", score=1)
+
+    assert resolve_prompt("{topic} / {score}", {}, state) == "{score} / 1"
+
+
+def test_resolve_prompt_non_identifier_braces_kept():
+    """Braces that aren't placeholders (e.g. JSON) are left untouched"""
+    state = SimpleState(topic="AI", score=1)
+
+    result = resolve_prompt('Return {"topic": "{topic}"} or { }', {}, state)
+
+    assert result == 'Return {"topic": "AI"} or { }'
+
+
+def test_compiled_render_missing_variable_error():
+    """Missing variables raise the same detailed error"""
+    state = SimpleState(topic="AI", score=1)
+
+    with pytest.raises(TemplateResolutionError) as exc_info:
+        compile_template("{state.topik}").render({}, state)
+
+    assert exc_info.value.variable == "topik"
+    assert exc_info.value.suggestion == "topic"
+
+
+def _legacy_resolve(template, inputs, state):
+    """Previous implementation: strip prefix, findall, one replace per variable."""
+    import re
+
+    template = re.sub(r"\{state\.([^}]+)\}", r"{\1}", template)
+    resolved = template
+    for var in extract_variables(template):
+        value = inputs[var] if var in inputs else get_nested_value(state, var)
+        resolved = resolved.replace(f"{{{var}}}", str(value))
+    return resolved
+
+
+def test_large_prompt_matches_legacy_rendering():
+    """Compiled rendering of a large prompt matches per-call regex + replace"""
+    field_count = 200
+    LargeState = create_model(
+        "LargeState", **{f"field_{i}": (str, f"value {i}") for i in range(field_count)}
+    )
+    state = LargeState()
+    filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 4
+    template = "".join(
+        f"{filler}{{state.field_{i}}} and {{field_{(i * 7) % field_count}}}. "
+        for i in range(field_count)
+    )
+
+    assert resolve_prompt(template, {}, state) == _legacy_resolve(template, {}, state)
+    assert compile_template(template) is compile_template(template)
@@ -9,7 +9,7 @@ Tests cover:
 """
 
 import os
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
 import pytest
 from langchain_core.language_models import BaseChatModel
@@ -22,6 +22,7 @@ from configurable_agents.llm import (
     LLMProviderError,
     LLMUsageMetadata,
     call_llm_structured,
+    call_llm_structured_async,
     create_llm,
     merge_llm_config,
 )
@@ -404,3 +405,72 @@ class TestCallLLMStructured:
         error = exc_info.value
         assert "unexpected type" in error.reason
         assert not error.retryable
+
+
+class TestCallLLMStructuredAsync:
+    """Test call_llm_structured_async function."""
+
+    @pytest.mark.asyncio
+    async def test_async_call_uses_ainvoke(self):
+        """Async call awaits ainvoke and never calls blocking invoke."""
+
+        class TestOutput(BaseModel):
+            result: str
+
+        mock_llm = Mock(spec=BaseChatModel)
+        mock_structured = Mock()
+        mock_structured.ainvoke = AsyncMock(
+            return_value=make_mock_response(TestOutput(result="Hello"))
+        )
+        mock_llm.with_structured_output.return_value = mock_structured
+
+        result, usage = await call_llm_structured_async(mock_llm, "Say hello", TestOutput)
+
+        assert result.result == "Hello"
+        assert usage.input_tokens == 100
+        assert usage.output_tokens == 50
+        mock_structured.ainvoke.assert_awaited_once_with("Say hello")
+        mock_structured.invoke.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch("configurable_agents.llm.provider.asyncio.sleep", new_callable=AsyncMock)
+    @patch("configurable_agents.llm.provider.time.sleep")
+    async def test_async_retries_without_blocking_sleep(self, mock_time_sleep, mock_sleep):
+        """Backoff uses asyncio.sleep; usage accumulates across attempts."""
+
+        class TestOutput(BaseModel):
+            result: str
+
+        mock_structured = Mock()
+        mock_structured.ainvoke = AsyncMock(
+            side_effect=[
+                RuntimeError("Rate limit exceeded"),
+                make_mock_response(TestOutput(result="Success")),
+            ]
+        )
+
+        result, usage = await call_llm_structured_async(
+            Mock(spec=BaseChatModel), "Test", TestOutput, structured_llm=mock_structured
+        )
+
+        assert result.result == "Success"
+        mock_sleep.assert_awaited_once_with(1)
+        mock_time_sleep.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_non_retryable_error_wrapped(self):
+        """Non-retryable errors raise LLMAPIError, as in the sync path."""
+
+        class TestOutput(BaseModel):
+            result: str
+
+        mock_structured = Mock()
+        mock_structured.ainvoke = AsyncMock(side_effect=RuntimeError("API Error"))
+
+        with pytest.raises(LLMAPIError) as exc_info:
+            await call_llm_structured_async(
+                Mock(spec=BaseChatModel), "Test", TestOutput, structured_llm=mock_structured
+            )
+
+        assert "API Error" in exc_info.value.reason
+        assert not exc_info.value.retryable
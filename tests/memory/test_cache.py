@@ -0,0 +1,257 @@
+"""Tests for the in-process memory cache, TTL expiry and invalidation."""
+
+import gc
+import time
+
+import pytest
+from sqlalchemy import create_engine, event, text
+
+from configurable_agents.memory import AgentMemory, MemoryCache, MemoryReaper, MemoryStore
+from configurable_agents.storage.models import Base
+from configurable_agents.storage.sqlite import SQLiteMemoryRepository
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """File database shared by several repositories (simulated workers)."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'memory.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def statements(engine):
+    """Record SQL statements issued against the test database."""
+    issued = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        issued.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield issued
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def memory_repo(engine):
+    return SQLiteMemoryRepository(engine)
+
+
+class TestReadThroughCache:
+    """Tests for cached reads and writes."""
+
+    def test_hot_reads_skip_database(self, memory_repo, statements):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("counter", 42)
+        statements.clear()
+
+        for _ in range(100):
+            assert memory["counter"] == 42
+
+        assert statements == []
+
+    def test_cache_shared_across_agent_memory_instances(self, memory_repo, statements):
+        AgentMemory(agent_id="bot", repo=memory_repo).write("name", "Alice")
+        statements.clear()
+
+        assert AgentMemory(agent_id="bot", repo=memory_repo)["name"] == "Alice"
+        assert statements == []
+
+    def test_missing_keys_are_cached(self, memory_repo, statements):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        assert memory["absent"] is None
+        statements.clear()
+
+        assert memory["absent"] is None
+        assert statements == []
+
+        memory.write("absent", "now present")
+        assert memory["absent"] == "now present"
+
+    def test_returned_containers_are_copies(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("settings", {"theme": "dark"})
+
+        memory["settings"]["theme"] = "light"
+
+        assert memory["settings"] == {"theme": "dark"}
+
+    def test_delete_and_clear_invalidate(self, memory_repo):
+        workflow = AgentMemory(agent_id="bot", workflow_id="wf", scope="workflow", repo=memory_repo)
+        workflow.write("a", 1)
+        workflow.write("b", 2)
+        assert workflow["a"] == 1
+
+        workflow.delete("a")
+        assert workflow["a"] is None
+
+        workflow.clear()
+        assert workflow["b"] is None
+
+    def test_lru_eviction(self, memory_repo):
+        cache = MemoryCache(memory_repo, max_entries=2)
+        for key in ("k1", "k2", "k3"):
+            cache.put(key, key)
+
+        stats = cache.stats()
+        assert stats["size"] == 2
+        assert stats["evictions"] == 1
+
+    def test_uncached_store(self, memory_repo):
+        store = MemoryStore(memory_repo, use_cache=False)
+        store.set("bot:*:*:k", [1, 2], "bot", None, None, "k")
+
+        assert store.cache is None
+        assert store.get("bot:*:*:k") == [1, 2]
+
+
+class TestTTL:
+    """Tests for expiry persisted in the database."""
+
+    def test_expired_key_reads_as_missing(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("token", "abc", ttl=0)
+        memory.write("kept", "value", ttl=3600)
+
+        assert memory["token"] is None
+        assert memory["kept"] == "value"
+        assert memory.keys() == ["kept"]
+        assert len(memory) == 1
+
+    def test_expiry_honoured_by_other_workers(self, engine, memory_repo):
+        AgentMemory(agent_id="bot", repo=memory_repo).write("token", "abc", ttl=0)
+        other = SQLiteMemoryRepository(engine)
+
+        assert AgentMemory(agent_id="bot", repo=other)["token"] is None
+        assert other.get_entry("bot:*:*:token") is None
+
+    def test_cached_entry_expires(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("token", "abc", ttl=1)
+        assert memory["token"] == "abc"
+
+        time.sleep(1.1)
+
+        assert memory["token"] is None
+
+    def test_purge_expired(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("old", 1, ttl=0)
+        memory.write("fresh", 2, ttl=3600)
+        memory.write("forever", 3)
+
+        assert memory_repo.purge_expired() == 1
+        assert memory_repo.count("bot:") == 2
+
+    def test_background_reaper(self, engine, memory_repo):
+        AgentMemory(agent_id="bot", repo=memory_repo).write("old", 1, ttl=0)
+
+        def stored_rows():
+            with engine.connect() as conn:
+                return conn.execute(text("SELECT COUNT(*) FROM memory_records")).scalar()
+
+        assert stored_rows() == 1
+        reaper = MemoryReaper(memory_repo, interval=0.05)
+        reaper.start()
+        try:
+            deadline = time.time() + 5
+            while stored_rows() and time.time() < deadline:
+                time.sleep(0.02)
+        finally:
+            reaper.stop()
+
+        assert stored_rows() == 0
+
+
+    def test_reaper_started_by_write_without_ttl(self, engine):
+        from configurable_agents.memory import cache as memory_cache
+
+        repo = SQLiteMemoryRepository(engine)
+        assert repo not in memory_cache._reapers
+
+        AgentMemory(agent_id="bot", repo=repo).write("k", "v")
+
+        assert memory_cache._reapers[repo]._thread.is_alive()
+
+    def test_reaper_does_not_keep_repository_alive(self, engine):
+        repo = SQLiteMemoryRepository(engine)
+        reaper = MemoryReaper(repo, interval=0.05)
+        reaper.start()
+        thread = reaper._thread
+
+        del repo
+        gc.collect()
+
+        thread.join(5)
+        assert not thread.is_alive()
+        assert reaper.purge() == 0
+
+class TestCrossProcessInvalidation:
+    """Two repositories on one database stand in for two worker processes."""
+
+    def test_write_by_other_worker_evicts_entry(self, engine, memory_repo):
+        other_repo = SQLiteMemoryRepository(engine)
+        ours = AgentMemory(agent_id="bot", repo=memory_repo)
+        theirs = AgentMemory(agent_id="bot", repo=other_repo)
+        ours.write("status", "draft")
+        assert theirs["status"] == "draft"  # Now cached by the other worker
+
+        ours.write("status", "published")
+        theirs._store.cache.sync(force=True)
+
+        assert theirs["status"] == "published"
+
+    def test_clear_by_other_worker_evicts_prefix(self, engine, memory_repo):
+        other_repo = SQLiteMemoryRepository(engine)
+        theirs = AgentMemory(agent_id="bot", repo=other_repo)
+        theirs.write("a", 1)
+        assert theirs["a"] == 1
+
+        AgentMemory(agent_id="bot", repo=memory_repo).clear()
+        theirs._store.cache.sync(force=True)
+
+        assert theirs["a"] is None
+
+    def test_own_writes_are_not_evicted(self, memory_repo, statements):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("k", "v")
+        memory._store.cache.sync(force=True)
+        statements.clear()
+
+        assert memory["k"] == "v"
+        assert all("memory_records" not in s for s in statements)
+
+    def test_staleness_bounded_by_sync_interval(self, engine, memory_repo):
+        other_repo = SQLiteMemoryRepository(engine)
+        theirs = AgentMemory(agent_id="bot", repo=other_repo)
+        theirs._store.cache.sync_interval = 0.1
+        AgentMemory(agent_id="bot", repo=memory_repo).write("k", 1)
+        assert theirs["k"] == 1
+
+        AgentMemory(agent_id="bot", repo=memory_repo).write("k", 2)
+        time.sleep(0.15)
+
+        assert theirs["k"] == 2
+
+
+def test_hot_key_reads_served_from_cache(memory_repo, statements):
+    """Repeated reads of a hot key hit the database only without the cache."""
+    AgentMemory(agent_id="bot", repo=memory_repo).write("hot", {"topics": ["a", "b"]})
+    uncached = MemoryStore(memory_repo, use_cache=False)
+    cached = MemoryStore(memory_repo)
+    runs = 20
+
+    statements.clear()
+    for _ in range(runs):
+        assert uncached.get("bot:*:*:hot") == {"topics": ["a", "b"]}
+    assert sum("memory_records" in s for s in statements) >= runs
+
+    assert cached.get("bot:*:*:hot") == {"topics": ["a", "b"]}
+    statements.clear()
+    for _ in range(runs):
+        assert cached.get("bot:*:*:hot") == {"topics": ["a", "b"]}
+    assert all("memory_records" not in s for s in statements)
+    assert cached.cache.stats()["hits"] >= runs
@@ -6,7 +6,7 @@ import tempfile
 from pathlib import Path
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 
 from configurable_agents.memory import AgentMemory, MemoryStore, memory_context
 from configurable_agents.storage.base import MemoryRepository
@@ -319,6 +319,208 @@ class TestMemoryClear:
         assert workflow2["key"] == "value2"
 
 
+class TestScopedListing:
+    """Tests for scope- and prefix-aware listing and pagination."""
+
+    @pytest.fixture
+    def statements(self, temp_db):
+        """Record SQL statements issued against the test database."""
+        issued = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            issued.append(statement)
+
+        event.listen(temp_db, "before_cursor_execute", record)
+        yield issued
+        event.remove(temp_db, "before_cursor_execute", record)
+
+    def test_list_is_single_query(self, memory_repo, statements):
+        """Listing costs one query regardless of the number of keys."""
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        for i in range(50):
+            memory.write(f"key{i:02d}", i)
+        statements.clear()
+
+        items = memory.list()
+
+        assert len(items) == 50
+        assert len(statements) == 1
+
+    def test_list_only_returns_current_scope(self, memory_repo):
+        """Same key at other scopes does not leak into the listing."""
+        agent = AgentMemory(agent_id="bot", scope="agent", repo=memory_repo)
+        workflow = AgentMemory(
+            agent_id="bot", workflow_id="wf", scope="workflow", repo=memory_repo
+        )
+        agent.write("shared", "agent_value")
+        workflow.write("shared", "workflow_value")
+        workflow.write("only_workflow", 1)
+
+        assert agent.list() == [("shared", "agent_value")]
+        assert workflow.list() == [("only_workflow", 1), ("shared", "workflow_value")]
+        assert len(agent) == 1
+        assert len(workflow) == 2
+
+    def test_prefix_does_not_match_neighbouring_agents(self, memory_repo):
+        """Agent 'bot' must not see 'bot2' entries through the range scan."""
+        AgentMemory(agent_id="bot", repo=memory_repo).write("k", 1)
+        AgentMemory(agent_id="bot2", repo=memory_repo).write("k", 2)
+
+        assert AgentMemory(agent_id="bot", repo=memory_repo).list() == [("k", 1)]
+
+    def test_prefix_with_like_wildcards(self, memory_repo):
+        """Prefixes are literal: % and _ are not wildcards."""
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("a_b", 1)
+        memory.write("axb", 2)
+        memory.write("100%", 3)
+        memory.write("1000", 4)
+
+        assert memory.list("a_") == [("a_b", 1)]
+        assert memory.list("100%") == [("100%", 3)]
+
+    def test_list_page_walks_all_keys(self, memory_repo):
+        """Pages follow key order and the last page has no cursor."""
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        for i in range(7):
+            memory.write(f"item:{i}", i)
+        memory.write("other", "x")
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            items, cursor = memory.list_page("item:", limit=3, cursor=cursor)
+            seen.extend(items)
+            pages += 1
+            if cursor is None:
+                break
+
+        assert pages == 3
+        assert seen == [(f"item:{i}", i) for i in range(7)]
+
+    def test_iter_items_streams_in_batches(self, memory_repo, statements):
+        """iter_items fetches one query per batch."""
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        for i in range(10):
+            memory.write(f"k{i}", i)
+        statements.clear()
+
+        items = list(memory.iter_items(batch_size=4))
+
+        assert [value for _, value in items] == list(range(10))
+        assert len(statements) == 3
+
+    def test_repository_scan_with_cursor(self, memory_repo):
+        """scan() resumes after the given namespace key."""
+        for key in ("a", "b", "c"):
+            memory_repo.set(f"bot:*:*:{key}", json.dumps(key), "bot", None, None, key)
+
+        first = memory_repo.scan("bot:*:*:", limit=2)
+        rest = memory_repo.scan("bot:*:*:", after=first[-1][0])
+
+        assert [k for k, _ in first] == ["bot:*:*:a", "bot:*:*:b"]
+        assert rest == [("bot:*:*:c", json.dumps("c"))]
+        assert memory_repo.count("bot:*:*:") == 3
+
+
+class TestBulkOperations:
+    """Tests for get_many / set_many / delete_many."""
+
+    @pytest.fixture
+    def statements(self, temp_db):
+        """Record SQL statements issued against the test database."""
+        issued = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            issued.append(statement)
+
+        event.listen(temp_db, "before_cursor_execute", record)
+        yield issued
+        event.remove(temp_db, "before_cursor_execute", record)
+
+    def test_set_many_and_get_many(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.set_many({"a": 1, "b": {"nested": True}, "c": [1, 2]})
+
+        values = AgentMemory(agent_id="bot", repo=memory_repo).get_many(["a", "b", "missing"], default=0)
+
+        assert values == {"a": 1, "b": {"nested": True}, "missing": 0}
+        assert memory["c"] == [1, 2]
+
+    def test_set_many_is_one_upsert_statement(self, memory_repo, statements):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+
+        memory.set_many({f"key{i}": i for i in range(200)})
+
+        upserts = [s for s in statements if "memory_records" in s]
+        assert len(upserts) == 1
+        assert "ON CONFLICT" in upserts[0]
+
+    def test_get_many_is_one_query(self, memory_repo, statements):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.set_many({f"key{i}": i for i in range(50)})
+        uncached = MemoryStore(memory_repo, use_cache=False)
+        statements.clear()
+
+        values = uncached.get_many([f"bot:*:*:key{i}" for i in range(50)])
+
+        assert len(values) == 50
+        assert len(statements) == 1
+
+    def test_upsert_keeps_row_identity(self, memory_repo, temp_db):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.write("k", "v1")
+        with temp_db.connect() as conn:
+            before = conn.exec_driver_sql(
+                "SELECT id, created_at FROM memory_records WHERE key = 'k'"
+            ).one()
+
+        memory.set_many({"k": "v2"})
+
+        with temp_db.connect() as conn:
+            after = conn.exec_driver_sql(
+                "SELECT id, created_at, value FROM memory_records WHERE key = 'k'"
+            ).one()
+        assert (after.id, after.created_at) == (before.id, before.created_at)
+        assert json.loads(after.value) == "v2"
+
+    def test_delete_many(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.set_many({"a": 1, "b": 2, "c": 3})
+        assert memory["a"] == 1  # cached
+
+        assert memory.delete_many(["a", "b", "missing"]) == 2
+        assert memory.get_many(["a", "b", "c"]) == {"a": None, "b": None, "c": 3}
+
+    def test_set_many_with_ttl(self, memory_repo):
+        memory = AgentMemory(agent_id="bot", repo=memory_repo)
+        memory.set_many({"a": 1, "b": 2}, ttl=0)
+
+        assert memory.get_many(["a", "b"]) == {"a": None, "b": None}
+        assert memory_repo.get_many(["bot:*:*:a"]) == {}
+
+    def test_without_repository(self):
+        memory = AgentMemory(agent_id="bot")
+
+        assert memory.get_many(["a"], default=1) == {"a": 1}
+        assert memory.set_many({"a": 1}) is None
+        assert memory.delete_many(["a"]) == 0
+
+
+def test_set_many_round_trips_10k_keys(memory_repo):
+    """Bulk write of 10k keys persists every value and bulk-overwrites in place."""
+    memory = AgentMemory(agent_id="bench", repo=memory_repo)
+    items = {f"fact:{i:05d}": {"n": i} for i in range(10_000)}
+
+    memory.set_many(items)
+    memory.set_many({key: {"n": -1} for key in list(items)[:100]})
+
+    assert len(memory) == 10_000
+    stored = AgentMemory(agent_id="bench", repo=memory_repo).get_many(list(items))
+    assert stored["fact:00000"] == {"n": -1}
+    assert stored["fact:09999"] == {"n": 9999}
+    assert sum(value == {"n": -1} for value in stored.values()) == 100
+
+
 class TestMemoryContext:
     """Tests for memory_context context manager."""
 
@@ -0,0 +1,251 @@
+"""Tests for the semantic memory index and AgentMemory.search()."""
+
+import numpy as np
+import pytest
+from sqlalchemy import create_engine, text
+
+from configurable_agents.memory import (
+    AgentMemory,
+    FlatIndex,
+    HashingEmbedder,
+    IVFIndex,
+    MemoryVectorIndex,
+    clear_vector_indexes,
+    format_recalled_memories,
+)
+from configurable_agents.memory.vector import default_index_path
+from configurable_agents.storage.models import Base
+from configurable_agents.storage.sqlite import SQLiteMemoryRepository
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'memory.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def memory_repo(engine):
+    yield SQLiteMemoryRepository(engine)
+    clear_vector_indexes()
+
+
+@pytest.fixture
+def memory(memory_repo):
+    memory = AgentMemory(agent_id="bot", repo=memory_repo)
+    memory.set_many(
+        {
+            "favorite_color": "The user's favorite color is blue",
+            "home_city": "The user lives in Berlin",
+            "pet": {"kind": "dog", "name": "Rex"},
+            "diet": "The user is vegetarian and avoids meat",
+        }
+    )
+    return memory
+
+
+class TestHashingEmbedder:
+    """Tests for the default embedder."""
+
+    def test_deterministic_and_normalized(self):
+        embedder = HashingEmbedder(dim=64)
+        first, second = embedder.embed(["Dark mode theme", "dark MODE theme"])
+
+        assert first.shape == (64,)
+        assert np.allclose(first, second)
+        assert np.isclose(np.linalg.norm(first), 1.0)
+
+    def test_shared_vocabulary_scores_higher(self):
+        embedder = HashingEmbedder()
+        query, related, unrelated = embedder.embed(
+            ["favorite color", "my favorite color is blue", "train schedule to Paris"]
+        )
+
+        assert query @ related > query @ unrelated
+
+    def test_empty_text_is_zero_vector(self):
+        assert not HashingEmbedder(dim=16).embed([""]).any()
+
+    def test_rejects_tiny_dimension(self):
+        with pytest.raises(ValueError, match="dim"):
+            HashingEmbedder(dim=4)
+
+
+class TestIndexes:
+    """Tests for the flat and IVF indexes."""
+
+    def test_flat_upsert_remove_search(self):
+        index = FlatIndex(dim=4)
+        vectors = np.eye(4, dtype=np.float32)
+        index.upsert(["a", "b", "c"], vectors[:3])
+
+        assert index.search(vectors[1], k=1) == [("b", 1.0)]
+
+        index.remove(["a"])
+        index.upsert(["b"], vectors[3:4])
+
+        assert len(index) == 2
+        assert index.search(vectors[3], k=1) == [("b", 1.0)]
+        assert index.search(vectors[2], k=5)[0] == ("c", 1.0)
+
+    def test_ivf_matches_flat_on_clustered_data(self):
+        rng = np.random.default_rng(1)
+        centers = rng.normal(size=(8, 32))
+        points = np.repeat(centers, 100, axis=0) + 0.05 * rng.normal(size=(800, 32))
+        points = (points / np.linalg.norm(points, axis=1, keepdims=True)).astype(np.float32)
+        ids = [f"v{i}" for i in range(len(points))]
+        flat, ivf = FlatIndex(32), IVFIndex(32, nlist=8, nprobe=2, min_train_size=100)
+        flat.upsert(ids, points)
+        ivf.upsert(ids, points)
+
+        for query in points[::97]:
+            assert ivf.search(query, k=1) == flat.search(query, k=1)
+
+    def test_ivf_survives_removal_after_training(self):
+        vectors = np.eye(8, dtype=np.float32)
+        ivf = IVFIndex(8, nlist=2, nprobe=2, min_train_size=4)
+        ivf.upsert([f"v{i}" for i in range(8)], vectors)
+        ivf.search(vectors[0], k=1)  # Trains
+
+        ivf.remove(["v0", "v3"])
+
+        assert ivf.search(vectors[7], k=1) == [("v7", 1.0)]
+        assert ivf.search(vectors[0], k=1)[0][0] != "v0"
+
+
+class TestAgentMemorySearch:
+    """Tests for recall through AgentMemory."""
+
+    def test_returns_most_relevant_keys(self, memory):
+        results = memory.search("what is the user's favorite color?", k=2)
+
+        assert results[0][:2] == ("favorite_color", "The user's favorite color is blue")
+        assert len(results) == 2
+        assert results[0][2] >= results[1][2]
+
+    def test_structured_values_are_searchable(self, memory):
+        key, value, _ = memory.search("dog named Rex", k=1)[0]
+
+        assert (key, value) == ("pet", {"kind": "dog", "name": "Rex"})
+
+    def test_follows_writes_and_deletes(self, memory):
+        memory.search("anything")  # Build the index
+        memory.write("allergy", "The user is allergic to peanuts")
+        memory.delete("favorite_color")
+
+        keys = [key for key, _, _ in memory.search("peanut allergy favorite color", k=5)]
+
+        assert keys[0] == "allergy"
+        assert "favorite_color" not in keys
+
+    def test_follows_writes_by_other_workers(self, engine, memory):
+        memory.search("anything")
+        other = AgentMemory(agent_id="bot", repo=SQLiteMemoryRepository(engine))
+        other.write("language", "The user speaks Portuguese")
+
+        assert memory.search("which language does the user speak", k=1)[0][0] == "language"
+
+    def test_clear_empties_index(self, memory):
+        memory.search("anything")
+        memory.clear()
+
+        assert memory.search("favorite color") == []
+
+    def test_expired_entries_not_returned(self, memory):
+        memory.write("coupon", "discount coupon code SAVE10", ttl=0)
+
+        assert "coupon" not in [key for key, _, _ in memory.search("discount coupon", k=5)]
+
+    def test_scoped_to_agent(self, memory, memory_repo):
+        AgentMemory(agent_id="other", repo=memory_repo).write("color", "favorite color red")
+
+        assert "color" not in [key for key, _, _ in memory.search("favorite color", k=10)]
+
+    def test_without_repository(self):
+        assert AgentMemory(agent_id="bot").search("anything") == []
+
+    def test_format_recalled_memories(self, memory):
+        text = format_recalled_memories(memory.search("dog named Rex", k=1))
+
+        assert text == 'Relevant memories:\n- pet: {"kind": "dog", "name": "Rex"}'
+
+
+class TestPersistence:
+    """Tests for the .npz file kept next to the database."""
+
+    def test_saved_next_to_database(self, memory, memory_repo, tmp_path):
+        memory.search("anything")
+        path = default_index_path(memory_repo, "bot:*:*:", "flat")
+
+        assert path.parent == tmp_path / "memory.db.vectors"
+        assert path.exists()
+
+    def test_loaded_index_catches_up(self, engine, memory, memory_repo):
+        memory.search("anything")
+        memory.write("hobby", "The user plays chess on weekends")
+        path = default_index_path(memory_repo, "bot:*:*:", "flat")
+
+        reloaded = MemoryVectorIndex(SQLiteMemoryRepository(engine), "bot:*:*:", path=path)
+
+        assert len(reloaded) == 4  # Loaded from file, not rebuilt
+        assert reloaded.search("chess hobby", k=1)[0][0] == "bot:*:*:hobby"
+
+    def test_stale_or_mismatched_file_rebuilt(self, engine, memory, memory_repo):
+        memory.search("anything")
+        path = default_index_path(memory_repo, "bot:*:*:", "flat")
+        repo = SQLiteMemoryRepository(engine)
+
+        different = MemoryVectorIndex(repo, "bot:*:*:", HashingEmbedder(dim=32), path=path)
+        stale = MemoryVectorIndex(repo, "bot:*:*:", path=path, max_index_age=-1)
+
+        assert len(different) == 4
+        assert len(stale) == 4
+        assert different.search("favorite color", k=1)[0][0] == "bot:*:*:favorite_color"
+
+    def test_index_idle_past_change_retention_rebuilt(self, engine, memory, memory_repo):
+        index = MemoryVectorIndex(memory_repo, "bot:*:*:")
+        AgentMemory(agent_id="bot", repo=SQLiteMemoryRepository(engine)).write(
+            "hobby", "The user plays chess on weekends"
+        )
+        # Idle past max_index_age; the change rows were purged meanwhile
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM memory_changes"))
+        index._synced_at -= index.max_index_age + 1
+
+        assert index.search("chess hobby", k=1)[0][0] == "bot:*:*:hobby"
+        assert len(index) == 5
+
+    def test_no_path_for_in_memory_database(self):
+        engine = create_engine("sqlite:///:memory:")
+        Base.metadata.create_all(engine)
+
+        assert default_index_path(SQLiteMemoryRepository(engine), "bot:", "flat") is None
+
+    def test_unknown_kind_rejected(self, memory_repo):
+        with pytest.raises(ValueError, match="kind"):
+            MemoryVectorIndex(memory_repo, "bot:", kind="hnsw")
+
+
+def test_indexed_search_matches_full_scan(memory_repo):
+    """Flat and trained IVF indexes rank the same top entries as embedding a full scan."""
+    words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "theta", "kappa"]
+    memory = AgentMemory(agent_id="bench", repo=memory_repo)
+    memory.set_many(
+        {f"note_{i}": f"note {words[i % 8]} {words[(i // 8) % 8]} topic {i % 500}" for i in range(2000)}
+    )
+    embedder = HashingEmbedder()
+    query = "gamma omega topic 42"
+
+    items = memory.list()
+    vectors = embedder.embed([f"{key}: {value}" for key, value in items])
+    scores = vectors @ embedder.embed([query])[0]
+    best = np.argsort(-scores)[:5]
+
+    for kind in ("flat", "ivf"):
+        results = AgentMemory(agent_id="bench", repo=memory_repo, index_kind=kind).search(query, k=5)
+        assert results[0][0] == items[best[0]][0]
+        assert [score for _, _, score in results] == pytest.approx(scores[best].tolist(), abs=1e-4)
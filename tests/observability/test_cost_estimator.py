@@ -1,10 +1,19 @@
 """Unit tests for CostEstimator."""
 
+import json
+from unittest.mock import patch
+
+import numpy as np
 import pytest
 
+from configurable_agents.observability import cost_estimator as cost_estimator_module
 from configurable_agents.observability.cost_estimator import (
+    PRICING_FILE_ENV,
     CostEstimator,
+    clear_cost_estimator,
+    get_cost_estimator,
     get_model_pricing,
+    load_pricing_file,
     GEMINI_PRICING,
 )
 
@@ -247,3 +256,180 @@ class TestCostEstimator:
         # Total: 0.0225
         expected = 0.0225
         assert cost == expected
+
+
+class TestPriceMemoization:
+    """Tests for the memoized (model, provider) price table."""
+
+    def test_price_resolved_once(self):
+        """Repeated estimates reuse the resolved price."""
+        estimator = CostEstimator()
+
+        with patch.object(
+            estimator, "_resolve_price", wraps=estimator._resolve_price
+        ) as resolve:
+            for _ in range(100):
+                estimator.estimate_cost("gemini-1.5-flash", 150, 500)
+            estimator.get_pricing("gemini-1.5-flash")
+
+        assert resolve.call_count == 1
+
+    def test_failed_lookup_memoized(self):
+        """Unpriced models keep raising without repeating the search."""
+        estimator = CostEstimator()
+
+        with patch.object(
+            estimator, "_resolve_price", wraps=estimator._resolve_price
+        ) as resolve:
+            for _ in range(3):
+                with pytest.raises(ValueError, match="Cannot auto-detect provider"):
+                    estimator.estimate_cost("unknown-model-xyz", 1, 1)
+
+        assert resolve.call_count == 1
+
+    def test_litellm_price_table(self):
+        """Models outside the built-in tables are priced from LiteLLM's table."""
+        model_cost = {
+            "gpt-4o": {
+                "input_cost_per_token": 2.5e-06,
+                "output_cost_per_token": 1e-05,
+                "litellm_provider": "openai",
+            }
+        }
+        with patch.object(cost_estimator_module, "LITELLM_AVAILABLE", True), patch.object(
+            cost_estimator_module, "litellm", create=True
+        ) as litellm:
+            litellm.model_cost = model_cost
+            estimator = CostEstimator()
+
+            assert estimator.estimate_cost("openai/gpt-4o", 1000, 1000) == pytest.approx(0.0125)
+            # Listed under another provider: not used
+            with pytest.raises(ValueError, match="Unsupported provider"):
+                estimator.estimate_cost("gpt-4o", 1000, 1000, provider="anthropic")
+
+
+class TestPricingOverrides:
+    """Tests for the pricing override file."""
+
+    def test_overrides_win_and_price_unknown_models(self, tmp_path):
+        """Override prices replace built-in ones and cover unknown models."""
+        pricing_file = tmp_path / "pricing.json"
+        pricing_file.write_text(json.dumps({
+            "gemini-1.5-flash": {"input": 0.001, "output": 0.002},
+            "my-finetune": {"input": 0.01, "output": 0.02},
+        }))
+        estimator = CostEstimator(pricing_file=pricing_file)
+
+        assert estimator.estimate_cost("gemini-1.5-flash", 1000, 1000) == 0.003
+        assert estimator.estimate_cost("custom/my-finetune", 500, 500) == 0.015
+        assert estimator.estimate_cost("gemini-1.5-pro", 100, 200) == 0.001125
+
+    def test_yaml_file(self, tmp_path):
+        """YAML override files are supported."""
+        pricing_file = tmp_path / "pricing.yaml"
+        pricing_file.write_text("gpt-4o:\n  input: 0.0025\n  output: 0.01\n")
+
+        assert load_pricing_file(pricing_file) == {"gpt-4o": {"input": 0.0025, "output": 0.01}}
+
+    def test_keyword_overrides_applied_after_file(self, tmp_path):
+        """pricing_overrides take precedence over the file."""
+        pricing_file = tmp_path / "pricing.json"
+        pricing_file.write_text(json.dumps({"gpt-4o": {"input": 1, "output": 1}}))
+        estimator = CostEstimator(
+            pricing_file=pricing_file,
+            pricing_overrides={"gpt-4o": {"input": 0.0025, "output": 0.01}},
+        )
+
+        assert estimator.get_pricing("gpt-4o") == {"input": 0.0025, "output": 0.01}
+
+    @pytest.mark.parametrize(
+        "content",
+        ["[1, 2]", '{"gpt-4o": 0.1}', '{"gpt-4o": {"input": 0.1}}', '{"gpt-4o": {"input": -1, "output": 0}}', "{"],
+    )
+    def test_invalid_file(self, tmp_path, content):
+        """Malformed override files are rejected."""
+        pricing_file = tmp_path / "pricing.json"
+        pricing_file.write_text(content)
+
+        with pytest.raises(ValueError):
+            CostEstimator(pricing_file=pricing_file)
+
+
+class TestBatchEstimation:
+    """Tests for vectorized estimate_costs()."""
+
+    def test_single_model_matches_scalar(self):
+        """Array results match estimate_cost per element."""
+        estimator = CostEstimator()
+        inputs = np.array([0, 1, 150, 500, 100000])
+        outputs = np.array([0, 1, 500, 0, 50000])
+
+        costs = estimator.estimate_costs("gemini-1.5-flash", inputs, outputs)
+
+        expected = [estimator.estimate_cost("gemini-1.5-flash", i, o) for i, o in zip(inputs, outputs)]
+        assert costs.tolist() == pytest.approx(expected, abs=1e-6)
+
+    def test_per_call_models(self):
+        """Each call may use its own model; prices are resolved per distinct model."""
+        estimator = CostEstimator()
+
+        with patch.object(
+            estimator, "_resolve_price", wraps=estimator._resolve_price
+        ) as resolve:
+            costs = estimator.estimate_costs(
+                ["gemini-1.5-pro", "gemini-1.5-flash", "gemini-1.5-pro", "ollama/llama2"],
+                [100, 1000, 100, 5000],
+                [200, 0, 200, 5000],
+            )
+
+        assert costs.tolist() == pytest.approx([0.001125, 0.000075, 0.001125, 0.0])
+        assert resolve.call_count == 3
+
+    def test_unpriced_models(self):
+        """strict=False prices unknown models at zero instead of raising."""
+        estimator = CostEstimator()
+
+        with pytest.raises(ValueError):
+            estimator.estimate_costs(["gemini-1.5-pro", "mystery"], [1, 1], [1, 1])
+        costs = estimator.estimate_costs(["gemini-1.5-pro", "mystery"], [1000, 1000], [0, 0], strict=False)
+        assert costs.tolist() == pytest.approx([0.00125, 0.0])
+
+    def test_shape_mismatch(self):
+        """Token arrays must have the same shape."""
+        with pytest.raises(ValueError, match="shape"):
+            CostEstimator().estimate_costs("gemini-1.5-pro", [1, 2], [1])
+
+
+class TestProcessWideEstimator:
+    """Tests for get_cost_estimator()."""
+
+    def test_shared_instance_reads_env_file(self, tmp_path, monkeypatch):
+        """One instance per process, configured from the pricing file env var."""
+        pricing_file = tmp_path / "pricing.json"
+        pricing_file.write_text(json.dumps({"my-model": {"input": 0.5, "output": 0.5}}))
+        monkeypatch.setenv(PRICING_FILE_ENV, str(pricing_file))
+        clear_cost_estimator()
+        try:
+            estimator = get_cost_estimator()
+            assert get_cost_estimator() is estimator
+            assert estimator.estimate_cost("my-model", 1000, 1000) == 1.0
+        finally:
+            clear_cost_estimator()
+
+
+def test_batch_matches_per_call_estimates():
+    """One vectorized batch agrees with per-call estimates on random token counts."""
+    estimator = CostEstimator()
+    count = 10_000
+    inputs = np.random.default_rng(0).integers(0, 5000, count)
+    outputs = np.random.default_rng(1).integers(0, 2000, count)
+
+    per_call = [
+        estimator.estimate_cost("gemini-1.5-flash", i, o)
+        for i, o in zip(inputs.tolist(), outputs.tolist())
+    ]
+    batch = estimator.estimate_costs("gemini-1.5-flash", inputs, outputs)
+
+    assert batch.shape == (count,)
+    # Both round to 6 decimals; float ties may land one step apart
+    assert batch.tolist() == pytest.approx(per_call, abs=1.5e-6)
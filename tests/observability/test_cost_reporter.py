@@ -13,7 +13,10 @@ from configurable_agents.observability.cost_reporter import (
     CostReporter,
     CostSummary,
     get_date_range_filter,
+    open_cost_ledger,
 )
+from configurable_agents.observability.multi_provider_tracker import generate_cost_report
+from configurable_agents.storage.base import CostLedgerEntry
 
 
 @pytest.fixture
@@ -545,6 +548,108 @@ class TestExport:
         assert "run_1,test,workflow_a" in lines[1]
 
 
+@pytest.fixture
+def ledger_path(tmp_path):
+    """Storage database with a small cost ledger."""
+    path = str(tmp_path / "workflows.db")
+    ledger = open_cost_ledger(path)
+    ledger.append([
+        CostLedgerEntry(
+            run_id=f"run_{i}",
+            workflow_name="workflow_a" if i % 2 else "workflow_b",
+            started_at=datetime(2026, 1, 1 + i, 12),
+            status="failure" if i == 3 else "success",
+            model="gpt-4o" if i % 2 else "claude-3-opus",
+            provider="openai" if i % 2 else "anthropic",
+            input_tokens=100,
+            output_tokens=400,
+            cost_usd=0.0 if i == 3 else 0.01 * (i + 1),
+            calls=2,
+            duration_seconds=10.0,
+            experiment="my_workflows",
+        )
+        for i in range(6)
+    ])
+    return path
+
+
+class TestLedgerSource:
+    """Tests for reporting from the local cost ledger (no MLFlow)."""
+
+    def test_summarize_in_database(self, ledger_path):
+        """Summary totals and breakdowns come from the ledger."""
+        reporter = CostReporter(ledger_path=ledger_path)
+
+        summary = reporter.summarize()
+        assert reporter.client is None
+        assert summary.total_runs == 6
+        assert summary.failed_runs == 1
+        assert summary.total_tokens == 3000
+        assert summary.total_cost_usd == pytest.approx(0.17)
+        assert summary.breakdown_by_model["gpt-4o"] == pytest.approx(0.08)
+
+        filtered = reporter.summarize(workflow_name="workflow_a", status_filter="success")
+        assert filtered.total_runs == 2
+        assert reporter.summarize(provider="anthropic").total_runs == 3
+
+    def test_entries_match_summary(self, ledger_path):
+        """Streamed entries and get_cost_entries agree with the summary."""
+        reporter = CostReporter(ledger_path=ledger_path)
+
+        entries = reporter.get_cost_entries(model="gpt-4o")
+        assert [e.run_id for e in entries] == ["run_5", "run_3", "run_1"]
+        assert entries[0].node_count == 2
+        streamed = reporter.generate_summary(reporter.iter_cost_entries())
+        summary = reporter.summarize()
+        assert streamed.total_cost_usd == pytest.approx(summary.total_cost_usd)
+        assert (streamed.total_runs, streamed.total_tokens, streamed.failed_runs) == (
+            summary.total_runs, summary.total_tokens, summary.failed_runs
+        )
+        assert streamed.date_range == summary.date_range
+        assert streamed.breakdown_by_model == pytest.approx(summary.breakdown_by_model)
+
+    def test_aggregate_without_entries(self, ledger_path):
+        """Period aggregation is pushed down when no entries are passed."""
+        reporter = CostReporter(ledger_path=ledger_path)
+
+        expected = reporter.aggregate_by_period(reporter.get_cost_entries(), period="daily")
+        assert reporter.aggregate_by_period(period="daily") == pytest.approx(expected)
+        monthly = reporter.aggregate_by_period(period="monthly", workflow_name="workflow_b")
+        assert sum(monthly.values()) == pytest.approx(0.09)
+
+    def test_aggregate_without_entries_requires_ledger(self, mock_mlflow):
+        """MLFlow-backed reporters still need entries to aggregate."""
+        with pytest.raises(ValueError, match="ledger"):
+            CostReporter().aggregate_by_period(period="daily")
+
+    def test_streaming_export(self, ledger_path, tmp_path):
+        """Exports accept the lazy iterator and keep the file format."""
+        reporter = CostReporter(ledger_path=ledger_path)
+
+        json_file = tmp_path / "costs.json"
+        reporter.export_to_json(reporter.iter_cost_entries(), str(json_file))
+        data = json.loads(json_file.read_text())
+        assert len(data["entries"]) == 6
+        assert data["summary"]["total_runs"] == 6
+
+        csv_file = tmp_path / "costs.csv"
+        reporter.export_to_csv(reporter.iter_cost_entries(workflow_name="workflow_a"), str(csv_file))
+        assert len(csv_file.read_text().splitlines()) == 4
+
+        empty_file = tmp_path / "empty.json"
+        reporter.export_to_json(iter([]), str(empty_file))
+        assert json.loads(empty_file.read_text())["entries"] == []
+
+    def test_provider_report_from_ledger(self, ledger_path):
+        """cost-report's per-provider breakdown is grouped by the ledger."""
+        report = generate_cost_report("my_workflows", ledger_path=ledger_path)
+
+        assert report["total_cost_usd"] == pytest.approx(0.17)
+        assert report["by_provider"]["openai"]["run_count"] == 3
+        assert report["by_provider"]["anthropic"]["models"]["claude-3-opus"]["total_tokens"] == 1500
+        assert generate_cost_report("other", ledger_path=ledger_path)["by_provider"] == {}
+
+
 class TestDateRangeFilter:
     """Tests for date range filter helper."""
 
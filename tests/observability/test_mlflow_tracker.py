@@ -354,6 +354,59 @@ class TestMLFlowTrackerLogSummary:
         mlflow_mock.log_dict.assert_called_once_with(cost_summary, "cost_summary.json")
 
 
+class TestMLFlowTrackerSummarySink:
+    """Test submit_workflow_summary() asynchronous sink."""
+
+    cost_summary = {
+        "total_cost_usd": 0.0023,
+        "total_tokens": {"prompt_tokens": 100, "completion_tokens": 200, "total_tokens": 300},
+        "node_breakdown": {"node1": {}},
+        "by_provider": {"openai": {"total_cost_usd": 0.0023, "total_tokens": 300, "calls": 1}},
+    }
+
+    def test_submit_when_disabled(self, minimal_workflow_config):
+        """Test that nothing is queued when tracking is disabled."""
+        tracker = MLFlowTracker(None, minimal_workflow_config)
+
+        assert tracker.submit_workflow_summary(self.cost_summary) is None
+
+    def test_submit_when_no_active_run(self, mlflow_config, minimal_workflow_config, mlflow_mock):
+        """Test that nothing is queued without an active run."""
+        mlflow_mock.active_run.return_value = None
+        tracker = MLFlowTracker(mlflow_config, minimal_workflow_config)
+
+        assert tracker.submit_workflow_summary(self.cost_summary) is None
+
+    def test_submit_logs_in_background(self, mlflow_config, minimal_workflow_config, mlflow_mock):
+        """Test that metrics/artifacts are written to the captured run by the sink."""
+        mlflow_mock.active_run.return_value = MagicMock(info=MagicMock(run_id="run_42"))
+        tracker = MLFlowTracker(mlflow_config, minimal_workflow_config)
+
+        with patch("mlflow.tracking.MlflowClient") as client_class:
+            future = tracker.submit_workflow_summary(self.cost_summary)
+            future.result(timeout=5)
+
+        client = client_class.return_value
+        run_id = client.log_batch.call_args.args[0]
+        metrics = {m.key: m.value for m in client.log_batch.call_args.kwargs["metrics"]}
+        assert run_id == "run_42"
+        assert metrics["total_tokens"] == 300
+        assert metrics["provider_openai_calls"] == 1
+        client.log_dict.assert_any_call("run_42", self.cost_summary, "cost_summary.json")
+        # The calling thread never logs
+        mlflow_mock.log_metrics.assert_not_called()
+
+    def test_submit_sync_when_async_logging_disabled(
+        self, minimal_workflow_config, mlflow_mock
+    ):
+        """Test that async_logging=False logs on the calling thread."""
+        config = ObservabilityMLFlowConfig(enabled=True, async_logging=False)
+        tracker = MLFlowTracker(config, minimal_workflow_config)
+
+        assert tracker.submit_workflow_summary(self.cost_summary) is None
+        mlflow_mock.log_metrics.assert_called_once()
+
+
 class TestMLFlowTrackerArtifactLevels:
     """Test _should_log_artifacts() method."""
 
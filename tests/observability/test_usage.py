@@ -0,0 +1,89 @@
+"""Tests for in-process per-run usage accounting."""
+
+import threading
+
+import pytest
+
+from configurable_agents.observability.usage import UsageAccumulator
+
+
+@pytest.fixture
+def usage():
+    acc = UsageAccumulator("article_writer", "1.0")
+    acc.record("research", "gpt-4o", 100, 400, 0.005, 800.0)
+    acc.record("write", "anthropic/claude-3-opus", 200, 600, 0.02, 1200.0)
+    acc.record("research", "gpt-4o", 50, 100, 0.001, 300.0)
+    return acc
+
+
+class TestSummary:
+    """Tests for the run cost summary."""
+
+    def test_totals(self, usage):
+        summary = usage.summary()
+
+        assert summary["total_tokens"] == {
+            "prompt_tokens": 350,
+            "completion_tokens": 1100,
+            "total_tokens": 1450,
+        }
+        assert summary["total_cost_usd"] == pytest.approx(0.026)
+        assert summary["workflow_name"] == "article_writer"
+        assert summary["workflow_version"] == "1.0"
+
+    def test_repeated_node_calls_summed(self, usage):
+        research = usage.summary()["node_breakdown"]["research"]
+
+        assert research["calls"] == 2
+        assert research["tokens"]["total_tokens"] == 650
+        assert research["cost_usd"] == pytest.approx(0.006)
+        assert research["duration_ms"] == pytest.approx(1100.0)
+        assert (research["model"], research["provider"]) == ("gpt-4o", "openai")
+
+    def test_by_provider(self, usage):
+        by_provider = usage.summary()["by_provider"]
+
+        assert by_provider["openai"]["calls"] == 2
+        assert by_provider["anthropic"]["total_tokens"] == 800
+        assert by_provider["anthropic"]["total_cost_usd"] == 0.02
+
+    def test_empty(self):
+        summary = UsageAccumulator().summary()
+
+        assert summary["total_cost_usd"] == 0
+        assert summary["total_tokens"]["total_tokens"] == 0
+        assert summary["node_breakdown"] == {}
+        assert summary["workflow_version"] == "unversioned"
+
+
+class TestByModel:
+    """Tests for (provider, model) grouping used by the cost ledger."""
+
+    def test_groups(self, usage):
+        groups = usage.by_model()
+
+        assert set(groups) == {("openai", "gpt-4o"), ("anthropic", "anthropic/claude-3-opus")}
+        assert groups[("openai", "gpt-4o")] == {
+            "input_tokens": 150,
+            "output_tokens": 500,
+            "cost_usd": pytest.approx(0.006),
+            "calls": 2,
+        }
+
+
+def test_concurrent_records():
+    """Parallel branches of one run record without losing calls."""
+    usage = UsageAccumulator()
+
+    def worker(n):
+        for _ in range(500):
+            usage.record(f"node_{n}", "gpt-4o", 1, 1, 0.0, 1.0)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(usage.calls) == 4000
+    assert usage.summary()["total_tokens"]["total_tokens"] == 8000
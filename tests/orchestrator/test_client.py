@@ -211,6 +211,49 @@ class TestAgentRegistryOrchestratorClient:
             assert results[0]["agent_id"] == "agent-1"
             assert results[1]["agent_id"] == "agent-2"
 
+    @patch("configurable_agents.orchestrator.client.httpx.Client")
+    def test_query_by_capability_uses_server_query(self, mock_client_class: Mock) -> None:
+        """Test that capability queries are resolved by the registry."""
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = [{"agent_id": "agent-1"}]
+        mock_response.raise_for_status = Mock()
+
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        client = AgentRegistryOrchestratorClient("http://localhost:9000")
+        results = client.query_by_capability({"model": "gpt-*"})
+
+        assert results == [{"agent_id": "agent-1"}]
+        mock_client.post.assert_called_once()
+        assert mock_client.post.call_args.kwargs["json"] == {"filters": {"model": "gpt-*"}}
+        mock_client.get.assert_not_called()
+
+    @patch("configurable_agents.orchestrator.client.httpx.Client")
+    def test_query_by_capability_falls_back_for_old_registry(self, mock_client_class: Mock) -> None:
+        """Test client-side filtering when the registry has no query endpoint."""
+        mock_response = Mock()
+        mock_response.status_code = 404
+
+        mock_client = Mock()
+        mock_client.post.return_value = mock_response
+        mock_client_class.return_value = mock_client
+
+        client = AgentRegistryOrchestratorClient("http://localhost:9000")
+        agents = [
+            {"agent_id": "agent-1", "metadata": '{"model": "gpt-4"}'},
+            {"agent_id": "agent-2", "metadata": '{"model": "claude"}'},
+        ]
+
+        with patch.object(client, "list_agents", return_value=agents):
+            results = client.query_by_capability({"model": "gpt-*"})
+            client.query_by_capability({"model": "gpt-*"})
+
+        assert [a["agent_id"] for a in results] == ["agent-1"]
+        mock_client.post.assert_called_once()  # Not retried once unsupported
+
     def test_query_by_capability_with_nested_keys(self) -> None:
         """Test querying agents with nested key filters."""
         client = AgentRegistryOrchestratorClient("http://localhost:9000")
@@ -0,0 +1,196 @@
+"""Tests for the registry server's in-memory capability index.
+
+Covers CapabilityIndex itself and the POST /agents/query handler it serves
+(called directly rather than over HTTP).
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from configurable_agents.config.schema import StorageConfig
+from configurable_agents.registry import AgentRegistryServer
+from configurable_agents.registry.index import CapabilityIndex
+from configurable_agents.registry.models import AgentQueryRequest, AgentRegistrationRequest
+from configurable_agents.storage.capabilities import metadata_matches
+from configurable_agents.storage.factory import create_storage_backend
+from configurable_agents.storage.models import AgentRecord
+
+
+AGENTS = {
+    "a": {"model": "gpt-4o", "tags": ["vision", "llm"], "caps": {"llm": True, "n": 2}},
+    "b": {"model": "claude-3", "tags": "llm", "caps": {"llm": False, "n": 2.5}},
+    "c": {"model": "gpt-3.5", "tags": ["gpt-*"], "caps": ["llm"], "score": 1},
+}
+
+
+@pytest.fixture
+def index():
+    index = CapabilityIndex()
+    for agent_id, metadata in AGENTS.items():
+        index.add(agent_id, json.dumps(metadata))
+    return index
+
+
+@pytest.fixture
+def registry_repo(tmp_path):
+    config = StorageConfig(backend="sqlite", path=str(tmp_path / "registry.db"))
+    _, _, repo, *_ = create_storage_backend(config)
+    return repo
+
+
+@pytest.fixture
+def server(registry_repo, tmp_path):
+    return AgentRegistryServer(
+        registry_url=f"sqlite:///{tmp_path / 'server.db'}", repo=registry_repo
+    )
+
+
+class TestCapabilityIndex:
+    """Tests for CapabilityIndex."""
+
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            {"model": "gpt-*"},
+            {"model": "gpt-?o"},
+            {"model": "[c]laude*"},
+            {"tags": "llm"},
+            {"tags": "gpt-*"},
+            {"tags": ["vision", "nope"]},
+            {"caps.llm": True},
+            {"caps.n": 2.0},
+            {"caps": ["llm"]},
+            {"score": True},
+            {"caps.missing": None},
+            {"model": "gpt-*", "caps.llm": True},
+            {},
+        ],
+    )
+    def test_matches_python_semantics(self, index, filters) -> None:
+        expected = {
+            agent_id for agent_id, metadata in AGENTS.items() if metadata_matches(metadata, filters)
+        }
+
+        assert index.query(filters) == expected
+
+    def test_readd_replaces_entries(self, index) -> None:
+        index.add("a", '{"model": "mistral"}')
+
+        assert index.query({"model": "gpt-*"}) == {"c"}
+        assert index.query({"model": "mistral"}) == {"a"}
+
+    def test_remove(self, index) -> None:
+        index.remove("a")
+        index.remove("unknown")
+
+        assert "a" not in index
+        assert len(index) == 2
+        assert index.query({"tags": "vision"}) == set()
+
+    def test_invalid_or_missing_metadata_not_indexed(self) -> None:
+        index = CapabilityIndex()
+        index.add("bad", "not-json")
+        index.add("none", None)
+
+        assert len(index) == 0
+        assert index.query({}) == set()
+
+
+class TestQueryAgents:
+    """Tests for AgentRegistryServer.query_agents (POST /agents/query)."""
+
+    async def _register(self, server, agent_id: str, metadata: dict) -> None:
+        await server.register_agent(
+            AgentRegistrationRequest(
+                agent_id=agent_id,
+                agent_name=agent_id,
+                host="localhost",
+                port=8000,
+                metadata=json.dumps(metadata),
+            )
+        )
+
+    async def _query(self, server, filters: dict, include_dead: bool = False) -> list:
+        agents = await server.query_agents(
+            AgentQueryRequest(filters=filters, include_dead=include_dead)
+        )
+        return [a.agent_id for a in agents]
+
+    @pytest.mark.asyncio
+    async def test_query_follows_registrations_and_deletes(self, server) -> None:
+        await self._register(server, "gpt-agent", {"type": "llm", "model": "gpt-4o"})
+        await self._register(server, "claude-agent", {"type": "llm", "model": "claude-3"})
+        await self._register(server, "tool-agent", {"type": "tool"})
+
+        assert set(await self._query(server, {"type": "llm"})) == {"gpt-agent", "claude-agent"}
+
+        # Re-registration with new metadata re-indexes the agent
+        await self._register(server, "claude-agent", {"type": "tool"})
+        await server.delete_agent("gpt-agent")
+
+        assert await self._query(server, {"type": "llm"}) == []
+        assert set(await self._query(server, {"type": "tool"})) == {"claude-agent", "tool-agent"}
+
+    @pytest.mark.asyncio
+    async def test_index_loaded_from_repository(self, server, registry_repo) -> None:
+        registry_repo.add(
+            AgentRecord(
+                agent_id="live", agent_name="live", host="localhost", port=8000,
+                agent_metadata='{"model": "gpt-4o"}',
+            )
+        )
+        registry_repo.add(
+            AgentRecord(
+                agent_id="dead", agent_name="dead", host="localhost", port=8001,
+                agent_metadata='{"model": "gpt-4"}',
+                last_heartbeat=datetime.utcnow() - timedelta(hours=1),
+            )
+        )
+
+        assert await self._query(server, {"model": "gpt-*"}) == ["live"]
+        assert set(await self._query(server, {"model": "gpt-*"}, include_dead=True)) == {
+            "live",
+            "dead",
+        }
+
+    @pytest.mark.asyncio
+    async def test_agents_deleted_elsewhere_are_dropped(self, server, registry_repo) -> None:
+        await self._register(server, "a", {"type": "llm"})
+        registry_repo.delete("a")
+
+        assert await self._query(server, {"type": "llm"}) == []
+        assert "a" not in server.capability_index
+
+
+def test_in_memory_index_matches_blob_scan() -> None:
+    """Inverted-index lookups return exactly the agents a blob scan would."""
+    models = ["gpt-4o", "gpt-4o-mini", "claude-3", "gemini-pro", "llama-3"]
+    blobs = {
+        f"agent-{i:04d}": json.dumps(
+            {
+                "type": "llm" if i % 2 else "tool",
+                "model": models[i % len(models)],
+                "capabilities": {"vision": i % 10 == 0, "region": f"r{i % 20}"},
+                "tags": [f"team-{i % 50}", "prod"],
+            }
+        )
+        for i in range(1_000)
+    }
+    index = CapabilityIndex()
+    for agent_id, blob in blobs.items():
+        index.add(agent_id, blob)
+
+    for filters in (
+        {"model": "gpt-4o*", "capabilities.vision": True, "tags": "team-0"},
+        {"type": "llm", "capabilities.region": "r3"},
+        {"tags": "prod", "model": "claude-3"},
+    ):
+        scanned = {
+            agent_id
+            for agent_id, blob in blobs.items()
+            if metadata_matches(json.loads(blob), filters)
+        }
+        assert index.query(filters) == scanned, filters
+        assert scanned
@@ -0,0 +1,223 @@
+"""Tests for heartbeat coalescing in the agent registry server.
+
+Covers LivenessTable and the server's heartbeat handlers (called directly
+rather than over HTTP), including batched writes to the repository.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+
+from configurable_agents.config.schema import StorageConfig
+from configurable_agents.registry import AgentRegistryServer
+from configurable_agents.registry.liveness import LivenessTable
+from configurable_agents.registry.models import AgentRegistrationRequest, BatchHeartbeatRequest
+from configurable_agents.storage.factory import create_storage_backend
+from configurable_agents.storage.models import AgentRecord
+
+
+@pytest.fixture
+def registry_repo(tmp_path):
+    config = StorageConfig(backend="sqlite", path=str(tmp_path / "registry.db"))
+    _, _, repo, *_ = create_storage_backend(config)
+    return repo
+
+
+@pytest.fixture
+def server(registry_repo, tmp_path):
+    return AgentRegistryServer(
+        registry_url=f"sqlite:///{tmp_path / 'server.db'}", repo=registry_repo
+    )
+
+
+def _record(agent_id: str, age_seconds: float = 0, ttl_seconds: int = 60) -> AgentRecord:
+    return AgentRecord(
+        agent_id=agent_id,
+        agent_name=agent_id,
+        host="localhost",
+        port=8000,
+        ttl_seconds=ttl_seconds,
+        last_heartbeat=datetime.utcnow() - timedelta(seconds=age_seconds),
+    )
+
+
+class TestLivenessTable:
+    """Tests for LivenessTable."""
+
+    def test_beat_only_tracked_agents(self) -> None:
+        table = LivenessTable()
+        table.track("a", datetime.utcnow() - timedelta(seconds=120), 60)
+
+        assert table.is_alive("a") is False
+        assert table.beat("a") is not None
+        assert table.is_alive("a") is True
+        assert table.beat("unknown") is None
+        assert table.is_alive("unknown") is None
+
+    def test_drain_coalesces_repeated_beats(self) -> None:
+        table = LivenessTable()
+        table.track("a", datetime.utcnow(), 60)
+        first = datetime.utcnow()
+        table.beat("a", first)
+        table.beat("a", first + timedelta(seconds=1))
+
+        assert table.drain() == {"a": first + timedelta(seconds=1)}
+        assert table.drain() == {}
+
+    def test_restore_keeps_newer_beats(self) -> None:
+        table = LivenessTable()
+        table.track("a", datetime.utcnow(), 60)
+        old = table.beat("a")
+        pending = table.drain()
+        newer = table.beat("a", old + timedelta(seconds=5))
+
+        table.restore(pending)
+
+        assert table.drain() == {"a": newer}
+
+    def test_expired_and_alive_ids(self) -> None:
+        table = LivenessTable()
+        table.load([_record("alive"), _record("dead", age_seconds=120)])
+
+        assert table.alive_ids() == {"alive"}
+        assert table.expired_ids() == ["dead"]
+
+    def test_load_keeps_pending_beats(self) -> None:
+        table = LivenessTable()
+        table.load([_record("a", age_seconds=120)])
+        beat = table.beat("a")
+
+        table.load([_record("a", age_seconds=120), _record("b")])
+
+        assert table.last_heartbeat("a") == beat
+        assert table.pending_count == 1
+
+
+class TestServerHeartbeats:
+    """Tests for the server's coalesced heartbeat handling."""
+
+    async def _register(self, server, agent_id: str) -> None:
+        await server.register_agent(
+            AgentRegistrationRequest(
+                agent_id=agent_id, agent_name=agent_id, host="localhost", port=8000
+            )
+        )
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_written_on_flush(self, server, registry_repo) -> None:
+        await self._register(server, "a")
+        stored = registry_repo.get("a").last_heartbeat
+
+        response = await server.heartbeat("a")
+
+        assert registry_repo.get("a").last_heartbeat == stored
+        assert server.flush_heartbeats() == 1
+        assert registry_repo.get("a").last_heartbeat == response.last_heartbeat
+        assert server.flush_heartbeats() == 0
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_unknown_agent_404(self, server) -> None:
+        with pytest.raises(HTTPException) as exc_info:
+            await server.heartbeat("unknown")
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_batch_heartbeat(self, server, registry_repo) -> None:
+        await self._register(server, "a")
+        await self._register(server, "b")
+        # Registered behind the server's back: picked up from the repository
+        registry_repo.add(_record("c", age_seconds=120))
+
+        response = await server.batch_heartbeat(
+            BatchHeartbeatRequest(agent_ids=["a", "b", "c", "missing"])
+        )
+
+        assert sorted(response.renewed) == ["a", "b", "c"]
+        assert response.unknown == ["missing"]
+        assert server.flush_heartbeats() == 3
+        assert registry_repo.get("c").is_alive()
+
+    @pytest.mark.asyncio
+    async def test_listing_and_health_use_memory(self, server, registry_repo) -> None:
+        registry_repo.add(_record("alive"))
+        registry_repo.add(_record("stale", age_seconds=120))
+
+        await server.heartbeat("stale")  # Renewed in memory only
+        alive = await server.list_agents(include_dead=False)
+        health = await server.health()
+
+        assert sorted(a.agent_id for a in alive) == ["alive", "stale"]
+        assert (health.registered_agents, health.active_agents) == (2, 2)
+        assert not registry_repo.get("stale").is_alive()
+
+    @pytest.mark.asyncio
+    async def test_retention_purges_only_expired_in_memory(self, server, registry_repo) -> None:
+        registry_repo.add(_record("expired", age_seconds=120))
+        registry_repo.add(_record("renewed", age_seconds=120))
+        await server.heartbeat("renewed")  # Pending, written before the sweep
+
+        assert server.retention.run_once() == {"agents": 1, "orchestrators": 0}
+
+        health = await server.health()
+        assert registry_repo.get("expired") is None
+        assert registry_repo.get("renewed").is_alive()
+        assert health.registered_agents == 1
+        assert health.retention["agents"]["rows_purged"] == 1
+
+    @pytest.mark.asyncio
+    async def test_write_through_when_interval_zero(self, registry_repo, tmp_path) -> None:
+        server = AgentRegistryServer(
+            registry_url=f"sqlite:///{tmp_path / 'server.db'}",
+            repo=registry_repo,
+            heartbeat_flush_interval=0,
+        )
+        registry_repo.add(_record("a", age_seconds=120))
+
+        await server.heartbeat("a")
+
+        assert server.liveness.pending_count == 0
+        assert registry_repo.get("a").is_alive()
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_heartbeats_pending(self, server, registry_repo, monkeypatch) -> None:
+        await self._register(server, "a")
+        await server.heartbeat("a")
+
+        def fail(heartbeats):
+            raise RuntimeError("database is locked")
+
+        monkeypatch.setattr(registry_repo, "update_heartbeats", fail)
+        with pytest.raises(RuntimeError):
+            server.flush_heartbeats()
+
+        assert server.liveness.pending_count == 1
+
+
+@pytest.mark.asyncio
+async def test_heartbeats_coalesced_into_one_flush(server, registry_repo, monkeypatch) -> None:
+    """500 heartbeats are written by a single batched flush, not one commit each."""
+    agent_ids = [f"agent-{i:04d}" for i in range(500)]
+    for agent_id in agent_ids:
+        registry_repo.add(_record(agent_id, age_seconds=120))
+    batches = []
+    update_heartbeats = registry_repo.update_heartbeats
+
+    def record_batch(heartbeats):
+        batches.append(len(heartbeats))
+        return update_heartbeats(heartbeats)
+
+    def unexpected_write(agent_id):
+        raise AssertionError("heartbeat written individually")
+
+    monkeypatch.setattr(registry_repo, "update_heartbeats", record_batch)
+    monkeypatch.setattr(registry_repo, "update_heartbeat", unexpected_write)
+
+    for agent_id in agent_ids:
+        await server.heartbeat(agent_id)
+    assert batches == []
+    server.flush_heartbeats()
+
+    assert batches == [500]
+    assert all(agent.is_alive() for agent in registry_repo.get_many(agent_ids))
@@ -27,7 +27,7 @@ def test_db_url(tmp_path):
 def test_repo(test_db_url):
     """Create a test repository."""
     config = StorageConfig(backend="sqlite", path=test_db_url.replace("sqlite:///", ""))
-    _, _, repo, _, _ = create_storage_backend(config)
+    _, _, repo, *_ = create_storage_backend(config)
     return repo
 
 
@@ -230,7 +230,8 @@ class TestHeartbeatEndpoint:
                 assert data["status"] == "ok"
                 assert "last_heartbeat" in data
 
-                # Verify timestamp was updated
+                # Verify timestamp was updated once pending heartbeats are written
+                server.flush_heartbeats()
                 agent = test_repo.get("test-agent-heartbeat")
                 assert agent.last_heartbeat > initial_heartbeat
         finally:
@@ -298,6 +299,10 @@ class TestListAgentsEndpoint:
                 with Session(engine) as session:
                     session.merge(dead_agent)
                     session.commit()
+                # The server reads liveness from memory; mirror the edit there
+                server.liveness.track(
+                    dead_agent.agent_id, dead_agent.last_heartbeat, dead_agent.ttl_seconds
+                )
 
                 # List agents (should filter dead)
                 response = await client.get("/agents")
@@ -350,6 +355,10 @@ class TestListAgentsEndpoint:
                 with Session(engine) as session:
                     session.merge(dead_agent)
                     session.commit()
+                # The server reads liveness from memory; mirror the edit there
+                server.liveness.track(
+                    dead_agent.agent_id, dead_agent.last_heartbeat, dead_agent.ttl_seconds
+                )
 
                 # List all agents
                 response = await client.get("/agents?include_dead=true")
@@ -383,6 +392,44 @@ class TestListAgentsEndpoint:
             await app.router.shutdown()
 
 
+    @pytest.mark.asyncio
+    async def test_list_agents_sees_other_processes(self, test_repo, tmp_path):
+        """Agents registered through another process appear once state refreshes."""
+        from httpx import AsyncClient, ASGITransport
+
+        server = AgentRegistryServer(
+            registry_url=f"sqlite:///{tmp_path}/test_server.db",
+            repo=test_repo,
+            state_refresh_interval=0,
+        )
+        app = server.create_app()
+        await app.router.startup()
+
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+                assert (await client.get("/agents")).json() == []
+
+                # Written by another replica, never seen by this server
+                test_repo.add(
+                    AgentRecord(
+                        agent_id="remote-agent",
+                        agent_name="Remote Agent",
+                        host="localhost",
+                        port=9000,
+                        ttl_seconds=60,
+                        last_heartbeat=datetime.utcnow(),
+                    )
+                )
+
+                agents = (await client.get("/agents")).json()
+                health = (await client.get("/health")).json()
+
+                assert [a["agent_id"] for a in agents] == ["remote-agent"]
+                assert agents[0]["is_alive"] is True
+                assert health["active_agents"] == 1
+        finally:
+            await app.router.shutdown()
+
 class TestGetAgentEndpoint:
     """Test GET /agents/{agent_id} endpoint."""
 
@@ -581,6 +628,10 @@ class TestHealthEndpoint:
                 with Session(engine) as session:
                     session.merge(dead_agent)
                     session.commit()
+                # The server reads liveness from memory; mirror the edit there
+                server.liveness.track(
+                    dead_agent.agent_id, dead_agent.last_heartbeat, dead_agent.ttl_seconds
+                )
 
                 response = await client.get("/health")
 
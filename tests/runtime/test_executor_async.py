@@ -0,0 +1,175 @@
+"""Tests for the native async workflow executor (graph.ainvoke)."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from configurable_agents.config import (
+    EdgeConfig,
+    FlowMetadata,
+    NodeConfig,
+    OutputSchema,
+    StateFieldConfig,
+    StateSchema,
+    WorkflowConfig,
+)
+from configurable_agents.llm import LLMUsageMetadata
+from configurable_agents.runtime import (
+    WorkflowExecutionError,
+    run_workflow_async,
+    run_workflow_from_config_async,
+)
+
+
+def make_config() -> WorkflowConfig:
+    """Create a minimal single-node config."""
+    return WorkflowConfig(
+        schema_version="1.0",
+        flow=FlowMetadata(name="async_flow"),
+        state=StateSchema(
+            fields={
+                "input": StateFieldConfig(type="str", required=True),
+                "output": StateFieldConfig(type="str", default=""),
+            }
+        ),
+        nodes=[
+            NodeConfig(
+                id="process",
+                prompt="Process {state.input}",
+                outputs=["output"],
+                output_schema=OutputSchema(type="str"),
+            )
+        ],
+        edges=[
+            EdgeConfig(from_="START", to="process"),
+            EdgeConfig(from_="process", to="END"),
+        ],
+    )
+
+
+class SimpleOutput(BaseModel):
+    result: str
+
+
+@pytest.fixture
+def no_storage():
+    """Run without persistence (storage failure degrades gracefully)."""
+    with patch(
+        "configurable_agents.runtime.executor.get_storage_backend",
+        side_effect=RuntimeError("storage disabled for test"),
+    ):
+        yield
+
+
+@pytest.mark.asyncio
+async def test_async_run_awaits_ainvoke(no_storage):
+    mock_graph = Mock()
+    mock_graph.ainvoke = AsyncMock(return_value={"input": "x", "output": "y"})
+
+    with patch("configurable_agents.runtime.executor.build_graph", return_value=mock_graph):
+        result = await run_workflow_from_config_async(make_config(), {"input": "x"})
+
+    assert result == {"input": "x", "output": "y"}
+    mock_graph.invoke.assert_not_called()
+    tracker = mock_graph.ainvoke.await_args.kwargs["config"]["configurable"]["tracker"]
+    assert tracker is not None
+
+
+@pytest.mark.asyncio
+async def test_async_run_failure_wrapped(no_storage):
+    mock_graph = Mock()
+    mock_graph.ainvoke = AsyncMock(side_effect=RuntimeError("node exploded"))
+
+    with patch("configurable_agents.runtime.executor.build_graph", return_value=mock_graph):
+        with pytest.raises(WorkflowExecutionError, match="node exploded"):
+            await run_workflow_from_config_async(make_config(), {"input": "x"})
+
+
+@pytest.mark.asyncio
+async def test_async_run_bookkeeping_off_event_loop():
+    """Storage setup and the checkpoint barrier never block the loop thread."""
+    threads = {}
+
+    def no_backend(config):
+        threads["prepare"] = threading.get_ident()
+        raise RuntimeError("storage disabled for test")
+
+    def record_barrier(repo, run_id):
+        threads.setdefault("complete", []).append(threading.get_ident())
+
+    mock_graph = Mock()
+    mock_graph.ainvoke = AsyncMock(side_effect=[{"output": "y"}, RuntimeError("boom")])
+
+    with patch("configurable_agents.runtime.executor.build_graph", return_value=mock_graph), \
+            patch("configurable_agents.runtime.executor.get_storage_backend", side_effect=no_backend), \
+            patch("configurable_agents.runtime.executor._complete_checkpoints", side_effect=record_barrier):
+        await run_workflow_from_config_async(make_config(), {"input": "x"}, use_cache=False)
+        with pytest.raises(WorkflowExecutionError):
+            await run_workflow_from_config_async(make_config(), {"input": "x"}, use_cache=False)
+
+    loop_thread = threading.get_ident()
+    assert threads["prepare"] != loop_thread
+    assert len(threads["complete"]) == 2
+    assert loop_thread not in threads["complete"]
+
+
+@pytest.mark.asyncio
+async def test_run_workflow_async_uses_native_path(tmp_path):
+    config_path = tmp_path / "flow.yaml"
+    config_path.write_text(
+        """
+schema_version: "1.0"
+flow:
+  name: file_flow
+state:
+  fields:
+    input: {type: str, required: true}
+    output: {type: str, default: ""}
+nodes:
+  - id: process
+    prompt: "Process {state.input}"
+    outputs: [output]
+    output_schema: {type: str}
+edges:
+  - {from: START, to: process}
+  - {from: process, to: END}
+"""
+    )
+
+    with patch(
+        "configurable_agents.runtime.executor.run_workflow_from_config_async",
+        new_callable=AsyncMock,
+        return_value={"output": "done"},
+    ) as mock_run:
+        result = await run_workflow_async(str(config_path), {"input": "x"})
+
+    assert result == {"output": "done"}
+    assert mock_run.await_args.args[0].flow.name == "file_flow"
+
+
+@pytest.mark.asyncio
+@patch("configurable_agents.core.node_executor.call_llm_structured_async")
+@patch("configurable_agents.core.node_executor.create_llm")
+async def test_concurrent_runs_share_one_event_loop(mock_create_llm, mock_async_call, no_storage):
+    """50 runs whose LLM call waits 100ms complete concurrently on one loop."""
+    mock_create_llm.return_value = MagicMock()
+
+    async def slow_llm(prompt, **kwargs):
+        await asyncio.sleep(0.1)
+        return SimpleOutput(result=prompt.upper()), LLMUsageMetadata(1, 1)
+
+    mock_async_call.side_effect = slow_llm
+    config = make_config()
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_workflow_from_config_async(config, {"input": f"run {i}"}) for i in range(50))
+    )
+    elapsed = time.perf_counter() - start
+
+    assert [r["output"] for r in results] == [f"PROCESS RUN {i}" for i in range(50)]
+    assert elapsed < 2.5  # sequential would take >= 5s
@@ -123,7 +123,7 @@ def test_run_persisted_before_execution(
     from configurable_agents.storage import create_storage_backend
     from configurable_agents.storage.models import WorkflowRunRecord
 
-    workflow_run_repo, _, _, _, _ = create_storage_backend(storage_config)
+    workflow_run_repo, *_ = create_storage_backend(storage_config)
     runs = workflow_run_repo.list_by_workflow("test_flow")
 
     assert len(runs) == 1
@@ -173,7 +173,7 @@ def test_run_updated_on_completion(
     # Verify run record has completion metrics
     from configurable_agents.storage import create_storage_backend
 
-    workflow_run_repo, _, _, _, _ = create_storage_backend(storage_config)
+    workflow_run_repo, *_ = create_storage_backend(storage_config)
     runs = workflow_run_repo.list_by_workflow("test_flow")
 
     assert len(runs) == 1
@@ -226,7 +226,7 @@ def test_run_updated_on_failure(
     # Verify run record has failed status
     from configurable_agents.storage import create_storage_backend
 
-    workflow_run_repo, _, _, _, _ = create_storage_backend(storage_config)
+    workflow_run_repo, *_ = create_storage_backend(storage_config)
     runs = workflow_run_repo.list_by_workflow("test_flow")
 
     assert len(runs) == 1
@@ -242,7 +242,7 @@ def test_run_updated_on_failure(
 @patch("configurable_agents.runtime.executor.validate_runtime_support")
 @patch("configurable_agents.runtime.executor.build_state_model")
 @patch("configurable_agents.runtime.executor.build_graph")
-@patch("configurable_agents.runtime.executor.create_storage_backend")
+@patch("configurable_agents.runtime.executor.get_storage_backend")
 def test_storage_failure_does_not_block_execution(
     mock_create_storage, mock_build_graph, mock_state_model, mock_runtime, mock_validate, minimal_config
 ):
@@ -307,3 +307,103 @@ def test_no_storage_config_runs_without_persistence(
 
     # Verify workflow completed
     assert result == {"input": "test", "output": "result"}
+
+
+@patch("configurable_agents.runtime.executor.validate_config")
+@patch("configurable_agents.runtime.executor.validate_runtime_support")
+@patch("configurable_agents.runtime.executor.build_state_model")
+@patch("configurable_agents.runtime.executor.build_graph")
+def test_runs_appended_to_cost_ledger(
+    mock_build_graph, mock_state_model, mock_runtime, mock_validate, minimal_config, tmp_path
+):
+    """Test that completed and failed runs are both appended to the cost ledger."""
+    mock_validate.return_value = None
+    mock_runtime.return_value = None
+
+    class MockState(BaseModel):
+        input: str
+        output: str = ""
+
+    mock_state_model.return_value = MockState
+
+    mock_graph = Mock()
+    mock_graph.invoke.side_effect = [
+        {"input": "test", "output": "result"},
+        RuntimeError("Node execution failed"),
+    ]
+    mock_build_graph.return_value = mock_graph
+
+    db_path = tmp_path / "test_ledger.db"
+    storage_config = StorageConfig(backend="sqlite", path=str(db_path))
+    config_with_storage = make_minimal_config(
+        config=GlobalConfig(storage=storage_config)
+    )
+
+    from configurable_agents.runtime import WorkflowExecutionError
+
+    run_workflow_from_config(config_with_storage, {"input": "test"}, use_cache=False)
+    with pytest.raises(WorkflowExecutionError):
+        run_workflow_from_config(config_with_storage, {"input": "test"}, use_cache=False)
+
+    from configurable_agents.storage import create_storage_backend
+
+    workflow_run_repo, *_ = create_storage_backend(storage_config)
+    entries = list(workflow_run_repo.cost_ledger.iter_runs())
+
+    assert sorted(entry.status for entry in entries) == ["failure", "success"]
+    assert {entry.workflow_name for entry in entries} == {"test_flow"}
+    assert {entry.run_id for entry in entries} == {
+        run.id for run in workflow_run_repo.list_by_workflow("test_flow")
+    }
+    assert all(entry.duration_seconds > 0 for entry in entries)
+
+
+@patch("configurable_agents.runtime.executor.validate_config")
+@patch("configurable_agents.runtime.executor.validate_runtime_support")
+@patch("configurable_agents.runtime.executor.build_state_model")
+@patch("configurable_agents.runtime.executor.build_graph")
+def test_run_costs_come_from_usage_accumulator(
+    mock_build_graph, mock_state_model, mock_runtime, mock_validate, minimal_config, tmp_path
+):
+    """Test that run totals and ledger rows come from usage recorded by nodes, not MLFlow."""
+    mock_validate.return_value = None
+    mock_runtime.return_value = None
+
+    class MockState(BaseModel):
+        input: str
+        output: str = ""
+
+    mock_state_model.return_value = MockState
+
+    def invoke(state, config):
+        # What node executors do for each LLM call
+        usage = config["configurable"]["tracker"].usage
+        usage.record("process", "gpt-4o", 100, 50, 0.002, 10.0)
+        usage.record("process", "claude-3-opus", 300, 100, 0.01, 20.0)
+        return {"input": "test", "output": "result"}
+
+    mock_graph = Mock()
+    mock_graph.invoke.side_effect = invoke
+    mock_build_graph.return_value = mock_graph
+
+    db_path = tmp_path / "test_usage.db"
+    storage_config = StorageConfig(backend="sqlite", path=str(db_path))
+    config_with_storage = make_minimal_config(
+        config=GlobalConfig(storage=storage_config)
+    )
+
+    with patch(
+        "configurable_agents.observability.mlflow_tracker.MLFlowTracker.get_workflow_cost_summary"
+    ) as mock_trace_summary:
+        run_workflow_from_config(config_with_storage, {"input": "test"}, use_cache=False)
+    mock_trace_summary.assert_not_called()
+
+    from configurable_agents.storage import create_storage_backend
+
+    workflow_run_repo, *_ = create_storage_backend(storage_config)
+    run = workflow_run_repo.list_by_workflow("test_flow")[0]
+    assert run.total_tokens == 550
+    assert run.total_cost_usd == pytest.approx(0.012)
+
+    summary = workflow_run_repo.cost_ledger.summarize()
+    assert summary["by_provider"] == pytest.approx({"openai": 0.002, "anthropic": 0.01})
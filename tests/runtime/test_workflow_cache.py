@@ -0,0 +1,223 @@
+"""Tests for the compiled-workflow cache."""
+
+from unittest.mock import Mock, patch
+
+import pytest
+from pydantic import BaseModel
+
+from configurable_agents.config import (
+    EdgeConfig,
+    FlowMetadata,
+    NodeConfig,
+    OutputSchema,
+    OutputSchemaField,
+    StateFieldConfig,
+    StateSchema,
+    WorkflowConfig,
+)
+from configurable_agents.runtime import (
+    CompiledWorkflow,
+    ConfigValidationError,
+    WorkflowCache,
+    compute_config_hash,
+    get_workflow_cache,
+    run_workflow_from_config,
+)
+from configurable_agents.runtime.executor import _get_compiled_workflow
+
+
+def make_config(name: str = "cached_flow", prompt: str = "Process {state.input}") -> WorkflowConfig:
+    """Create a minimal valid config."""
+    return WorkflowConfig(
+        schema_version="1.0",
+        flow=FlowMetadata(name=name),
+        state=StateSchema(
+            fields={
+                "input": StateFieldConfig(type="str", required=True),
+                "output": StateFieldConfig(type="str", default=""),
+            }
+        ),
+        nodes=[
+            NodeConfig(
+                id="process",
+                prompt=prompt,
+                outputs=["output"],
+                output_schema=OutputSchema(
+                    type="object",
+                    fields=[OutputSchemaField(name="output", type="str")],
+                ),
+            )
+        ],
+        edges=[
+            EdgeConfig(from_="START", to="process"),
+            EdgeConfig(from_="process", to="END"),
+        ],
+    )
+
+
+def make_compiled(key: str) -> CompiledWorkflow:
+    """Create a placeholder artifact."""
+    return CompiledWorkflow(config_hash=key, config=Mock(), state_model=BaseModel, graph=Mock())
+
+
+class MockState(BaseModel):
+    input: str
+    output: str = ""
+
+
+# ============================================
+# WorkflowCache
+# ============================================
+
+
+class TestWorkflowCache:
+    def test_get_miss_then_hit(self):
+        cache = WorkflowCache(max_entries=2)
+        assert cache.get("a") is None
+
+        compiled = make_compiled("a")
+        cache.put("a", compiled)
+
+        assert cache.get("a") is compiled
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        cache = WorkflowCache(max_entries=2)
+        cache.put("a", make_compiled("a"))
+        cache.put("b", make_compiled("b"))
+        cache.get("a")  # "b" becomes least recently used
+        cache.put("c", make_compiled("c"))
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+        assert cache.stats()["evictions"] == 1
+
+    def test_put_existing_key_returns_first_entry(self):
+        cache = WorkflowCache()
+        first = make_compiled("a")
+        cache.put("a", first)
+
+        assert cache.put("a", make_compiled("a")) is first
+
+    def test_invalidate_single_and_all(self):
+        cache = WorkflowCache()
+        cache.put("a", make_compiled("a"))
+        cache.put("b", make_compiled("b"))
+
+        assert cache.invalidate("a") == 1
+        assert cache.invalidate("missing") == 0
+        assert len(cache) == 1
+        assert cache.invalidate() == 1
+        assert len(cache) == 0
+
+    def test_invalid_max_entries(self):
+        with pytest.raises(ValueError):
+            WorkflowCache(max_entries=0)
+
+
+class TestComputeConfigHash:
+    def test_equal_content_equal_hash(self):
+        assert compute_config_hash(make_config()) == compute_config_hash(make_config())
+
+    def test_different_content_different_hash(self):
+        assert compute_config_hash(make_config()) != compute_config_hash(
+            make_config(prompt="Summarize {state.input}")
+        )
+
+
+# ============================================
+# Executor integration
+# ============================================
+
+
+def _patched_builders():
+    return (
+        patch("configurable_agents.runtime.executor.validate_config"),
+        patch("configurable_agents.runtime.executor.validate_runtime_support"),
+        patch("configurable_agents.runtime.executor.build_state_model", return_value=MockState),
+        patch("configurable_agents.runtime.executor.build_graph"),
+    )
+
+
+def test_repeat_runs_compile_once():
+    """Second run of identical config content skips validation and graph build."""
+    p_validate, p_runtime, p_state, p_graph = _patched_builders()
+    with p_validate as mock_validate, p_runtime, p_state as mock_state, p_graph as mock_build:
+        mock_graph = Mock()
+        mock_graph.invoke.return_value = {"input": "x", "output": "y"}
+        mock_build.return_value = mock_graph
+
+        run_workflow_from_config(make_config(), {"input": "x"})
+        run_workflow_from_config(make_config(), {"input": "x"})
+
+        assert mock_validate.call_count == 1
+        assert mock_state.call_count == 1
+        assert mock_build.call_count == 1
+        assert mock_graph.invoke.call_count == 2
+
+
+def test_tracker_passed_per_invocation():
+    """Compiled graph is built without a tracker; each run binds its own."""
+    p_validate, p_runtime, p_state, p_graph = _patched_builders()
+    with p_validate, p_runtime, p_state, p_graph as mock_build:
+        mock_graph = Mock()
+        mock_graph.invoke.return_value = {}
+        mock_build.return_value = mock_graph
+
+        run_workflow_from_config(make_config(), {"input": "x"})
+        run_workflow_from_config(make_config(), {"input": "x"})
+
+        assert "tracker" not in mock_build.call_args.kwargs
+        first, second = (c.kwargs["config"]["configurable"]["tracker"] for c in mock_graph.invoke.call_args_list)
+        assert first is not second
+
+
+def test_use_cache_false_always_compiles():
+    p_validate, p_runtime, p_state, p_graph = _patched_builders()
+    with p_validate, p_runtime, p_state, p_graph as mock_build:
+        mock_build.return_value.invoke.return_value = {}
+
+        run_workflow_from_config(make_config(), {"input": "x"}, use_cache=False)
+        run_workflow_from_config(make_config(), {"input": "x"}, use_cache=False)
+
+        assert mock_build.call_count == 2
+        assert len(get_workflow_cache()) == 0
+
+
+def test_validation_failure_not_cached():
+    from configurable_agents.config import ValidationError
+
+    with patch(
+        "configurable_agents.runtime.executor.validate_config",
+        side_effect=ValidationError("bad config"),
+    ):
+        with pytest.raises(ConfigValidationError):
+            run_workflow_from_config(make_config(), {"input": "x"})
+
+    assert len(get_workflow_cache()) == 0
+
+
+def test_real_compile_prebuilds_output_models():
+    compiled = _get_compiled_workflow(make_config())
+
+    assert set(compiled.output_models) == {"process"}
+    assert compiled.state_model(input="x").input == "x"
+    assert _get_compiled_workflow(make_config()) is compiled
+
+
+def test_real_compile_reused_across_runs():
+    """Cached lookups reuse one real compile; uncached lookups rebuild and bypass the cache."""
+    config = make_config()
+    before = get_workflow_cache().stats()
+
+    uncached = [_get_compiled_workflow(config, use_cache=False) for _ in range(3)]
+    cached = [_get_compiled_workflow(config) for _ in range(3)]
+
+    assert len({id(compiled) for compiled in uncached}) == 3
+    assert all(compiled is cached[0] for compiled in cached)
+    after = get_workflow_cache().stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 2
+    assert after["size"] == 1
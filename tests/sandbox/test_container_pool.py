@@ -0,0 +1,270 @@
+"""
+Tests for the warm Docker container pool.
+
+Runs against a local stand-in Docker client: "containers" are local Python
+subprocesses and attach sockets speak Docker's multiplexed stream format,
+so the pool's real protocol is exercised without a Docker daemon.
+
+Tests cover:
+- Job execution over stdin (outputs, stdout, errors)
+- Locked-down container settings
+- Container reuse and max-uses recycling
+- Timeout kill/replace and health checks
+- DockerSandboxExecutor pooled mode (incl. pool sharing across executors)
+"""
+
+import socket
+import struct
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from configurable_agents.sandbox import (
+    ContainerPool,
+    DockerSandboxExecutor,
+    get_preset,
+    shutdown_container_pools,
+)
+
+
+class StandInContainer:
+    """Local subprocess with the docker-py Container API used by the sandbox."""
+
+    def __init__(self, config):
+        self.config = config
+        command = [sys.executable] + list(config["command"][1:])
+        self.process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE if config.get("stdin_open") else subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+        )
+        self.status = "running"
+        self._logs = b""
+
+    def attach_socket(self, params):
+        ours, theirs = socket.socketpair()
+        threading.Thread(target=self._pump_stdin, args=(theirs,), daemon=True).start()
+        threading.Thread(target=self._pump_stdout, args=(theirs,), daemon=True).start()
+        return ours
+
+    def _pump_stdin(self, sock):
+        try:
+            while True:
+                data = sock.recv(65536)
+                if not data:
+                    break
+                self.process.stdin.write(data)
+                self.process.stdin.flush()
+        except (OSError, ValueError):
+            pass
+
+    def _pump_stdout(self, sock):
+        try:
+            for chunk in iter(lambda: self.process.stdout.read1(65536), b""):
+                sock.sendall(struct.pack(">BxxxI", 1, len(chunk)) + chunk)
+        except (OSError, ValueError):
+            pass
+
+    def reload(self):
+        if self.process.poll() is not None:
+            self.status = "exited"
+
+    def wait(self, timeout=None):
+        self._logs, _ = self.process.communicate(timeout=timeout)
+        return {"StatusCode": self.process.returncode}
+
+    def logs(self, stdout=True, stderr=True):
+        return self._logs
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+        self.status = "exited"
+
+    def stop(self, timeout=None):
+        self.kill()
+
+    def remove(self, force=False):
+        pass
+
+
+class StandInDockerClient:
+    """Minimal docker-py client stand-in (containers.run, images.get/pull)."""
+
+    def __init__(self):
+        self.started = []
+        client = self
+
+        class _Containers:
+            def run(self, **config):
+                container = StandInContainer(config)
+                client.started.append(container)
+                return container
+
+        class _Images:
+            def get(self, name):
+                return name
+
+            def pull(self, name):
+                return name
+
+        self.containers = _Containers()
+        self.images = _Images()
+
+    def ping(self):
+        return True
+
+
+@pytest.fixture
+def client():
+    stand_in = StandInDockerClient()
+    yield stand_in
+    for container in stand_in.started:
+        if container.process.poll() is None:
+            container.kill()
+
+
+@pytest.fixture
+def pool(client):
+    with ContainerPool(client, "python:3.11-slim", size=2, network_enabled=False) as warm:
+        yield warm
+
+
+class TestContainerPoolExecution:
+    """Tests for running jobs in warm containers."""
+
+    def test_result_stdout_and_inputs(self, pool):
+        result = pool.execute('print("sum")\nresult = sum(inputs["nums"])', {"nums": [1, 2, 3]})
+
+        assert result.success is True
+        assert result.output == "6"  # str(result), as for cold runs
+        assert result.stdout == "sum\n"
+
+    def test_runtime_error_reported(self, pool):
+        result = pool.execute("result = undefined_name", {})
+
+        assert result.success is False
+        assert "NameError" in result.error
+
+    def test_system_exit_does_not_kill_container(self, pool, client):
+        assert pool.execute("raise SystemExit(3)", {}).success is False
+        assert pool.execute("result = 1", {}).output == "1"
+        assert len(client.started) == 2
+
+    def test_non_json_inputs_rejected(self, pool):
+        result = pool.execute("result = 1", {"obj": object()})
+
+        assert result.success is False
+        assert "JSON" in result.error
+
+    def test_containers_are_locked_down(self, pool, client):
+        config = client.started[0].config
+
+        assert config["cap_drop"] == ["ALL"]
+        assert config["read_only"] is True
+        assert config["security_opt"] == ["no-new-privileges"]
+        assert config["network_mode"] == "none"
+        assert config["stdin_open"] is True
+
+    def test_containers_reused(self, pool, client):
+        for i in range(10):
+            assert pool.execute("result = inputs['i']", {"i": i}).output == str(i)
+
+        assert len(client.started) == 2
+        assert pool.stats()["executions"] == 10
+
+
+class TestContainerPoolLifecycle:
+    """Tests for recycling, timeouts and health checks."""
+
+    def test_recycled_after_max_uses(self, client):
+        with ContainerPool(client, "img", size=1, max_uses=3) as single:
+            for _ in range(7):
+                assert single.execute("result = 1", {}).success
+
+            assert len(client.started) == 3  # initial + 2 replacements
+            assert single.stats()["recycled"] == 2
+
+    def test_timeout_kills_and_replaces(self, client):
+        with ContainerPool(client, "img", size=1) as single:
+            result = single.execute("while True:\n    pass", {}, timeout=1)
+
+            assert result.success is False
+            assert "timeout" in result.error.lower()
+            assert client.started[0].process.poll() is not None
+            assert single.execute("result = 'ok'", {}).output == "ok"
+            assert single.stats()["timeouts"] == 1
+
+    def test_unhealthy_container_replaced_before_use(self, client):
+        with ContainerPool(client, "img", size=1, health_check_interval=0) as single:
+            client.started[0].process.kill()
+            client.started[0].process.wait()
+
+            assert single.execute("result = 2", {}).output == "2"
+            assert single.stats()["unhealthy"] == 1
+            assert len(client.started) == 2
+
+    def test_closed_pool_rejects_work(self, client):
+        closed = ContainerPool(client, "img", size=1)
+        closed.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            closed.execute("result = 1", {})
+        assert client.started[0].process.poll() is not None
+
+
+def test_executor_pooled_mode_uses_preset_pool_size(client):
+    executor = DockerSandboxExecutor(client=client, pooled=True)
+    resources = get_preset("low")
+
+    try:
+        for i in range(6):
+            result = executor.execute("result = inputs['i'] * 2", {"i": i}, resources=resources)
+            assert result.output == str(i * 2)
+
+        assert len(client.started) == resources["pool_size"]
+    finally:
+        shutdown_container_pools()
+
+
+def test_executors_without_client_share_pool(client, monkeypatch):
+    """Per-run executors reuse the first run's pool instead of starting another."""
+    import docker
+
+    from configurable_agents.sandbox import container_pool, docker_executor
+
+    # docker.from_env() returns a new client object on every call
+    monkeypatch.setattr(docker, "from_env", lambda: client if not client.started else StandInDockerClient())
+    monkeypatch.setattr(docker_executor, "_shared_client", None)
+    resources = get_preset("low")
+
+    try:
+        first = DockerSandboxExecutor(pooled=True).execute("result = 1", {}, resources=resources)
+        pool = next(iter(container_pool._pools.values()))
+        second = DockerSandboxExecutor(pooled=True).execute("result = 2", {}, resources=resources)
+
+        assert (first.output, second.output) == ("1", "2")
+        assert list(container_pool._pools.values()) == [pool]
+        assert len(client.started) == resources["pool_size"]
+    finally:
+        shutdown_container_pools()
+
+
+def test_pooled_executions_reuse_one_container(client):
+    """Cold executions start a container each; a warm pool reuses one."""
+    code = "result = sum(inputs['nums'])"
+    inputs = {"nums": list(range(100))}
+    runs = 5
+
+    cold = DockerSandboxExecutor(client=client)
+    for _ in range(runs):
+        assert cold.execute(code, inputs).output == "4950"
+    assert len(client.started) == runs
+
+    with ContainerPool(client, "img", size=1) as warm:
+        for _ in range(runs):
+            assert warm.execute(code, inputs).output == "4950"
+    assert len(client.started) == runs + 1
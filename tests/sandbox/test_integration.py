@@ -132,6 +132,37 @@ class TestPythonSandboxIntegration:
         new_state = execute_node(node_config, state)
         assert new_state.doubled == 42
 
+    def test_pooled_sandbox_uses_shared_worker_pool(self):
+        """pool=True runs code in the process-wide pool for the preset's memory."""
+        from pydantic import BaseModel
+
+        from configurable_agents.sandbox import get_sandbox_pool, shutdown_sandbox_pools
+
+        class TestState(BaseModel):
+            doubled: int = 0
+            value: int = 0
+
+        node_config = NodeConfig(
+            id="pooled_node",
+            prompt="Double the value",
+            output_schema=OutputSchema(type="int"),
+            outputs=["doubled"],
+            code="result = inputs['value'] * 2",
+            inputs={"value": "{value}"},
+            sandbox=SandboxConfig(mode="python", preset="high", pool=True),
+        )
+
+        try:
+            for value in range(3):
+                new_state = execute_node(node_config, TestState(value=value))
+                assert new_state.doubled == value * 2
+
+            pool = get_sandbox_pool(1024)
+            assert pool.memory_limit_mb == 1024
+            assert pool.stats()["executions"] == 3
+        finally:
+            shutdown_sandbox_pools()
+
     def test_sandbox_disabled_unsafe_execution(self):
         """Test that sandbox can be disabled (unsafe)."""
         from pydantic import BaseModel
@@ -289,6 +320,7 @@ class TestWorkflowConfigIntegration:
         assert sandbox.preset == "medium"
         assert sandbox.resources is None
         assert sandbox.timeout is None
+        assert sandbox.pool is False
 
 
 class TestEdgeCases:
@@ -0,0 +1,212 @@
+"""
+Tests for the warm sandbox worker pool.
+
+Tests cover:
+- Execution, stdout capture and error reporting in worker processes
+- Compiled-code reuse keyed by code hash
+- Timeout enforcement (runaway workers are killed and replaced)
+- Worker recycling and memory limits
+- Thread-safe stdout capture for the in-process executor
+"""
+
+import hashlib
+import sys
+import threading
+import time
+
+import pytest
+
+from configurable_agents.sandbox import (
+    PythonSandboxExecutor,
+    SandboxWorkerPool,
+    compile_sandboxed,
+    parse_memory_limit,
+)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    """One warm pool shared by the tests in this module."""
+    with SandboxWorkerPool(size=2, max_tasks_per_worker=1000) as shared_pool:
+        yield shared_pool
+
+
+class TestPoolExecution:
+    """Tests for running code in pooled workers."""
+
+    def test_result_and_stdout(self, pool):
+        result = pool.execute('print("hi", inputs["n"])\nresult = inputs["n"] * 2', {"n": 21})
+
+        assert result.success is True
+        assert result.output == 42
+        assert result.stdout == "hi 21\n"
+
+    def test_executor_delegates_to_pool(self, pool):
+        executor = PythonSandboxExecutor(pool=pool)
+        before = pool.stats()["executions"]
+
+        result = executor.execute('result = sum(inputs["nums"])', {"nums": [1, 2, 3]})
+
+        assert result.output == 6
+        assert pool.stats()["executions"] == before + 1
+
+    def test_runtime_error_reported(self, pool):
+        result = pool.execute("result = 1 / 0", {})
+
+        assert result.success is False
+        assert "ZeroDivisionError" in result.error
+
+    def test_unsafe_code_rejected(self, pool):
+        result = PythonSandboxExecutor(pool=pool).execute("result = eval('1')", {})
+
+        assert result.success is False
+        assert "Safety violation" in result.error
+
+    def test_import_blocked_in_worker(self, pool):
+        result = pool.execute("import os\nresult = os.getcwd()", {})
+
+        assert result.success is False
+
+    def test_unpicklable_input_does_not_break_worker(self, pool):
+        result = pool.execute("result = 1", {"lock": threading.Lock()})
+
+        assert result.success is False
+        assert "not transferable" in result.error
+        assert pool.execute("result = 2", {}).output == 2
+
+    def test_source_sent_once_per_worker(self):
+        with SandboxWorkerPool(size=1) as single:
+            single.execute("result = inputs['x']", {"x": 1})
+            worker = single._idle.queue[0]
+            sent = []
+            original_send = worker.conn.send
+            worker.conn.send = lambda msg: (sent.append(msg), original_send(msg))[1]
+
+            result = single.execute("result = inputs['x']", {"x": 2})
+
+        assert result.output == 2
+        assert sent[0][1] is None  # digest only, worker reuses its code object
+
+    def test_rejected_code_not_marked_cached(self):
+        with SandboxWorkerPool(size=1) as single:
+            for _ in range(2):
+                result = single.execute("result = ().__class__", {})
+
+                assert result.success is False
+                assert "Safety violation" in result.error
+            assert single.stats()["crashes"] == 0
+
+    def test_uncached_digest_reported_not_crashed(self):
+        code = "result = 3"
+        with SandboxWorkerPool(size=1) as single:
+            single._idle.queue[0].known.add(hashlib.sha256(code.encode("utf-8")).hexdigest())
+
+            result = single.execute(code, {})
+
+            assert result.success is False
+            assert "not cached" in result.error
+            assert single.stats()["crashes"] == 0
+            assert single.execute(code, {}).output == 3  # Source sent again
+
+
+class TestPoolLimits:
+    """Tests for timeouts, recycling and memory limits."""
+
+    def test_timeout_kills_runaway_worker(self):
+        with SandboxWorkerPool(size=1) as single:
+            start = time.time()
+            result = single.execute("while True:\n    pass", {}, timeout=1)
+            elapsed = time.time() - start
+
+            assert result.success is False
+            assert "timeout" in result.error.lower()
+            assert elapsed < 5
+            assert single.stats()["timeouts"] == 1
+            assert single.execute("result = 'alive'", {}).output == "alive"
+
+    def test_workers_recycled_after_max_tasks(self):
+        with SandboxWorkerPool(size=1, max_tasks_per_worker=2) as single:
+            for i in range(5):
+                assert single.execute("result = inputs['i']", {"i": i}).output == i
+
+            assert single.stats()["recycled"] == 2
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="RLIMIT_AS is POSIX only")
+    def test_memory_limit(self):
+        with SandboxWorkerPool(size=1, memory_limit_mb=256) as limited:
+            result = limited.execute("result = len('x' * (1024 * 1024 * 1024))", {})
+
+            assert result.success is False
+            assert "memory" in result.error.lower() or "exited" in result.error.lower()
+            assert limited.execute("result = 1", {}).output == 1
+
+    def test_closed_pool_rejects_work(self):
+        closed = SandboxWorkerPool(size=1)
+        closed.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            closed.execute("result = 1", {})
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            SandboxWorkerPool(size=0)
+        with pytest.raises(ValueError):
+            SandboxWorkerPool(max_tasks_per_worker=0)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [("512m", 512), ("1g", 1024), ("1GB", 1024), ("2048k", 2), (300, 300), (None, None)],
+)
+def test_parse_memory_limit(value, expected):
+    assert parse_memory_limit(value) == expected
+
+
+def test_parse_memory_limit_invalid():
+    with pytest.raises(ValueError):
+        parse_memory_limit("lots")
+
+
+class TestInProcessExecutor:
+    """Tests for the in-process path changes."""
+
+    def test_compile_cached_per_code_string(self):
+        code = "result = inputs['a'] + 1"
+        assert compile_sandboxed(code) is compile_sandboxed(code)
+
+    def test_stdout_capture_is_per_thread(self):
+        executor = PythonSandboxExecutor()
+        results = {}
+        barrier = threading.Barrier(8)
+
+        def worker(tag):
+            barrier.wait()
+            results[tag] = executor.execute(
+                'for i in range(200):\n    print(inputs["tag"])\nresult = 1',
+                {"tag": tag},
+            )
+
+        threads = [threading.Thread(target=worker, args=(f"t{i}",)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        for tag, result in results.items():
+            assert result.success is True
+            assert set(result.stdout.split()) == {tag}
+
+
+def test_pooled_results_match_in_process(pool):
+    """Repeated pooled calls reuse warm workers and match in-process execution."""
+    code = "total = 0\nfor n in inputs['nums']:\n    total = total + n\nresult = total"
+    executor = PythonSandboxExecutor()
+    before = pool.stats()
+
+    for n in range(1, 51):
+        inputs = {"nums": list(range(n))}
+        assert pool.execute(code, inputs).output == executor.execute(code, inputs).output
+
+    after = pool.stats()
+    assert after["executions"] == before["executions"] + 50
+    assert (after["recycled"], after["crashes"]) == (before["recycled"], before["crashes"])
@@ -8,10 +8,10 @@ import json
 from datetime import datetime, timedelta
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, select
 from sqlalchemy.orm import Session
 
-from configurable_agents.storage.models import AgentRecord, Base
+from configurable_agents.storage.models import AgentCapabilityRecord, AgentRecord, Base
 from configurable_agents.storage.sqlite import SqliteAgentRegistryRepository
 
 
@@ -206,6 +206,161 @@ class TestQueryByMetadata:
         assert len(results) == 0
 
 
+def _agent(agent_id: str, metadata, **kwargs) -> AgentRecord:
+    return AgentRecord(
+        agent_id=agent_id,
+        agent_name=agent_id,
+        host="localhost",
+        port=8000,
+        agent_metadata=json.dumps(metadata) if metadata is not None else None,
+        **kwargs,
+    )
+
+
+class TestCapabilityIndex:
+    """Tests for the agent_capabilities index behind query_by_metadata."""
+
+    def _ids(self, agent_repo, filters) -> set:
+        return {a.agent_id for a in agent_repo.query_by_metadata(filters)}
+
+    def _index_rows(self, agent_repo, agent_id: str) -> set:
+        with Session(agent_repo.engine) as session:
+            rows = session.scalars(
+                select(AgentCapabilityRecord).where(AgentCapabilityRecord.agent_id == agent_id)
+            ).all()
+            return {(r.key, r.value_type, r.value, r.in_list) for r in rows}
+
+    def test_index_written_on_add(self, agent_repo) -> None:
+        agent_repo.add(_agent("a", {"model": "gpt-4o", "tags": ["x", "y"], "caps": {"llm": True}}))
+
+        assert self._index_rows(agent_repo, "a") == {
+            ("model", "str", "gpt-4o", False),
+            ("tags", "str", "x", True),
+            ("tags", "str", "y", True),
+            ("caps.llm", "num", "1", False),
+        }
+
+    def test_index_follows_metadata_updates_not_heartbeats(self, agent_repo) -> None:
+        agent_repo.add(_agent("a", {"type": "llm"}))
+        with Session(agent_repo.engine) as session:
+            session.get(AgentRecord, "a").agent_metadata = json.dumps({"type": "tool"})
+            session.commit()
+        agent_repo.update_heartbeat("a")
+
+        assert self._ids(agent_repo, {"type": "llm"}) == set()
+        assert self._ids(agent_repo, {"type": "tool"}) == {"a"}
+        assert self._index_rows(agent_repo, "a") == {("type", "str", "tool", False)}
+
+    def test_index_cleared_on_delete(self, agent_repo) -> None:
+        agent_repo.add(_agent("a", {"type": "llm"}))
+        agent_repo.add(
+            _agent("old", {"type": "llm"}, last_heartbeat=datetime.utcnow() - timedelta(hours=1))
+        )
+
+        agent_repo.delete("a")
+        agent_repo.delete_expired()
+
+        assert self._index_rows(agent_repo, "a") == set()
+        assert self._index_rows(agent_repo, "old") == set()
+
+    def test_matches_python_semantics(self, agent_repo) -> None:
+        """Every filter shape gives the same result as the Python matcher."""
+        agents = {
+            "a": {"model": "gpt-4o", "tags": ["vision", "llm"], "caps": {"llm": True, "n": 2}},
+            "b": {"model": "claude-3", "tags": "llm", "caps": {"llm": False, "n": 2.5}},
+            "c": {"model": "gpt-3.5", "tags": ["gpt-*"], "caps": ["llm"], "score": 1},
+            "d": {"model": "[gpt]", "name": "a.b", "a.b": "dotted"},
+        }
+        for agent_id, metadata in agents.items():
+            agent_repo.add(_agent(agent_id, metadata))
+        filters = [
+            {"model": "gpt-*"},
+            {"model": "*-3*"},
+            {"model": "gpt-?o"},
+            {"model": "[[]gpt*"},
+            {"tags": "llm"},
+            {"tags": "gpt-*"},
+            {"tags": ["vision", "nope"]},
+            {"tags": ["llm"]},
+            {"model": ["claude-3", "gpt-4o"]},
+            {"caps.llm": True},
+            {"caps.llm": 1},
+            {"caps.n": 2.0},
+            {"caps": ["llm"]},
+            {"score": True},
+            {"a.b": "dotted"},
+            {"caps.missing": None},
+            {"caps": {"llm": True, "n": 2}},
+            {"model": "gpt-*", "caps.llm": True},
+            {},
+        ]
+        for f in filters:
+            expected = {
+                agent_id
+                for agent_id, metadata in agents.items()
+                if agent_repo._matches_filters(metadata, f)
+            }
+            assert self._ids(agent_repo, f) == expected, f
+
+    def test_excludes_dead_agents(self, agent_repo) -> None:
+        agent_repo.add(_agent("live", {"type": "llm"}))
+        agent_repo.add(
+            _agent("dead", {"type": "llm"}, last_heartbeat=datetime.utcnow() - timedelta(hours=1))
+        )
+
+        assert self._ids(agent_repo, {"type": "llm"}) == {"live"}
+
+    def test_rebuild_capability_index(self, agent_repo) -> None:
+        agent_repo.add(_agent("a", {"type": "llm"}))
+        agent_repo.add(_agent("b", None))
+        with agent_repo.engine.begin() as conn:
+            conn.execute(AgentCapabilityRecord.__table__.delete())
+
+        assert agent_repo.rebuild_capability_index() == 2
+        assert self._ids(agent_repo, {"type": "llm"}) == {"a"}
+
+    def test_get_many(self, agent_repo) -> None:
+        for agent_id in ("a", "b", "c"):
+            agent_repo.add(_agent(agent_id, None))
+
+        agents = agent_repo.get_many(["c", "a", "missing", "a"])
+
+        assert sorted(a.agent_id for a in agents) == ["a", "c"]
+
+
+def test_capability_query_matches_blob_scan(agent_repo) -> None:
+    """Indexed capability lookups return exactly the agents a blob scan would."""
+    models = ["gpt-4o", "gpt-4o-mini", "claude-3", "gemini-pro", "llama-3"]
+    with Session(agent_repo.engine) as session:
+        session.add_all(
+            _agent(
+                f"agent-{i:04d}",
+                {
+                    "type": "llm" if i % 2 else "tool",
+                    "model": models[i % len(models)],
+                    "capabilities": {"vision": i % 10 == 0, "region": f"r{i % 20}"},
+                    "tags": [f"team-{i % 50}", "prod"],
+                },
+            )
+            for i in range(1_000)
+        )
+        session.commit()
+
+    for filters in (
+        {"model": "gpt-4o*", "capabilities.vision": True, "tags": "team-0"},
+        {"type": "llm", "capabilities.region": "r3"},
+        {"tags": "prod", "model": "claude-3"},
+    ):
+        scanned = {
+            a.agent_id
+            for a in agent_repo.list_all()
+            if agent_repo._matches_filters(json.loads(a.agent_metadata), filters)
+        }
+        indexed = {a.agent_id for a in agent_repo.query_by_metadata(filters)}
+        assert indexed == scanned, filters
+        assert scanned
+
+
 class TestGetActiveAgents:
     """Tests for get_active_agents method."""
 
@@ -325,3 +480,25 @@ class TestGetActiveAgents:
 
         # Should be excluded because heartbeat is too old
         assert len(active) == 0
+
+
+class TestUpdateHeartbeats:
+    """Tests for batched heartbeat writes."""
+
+    def test_writes_given_timestamps(self, agent_repo) -> None:
+        agent_repo.add(_agent("a", {"type": "llm"}))
+        agent_repo.add(_agent("b", None))
+        stamp = datetime(2030, 1, 1, 12, 0, 0)
+
+        updated = agent_repo.update_heartbeats(
+            {"a": stamp, "b": stamp + timedelta(seconds=1), "missing": stamp}
+        )
+
+        assert updated == 2
+        assert agent_repo.get("a").last_heartbeat == stamp
+        assert agent_repo.get("b").last_heartbeat == stamp + timedelta(seconds=1)
+        # Metadata index untouched by heartbeat writes
+        assert [a.agent_id for a in agent_repo.query_by_metadata({"type": "llm"})] == ["a"]
+
+    def test_empty(self, agent_repo) -> None:
+        assert agent_repo.update_heartbeats({}) == 0
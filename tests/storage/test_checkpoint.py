@@ -0,0 +1,145 @@
+"""Tests for the batched execution state checkpoint writer."""
+
+import threading
+import time
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine
+
+from configurable_agents.config.schema import StorageConfig
+from configurable_agents.storage import get_checkpoint_writer
+from configurable_agents.storage.checkpoint import BatchedCheckpointWriter
+from configurable_agents.storage.models import Base, WorkflowRunRecord
+from configurable_agents.storage.sqlite import (
+    SQLiteExecutionStateRepository,
+    SQLiteWorkflowRunRepository,
+)
+
+
+@pytest.fixture
+def temp_engine(tmp_path):
+    """Create a temporary SQLite database engine."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def states_repo(temp_engine):
+    """Create an execution state repository with a run 'run-1'."""
+    SQLiteWorkflowRunRepository(temp_engine).add(
+        WorkflowRunRecord(
+            id="run-1",
+            workflow_name="wf",
+            status="running",
+            config_snapshot="{}",
+            started_at=datetime.utcnow(),
+        )
+    )
+    return SQLiteExecutionStateRepository(temp_engine)
+
+
+class TestBatchedCheckpointWriter:
+    def test_group_mode_batches_and_flushes(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="group", batch_size=50)
+
+        for i in range(20):
+            writer.save_state("run-1", {"step": i}, f"node_{i}")
+        assert writer.run_completed("run-1") is True
+
+        history = states_repo.get_state_history("run-1")
+        assert [h["state_data"]["step"] for h in history] == list(range(20))
+        assert writer.stats()["rows_written"] == 20
+        assert writer.stats()["batches_written"] < 20
+        writer.close()
+
+    def test_save_state_does_not_wait_for_commit(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="group")
+        commit_started = threading.Event()
+        release = threading.Event()
+        original = writer._write_batch
+
+        def slow_write(rows):
+            commit_started.set()
+            release.wait(5)
+            original(rows)
+
+        writer._write_batch = slow_write
+        writer.save_state("run-1", {"step": 0}, "a")
+        commit_started.wait(5)
+
+        start = time.perf_counter()
+        writer.save_state("run-1", {"step": 1}, "b")
+        assert time.perf_counter() - start < 0.5
+
+        release.set()
+        writer.flush()
+        assert len(states_repo.get_state_history("run-1")) == 2
+        writer.close()
+
+    def test_sync_mode_writes_immediately(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="sync")
+
+        writer.save_state("run-1", {"step": 0}, "a")
+
+        assert states_repo.get_latest_state("run-1") == {"step": 0}
+        with pytest.raises(ValueError, match="Workflow run not found"):
+            writer.save_state("missing", {}, "a")
+
+    def test_async_mode_completion_does_not_wait(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="async")
+        writer.flush = lambda timeout=None: pytest.fail("async must not flush")
+
+        writer.save_state("run-1", {"step": 0}, "a")
+
+        assert writer.run_completed("run-1") is True
+        del writer.flush
+        writer.close()
+        assert states_repo.get_latest_state("run-1") == {"step": 0}
+
+    def test_unknown_run_rows_dropped(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="group")
+
+        writer.save_state("run-1", {"step": 0}, "a")
+        writer.save_state("missing", {"step": 1}, "b")
+        writer.flush()
+
+        assert writer.stats()["rows_written"] == 1
+        assert writer.stats()["rows_dropped"] == 1
+        writer.close()
+
+    def test_reads_see_pending_writes(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="group")
+
+        writer.save_state("run-1", {"step": 7}, "a")
+
+        assert writer.get_latest_state("run-1") == {"step": 7}
+        writer.close()
+
+    def test_closed_writer_rejects_writes(self, states_repo) -> None:
+        writer = BatchedCheckpointWriter(states_repo, durability="group")
+        writer.close()
+
+        with pytest.raises(RuntimeError, match="closed"):
+            writer.save_state("run-1", {}, "a")
+
+    def test_invalid_durability(self, states_repo) -> None:
+        with pytest.raises(ValueError, match="Invalid checkpoint durability"):
+            BatchedCheckpointWriter(states_repo, durability="eventually")
+
+
+class TestGetCheckpointWriter:
+    def test_sync_returns_plain_repository(self, tmp_path) -> None:
+        config = StorageConfig(path=str(tmp_path / "a.db"), checkpoint_durability="sync")
+
+        assert isinstance(get_checkpoint_writer(config), SQLiteExecutionStateRepository)
+
+    def test_group_writer_is_shared(self, tmp_path) -> None:
+        config = StorageConfig(path=str(tmp_path / "a.db"))
+
+        writer = get_checkpoint_writer(config)
+
+        assert isinstance(writer, BatchedCheckpointWriter)
+        assert writer.durability == "group"
+        assert get_checkpoint_writer(config) is writer
@@ -4,11 +4,19 @@ Tests that the factory correctly creates repositories based on
 configuration and handles errors appropriately.
 """
 
+import threading
+
 import pytest
-from sqlalchemy import inspect
+from sqlalchemy import create_engine, insert, inspect, text
 
 from configurable_agents.config.schema import StorageConfig
-from configurable_agents.storage import create_storage_backend
+from configurable_agents.storage import (
+    create_storage_backend,
+    get_pool_metrics,
+    get_storage_backend,
+    upgrade_schema,
+)
+from configurable_agents.storage.models import AgentRecord, Base, WorkflowRunRecord
 from configurable_agents.storage.sqlite import (
     SQLiteExecutionStateRepository,
     SQLiteWorkflowRunRepository,
@@ -82,3 +90,160 @@ class TestFactory:
 
         assert isinstance(runs_repo, SQLiteWorkflowRunRepository)
         assert isinstance(states_repo, SQLiteExecutionStateRepository)
+
+
+class TestSharedBackend:
+    """Tests for the process-wide get_storage_backend registry."""
+
+    def test_same_config_returns_same_repositories(self, tmp_path) -> None:
+        config = StorageConfig(backend="sqlite", path=str(tmp_path / "shared.db"))
+
+        first = get_storage_backend(config)
+        second = get_storage_backend(StorageConfig(backend="sqlite", path=str(tmp_path / "shared.db")))
+
+        assert first[0] is second[0]
+        assert first[0].engine is first[5].engine
+
+    def test_different_paths_get_different_engines(self, tmp_path) -> None:
+        first = get_storage_backend(StorageConfig(path=str(tmp_path / "a.db")))
+        second = get_storage_backend(StorageConfig(path=str(tmp_path / "b.db")))
+
+        assert first[0].engine is not second[0].engine
+
+    def test_schema_initialized_and_pragmas_applied(self, tmp_path) -> None:
+        runs_repo, *_ = get_storage_backend(StorageConfig(path=str(tmp_path / "tuned.db")))
+
+        assert "workflow_runs" in inspect(runs_repo.engine).get_table_names()
+        with runs_repo.engine.connect() as conn:
+            assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert conn.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+
+    def test_concurrent_first_use_creates_one_backend(self, tmp_path) -> None:
+        config = StorageConfig(path=str(tmp_path / "race.db"))
+        results = []
+
+        def worker():
+            results.append(get_storage_backend(config)[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len({id(repo) for repo in results}) == 1
+
+    def test_pool_metrics_track_checkouts(self, tmp_path) -> None:
+        config = StorageConfig(path=str(tmp_path / "metrics.db"))
+        runs_repo, *_ = get_storage_backend(config)
+        before = next(iter(get_pool_metrics(config).values()))["checkouts"]
+
+        runs_repo.list_by_workflow("anything")
+
+        metrics = next(iter(get_pool_metrics(config).values()))
+        assert metrics["checkouts"] == before + 1
+        assert metrics["checked_out"] == 0
+
+    def test_unsupported_backend_raises_value_error(self) -> None:
+        with pytest.raises(ValueError, match="Unsupported storage backend"):
+            get_storage_backend(StorageConfig(backend="postgresql", path="localhost:5432"))
+
+
+class TestSchemaUpgrade:
+    """Tests for additive upgrades of databases created by older releases."""
+
+    def test_missing_index_column_and_table_added(self, tmp_path) -> None:
+        engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+        create_storage_backend(StorageConfig(path=str(tmp_path / "old.db")))
+        with engine.begin() as conn:
+            conn.execute(text("DROP INDEX ix_memory_records_agent_key"))
+            conn.execute(text("DROP INDEX ix_memory_records_expires_at"))
+            conn.execute(text("ALTER TABLE memory_records DROP COLUMN expires_at"))
+            conn.execute(text("DROP TABLE orchestrators"))
+            conn.execute(text("DROP INDEX ix_workflow_runs_status_started_at"))
+
+        applied = upgrade_schema(engine)
+
+        assert "index ix_memory_records_agent_key" in applied
+        assert "column memory_records.expires_at" in applied
+        assert "index ix_memory_records_expires_at" in applied
+        assert "table orchestrators" in applied
+        assert "index ix_workflow_runs_status_started_at" in applied
+        assert upgrade_schema(engine) == []
+        engine.dispose()
+
+    def test_baseline_database_upgraded_on_startup(self, tmp_path) -> None:
+        """A database from before the cache, ledger and job queue tables is upgraded."""
+        db_path = tmp_path / "old.db"
+        engine = create_engine(f"sqlite:///{db_path}")
+        Base.metadata.create_all(engine)
+        with engine.begin() as conn:
+            for table in (
+                "agent_capabilities", "cost_ledger", "memory_changes",
+                "metrics_duration_bins", "metrics_rollups", "workflow_jobs",
+            ):
+                conn.execute(text(f"DROP TABLE {table}"))
+            for index in (
+                "ix_memory_records_agent_key", "ix_memory_records_expires_at",
+                "ix_webhook_events_processed_at", "ix_workflow_runs_started_at",
+                "ix_workflow_runs_workflow_name_started_at",
+                "ix_workflow_runs_status_started_at",
+            ):
+                conn.execute(text(f"DROP INDEX {index}"))
+            conn.execute(text("ALTER TABLE memory_records DROP COLUMN expires_at"))
+            conn.execute(
+                insert(WorkflowRunRecord.__table__).values(
+                    id="a", workflow_name="wf", status="completed",
+                    duration_seconds=1.0, total_tokens=10, total_cost_usd=0.5,
+                )
+            )
+            conn.execute(
+                insert(AgentRecord.__table__).values(
+                    agent_id="a", agent_name="a", host="localhost", port=8000,
+                    agent_metadata='{"type": "llm"}',
+                )
+            )
+        engine.dispose()
+
+        runs_repo, _, agents_repo, _, _, memory_repo, *_ = create_storage_backend(
+            StorageConfig(path=str(db_path))
+        )
+
+        memory_repo.set("a:k", '"v"', "a", None, None, "k", ttl=60)
+        assert memory_repo.get("a:k") == '"v"'
+        assert runs_repo.rollups.totals()["total_cost_usd"] == pytest.approx(0.5)
+        assert [a.agent_id for a in agents_repo.query_by_metadata({"type": "llm"})] == ["a"]
+        indexes = {i["name"] for i in inspect(runs_repo.engine).get_indexes("workflow_runs")}
+        assert "ix_workflow_runs_status_started_at" in indexes
+        assert upgrade_schema(runs_repo.engine) == []
+
+    def test_added_rollup_tables_are_backfilled(self, tmp_path) -> None:
+        runs_repo, *_ = create_storage_backend(StorageConfig(path=str(tmp_path / "old.db")))
+        for run_id in ("a", "b"):
+            runs_repo.add(WorkflowRunRecord(id=run_id, workflow_name="wf", status="running"))
+            runs_repo.update_run_completion(run_id, "completed", 1.0, 10, 0.5)
+        with runs_repo.engine.begin() as conn:
+            conn.execute(text("DROP TABLE metrics_rollups"))
+            conn.execute(text("DROP TABLE metrics_duration_bins"))
+
+        applied = upgrade_schema(runs_repo.engine)
+
+        assert "backfill metrics_rollups (2 runs)" in applied
+        assert runs_repo.rollups.totals()["total_cost_usd"] == pytest.approx(1.0)
+
+    def test_added_capability_index_is_backfilled(self, tmp_path) -> None:
+        _, _, agents_repo, *_ = create_storage_backend(StorageConfig(path=str(tmp_path / "old.db")))
+        agents_repo.add(
+            AgentRecord(
+                agent_id="a", agent_name="a", host="localhost", port=8000,
+                agent_metadata='{"type": "llm"}',
+            )
+        )
+        with agents_repo.engine.begin() as conn:
+            conn.execute(text("DROP TABLE agent_capabilities"))
+
+        applied = upgrade_schema(agents_repo.engine)
+
+        assert "backfill agent_capabilities (1 agents)" in applied
+        assert [a.agent_id for a in agents_repo.query_by_metadata({"type": "llm"})] == ["a"]
@@ -0,0 +1,138 @@
+"""Tests for atomic webhook claims and the in-memory recent-ID front."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, func, select, update
+from sqlalchemy.orm import Session
+
+from configurable_agents.storage.idempotency import CachedWebhookEventRepository, RecentIdCache
+from configurable_agents.storage.models import Base, WebhookEventRecord
+from configurable_agents.storage.sqlite import SqliteWebhookEventRepository
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'webhooks.db'}", connect_args={"timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def webhook_repo(engine):
+    return SqliteWebhookEventRepository(engine)
+
+
+class TestRecentIdCache:
+    """Tests for RecentIdCache."""
+
+    def test_evicts_least_recently_used(self) -> None:
+        cache = RecentIdCache(capacity=2)
+        cache.add("a")
+        cache.add("b")
+        assert "a" in cache  # Refreshes "a"
+        cache.add("c")
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert len(cache) == 2
+
+    def test_invalid_capacity(self) -> None:
+        with pytest.raises(ValueError, match="capacity"):
+            RecentIdCache(capacity=0)
+
+
+class TestClaim:
+    """Tests for SqliteWebhookEventRepository.claim."""
+
+    def test_first_claim_wins(self, webhook_repo, engine) -> None:
+        assert webhook_repo.claim("evt-1", "telegram") is True
+        assert webhook_repo.claim("evt-1", "telegram") is False
+        assert webhook_repo.is_processed("evt-1")
+        with Session(engine) as session:
+            assert session.scalar(select(WebhookEventRecord.provider)) == "telegram"
+
+    def test_concurrent_claims_have_one_winner(self, webhook_repo, engine) -> None:
+        """Threads on separate connections race for the same IDs."""
+        ids = [f"evt-{i}" for i in range(50)]
+        wins = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(8)
+
+        def deliver() -> None:
+            barrier.wait()
+            for webhook_id in ids:
+                if webhook_repo.claim(webhook_id, "generic"):
+                    with lock:
+                        wins.append(webhook_id)
+
+        threads = [threading.Thread(target=deliver) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(wins) == sorted(ids)
+        with Session(engine) as session:
+            assert session.scalar(select(func.count()).select_from(WebhookEventRecord)) == 50
+
+
+class TestCachedWebhookEventRepository:
+    """Tests for CachedWebhookEventRepository."""
+
+    def test_replays_rejected_from_memory(self, webhook_repo) -> None:
+        repo = CachedWebhookEventRepository(webhook_repo)
+
+        assert repo.claim("evt-1", "generic") is True
+        assert repo.claim("evt-1", "generic") is False
+        assert repo.is_processed("evt-1")
+
+        assert repo.stats() == {
+            "memory_rejects": 1,
+            "db_claims": 1,
+            "db_conflicts": 0,
+            "cached_ids": 1,
+        }
+
+    def test_claims_from_other_processes_fall_through(self, webhook_repo) -> None:
+        webhook_repo.claim("evt-1", "generic")  # Another worker
+        repo = CachedWebhookEventRepository(webhook_repo)
+
+        assert repo.claim("evt-1", "generic") is False
+        assert repo.claim("evt-1", "generic") is False
+        assert repo.stats()["db_conflicts"] == 1
+        assert repo.stats()["memory_rejects"] == 1
+
+    def test_cleanup_clears_cache(self, webhook_repo, engine) -> None:
+        repo = CachedWebhookEventRepository(webhook_repo)
+        repo.claim("evt-1", "generic")
+        with engine.begin() as conn:
+            conn.execute(
+                update(WebhookEventRecord).values(
+                    processed_at=datetime.utcnow() - timedelta(days=8)
+                )
+            )
+
+        assert repo.cleanup_old_events(days=7, batch_size=10) == 1
+        assert repo.claim("evt-1", "generic") is True
+
+
+def test_replay_flood_never_reaches_database(webhook_repo, monkeypatch) -> None:
+    """10k replays of 100 claimed IDs are all rejected from memory."""
+    ids = [f"evt-{i}" for i in range(100)]
+    cached = CachedWebhookEventRepository(webhook_repo)
+    assert all(cached.claim(webhook_id, "generic") for webhook_id in ids)
+
+    def unexpected_claim(webhook_id, provider):
+        raise AssertionError("replay reached the database")
+
+    monkeypatch.setattr(webhook_repo, "claim", unexpected_claim)
+    deliveries = ids * 100
+
+    assert not any(cached.claim(webhook_id, "generic") for webhook_id in deliveries)
+    stats = cached.stats()
+    assert stats["memory_rejects"] == len(deliveries)
+    assert stats["db_claims"] == len(ids)
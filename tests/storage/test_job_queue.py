@@ -0,0 +1,217 @@
+"""Tests for the SQLite webhook workflow job queue repository."""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, update
+
+from configurable_agents.storage.models import Base, WorkflowJobRecord
+from configurable_agents.storage.sqlite import SqliteWorkflowJobRepository
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"timeout": 30}
+    )
+    Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def jobs(engine):
+    return SqliteWorkflowJobRepository(engine)
+
+
+class TestEnqueueAndGet:
+    """Tests for enqueue and get."""
+
+    def test_round_trip(self, jobs) -> None:
+        job = jobs.enqueue(
+            "article_writer.yaml", {"input": "AI"}, source="telegram", reply_to="42", priority=3
+        )
+
+        stored = jobs.get(job.id)
+        assert stored == job
+        assert stored.status == "queued"
+        assert stored.inputs == {"input": "AI"}
+        assert stored.reply_to == "42"
+        assert stored.to_dict()["job_id"] == job.id
+        assert "reply_to" not in stored.to_dict()
+
+    def test_get_missing(self, jobs) -> None:
+        assert jobs.get("missing") is None
+
+    def test_invalid_max_attempts(self, jobs) -> None:
+        with pytest.raises(ValueError, match="max_attempts"):
+            jobs.enqueue("w", {}, max_attempts=0)
+
+
+class TestClaimNext:
+    """Tests for claim_next."""
+
+    def test_priority_then_age(self, jobs) -> None:
+        first = jobs.enqueue("w", {"n": 1})
+        urgent = jobs.enqueue("w", {"n": 2}, priority=10)
+        second = jobs.enqueue("w", {"n": 3})
+
+        claimed = [jobs.claim_next().id for _ in range(3)]
+
+        assert claimed == [urgent.id, first.id, second.id]
+        assert jobs.claim_next() is None
+
+    def test_marks_running(self, jobs) -> None:
+        jobs.enqueue("w", {})
+
+        job = jobs.claim_next(worker_id="host:1:a", lease_seconds=60)
+
+        assert job.status == "running"
+        assert job.attempts == 1
+        assert job.started_at is not None
+        assert job.worker_id == "host:1:a"
+        assert job.lease_expires_at > job.started_at
+
+    def test_excluded_workflows_skipped(self, jobs) -> None:
+        jobs.enqueue("busy", {}, priority=5)
+        other = jobs.enqueue("idle", {})
+
+        assert jobs.claim_next(exclude_workflows=["busy"]).id == other.id
+        assert jobs.claim_next(exclude_workflows=["busy"]) is None
+
+    def test_concurrent_claims_take_each_job_once(self, jobs) -> None:
+        """Threads on separate connections drain the same queue."""
+        queued = {jobs.enqueue("w", {"n": i}).id for i in range(60)}
+        claimed = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(6)
+
+        def worker() -> None:
+            barrier.wait()
+            while (job := jobs.claim_next()) is not None:
+                with lock:
+                    claimed.append(job.id)
+
+        threads = [threading.Thread(target=worker) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(claimed) == sorted(queued)
+
+
+class TestOutcomes:
+    """Tests for complete, fail and lease recovery."""
+
+    def test_complete(self, jobs) -> None:
+        job = jobs.enqueue("w", {})
+        jobs.claim_next()
+
+        jobs.complete(job.id, {"article": "text"})
+
+        done = jobs.get(job.id)
+        assert done.status == "succeeded"
+        assert done.result == {"article": "text"}
+        assert done.finished_at is not None
+
+    def test_fail_retries_with_delay_then_fails(self, jobs, engine) -> None:
+        job = jobs.enqueue("w", {}, max_attempts=2)
+
+        jobs.claim_next()
+        retried = jobs.fail(job.id, "boom", retry_delay=60)
+        assert retried.status == "queued"
+        assert retried.error == "boom"
+        assert jobs.claim_next() is None  # Not available for 60s
+
+        with engine.begin() as conn:
+            conn.execute(
+                update(WorkflowJobRecord).values(
+                    available_at=datetime.utcnow() - timedelta(seconds=1)
+                )
+            )
+        assert jobs.claim_next().attempts == 2
+        failed = jobs.fail(job.id, "boom again")
+        assert failed.status == "failed"
+        assert failed.attempts == 2
+        assert failed.finished_at is not None
+
+    def test_fail_missing(self, jobs) -> None:
+        assert jobs.fail("missing", "boom") is None
+
+    def test_outcomes_need_the_lease(self, jobs) -> None:
+        job = jobs.enqueue("w", {}, max_attempts=1)
+        jobs.claim_next(worker_id="stale", lease_seconds=-1)
+        jobs.requeue_expired()
+        jobs.claim_next(worker_id="current")
+
+        # The stale worker's lease was taken over; its outcome is discarded
+        assert jobs.complete(job.id, {"late": True}, worker_id="stale") is False
+        assert jobs.fail(job.id, "late", worker_id="stale") is None
+        current = jobs.get(job.id)
+        assert (current.status, current.worker_id, current.result) == ("running", "current", None)
+
+        assert jobs.complete(job.id, {"ok": True}, worker_id="current") is True
+        assert jobs.complete(job.id, {"again": True}, worker_id="current") is False
+        assert jobs.get(job.id).result == {"ok": True}
+
+    def test_requeue_expired_leaves_live_leases(self, jobs) -> None:
+        abandoned = jobs.enqueue("w", {}, priority=1)
+        live = jobs.enqueue("w", {})
+        jobs.claim_next(worker_id="dead", lease_seconds=-1)
+        jobs.claim_next(worker_id="alive", lease_seconds=60)
+
+        assert jobs.requeue_expired() == 1
+
+        requeued = jobs.get(abandoned.id)
+        assert requeued.status == "queued"
+        assert requeued.attempts == 0
+        assert requeued.worker_id is None
+        assert jobs.get(live.id).status == "running"
+        assert jobs.claim_next().id == abandoned.id
+
+    def test_renew_leases_only_for_owner(self, jobs) -> None:
+        ours = jobs.enqueue("w", {})
+        theirs = jobs.enqueue("w", {})
+        jobs.claim_next(worker_id="a", lease_seconds=-1)
+        jobs.claim_next(worker_id="b", lease_seconds=-1)
+
+        assert jobs.renew_leases("a", [ours.id, theirs.id], lease_seconds=60) == 1
+        assert jobs.renew_leases("a", []) == 0
+
+        assert jobs.requeue_expired() == 1
+        assert jobs.get(ours.id).status == "running"
+        assert jobs.get(theirs.id).status == "queued"
+
+    def test_count_by_status(self, jobs) -> None:
+        for _ in range(3):
+            jobs.enqueue("w", {})
+        jobs.claim_next()
+        jobs.complete(jobs.claim_next().id, {})
+
+        assert jobs.count_by_status() == {
+            "queued": 1,
+            "running": 1,
+            "succeeded": 1,
+            "failed": 0,
+        }
+
+
+def test_cleanup_finished(jobs, engine) -> None:
+    old = jobs.enqueue("w", {})
+    recent = jobs.enqueue("w", {})
+    pending = jobs.enqueue("w", {})
+    for job in (old, recent):
+        jobs.claim_next()
+        jobs.complete(job.id, {})
+    with engine.begin() as conn:
+        conn.execute(
+            update(WorkflowJobRecord)
+            .where(WorkflowJobRecord.id == old.id)
+            .values(finished_at=datetime.utcnow() - timedelta(days=8))
+        )
+
+    assert jobs.cleanup_finished(days=7, batch_size=1) == 1
+    assert jobs.get(old.id) is None
+    assert jobs.get(recent.id) is not None
+    assert jobs.get(pending.id) is not None
@@ -0,0 +1,224 @@
+"""Tests for set-based retention cleanup and the retention scheduler.
+
+Covers the chunked delete_expired()/cleanup_old_events() implementations
+of the SQLite repositories and RetentionScheduler.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event, func, insert, select
+from sqlalchemy.orm import Session
+
+from configurable_agents.storage.models import (
+    AgentCapabilityRecord,
+    AgentRecord,
+    Base,
+    OrchestratorRecord,
+    WebhookEventRecord,
+)
+from configurable_agents.storage.retention import RetentionScheduler
+from configurable_agents.storage.sqlite import (
+    SqliteAgentRegistryRepository,
+    SqliteOrchestratorRepository,
+    SqliteWebhookEventRepository,
+)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    return engine
+
+
+def _agent(agent_id: str, age_seconds: float, ttl_seconds=60) -> AgentRecord:
+    return AgentRecord(
+        agent_id=agent_id,
+        agent_name=agent_id,
+        host="localhost",
+        port=8000,
+        ttl_seconds=ttl_seconds,
+        agent_metadata='{"type": "llm"}',
+        last_heartbeat=datetime.utcnow() - timedelta(seconds=age_seconds),
+    )
+
+
+def _count(engine, model) -> int:
+    with Session(engine) as session:
+        return session.scalar(select(func.count()).select_from(model))
+
+
+def _insert_events(engine, count: int, age_days: float, prefix: str) -> None:
+    processed_at = datetime.utcnow() - timedelta(days=age_days)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(WebhookEventRecord),
+            [
+                {"webhook_id": f"{prefix}-{i}", "provider": "generic", "processed_at": processed_at}
+                for i in range(count)
+            ],
+        )
+
+
+class TestAgentDeleteExpired:
+    """Tests for SqliteAgentRegistryRepository.delete_expired."""
+
+    def test_deletes_only_expired_per_ttl(self, engine) -> None:
+        repo = SqliteAgentRegistryRepository(engine)
+        repo.add(_agent("expired-60", age_seconds=61))
+        repo.add(_agent("alive-60", age_seconds=30))
+        repo.add(_agent("expired-10", age_seconds=11, ttl_seconds=10))
+        repo.add(_agent("alive-600", age_seconds=300, ttl_seconds=600))
+        repo.add(_agent("boundary", age_seconds=60))
+
+        assert repo.delete_expired() == 3
+        assert sorted(a.agent_id for a in repo.list_all(include_dead=True)) == [
+            "alive-60",
+            "alive-600",
+        ]
+
+    def test_chunks_and_removes_capability_rows(self, engine) -> None:
+        repo = SqliteAgentRegistryRepository(engine)
+        for i in range(10):
+            repo.add(_agent(f"old-{i}", age_seconds=3600))
+        repo.add(_agent("alive", age_seconds=0))
+        statements = []
+        event.listen(
+            engine,
+            "before_cursor_execute",
+            lambda conn, cursor, sql, *args: statements.append(sql),
+        )
+
+        assert repo.delete_expired(batch_size=3) == 10
+
+        deletes = [sql for sql in statements if sql.startswith("DELETE FROM agents")]
+        assert len(deletes) == 4
+        assert _count(engine, AgentRecord) == 1
+        with Session(engine) as session:
+            owners = set(session.scalars(select(AgentCapabilityRecord.agent_id)))
+        assert owners == {"alive"}
+
+    def test_invalid_batch_size(self, engine) -> None:
+        with pytest.raises(ValueError, match="batch_size"):
+            SqliteAgentRegistryRepository(engine).delete_expired(batch_size=0)
+
+
+class TestOrchestratorDeleteExpired:
+    """Tests for SqliteOrchestratorRepository.delete_expired."""
+
+    def test_default_ttl_and_chunking(self, engine) -> None:
+        repo = SqliteOrchestratorRepository(engine)
+        for i in range(5):
+            repo.add(
+                OrchestratorRecord(
+                    orchestrator_id=f"old-{i}",
+                    orchestrator_name="old",
+                    orchestrator_type="central",
+                    api_endpoint="http://localhost",
+                    last_heartbeat=datetime.utcnow() - timedelta(seconds=301),
+                )
+            )
+        repo.add(
+            OrchestratorRecord(
+                orchestrator_id="alive",
+                orchestrator_name="alive",
+                orchestrator_type="central",
+                api_endpoint="http://localhost",
+                last_heartbeat=datetime.utcnow() - timedelta(seconds=200),
+            )
+        )
+
+        assert repo.delete_expired(batch_size=2) == 5
+        assert [o.orchestrator_id for o in repo.list_all(include_dead=True)] == ["alive"]
+
+
+class TestWebhookCleanup:
+    """Tests for SqliteWebhookEventRepository.cleanup_old_events."""
+
+    def test_deletes_old_events_in_chunks(self, engine) -> None:
+        repo = SqliteWebhookEventRepository(engine)
+        _insert_events(engine, 25, age_days=8, prefix="old")
+        _insert_events(engine, 5, age_days=6, prefix="recent")
+
+        assert repo.cleanup_old_events(days=7, batch_size=10) == 25
+        assert _count(engine, WebhookEventRecord) == 5
+        assert repo.is_processed("recent-0")
+        assert not repo.is_processed("old-0")
+
+    def test_predicate_uses_index(self, engine) -> None:
+        with engine.connect() as conn:
+            plan = conn.exec_driver_sql(
+                "EXPLAIN QUERY PLAN SELECT id FROM webhook_events WHERE processed_at < ?",
+                (datetime.utcnow(),),
+            ).all()
+
+        assert "ix_webhook_events_processed_at" in str(plan)
+
+
+class TestRetentionScheduler:
+    """Tests for RetentionScheduler."""
+
+    def test_run_once_records_metrics(self) -> None:
+        scheduler = RetentionScheduler()
+        purged = iter([3, 0])
+        scheduler.add_job("agents", lambda: next(purged))
+
+        assert scheduler.run_once() == {"agents": 3}
+        assert scheduler.run_once() == {"agents": 0}
+
+        metrics = scheduler.metrics()["agents"]
+        assert (metrics["rows_purged"], metrics["runs"], metrics["last_purged"]) == (3, 2, 0)
+        assert metrics["last_run_at"] is not None
+        assert metrics["errors"] == 0
+
+    def test_failing_job_does_not_stop_others(self) -> None:
+        scheduler = RetentionScheduler()
+
+        def fail() -> int:
+            raise RuntimeError("database is locked")
+
+        scheduler.add_job("agents", fail)
+        scheduler.add_job("webhook_events", lambda: 2)
+
+        assert scheduler.run_once() == {"webhook_events": 2}
+        metrics = scheduler.metrics()
+        assert metrics["agents"]["errors"] == 1
+        assert metrics["agents"]["last_error"] == "database is locked"
+        assert metrics["webhook_events"]["rows_purged"] == 2
+
+    @pytest.mark.asyncio
+    async def test_background_task(self) -> None:
+        scheduler = RetentionScheduler(interval_seconds=0.01)
+        scheduler.add_job("webhook_events", lambda: 1)
+
+        task = scheduler.start()
+        assert scheduler.start() is task
+        for _ in range(200):
+            if scheduler.metrics()["webhook_events"]["runs"] >= 2:
+                break
+            await asyncio.sleep(0.01)
+        await scheduler.stop()
+
+        assert not scheduler.running
+        assert scheduler.metrics()["webhook_events"]["rows_purged"] >= 2
+
+
+def test_large_webhook_cleanup_is_set_based(engine) -> None:
+    """Purging 10k events issues one DELETE per chunk and loads no rows."""
+    _insert_events(engine, 10_000, age_days=8, prefix="old")
+    _insert_events(engine, 1_000, age_days=1, prefix="new")
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, sql, *args: statements.append(sql),
+    )
+
+    deleted = SqliteWebhookEventRepository(engine).cleanup_old_events(days=7, batch_size=1_000)
+
+    deletes = [sql for sql in statements if sql.startswith("DELETE FROM webhook_events")]
+    assert len(deletes) == len(statements) == 11
+    assert deleted == 10_000
+    assert _count(engine, WebhookEventRecord) == 1_000
@@ -4,18 +4,25 @@ Tests all CRUD operations for workflow runs and execution state
 using temporary database files.
 """
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, select, text
 from sqlalchemy.orm import Session
 
+from configurable_agents.storage.base import (
+    CostLedgerEntry,
+    CostLedgerFilter,
+    WorkflowRunSummary,
+)
 from configurable_agents.storage.models import (
     Base,
     ExecutionStateRecord,
     WorkflowRunRecord,
 )
 from configurable_agents.storage.sqlite import (
+    DURATION_BIN_BOUNDS,
+    SQLiteCostLedgerRepository,
     SQLiteExecutionStateRepository,
     SQLiteWorkflowRunRepository,
 )
@@ -359,6 +366,282 @@ class TestSQLiteWorkflowRunRepo:
             )
 
 
+class TestRunListing:
+    """Tests for keyset-paginated, column-projected run listing."""
+
+    @pytest.fixture
+    def seeded_repo(self, runs_repo):
+        """30 runs over two workflows and two statuses, one per minute."""
+        base = datetime(2026, 1, 1)
+        for i in range(30):
+            runs_repo.add(
+                WorkflowRunRecord(
+                    id=f"run-{i:02d}",
+                    workflow_name="even" if i % 2 == 0 else "odd",
+                    status="failed" if i % 3 == 0 else "completed",
+                    config_snapshot="x" * 10_000,
+                    inputs="{}",
+                    started_at=base + timedelta(minutes=i),
+                    total_cost_usd=0.01,
+                )
+            )
+        return runs_repo
+
+    def test_pages_cover_all_runs_newest_first(self, seeded_repo) -> None:
+        seen, cursor = [], None
+        while True:
+            page, cursor = seeded_repo.list_runs(limit=7, cursor=cursor)
+            seen.extend(run.id for run in page)
+            if cursor is None:
+                break
+
+        assert seen == [f"run-{i:02d}" for i in range(29, -1, -1)]
+
+    def test_filters(self, seeded_repo) -> None:
+        page, cursor = seeded_repo.list_runs(workflow_name="even", statuses=["failed"])
+
+        assert [run.id for run in page] == ["run-24", "run-18", "run-12", "run-06", "run-00"]
+        assert cursor is None
+        assert seeded_repo.count_runs(workflow_name="even", statuses=["failed"]) == 5
+        assert seeded_repo.count_runs() == 30
+
+    def test_started_after(self, seeded_repo) -> None:
+        page, _ = seeded_repo.list_runs(started_after=datetime(2026, 1, 1, 0, 27))
+
+        assert [run.id for run in page] == ["run-29", "run-28", "run-27"]
+
+    def test_runs_sharing_a_timestamp_are_not_skipped(self, runs_repo) -> None:
+        started = datetime(2026, 1, 1)
+        for run_id in ("a", "b", "c"):
+            runs_repo.add(
+                WorkflowRunRecord(id=run_id, workflow_name="wf", status="completed", started_at=started)
+            )
+
+        first, cursor = runs_repo.list_runs(limit=2)
+        second, _ = runs_repo.list_runs(limit=2, cursor=cursor)
+
+        assert [run.id for run in first + second] == ["c", "b", "a"]
+
+    def test_summaries_skip_payload_columns(self, seeded_repo, temp_engine) -> None:
+        statements = []
+        event.listen(
+            temp_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        page, _ = seeded_repo.list_runs(limit=1)
+
+        assert isinstance(page[0], WorkflowRunSummary)
+        assert page[0].total_cost_usd == 0.01
+        assert not any(col in statements[0] for col in ("config_snapshot", "inputs", "outputs"))
+
+    def test_listing_uses_index(self, temp_engine) -> None:
+        with temp_engine.connect() as conn:
+            plan = conn.execute(
+                text(
+                    "EXPLAIN QUERY PLAN SELECT id FROM workflow_runs WHERE workflow_name = 'wf' "
+                    "ORDER BY started_at DESC, id DESC LIMIT 10"
+                )
+            ).all()
+
+        details = " ".join(str(row[-1]) for row in plan)
+        assert "ix_workflow_runs_workflow_name_started_at" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_invalid_cursor_rejected(self, runs_repo) -> None:
+        with pytest.raises(ValueError, match="Invalid run cursor"):
+            runs_repo.list_runs(cursor="not-a-cursor")
+
+
+class TestMetricsRollups:
+    """Tests for incrementally maintained metrics rollups."""
+
+    def finish(self, repo, run_id, workflow="wf", status="completed", duration=1.0, cost=0.1):
+        repo.add(WorkflowRunRecord(id=run_id, workflow_name=workflow, status="running"))
+        repo.update_run_completion(run_id, status, duration, 100, cost)
+
+    def test_completion_updates_totals(self, runs_repo) -> None:
+        self.finish(runs_repo, "a", duration=2.0, cost=0.25)
+        self.finish(runs_repo, "b", status="failed", duration=4.0, cost=0.5)
+        self.finish(runs_repo, "c", workflow="other")
+
+        totals = runs_repo.rollups.totals()
+        assert totals["runs"] == 3
+        assert totals["by_status"] == {"completed": 2, "failed": 1}
+        assert totals["total_tokens"] == 300
+        assert totals["total_cost_usd"] == pytest.approx(0.85)
+        assert totals["avg_duration_seconds"] == pytest.approx(7.0 / 3)
+        assert runs_repo.rollups.totals("other")["runs"] == 1
+
+    def test_buckets_per_granularity(self, runs_repo) -> None:
+        self.finish(runs_repo, "a")
+        self.finish(runs_repo, "b", workflow="other")
+
+        for granularity in ("minute", "hour", "day"):
+            buckets = runs_repo.rollups.query(granularity)
+            assert sum(bucket["runs"] for bucket in buckets) == 2
+        by_workflow = runs_repo.rollups.query("day", by_workflow=True)
+        assert sorted(bucket["workflow_name"] for bucket in by_workflow) == ["other", "wf"]
+        assert runs_repo.rollups.query("hour", start=datetime.utcnow() + timedelta(hours=2)) == []
+
+    def test_percentiles_within_bin_resolution(self, runs_repo) -> None:
+        for i in range(100):
+            self.finish(runs_repo, f"r{i}", duration=float(i + 1))
+
+        totals = runs_repo.rollups.totals()
+        # Adjacent bins differ by sqrt(2), so estimates are within ~20%
+        assert totals["p50_duration_seconds"] == pytest.approx(50, rel=0.2)
+        assert totals["p95_duration_seconds"] == pytest.approx(95, rel=0.2)
+        assert DURATION_BIN_BOUNDS[-1] > 3600
+
+    def test_status_change_moves_run(self, runs_repo) -> None:
+        self.finish(runs_repo, "a")
+        runs_repo.update_status("a", "cancelled")
+        runs_repo.add(WorkflowRunRecord(id="b", workflow_name="wf", status="running"))
+        runs_repo.update_status("b", "cancelled")
+
+        totals = runs_repo.rollups.totals()
+        assert totals["runs"] == 2
+        assert totals["by_status"] == {"cancelled": 2}
+        assert totals["total_cost_usd"] == pytest.approx(0.1)
+
+    def test_backfill_matches_incremental(self, runs_repo) -> None:
+        for i in range(25):
+            self.finish(runs_repo, f"r{i}", workflow=f"wf-{i % 3}", duration=i + 0.5)
+        runs_repo.add(WorkflowRunRecord(id="live", workflow_name="wf-0", status="running"))
+        incremental = runs_repo.rollups.query("minute", by_workflow=True)
+
+        assert runs_repo.rollups.backfill() == 25
+        assert runs_repo.rollups.query("minute", by_workflow=True) == incremental
+
+    def test_prune_keeps_all_time_totals(self, runs_repo) -> None:
+        self.finish(runs_repo, "a")
+
+        assert runs_repo.rollups.prune("minute", datetime.utcnow() + timedelta(minutes=1)) == 1
+        assert runs_repo.rollups.query("minute") == []
+        assert runs_repo.rollups.totals()["runs"] == 1
+        with pytest.raises(ValueError, match="granularity"):
+            runs_repo.rollups.prune("all", datetime.utcnow())
+
+    def test_unknown_granularity_rejected(self, runs_repo) -> None:
+        with pytest.raises(ValueError, match="Unknown rollup granularity"):
+            runs_repo.rollups.query("week")
+
+
+class TestCostLedger:
+    """Tests for the append-only cost ledger."""
+
+    @pytest.fixture
+    def ledger(self, runs_repo):
+        return runs_repo.cost_ledger
+
+    def entry(self, run_id, day=1, workflow="wf", model="gpt-4o", provider="openai", **kwargs):
+        values = dict(input_tokens=100, output_tokens=50, cost_usd=0.01, calls=1, status="success")
+        values.update(kwargs)
+        return CostLedgerEntry(
+            run_id=run_id,
+            workflow_name=workflow,
+            started_at=datetime(2026, 1, day, 12),
+            model=model,
+            provider=provider,
+            experiment="exp",
+            **values,
+        )
+
+    def test_attached_to_run_repository(self, runs_repo) -> None:
+        assert isinstance(runs_repo.cost_ledger, SQLiteCostLedgerRepository)
+
+    def test_iter_runs_sums_models_per_run(self, ledger) -> None:
+        ledger.append([
+            self.entry("a", model="gpt-4o"),
+            self.entry("a", model="claude-3", provider="anthropic", cost_usd=0.02),
+            self.entry("b", day=2),
+        ])
+
+        runs = list(ledger.iter_runs())
+        assert [run.run_id for run in runs] == ["b", "a"]
+        assert runs[1].cost_usd == pytest.approx(0.03)
+        assert runs[1].input_tokens == 200
+        assert runs[1].calls == 2
+        assert (runs[1].model, runs[1].provider) == (None, None)
+        assert (runs[0].model, runs[0].provider) == ("gpt-4o", "openai")
+
+    def test_iter_runs_pages_with_keyset(self, ledger) -> None:
+        # Same start time for several runs: the run_id tiebreaker keeps pages disjoint
+        ledger.append([self.entry(f"r{i:02d}", day=1 + i % 3) for i in range(25)])
+
+        runs = list(ledger.iter_runs(batch_size=4))
+        assert len(runs) == 25
+        assert len({run.run_id for run in runs}) == 25
+        keys = [(run.started_at, run.run_id) for run in runs]
+        assert keys == sorted(keys, reverse=True)
+
+    def test_filters_pushed_down(self, ledger) -> None:
+        ledger.append([
+            self.entry("a", day=1, workflow="wf-a"),
+            self.entry("b", day=5, workflow="wf-b", model="claude-3", provider="anthropic"),
+            self.entry("c", day=9, workflow="wf-a", status="failure", cost_usd=0.0),
+        ])
+
+        def ids(**kwargs):
+            return {run.run_id for run in ledger.iter_runs(CostLedgerFilter(**kwargs))}
+
+        assert ids(workflow_name="wf-a") == {"a", "c"}
+        assert ids(provider="anthropic") == {"b"}
+        assert ids(model="gpt-4o", status="success") == {"a"}
+        assert ids(start=datetime(2026, 1, 5), end=datetime(2026, 1, 9)) == {"b"}
+        assert ids(experiment="other") == set()
+
+    def test_summarize(self, ledger) -> None:
+        ledger.append([
+            self.entry("a", model="gpt-4o"),
+            self.entry("a", model="claude-3", provider="anthropic", cost_usd=0.02),
+            self.entry("b", day=3, workflow="other", status="failure", cost_usd=0.0,
+                       model="unknown", provider="unknown", input_tokens=0, output_tokens=0),
+        ])
+
+        summary = ledger.summarize()
+        assert summary["total_runs"] == 2
+        assert summary["successful_runs"] == 1
+        assert summary["failed_runs"] == 1
+        assert summary["total_tokens"] == 300
+        assert summary["total_cost_usd"] == pytest.approx(0.03)
+        assert summary["by_workflow"] == pytest.approx({"wf": 0.03, "other": 0.0})
+        assert summary["by_model"] == pytest.approx({"gpt-4o": 0.01, "claude-3": 0.02})
+        assert summary["first_started_at"] == datetime(2026, 1, 1, 12)
+        assert summary["last_started_at"] == datetime(2026, 1, 3, 12)
+        assert ledger.summarize(CostLedgerFilter(workflow_name="none"))["total_runs"] == 0
+
+    def test_aggregate_by_day_and_provider(self, ledger) -> None:
+        ledger.append([
+            self.entry("a", day=1),
+            self.entry("b", day=1, model="claude-3", provider="anthropic", cost_usd=0.04),
+            self.entry("c", day=2),
+        ])
+
+        assert ledger.aggregate_by_day() == pytest.approx(
+            {"2026-01-01": 0.05, "2026-01-02": 0.01}
+        )
+        report = ledger.by_provider()
+        assert report["openai"]["run_count"] == 2
+        assert report["openai"]["total_tokens"] == 300
+        assert report["anthropic"]["models"]["claude-3"]["total_cost_usd"] == pytest.approx(0.04)
+
+    def test_queries_use_indexes(self, ledger, temp_engine) -> None:
+        with temp_engine.connect() as conn:
+            plan = " ".join(
+                str(row[-1])
+                for row in conn.execute(
+                    text(
+                        "EXPLAIN QUERY PLAN SELECT sum(cost_usd) FROM cost_ledger "
+                        "WHERE workflow_name = 'wf' AND started_at >= '2026-01-01'"
+                    )
+                )
+            )
+        assert "ix_cost_ledger_workflow_started_at" in plan
+
+
 class TestSQLiteExecutionStateRepo:
     """Tests for SQLiteExecutionStateRepository."""
 
@@ -487,3 +770,110 @@ class TestSQLiteExecutionStateRepo:
 
         assert len(history) == 1
         assert history[0]["state_data"] == original_state
+
+
+def test_paging_through_runs_matches_full_listing(runs_repo, temp_engine) -> None:
+    """Keyset pages of run summaries cover every run once, newest first."""
+    base = datetime(2026, 1, 1)
+    with Session(temp_engine) as session:
+        session.add_all(
+            WorkflowRunRecord(
+                id=f"run-{i:04d}",
+                workflow_name=f"wf-{i % 10}",
+                status="completed",
+                config_snapshot="x" * 2_000,
+                started_at=base + timedelta(seconds=i // 3),
+            )
+            for i in range(1_000)
+        )
+        session.commit()
+    with Session(temp_engine) as session:
+        expected = session.scalars(
+            select(WorkflowRunRecord.id).order_by(
+                WorkflowRunRecord.started_at.desc(), WorkflowRunRecord.id.desc()
+            )
+        ).all()
+
+    listed, pages, cursor = [], 0, None
+    while True:
+        page, cursor = runs_repo.list_runs(limit=100, cursor=cursor)
+        listed.extend(run.id for run in page)
+        pages += 1
+        if cursor is None:
+            break
+
+    assert listed == expected
+    assert pages <= 11
+
+
+def test_rollup_totals_do_not_scan_runs(runs_repo, temp_engine) -> None:
+    """Dashboard totals come from the rollup rows, however many runs exist."""
+
+    def seed(start, count):
+        base = datetime(2026, 1, 1)
+        with Session(temp_engine) as session:
+            session.add_all(
+                WorkflowRunRecord(
+                    id=f"run-{i:05d}",
+                    workflow_name=f"wf-{i % 10}",
+                    status="completed",
+                    started_at=base + timedelta(minutes=i),
+                    completed_at=base + timedelta(minutes=i, seconds=30),
+                    duration_seconds=30.0,
+                    total_cost_usd=0.01,
+                )
+                for i in range(start, start + count)
+            )
+            session.commit()
+        runs_repo.rollups.backfill()
+
+    statements = []
+    event.listen(
+        temp_engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    seed(0, 500)
+    assert runs_repo.rollups.totals()["runs"] == 500
+
+    seed(500, 1_500)
+    statements.clear()
+    totals = runs_repo.rollups.totals()
+    assert totals["runs"] == 2_000
+    assert totals["total_cost_usd"] == pytest.approx(20.0)
+    assert statements and not any("workflow_runs" in statement for statement in statements)
+
+
+def test_filtered_ledger_summary_matches_rows(runs_repo) -> None:
+    """Summary for one workflow and week matches the rows in that window."""
+    base = datetime(2026, 1, 1)
+    entries = [
+        CostLedgerEntry(
+            run_id=f"run-{i:05d}",
+            workflow_name=f"wf-{i % 50}",
+            started_at=base + timedelta(minutes=10 * i),
+            status="success",
+            model="gpt-4o",
+            provider="openai",
+            input_tokens=100,
+            output_tokens=50,
+            cost_usd=0.01,
+        )
+        for i in range(5_000)
+    ]
+    runs_repo.cost_ledger.append(entries)
+    filters = CostLedgerFilter(
+        workflow_name="wf-7", start=base + timedelta(days=10), end=base + timedelta(days=17)
+    )
+    matching = [
+        entry
+        for entry in entries
+        if entry.workflow_name == "wf-7" and filters.start <= entry.started_at < filters.end
+    ]
+
+    summary = runs_repo.cost_ledger.summarize(filters)
+    assert summary["total_runs"] == len(matching) > 0
+    assert summary["total_cost_usd"] == pytest.approx(0.01 * len(matching))
+    assert summary["by_workflow"] == pytest.approx({"wf-7": 0.01 * len(matching)})
+    assert runs_repo.cost_ledger.summarize()["total_runs"] == 5_000
@@ -624,6 +624,7 @@ def test_cmd_report_costs_success(mock_date_filter, mock_reporter_class):
 
     # Create args
     args = Namespace(
+        source="mlflow",
         tracking_uri="file://./mlruns",
         experiment=None,
         workflow=None,
@@ -662,6 +663,7 @@ def test_cmd_report_costs_no_entries(mock_reporter_class):
 
     # Create args
     args = Namespace(
+        source="mlflow",
         tracking_uri="file://./mlruns",
         experiment=None,
         workflow=None,
@@ -694,6 +696,7 @@ def test_cmd_report_costs_mlflow_unavailable(mock_reporter_class):
 
     # Create args
     args = Namespace(
+        source="mlflow",
         tracking_uri="file://./mlruns",
         experiment=None,
         workflow=None,
@@ -765,6 +768,7 @@ def test_cmd_report_costs_with_export(mock_date_filter, mock_reporter_class, tmp
     # Create args with output file
     output_file = tmp_path / "costs.json"
     args = Namespace(
+        source="mlflow",
         tracking_uri="file://./mlruns",
         experiment=None,
         workflow=None,
@@ -801,6 +805,7 @@ def test_cmd_report_costs_invalid_period(mock_reporter_class):
 
     # Create args with invalid period (will fail at get_date_range_filter)
     args = Namespace(
+        source="mlflow",
         tracking_uri="file://./mlruns",
         experiment=None,
         workflow=None,
@@ -825,13 +830,66 @@ def test_cmd_report_costs_invalid_period(mock_reporter_class):
     assert exit_code == 1
 
 
+def test_cmd_report_costs_from_ledger(tmp_path):
+    """Test cost report answered from the local cost ledger (default source)."""
+    from argparse import Namespace
+    from datetime import datetime
+    import json
+
+    from configurable_agents.observability.cost_reporter import open_cost_ledger
+    from configurable_agents.storage.base import CostLedgerEntry
+
+    db_path = str(tmp_path / "workflows.db")
+    open_cost_ledger(db_path).append([
+        CostLedgerEntry(
+            run_id=f"run_{i}",
+            workflow_name="workflow_a" if i % 2 else "workflow_b",
+            started_at=datetime(2026, 1, 15, i),
+            status="success",
+            model="gpt-4o",
+            provider="openai",
+            input_tokens=100,
+            output_tokens=400,
+            cost_usd=0.005,
+        )
+        for i in range(4)
+    ])
+
+    output_file = tmp_path / "costs.json"
+    args = Namespace(
+        source="ledger",
+        db=db_path,
+        experiment=None,
+        workflow="workflow_a",
+        period=None,
+        start_date=None,
+        end_date=None,
+        status=None,
+        model="gpt-4o",
+        provider=None,
+        breakdown=True,
+        aggregate_by="monthly",
+        output=str(output_file),
+        format="json",
+        include_summary=True,
+        verbose=False,
+    )
+
+    exit_code = cmd_report_costs(args)
+
+    assert exit_code == 0
+    exported = json.loads(output_file.read_text())
+    assert [entry["workflow_name"] for entry in exported["entries"]] == ["workflow_a"] * 2
+    assert exported["summary"]["total_runs"] == 2
+
+
 # --- Test Summary ---
-# Total: 47 tests
+# Total: 48 tests
 # - Input parsing: 11 tests
 # - Color output: 8 tests
 # - Argument parser: 6 tests
 # - cmd_run: 9 tests
 # - cmd_validate: 4 tests
-# - cmd_report_costs: 5 tests
+# - cmd_report_costs: 6 tests
 # - main(): 2 tests
 # - Integration: 2 tests
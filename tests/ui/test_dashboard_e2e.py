@@ -176,6 +176,8 @@ class TestDashboardPageLoads:
             assert "text/html" in content_type
             text = response.text
             assert "Workflow" in text
+            # The table refreshes on the stream's delta events
+            assert 'hx-trigger="sse:workflow_update_delta"' in text
 
     async def test_workflows_page_without_trailing_slash(self):
         """Test GET /workflows (no trailing slash) works."""
@@ -197,6 +199,7 @@ class TestDashboardPageLoads:
             assert "text/html" in content_type
             text = response.text
             assert "Agent" in text
+            assert 'hx-trigger="sse:agent_update_delta"' in text
 
     async def test_agents_page_without_trailing_slash(self):
         """Test GET /agents (no trailing slash) works."""
@@ -560,6 +560,33 @@ class TestMetricsEndpoints:
         assert "total_cost_usd" in data
         assert "timestamp" in data
 
+    async def test_metrics_summary_reads_rollups(self, dashboard_app, seeded_workflow_repo):
+        """Summary counts and cost match the seeded runs via the rollups."""
+        transport = ASGITransport(app=dashboard_app.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics/summary")
+
+        data = response.json()
+        runs, _ = seeded_workflow_repo.list_runs(limit=1000)
+        assert data["total_workflows"] == len(runs)
+        finished_cost = sum(
+            r.total_cost_usd or 0 for r in runs if r.status not in ("running", "pending")
+        )
+        assert data["total_cost_usd"] == pytest.approx(finished_cost)
+
+    async def test_metrics_rollups(self, dashboard_app):
+        """GET /metrics/rollups returns buckets and totals."""
+        transport = ASGITransport(app=dashboard_app.app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            response = await client.get("/metrics/rollups?granularity=day&hours=48")
+            invalid = await client.get("/metrics/rollups?granularity=week")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["granularity"] == "day"
+        assert data["totals"]["runs"] == sum(bucket["runs"] for bucket in data["buckets"])
+        assert invalid.status_code == 400
+
 
 @pytest.mark.asyncio
 class TestAgentsEndpoints:
@@ -0,0 +1,190 @@
+"""Tests for the shared, change-detecting SSE publisher."""
+
+import asyncio
+import json
+
+import pytest
+
+from configurable_agents.ui.dashboard.publisher import SSEPublisher
+
+
+class Source:
+    """Mutable item source that counts fetches."""
+
+    def __init__(self, items):
+        self.items = {item["id"]: item for item in items}
+        self.fetches = 0
+
+    def __call__(self):
+        self.fetches += 1
+        return [dict(item) for item in self.items.values()]
+
+
+def parse(message):
+    """Split an SSE message into (id, event, data)."""
+    fields = dict(line.split(": ", 1) for line in message.strip().split("\n"))
+    return fields.get("id"), fields.get("event"), json.loads(fields["data"])
+
+
+@pytest.fixture
+def source():
+    return Source([{"id": "r1", "status": "running"}, {"id": "r2", "status": "pending"}])
+
+
+@pytest.fixture
+def publisher(source):
+    # Long interval: tests drive polls with refresh()
+    return SSEPublisher("workflow_update", source, interval=3600)
+
+
+@pytest.mark.asyncio
+class TestDeltas:
+    """Tests for snapshots and deltas."""
+
+    async def test_snapshot_then_delta(self, publisher, source):
+        stream = publisher.stream()
+        _, event, data = parse(await stream.__anext__())
+        assert event == "workflow_update"
+        assert [item["id"] for item in data] == ["r1", "r2"]
+
+        source.items["r1"]["status"] = "completed"
+        del source.items["r2"]
+        source.items["r3"] = {"id": "r3", "status": "running"}
+        await publisher.refresh()
+
+        _, event, data = parse(await stream.__anext__())
+        assert event == "workflow_update_delta"
+        assert data == {
+            "changed": [{"id": "r1", "status": "completed"}, {"id": "r3", "status": "running"}],
+            "removed": ["r2"],
+        }
+        await stream.aclose()
+
+    async def test_unchanged_poll_publishes_nothing(self, publisher):
+        stream = publisher.stream()
+        await stream.__anext__()
+
+        assert await publisher.refresh() is None
+        assert publisher.stats()["deltas"] == 0
+        await stream.aclose()
+
+    async def test_one_fetch_per_poll_for_all_clients(self, publisher, source):
+        streams = [publisher.stream() for _ in range(50)]
+        for stream in streams:
+            await stream.__anext__()
+        source.items["r1"]["status"] = "failed"
+
+        await publisher.refresh()
+
+        assert source.fetches == 2  # Initial snapshot + one poll
+        for stream in streams:
+            _, event, _ = parse(await stream.__anext__())
+            assert event == "workflow_update_delta"
+            await stream.aclose()
+        assert publisher.stats()["subscribers"] == 0
+
+
+@pytest.mark.asyncio
+class TestResume:
+    """Tests for Last-Event-ID resume."""
+
+    async def test_resume_sends_only_missed_deltas(self, publisher, source):
+        stream = publisher.stream()
+        last_id, _, _ = parse(await stream.__anext__())
+        await stream.aclose()
+
+        source.items["r1"]["status"] = "completed"
+        await publisher.refresh()
+        source.items["r2"]["status"] = "running"
+        await publisher.refresh()
+
+        resumed = publisher.stream(last_id)
+        first = parse(await resumed.__anext__())
+        second = parse(await resumed.__anext__())
+        assert [first[1], second[1]] == ["workflow_update_delta"] * 2
+        assert first[2]["changed"][0]["id"] == "r1"
+        assert second[0] == publisher.last_event_id
+        await resumed.aclose()
+
+    async def test_unknown_or_expired_id_gets_snapshot(self, source):
+        publisher = SSEPublisher("workflow_update", source, interval=3600, history_size=1)
+        stream = publisher.stream()
+        last_id, _, _ = parse(await stream.__anext__())
+        await stream.aclose()
+        for status in ("a", "b", "c"):
+            source.items["r1"]["status"] = status
+            await publisher.refresh()
+
+        for stale in (last_id, "other-epoch-3", "garbage"):
+            resumed = publisher.stream(stale)
+            _, event, data = parse(await resumed.__anext__())
+            assert event == "workflow_update"
+            assert data[0]["status"] == "c"
+            await resumed.aclose()
+
+
+@pytest.mark.asyncio
+class TestBackpressure:
+    """Tests for slow clients."""
+
+    async def test_slow_client_resynced_with_snapshot(self, source):
+        publisher = SSEPublisher("workflow_update", source, interval=3600, queue_size=2)
+        slow = publisher.stream()
+        await slow.__anext__()
+
+        for i in range(10):
+            source.items["r1"]["status"] = f"step-{i}"
+            await publisher.refresh()
+
+        _, event, data = parse(await slow.__anext__())
+        assert event == "workflow_update"
+        assert data[0]["status"] == "step-9"
+        assert publisher.stats()["resyncs"] == 1
+
+        source.items["r2"]["status"] = "running"
+        await publisher.refresh()
+        _, event, _ = parse(await slow.__anext__())
+        assert event == "workflow_update_delta"
+        await slow.aclose()
+
+
+@pytest.mark.asyncio
+class TestPolling:
+    """Tests for the shared poll loop."""
+
+    async def test_polls_only_while_subscribed(self, source):
+        publisher = SSEPublisher("workflow_update", source, interval=0.01)
+        stream = publisher.stream()
+        await stream.__anext__()
+        source.items["r1"]["status"] = "completed"
+
+        _, event, _ = parse(await asyncio.wait_for(stream.__anext__(), timeout=2))
+        assert event == "workflow_update_delta"
+
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        fetches = source.fetches
+        await asyncio.sleep(0.05)
+        assert source.fetches == fetches
+        await publisher.close()
+
+    async def test_notify_triggers_immediate_poll(self, publisher, source):
+        stream = publisher.stream()
+        await stream.__anext__()
+        source.items["r2"]["status"] = "running"
+
+        publisher.notify()
+
+        _, event, _ = parse(await asyncio.wait_for(stream.__anext__(), timeout=2))
+        assert event == "workflow_update_delta"
+        await stream.aclose()
+        await publisher.close()
+
+    async def test_idle_stream_sends_heartbeat(self, source):
+        publisher = SSEPublisher("workflow_update", source, interval=3600, heartbeat_interval=0.01)
+        stream = publisher.stream()
+        await stream.__anext__()
+
+        assert await stream.__anext__() == ": heartbeat\n\n"
+        await stream.aclose()
+        await publisher.close()
@@ -211,8 +211,7 @@ class TestWebhookHandler:
 
         # Mock webhook repository
         webhook_repo = Mock()
-        webhook_repo.is_processed = Mock(return_value=True)
-        webhook_repo.mark_processed = Mock()
+        webhook_repo.claim = Mock(return_value=False)
 
         # Mock request
         request = Mock()
@@ -238,8 +237,7 @@ class TestWebhookHandler:
 
         # Mock webhook repository
         webhook_repo = Mock()
-        webhook_repo.is_processed = Mock(return_value=False)
-        webhook_repo.mark_processed = Mock()
+        webhook_repo.claim = Mock(return_value=True)
 
         # Mock request
         request = Mock()
@@ -255,9 +253,8 @@ class TestWebhookHandler:
         result = await handler.handle_webhook(request, handler_func, webhook_repo=webhook_repo)
 
         assert result == {"status": "ok"}
-        # Check that webhook was marked as processed
-        webhook_repo.is_processed.assert_called_once_with("abc123")
-        webhook_repo.mark_processed.assert_called_once_with("abc123", "unknown")
+        # Check that webhook was claimed
+        webhook_repo.claim.assert_called_once_with("abc123", "unknown")
 
     @pytest.mark.asyncio
     async def test_handle_webhook_with_provider_in_data(self):
@@ -266,8 +263,7 @@ class TestWebhookHandler:
 
         # Mock webhook repository
         webhook_repo = Mock()
-        webhook_repo.is_processed = Mock(return_value=False)
-        webhook_repo.mark_processed = Mock()
+        webhook_repo.claim = Mock(return_value=True)
 
         # Mock request with provider
         request = Mock()
@@ -283,7 +279,7 @@ class TestWebhookHandler:
         await handler.handle_webhook(request, handler_func, webhook_repo=webhook_repo)
 
         # Check that provider was used
-        webhook_repo.mark_processed.assert_called_once_with("abc123", "test-provider")
+        webhook_repo.claim.assert_called_once_with("abc123", "test-provider")
 
     @pytest.mark.asyncio
     async def test_handle_webhook_non_dict_result(self):
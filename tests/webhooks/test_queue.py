@@ -0,0 +1,290 @@
+"""Tests for the webhook workflow job queue worker pool."""
+
+import asyncio
+import threading
+
+import pytest
+from sqlalchemy import create_engine, delete, update
+from sqlalchemy.orm import Session
+
+from configurable_agents.storage.models import Base, WorkflowJobRecord
+from configurable_agents.storage.sqlite import SqliteWorkflowJobRepository
+from configurable_agents.webhooks.queue import WorkflowJobQueue, parse_concurrency_limits
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    return SqliteWorkflowJobRepository(engine)
+
+
+async def _wait_for(predicate, timeout: float = 5.0) -> None:
+    """Poll until predicate() is true."""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError("condition not reached")
+        await asyncio.sleep(0.01)
+
+
+class TestParseConcurrencyLimits:
+    """Tests for parse_concurrency_limits."""
+
+    def test_parses_pairs(self) -> None:
+        assert parse_concurrency_limits(" a.yaml=1, b=2 ,") == {"a.yaml": 1, "b": 2}
+        assert parse_concurrency_limits(None) == {}
+
+    @pytest.mark.parametrize("spec", ["a", "=1", "a=0", "a=x"])
+    def test_rejects_invalid(self, spec) -> None:
+        with pytest.raises(ValueError):
+            parse_concurrency_limits(spec)
+
+
+class TestRunOnce:
+    """Tests for running single jobs."""
+
+    @pytest.mark.asyncio
+    async def test_success_notifies_source(self, jobs) -> None:
+        async def runner(name, inputs):
+            return {"echo": inputs["input"]}
+
+        delivered = []
+
+        async def notifier(job):
+            delivered.append(job)
+
+        queue = WorkflowJobQueue(jobs, runner=runner)
+        queue.register_notifier("whatsapp", notifier)
+        job = await queue.enqueue("w.yaml", {"input": "hi"}, source="whatsapp", reply_to="123")
+
+        done = await queue.run_once()
+
+        assert done.id == job.id
+        assert done.status == "succeeded"
+        assert done.result == {"echo": "hi"}
+        assert [d.reply_to for d in delivered] == ["123"]
+        assert await queue.run_once() is None
+
+    @pytest.mark.asyncio
+    async def test_non_dict_result_wrapped(self, jobs) -> None:
+        async def runner(name, inputs):
+            return "text"
+
+        queue = WorkflowJobQueue(jobs, runner=runner)
+        await queue.enqueue("w", {})
+
+        assert (await queue.run_once()).result == {"result": "text"}
+
+    @pytest.mark.asyncio
+    async def test_retries_then_fails(self, jobs) -> None:
+        async def runner(name, inputs):
+            raise RuntimeError("boom")
+
+        delivered = []
+
+        async def notifier(job):
+            delivered.append(job)
+
+        queue = WorkflowJobQueue(jobs, runner=runner, max_attempts=2, retry_backoff=0)
+        queue.register_notifier("telegram", notifier)
+        await queue.enqueue("w", {}, source="telegram", reply_to="42")
+
+        assert (await queue.run_once()).status == "queued"
+        assert delivered == []
+        failed = await queue.run_once()
+
+        assert failed.status == "failed"
+        assert failed.error == "boom"
+        assert [d.status for d in delivered] == ["failed"]
+        metrics = queue.metrics()
+        assert (metrics["retried"], metrics["failed"], metrics["succeeded"]) == (1, 1, 0)
+        assert metrics["jobs"]["failed"] == 1
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fails", [False, True])
+    async def test_job_deleted_while_running(self, jobs, fails) -> None:
+        async def runner(name, inputs):
+            with Session(jobs.engine) as session:
+                session.execute(delete(WorkflowJobRecord))
+                session.commit()
+            if fails:
+                raise RuntimeError("boom")
+            return {}
+
+        delivered = []
+
+        async def notifier(job):
+            delivered.append(job)
+
+        queue = WorkflowJobQueue(jobs, runner=runner)
+        queue.register_notifier("whatsapp", notifier)
+        job = await queue.enqueue("w", {}, source="whatsapp", reply_to="123")
+
+        done = await queue.run_once()
+
+        assert done.id == job.id
+        assert done.status == "running"
+        assert delivered == []
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("fails", [False, True])
+    async def test_lost_lease_discards_outcome(self, jobs, fails) -> None:
+        async def runner(name, inputs):
+            # Lease lapsed and another process claimed the job meanwhile
+            with Session(jobs.engine) as session:
+                session.execute(update(WorkflowJobRecord).values(worker_id="other"))
+                session.commit()
+            if fails:
+                raise RuntimeError("boom")
+            return {}
+
+        delivered = []
+
+        async def notifier(job):
+            delivered.append(job)
+
+        queue = WorkflowJobQueue(jobs, runner=runner, max_attempts=1)
+        queue.register_notifier("whatsapp", notifier)
+        job = await queue.enqueue("w", {}, source="whatsapp", reply_to="123")
+
+        await queue.run_once()
+
+        stored = jobs.get(job.id)
+        assert (stored.status, stored.worker_id) == ("running", "other")
+        assert delivered == []
+        assert (queue.metrics()["succeeded"], queue.metrics()["failed"]) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_enqueue_runs_off_event_loop(self, jobs) -> None:
+        loop_thread = threading.get_ident()
+        threads = []
+        insert = jobs.enqueue
+
+        def enqueue(*args, **kwargs):
+            threads.append(threading.get_ident())
+            return insert(*args, **kwargs)
+
+        jobs.enqueue = enqueue
+        queue = WorkflowJobQueue(jobs)
+
+        job = await queue.enqueue("w", {})
+
+        assert queue.get(job.id).status == "queued"
+        assert threads and loop_thread not in threads
+
+    @pytest.mark.asyncio
+    async def test_notifier_errors_are_contained(self, jobs) -> None:
+        async def runner(name, inputs):
+            return {}
+
+        async def notifier(job):
+            raise RuntimeError("send failed")
+
+        queue = WorkflowJobQueue(jobs, runner=runner)
+        queue.register_notifier("whatsapp", notifier)
+        await queue.enqueue("w", {}, source="whatsapp", reply_to="123")
+
+        assert (await queue.run_once()).status == "succeeded"
+
+
+class TestWorkerPool:
+    """Tests for the background workers."""
+
+    @pytest.mark.asyncio
+    async def test_per_workflow_concurrency_limit(self, jobs) -> None:
+        release = asyncio.Event()
+        running = {"slow": 0, "peak": 0}
+        finished = []
+
+        async def runner(name, inputs):
+            if name == "slow":
+                running["slow"] += 1
+                running["peak"] = max(running["peak"], running["slow"])
+                await release.wait()
+                running["slow"] -= 1
+            finished.append(name)
+            return {}
+
+        queue = WorkflowJobQueue(
+            jobs, runner=runner, workers=3, concurrency_limits={"slow": 1}, poll_interval=0.05
+        )
+        queue.start()
+        try:
+            for _ in range(3):
+                await queue.enqueue("slow", {}, priority=1)
+            await queue.enqueue("fast", {})
+
+            # The fast job runs while one slow job holds its only slot
+            await _wait_for(lambda: queue.metrics()["running"] == {"slow": 1} and finished == ["fast"])
+
+            release.set()
+            await _wait_for(lambda: jobs.count_by_status()["succeeded"] == 4)
+        finally:
+            await queue.stop()
+
+        assert running["peak"] == 1
+        assert sorted(finished) == ["fast", "slow", "slow", "slow"]
+
+    @pytest.mark.asyncio
+    async def test_start_requeues_only_expired_jobs(self, jobs) -> None:
+        job = jobs.enqueue("w", {}, priority=1)
+        other = jobs.enqueue("w", {})
+        jobs.claim_next(worker_id="crashed", lease_seconds=-1)  # Process died
+        jobs.claim_next(worker_id="other-process", lease_seconds=60)  # Still running
+
+        async def runner(name, inputs):
+            return {}
+
+        queue = WorkflowJobQueue(jobs, runner=runner, poll_interval=0.05)
+        queue.start()
+        try:
+            await _wait_for(lambda: jobs.get(job.id).status == "succeeded")
+        finally:
+            await queue.stop()
+
+        assert not queue.is_running
+        assert jobs.get(job.id).attempts == 1
+        assert jobs.get(other.id).status == "running"
+
+    @pytest.mark.asyncio
+    async def test_leases_renewed_while_running(self, jobs) -> None:
+        release = asyncio.Event()
+
+        async def runner(name, inputs):
+            await release.wait()
+            return {}
+
+        queue = WorkflowJobQueue(jobs, runner=runner, poll_interval=0.05, lease_seconds=0.3)
+        queue.start()
+        try:
+            job = await queue.enqueue("w", {})
+            await _wait_for(lambda: jobs.get(job.id).status == "running")
+            await asyncio.sleep(0.6)  # Two lease lengths
+
+            # Another process recovering abandoned jobs leaves this one alone
+            assert jobs.requeue_expired() == 0
+            assert jobs.get(job.id).worker_id == queue.worker_id
+
+            release.set()
+            await _wait_for(lambda: jobs.get(job.id).status == "succeeded")
+        finally:
+            await queue.stop()
+
+        assert jobs.get(job.id).attempts == 1
+
+    @pytest.mark.asyncio
+    async def test_stop_while_waking(self, jobs) -> None:
+        queue = WorkflowJobQueue(jobs, workers=2, poll_interval=0.01)
+        for _ in range(20):
+            queue.start()
+            await asyncio.sleep(0)
+            queue._wake()  # Cancel lands as the idle workers wake up
+            await asyncio.wait_for(queue.stop(), timeout=2)
+            assert not queue.is_running
+
+    def test_invalid_workers(self, jobs) -> None:
+        with pytest.raises(ValueError, match="workers"):
+            WorkflowJobQueue(jobs, workers=0)
+        with pytest.raises(ValueError, match="lease_seconds"):
+            WorkflowJobQueue(jobs, lease_seconds=0)
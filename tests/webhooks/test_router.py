@@ -26,6 +26,7 @@ def mock_whatsapp_handler():
     handler.extract_phone = MagicMock(return_value="1234567890")
     handler.extract_message = MagicMock(return_value="/workflow_name input")
     handler.handle_message = AsyncMock(return_value="Executing workflow: workflow_name")
+    handler.queue_message = AsyncMock(return_value="Queued workflow: workflow_name (job job-1)")
     return handler
 
 
@@ -96,6 +97,10 @@ class TestWhatsAppEndpoints:
 
             assert response.status_code == 200
             assert response.json()["status"] == "received"
+            assert mock_whatsapp_handler.queue_message.await_args.args[:2] == (
+                "1234567890",
+                "/workflow_name input",
+            )
 
     def test_whatsapp_post_no_message(self, test_client, mock_whatsapp_handler):
         """Test POST to WhatsApp webhook with no message payload."""
@@ -173,17 +178,16 @@ class TestGenericWebhook:
             "webhook_id": webhook_id,
         }
 
-        # Mock the run_workflow_async to avoid actual execution
-        with patch(
-            "configurable_agents.runtime.executor.run_workflow_async",
-            new_callable=AsyncMock,
-            return_value={"result": "success"},
-        ):
+        # Mock the job queue to avoid actual execution
+        queue = MagicMock()
+        queue.enqueue = AsyncMock(return_value=MagicMock(id="job-1"))
+        with patch("configurable_agents.webhooks.router.get_job_queue", return_value=queue):
             response = test_client.post("/webhooks/generic", json=payload)
 
-            # Should get 200 since we're mocking the workflow execution
-            assert response.status_code == 200
-            assert response.json()["status"] == "success"
+            # Should get 202 since the workflow is queued
+            assert response.status_code == 202
+            assert response.json()["status"] == "queued"
+            assert response.json()["job_id"] == "job-1"
 
     def test_generic_webhook_missing_workflow_name(self, test_client):
         """Test generic webhook with missing workflow_name."""
@@ -204,6 +208,30 @@ class TestGenericWebhook:
         assert "inputs" in response.json()["detail"]
 
 
+class TestJobStatusEndpoint:
+    """Tests for job status endpoint."""
+
+    def test_job_status(self, test_client):
+        """Test job status is returned for a known job."""
+        queue = MagicMock()
+        queue.get.return_value.to_dict.return_value = {"job_id": "job-1", "status": "running"}
+        with patch("configurable_agents.webhooks.router.get_job_queue", return_value=queue):
+            response = test_client.get("/webhooks/jobs/job-1")
+
+        assert response.status_code == 200
+        assert response.json() == {"job_id": "job-1", "status": "running"}
+        queue.get.assert_called_once_with("job-1")
+
+    def test_job_status_not_found(self, test_client):
+        """Test unknown job returns 404."""
+        queue = MagicMock()
+        queue.get.return_value = None
+        with patch("configurable_agents.webhooks.router.get_job_queue", return_value=queue):
+            response = test_client.get("/webhooks/jobs/missing")
+
+        assert response.status_code == 404
+
+
 class TestHealthEndpoint:
     """Tests for health check endpoint."""
 
@@ -217,6 +245,7 @@ class TestHealthEndpoint:
         assert "service" in data
         assert "whatsapp_configured" in data
         assert "telegram_configured" in data
+        assert "queue" in data
 
 
 class TestPlatformConfiguration:
@@ -25,6 +25,7 @@ class TestGetWebhookRepository:
         assert repo is not None
         assert hasattr(repo, "is_processed")
         assert hasattr(repo, "mark_processed")
+        assert hasattr(repo, "claim")
         assert hasattr(repo, "cleanup_old_events")
 
 
@@ -40,10 +41,17 @@ class TestGenericWebhookEndpoint:
     def mock_webhook_repo(self):
         """Create mock webhook repository."""
         repo = Mock()
-        repo.is_processed = Mock(return_value=False)
-        repo.mark_processed = Mock()
+        repo.claim = Mock(return_value=True)
         return repo
 
+    @pytest.fixture(autouse=True)
+    def mock_job_queue(self):
+        """Replace the workflow job queue."""
+        queue = Mock()
+        queue.enqueue = AsyncMock(return_value=Mock(id="job-1"))
+        with patch("configurable_agents.webhooks.router.get_job_queue", return_value=queue):
+            yield queue
+
     def test_generic_webhook_missing_workflow_name(self, client, mock_webhook_repo):
         """Test endpoint returns 400 when workflow_name is missing."""
         with patch("configurable_agents.webhooks.router.get_webhook_repository", return_value=mock_webhook_repo):
@@ -64,19 +72,38 @@ class TestGenericWebhookEndpoint:
             assert response.status_code == 400
             assert "inputs" in response.json()["detail"]
 
-    def test_generic_webhook_success_without_workflow_file(self, client, mock_webhook_repo):
-        """Test endpoint returns 500 when workflow file doesn't exist."""
+    def test_generic_webhook_queues_job(self, client, mock_webhook_repo, mock_job_queue):
+        """Test endpoint queues the workflow and returns 202 with the job id."""
         with patch("configurable_agents.webhooks.router.get_webhook_repository", return_value=mock_webhook_repo):
             response = client.post(
                 "/webhooks/generic",
                 json={
                     "workflow_name": "nonexistent",
                     "inputs": {"topic": "AI"},
+                    "priority": 5,
                 },
             )
-            # Workflow will fail to load (file not found)
-            assert response.status_code == 500
-            assert "Workflow execution failed" in response.json()["detail"]
+            # Workflow runs later, in the worker pool
+            assert response.status_code == 202
+            assert response.json() == {
+                "status": "queued",
+                "job_id": "job-1",
+                "workflow_name": "nonexistent",
+            }
+            mock_job_queue.enqueue.assert_awaited_once_with(
+                "nonexistent", {"topic": "AI"}, source="generic", priority=5
+            )
+
+    def test_generic_webhook_invalid_priority(self, client, mock_webhook_repo, mock_job_queue):
+        """Test endpoint returns 400 when priority is not an integer."""
+        with patch("configurable_agents.webhooks.router.get_webhook_repository", return_value=mock_webhook_repo):
+            response = client.post(
+                "/webhooks/generic",
+                json={"workflow_name": "test", "inputs": {}, "priority": "high"},
+            )
+            assert response.status_code == 400
+            assert "priority" in response.json()["detail"]
+            mock_job_queue.enqueue.assert_not_called()
 
     def test_generic_webhook_with_webhook_id(self, client, mock_webhook_repo):
         """Test endpoint tracks webhook_id for idempotency."""
@@ -90,15 +117,13 @@ class TestGenericWebhookEndpoint:
                 },
             )
             # Even though workflow fails, webhook_id should be tracked
-            mock_webhook_repo.is_processed.assert_called_once_with("test-123")
-            mock_webhook_repo.mark_processed.assert_called_once()
+            mock_webhook_repo.claim.assert_called_once_with("test-123", "generic")
 
     def test_generic_webhook_replay_attack(self, client):
         """Test endpoint prevents replay attack with duplicate webhook_id."""
         # Create repo that reports webhook as already processed
         mock_repo = Mock()
-        mock_repo.is_processed = Mock(return_value=True)
-        mock_repo.mark_processed = Mock()
+        mock_repo.claim = Mock(return_value=False)
 
         # Need to also patch the global repository reference
         with patch("configurable_agents.webhooks.router.get_webhook_repository", return_value=mock_repo):
@@ -111,9 +136,8 @@ class TestGenericWebhookEndpoint:
                         "webhook_id": "duplicate-123",
                     },
                 )
-                # Either 409 (replay detected) or 500 (depends on execution path)
-                # The key is is_processed was called
-                mock_repo.is_processed.assert_called_once_with("duplicate-123")
+                assert response.status_code == 409
+                mock_repo.claim.assert_called_once_with("duplicate-123", "generic")
 
     def test_generic_webhook_with_id_field(self, client, mock_webhook_repo):
         """Test endpoint uses 'id' field as webhook_id alternative."""
@@ -127,7 +151,7 @@ class TestGenericWebhookEndpoint:
                 },
             )
             # Should use 'id' as webhook_id
-            mock_webhook_repo.is_processed.assert_called_once_with("test-id-456")
+            mock_webhook_repo.claim.assert_called_once_with("test-id-456", "generic")
 
     def test_generic_webhook_with_signature(self, client, mock_webhook_repo):
         """Test endpoint validates HMAC signature when secret is configured."""
@@ -140,8 +164,8 @@ class TestGenericWebhookEndpoint:
                 "/webhooks/generic",
                 json={"workflow_name": "nonexistent", "inputs": {"topic": "AI"}},
             )
-            # Should return 500 (workflow file not found) not 403 (signature error)
-            assert response.status_code == 500
+            # Should be queued, not rejected with 403 (signature error)
+            assert response.status_code == 202
 
     def test_generic_webhook_with_invalid_signature(self, client, mock_webhook_repo):
         """Test endpoint rejects request with invalid signature."""
@@ -202,3 +226,46 @@ class TestHealthEndpoint:
         assert "service" in data
         assert data["service"] == "webhooks"
         assert "repository" in data
+
+
+class TestConcurrentDuplicateDeliveries:
+    """Load test: duplicate deliveries fired concurrently at /webhooks/generic."""
+
+    @pytest.mark.asyncio
+    async def test_each_webhook_id_runs_once(self, tmp_path):
+        import asyncio
+
+        import httpx
+        from sqlalchemy import create_engine
+
+        from configurable_agents.storage.idempotency import CachedWebhookEventRepository
+        from configurable_agents.storage.models import Base
+        from configurable_agents.storage.sqlite import SqliteWebhookEventRepository
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'webhooks.db'}")
+        Base.metadata.create_all(engine)
+        repo = CachedWebhookEventRepository(SqliteWebhookEventRepository(engine))
+
+        async def process(data):
+            await asyncio.sleep(0.01)
+            return {"status": "success"}
+
+        transport = httpx.ASGITransport(app=test_app)
+        with patch("configurable_agents.webhooks.router.get_webhook_repository", return_value=repo), \
+                patch("configurable_agents.webhooks.router._process_generic_webhook", process):
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                responses = await asyncio.gather(
+                    *(
+                        client.post(
+                            "/webhooks/generic",
+                            json={"workflow_name": "w", "inputs": {}, "webhook_id": f"evt-{i % 5}"},
+                        )
+                        for i in range(100)
+                    )
+                )
+
+        statuses = [response.status_code for response in responses]
+        assert statuses.count(202) == 5
+        assert statuses.count(409) == 95
+        assert repo.stats()["db_claims"] == 5
+        assert repo.stats()["memory_rejects"] == 95
@@ -224,6 +224,16 @@ class TestWorkflowCommandParsing:
         assert telegram_dispatcher is not None
 
 
+    def test_register_with_enqueue_func(self, telegram_dispatcher):
+        """Test handlers can be registered with a job enqueue function only."""
+        register_workflow_handlers(telegram_dispatcher, enqueue_func=AsyncMock())
+
+    def test_register_requires_runner_or_enqueue(self, telegram_dispatcher):
+        """Test registration fails without a way to run workflows."""
+        with pytest.raises(ValueError, match="run_workflow_func or enqueue_func"):
+            register_workflow_handlers(telegram_dispatcher)
+
+
 # Test that MAX_TELEGRAM_MESSAGE_LENGTH is correctly defined
 def test_max_telegram_message_length():
     """Test Telegram message length constant."""
@@ -374,3 +374,37 @@ class TestHandleMessage:
                 sent_message = mock_send.call_args[0][1]
                 assert len(sent_message) <= 4096
                 assert "..." in sent_message
+
+
+class TestQueueMessage:
+    """Tests for queue_message method."""
+
+    @pytest.mark.asyncio
+    async def test_queue_message_valid_command(self, whatsapp_handler):
+        """Test valid command is queued with the sender as reply target."""
+        enqueue = AsyncMock(return_value=MagicMock(id="job-1"))
+
+        ack = await whatsapp_handler.queue_message(
+            "1234567890", "/article_writer AI Safety", enqueue
+        )
+
+        assert ack == "Queued workflow: article_writer (job job-1)"
+        enqueue.assert_awaited_once_with("article_writer", {"input": "AI Safety"}, "1234567890")
+
+    @pytest.mark.asyncio
+    async def test_queue_message_invalid_format(self, whatsapp_handler):
+        """Test invalid command is answered with usage and not queued."""
+        enqueue = AsyncMock()
+
+        ack = await whatsapp_handler.queue_message("1234567890", "invalid format", enqueue)
+
+        assert "Usage:" in ack
+        enqueue.assert_not_called()
+
+    def test_format_result_truncates(self):
+        """Test results are truncated to WhatsApp's limit."""
+        text = WhatsAppWebhookHandler.format_result("x" * 5000)
+
+        assert text.startswith("Result:\n")
+        assert len(text) == 4096
+        assert text.endswith("...")